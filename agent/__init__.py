@@ -8,17 +8,33 @@ Package Structure:
 - mcp/: MCP 도구 및 서버
 - llm/: Kanana LLM 관리
 - tests/: 단위 테스트
-"""
 
-# Core models
-from .core.models import RiskLevel, AnalysisRequest, AnalysisResponse
+공개 이름은 처음 접근할 때 import한다 (PEP 562). `from agent.core import pattern_matcher`처럼
+규칙 엔진만 쓰는 워커/CLI는 MCP(FastMCP, pydantic)와 LLM(openai, dotenv) 스택을 로드하지 않는다.
+"""
+import importlib
+from typing import TYPE_CHECKING
 
-# Agents
-from .agents.outgoing import OutgoingAgent
-from .agents.incoming import IncomingAgent
+if TYPE_CHECKING:
+    from .core.models import RiskLevel, AnalysisRequest, AnalysisResponse
+    from .agents.outgoing import OutgoingAgent
+    from .agents.incoming import IncomingAgent
+    from .mcp.tools import analyze_outgoing, analyze_incoming, analyze_image
 
-# MCP tools
-from .mcp.tools import analyze_outgoing, analyze_incoming, analyze_image
+# 공개 이름 → 정의 모듈
+_LAZY_ATTRS = {
+    # Core models
+    "RiskLevel": ".core.models",
+    "AnalysisRequest": ".core.models",
+    "AnalysisResponse": ".core.models",
+    # Agents
+    "OutgoingAgent": ".agents.outgoing",
+    "IncomingAgent": ".agents.incoming",
+    # MCP tools
+    "analyze_outgoing": ".mcp.tools",
+    "analyze_incoming": ".mcp.tools",
+    "analyze_image": ".mcp.tools",
+}
 
 __all__ = [
     # Models
@@ -35,3 +51,16 @@ __all__ = [
 ]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # 이후 접근은 __getattr__ 거치지 않음
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -1,7 +1,29 @@
 """
-Agents module - 보안 Agent 구현
+Agents module - 보안 Agent 구현 (처음 접근할 때 import)
 """
-from .outgoing import OutgoingAgent
-from .incoming import IncomingAgent
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .outgoing import OutgoingAgent
+    from .incoming import IncomingAgent
+
+_LAZY_ATTRS = {
+    "OutgoingAgent": ".outgoing",
+    "IncomingAgent": ".incoming",
+}
 
 __all__ = ["OutgoingAgent", "IncomingAgent"]
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -1,6 +1,7 @@
 """
 Base Agent - Agent 공통 인터페이스
 """
+import asyncio
 from abc import ABC, abstractmethod
 from ..core.models import AnalysisResponse
 
@@ -22,6 +23,15 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def analyze_async(self, text: str, **kwargs) -> AnalysisResponse:
+        """
+        메시지 분석 (비동기 진입점 - FastAPI 핸들러용)
+
+        기본 구현은 analyze()를 스레드 풀에서 실행하여 이벤트 루프를 막지 않는다.
+        LLM을 호출하는 Agent는 AsyncKananaLLM으로 직접 구현한다.
+        """
+        return await asyncio.to_thread(self.analyze, text, **kwargs)
+
     @property
     @abstractmethod
     def name(self) -> str:
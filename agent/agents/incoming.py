@@ -10,6 +10,11 @@ v3.1 - 4단계 완전 분석 파이프라인 (category 필드 포함)
 3. 발신자 신뢰도 분석 (대화관계 조회)
 4. 정책 기반 최종 판정 (액션 정책)
 
+1~3단계는 서로 의존하지 않으므로 StageExecutor DAG로 구성하고 4단계가 그 결과를
+모아 판정한다. KAT_INCOMING_STAGE_OFFLOAD=1이면 2·3단계를 스레드 풀에서 동시에
+실행한다 (단계별 시간 제한, 초과 시 부분 결과로 판정).
+새 단계는 IncomingAgent(extra_stages=[Stage(...)])로 추가한다.
+
 MCP 도구:
 - scan_threats: 위협 패턴 스캔
 - scan_urls: URL 분석
@@ -18,14 +23,117 @@ MCP 도구:
 - get_sender_trust: 발신자 신뢰도
 - get_action_policy_for_risk: 액션 정책
 """
+import asyncio
+import os
+
 from .base import BaseAgent
 from ..core.models import RiskLevel, AnalysisResponse
 from ..core.threat_matcher import analyze_incoming_message
+from ..core.stage_executor import Stage, StageExecutor, StageRun
+
+
+# 2·3단계(신고 DB, 대화 이력 DB)를 스레드 풀에서 동시에 실행할지 여부
+# 현재 저장소는 메모리 색인/로컬 SQLite라 두 단계 합계 수십 us이고 스레드 전환은
+# 메시지당 ~100us이므로 기본은 호출 스레드에서 실행. 원격 서비스로 바뀌면 "1"로 켠다.
+STAGE_OFFLOAD = os.getenv("KAT_INCOMING_STAGE_OFFLOAD", "0") == "1"
+# 2·3단계 시간 제한 (ms) - 초과 시 해당 단계 없이 판정
+STAGE_TIMEOUT_MS = int(os.getenv("KAT_INCOMING_STAGE_TIMEOUT_MS", "2000"))
+
+STAGE_THREAT = "stage1_threat_detection"
+STAGE_SCAM = "stage2_scam_check"
+STAGE_SENDER = "stage3_sender_trust"
+STAGE_POLICY = "stage4_final_policy"
+
+
+def _stage1_risk_level(stage1: dict) -> str:
+    """Stage 1 판정 → 정책 입력용 위험도 (LOW/MEDIUM/HIGH/CRITICAL)"""
+    # analyze_incoming_message는 risk_level을 반환 (safe/low/medium/high/critical)
+    risk_level_raw = stage1.get("final_assessment", {}).get("risk_level", "safe")
+    # 소문자 → 대문자 변환 (SAFE → safe 호환)
+    level_to_threat = {
+        "safe": "SAFE",
+        "low": "SAFE",
+        "medium": "SUSPICIOUS",
+        "high": "DANGEROUS",
+        "critical": "CRITICAL"
+    }
+    threat_level = level_to_threat.get(risk_level_raw.lower(), "SAFE") if isinstance(risk_level_raw, str) else "SAFE"
+
+    # threat_level → risk_level 변환 (action_policy가 기대하는 형식)
+    level_convert = {
+        "SAFE": "LOW",
+        "SUSPICIOUS": "MEDIUM",
+        "DANGEROUS": "HIGH",
+        "CRITICAL": "CRITICAL"
+    }
+    return level_convert.get(threat_level, "LOW")
+
+
+def _run_threat_detection(ctx: dict) -> dict:
+    """Stage 1: 텍스트 패턴 분석 (Rule-based, 항상 수행)"""
+    return analyze_incoming_message(ctx["text"], ctx["features"])
+
+
+def _run_scam_check(ctx: dict) -> dict:
+    """Stage 2: 사기 신고 DB 조회"""
+    from ..core.scam_checker import check_scam_in_message
+    return check_scam_in_message(ctx["text"], ctx["features"])
+
+
+def _run_sender_trust(ctx: dict) -> dict:
+    """Stage 3: 발신자 신뢰도 분석"""
+    from ..core.conversation_analyzer import analyze_sender_risk
+    return analyze_sender_risk(ctx["user_id"], ctx["sender_id"], ctx["text"], ctx["features"])
+
+
+def _run_final_policy(ctx: dict) -> dict:
+    """Stage 4: 정책 기반 최종 판정 (1~3단계 결과 종합)"""
+    from ..core.action_policy import get_combined_policy
+
+    stage1 = ctx[STAGE_THREAT]
+
+    # 시나리오 매칭 확인
+    scenario_match = None
+    if stage1.get("scenario_match", {}).get("matched_scenario"):
+        scenario_match = stage1["scenario_match"]["matched_scenario"].get("id")
+
+    return get_combined_policy(
+        text_risk=_stage1_risk_level(stage1),
+        scam_check_result=ctx[STAGE_SCAM],
+        sender_analysis=ctx[STAGE_SENDER],
+        scenario_match=scenario_match
+    )
+
+
+def build_incoming_stages() -> list:
+    """IncomingAgent 기본 4단계 (1~3단계 독립, 4단계가 모두에 의존)"""
+    timeout = STAGE_TIMEOUT_MS / 1000
+    return [
+        Stage(STAGE_THREAT, _run_threat_detection, required=True),
+        Stage(STAGE_SCAM, _run_scam_check, blocking=STAGE_OFFLOAD, timeout=timeout, default={}),
+        Stage(
+            STAGE_SENDER, _run_sender_trust, blocking=STAGE_OFFLOAD, timeout=timeout,
+            enabled=lambda ctx: bool(ctx["user_id"] and ctx["sender_id"])
+        ),
+        Stage(STAGE_POLICY, _run_final_policy, depends_on=(STAGE_THREAT, STAGE_SCAM, STAGE_SENDER), required=True),
+    ]
 
 
 class IncomingAgent(BaseAgent):
     """안심 가드 Agent - 수신 메시지 위협 탐지 (4단계 분석)"""
 
+    def __init__(self, extra_stages: list = None, verbose: bool = True):
+        """
+        Args:
+            extra_stages: 추가 단계 (Stage 목록, 같은 이름이면 기본 단계 교체)
+                          결과는 분석 결과 dict에 단계 이름으로 들어간다.
+            verbose: 메시지별 분석 로그 출력 여부 (배치 처리 시 False)
+        """
+        self.verbose = verbose
+        self.executor = StageExecutor(build_incoming_stages())
+        for stage in extra_stages or ():
+            self.executor.add(stage)
+
     @property
     def name(self) -> str:
         return "incoming"
@@ -50,12 +158,56 @@ class IncomingAgent(BaseAgent):
         Returns:
             AnalysisResponse: 분석 결과
         """
-        print(f"[IncomingAgent] 4단계 분석 시작: text={text[:50]}...")
+        if self.verbose:
+            print(f"[IncomingAgent] 4단계 분석 시작: text={text[:50]}...")
 
         # 4단계 완전 분석
         result = self._analyze_4_stages(text, user_id, sender_id, use_ai)
         return self._convert_full_result_to_response(result)
 
+    async def analyze_async(
+        self,
+        text: str,
+        sender_id: int = None,
+        user_id: int = None,
+        use_ai: bool = True,
+        **kwargs
+    ) -> AnalysisResponse:
+        """
+        수신 메시지 위협 분석 (비동기 진입점)
+
+        스레드 풀 단계(KAT_INCOMING_STAGE_OFFLOAD=1일 때 2·3단계)를 기다리는 동안
+        이벤트 루프를 막지 않는다.
+        """
+        run = StageRun()
+        async for _ in self.executor.iter_async(self._stage_context(text, user_id, sender_id), run):
+            pass
+        return self._convert_full_result_to_response(self._finish(run))
+
+    @staticmethod
+    def _stage_context(text: str, user_id, sender_id) -> dict:
+        """단계 입력 - 메시지 특징(URL, 전화번호, 계좌번호, 키워드 히트 등)은 한 번만 추출하여 공유"""
+        from ..core.message_features import extract_message_features
+        return {
+            "text": text,
+            "features": extract_message_features(text),
+            "user_id": user_id,
+            "sender_id": sender_id,
+        }
+
+    def _finish(self, run: StageRun) -> dict:
+        """단계 결과 통합"""
+        from ..core.action_policy import format_warning_for_ui
+
+        result = dict(run.results)
+        stage4 = result[STAGE_POLICY]
+        result["final_risk_level"] = stage4["final_risk_level"]
+        result["ui_warning"] = format_warning_for_ui(stage4["policy"])
+        result["partial_stages"] = run.partial
+        if self.verbose:
+            print(f"[IncomingAgent] 판정: {result['final_risk_level']} (score={stage4.get('total_risk_score')}) | {run.summary()}")
+        return result
+
     def _analyze_4_stages(
         self,
         text: str,
@@ -70,80 +222,90 @@ class IncomingAgent(BaseAgent):
         Stage 2: 사기 신고 DB 조회
         Stage 3: 발신자 신뢰도 분석
         Stage 4: 정책 기반 최종 판정
+
+        1~3단계는 동시에 실행되며, 시간 초과/실패한 2·3단계는 빈 결과로
+        대체하고 partial_stages에 기록한다.
         """
-        from ..core.scam_checker import check_scam_in_message
-        from ..core.conversation_analyzer import analyze_sender_risk
-        from ..core.action_policy import get_combined_policy, format_warning_for_ui
-
-        # ========== Stage 1: 텍스트 패턴 분석 ==========
-        print("[IncomingAgent] Stage 1: 텍스트 패턴 분석...")
-
-        # Rule-based 분석 먼저 수행 (항상)
-        stage1 = analyze_incoming_message(text)
-        # analyze_incoming_message는 risk_level을 반환 (safe/low/medium/high/critical)
-        risk_level_raw = stage1.get("final_assessment", {}).get("risk_level", "safe")
-        # 소문자 → 대문자 변환 (SAFE → safe 호환)
-        level_to_threat = {
-            "safe": "SAFE",
-            "low": "SAFE",
-            "medium": "SUSPICIOUS",
-            "high": "DANGEROUS",
-            "critical": "CRITICAL"
-        }
-        threat_level = level_to_threat.get(risk_level_raw.lower(), "SAFE") if isinstance(risk_level_raw, str) else "SAFE"
-        print(f"[IncomingAgent] Stage 1 Rule-based: risk_level={risk_level_raw} → threat_level={threat_level}")
-        print(f"[IncomingAgent] Stage 1 결과: threat_level={threat_level}")
-
-        # ========== Stage 2: 사기 신고 DB 조회 ==========
-        print("[IncomingAgent] Stage 2: 사기 신고 DB 조회...")
-        stage2 = check_scam_in_message(text)
-        print(f"[IncomingAgent] Stage 2 결과: has_reported={stage2.get('has_reported_identifier')}")
-
-        # ========== Stage 3: 발신자 신뢰도 분석 ==========
-        stage3 = None
-        if user_id and sender_id:
-            print(f"[IncomingAgent] Stage 3: 발신자 신뢰도 분석 (user={user_id}, sender={sender_id})...")
-            stage3 = analyze_sender_risk(user_id, sender_id, text)
-            print(f"[IncomingAgent] Stage 3 결과: trust_level={stage3.get('sender_trust', {}).get('trust_level')}")
-        else:
-            print("[IncomingAgent] Stage 3: 스킵 (user_id/sender_id 없음)")
-
-        # ========== Stage 4: 정책 기반 최종 판정 ==========
-        print("[IncomingAgent] Stage 4: 정책 기반 최종 판정...")
-
-        # 시나리오 매칭 확인
-        scenario_match = None
-        if stage1.get("scenario_match", {}).get("matched_scenario"):
-            scenario_match = stage1["scenario_match"]["matched_scenario"].get("id")
-
-        # threat_level → risk_level 변환 (action_policy가 기대하는 형식)
-        level_convert = {
-            "SAFE": "LOW",
-            "SUSPICIOUS": "MEDIUM",
-            "DANGEROUS": "HIGH",
-            "CRITICAL": "CRITICAL"
-        }
-        risk_level_for_policy = level_convert.get(threat_level, "LOW")
+        return self._finish(self.executor.run(self._stage_context(text, user_id, sender_id)))
 
-        stage4 = get_combined_policy(
-            text_risk=risk_level_for_policy,
-            scam_check_result=stage2,
-            sender_analysis=stage3,
-            scenario_match=scenario_match
-        )
+    async def analyze_stream(
+        self,
+        text: str,
+        sender_id: int = None,
+        user_id: int = None,
+        use_ai: bool = True
+    ):
+        """
+        단계별 점진 분석 (비동기 제너레이터)
 
-        final_level = stage4["final_risk_level"]
-        print(f"[IncomingAgent] Stage 4 결과: final_risk_level={final_level}, score={stage4.get('total_risk_score')}")
+        단계가 끝날 때마다 {"stage", "result", "verdict", "final"}를 내보낸다.
+        verdict는 그 시점까지의 결과로 만든 AnalysisResponse이며, Stage 4 이후
+        LLM 정밀 분석(llm_refinement)이 위험도를 올리면 갱신된 verdict를 한 번 더 보낸다.
 
-        # 결과 통합
-        return {
-            "stage1_threat_detection": stage1,
-            "stage2_scam_check": stage2,
-            "stage3_sender_trust": stage3,
-            "stage4_final_policy": stage4,
-            "final_risk_level": final_level,
-            "ui_warning": format_warning_for_ui(stage4["policy"])
+        1~3단계(stage1_threat_detection, stage2_scam_check, stage3_sender_trust)는
+        끝나는 순서대로, 그 다음 stage4_final_policy → llm_refinement (use_ai일 때)
+        """
+        from ..core.action_policy import format_warning_for_ui
+
+        run = StageRun()
+        partial: dict = {}
+        async for stage, payload in self.executor.iter_async(self._stage_context(text, user_id, sender_id), run):
+            partial[stage] = payload
+            if stage == STAGE_POLICY:
+                partial["final_risk_level"] = payload["final_risk_level"]
+                partial["ui_warning"] = format_warning_for_ui(payload["policy"])
+                partial["partial_stages"] = run.partial
+            else:
+                # 정책 판정 전에는 Stage 1 위험도를 잠정 판정으로 사용
+                partial["final_risk_level"] = _stage1_risk_level(partial.get(STAGE_THREAT) or {})
+            verdict = self._convert_full_result_to_response(partial)
+            yield {"stage": stage, "result": payload, "verdict": verdict, "final": not use_ai and stage == STAGE_POLICY}
+
+        if not use_ai:
+            return
+
+        # LLM 스케줄러 공정성 키: 분석을 요청한 사용자 (없으면 발신자)
+        refinement = await self._refine_with_llm(text, verdict, user_id if user_id is not None else sender_id)
+        yield {"stage": "llm_refinement", "result": refinement, "verdict": refinement.pop("verdict"), "final": True}
+
+    async def _refine_with_llm(self, text: str, verdict: AnalysisResponse, user_key=None) -> dict:
+        """
+        LLM 정밀 분석으로 정책 판정 보정 (위험도는 올리기만 함)
+
+        Rule 판정이 SAFE인 메시지는 HybridThreatAnalyzer가 LLM을 건너뛴다.
+        """
+        from ..core.hybrid_threat_analyzer import hybrid_threat_analyze_async
+
+        level_map = {
+            "SAFE": RiskLevel.LOW,
+            "SUSPICIOUS": RiskLevel.MEDIUM,
+            "DANGEROUS": RiskLevel.HIGH,
+            "CRITICAL": RiskLevel.CRITICAL
+        }
+        order = [RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL]
+
+        try:
+            result = await hybrid_threat_analyze_async(text, use_llm=True, user_id=user_key)
+        except Exception as e:
+            print(f"[IncomingAgent] LLM 정밀 분석 오류: {e}")
+            return {"llm_used": False, "upgraded": False, "error": str(e), "verdict": verdict}
+
+        llm_level = level_map.get(result.get("threat_level", "SAFE"), RiskLevel.LOW)
+        refined = {
+            "llm_used": bool(result.get("llm_used")),
+            "llm_shed": bool(result.get("llm_shed")),
+            "threat_level": result.get("threat_level"),
+            "upgraded": False,
+            "verdict": verdict,
         }
+        if refined["llm_used"] and order.index(llm_level) > order.index(verdict.risk_level):
+            reasons = list(verdict.reasons)
+            warning = result.get("warning_message")
+            if warning and warning not in reasons:
+                reasons.insert(0, warning)
+            refined["upgraded"] = True
+            refined["verdict"] = verdict.model_copy(update={"risk_level": llm_level, "reasons": reasons})
+        return refined
 
     def _convert_full_result_to_response(self, result: dict) -> AnalysisResponse:
         """4단계 분석 결과를 AnalysisResponse로 변환"""
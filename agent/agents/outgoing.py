@@ -7,15 +7,31 @@ v2.0 - pattern_matcher.py + sensitive_patterns.json 기반
 기능:
 - Rule-based PII 감지 (pattern_matcher 사용)
 - 조합 규칙 적용 (이름+주민번호 → CRITICAL 등)
-- Kanana LLM + ReAct 패턴 (use_ai=True)
+- Kanana LLM 정밀 분석 (use_ai=True)
+  * single (기본): 규칙 분석(scan_pii + evaluate_risk)을 먼저 실행해 결과를 프롬프트에 넣고 JSON 판정 1회 요청
+  * react: MCP 도구를 LLM이 직접 호출하는 ReAct 반복 (최대 3회 왕복)
 """
+import os
 import re
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 from .base import BaseAgent
 from ..core.models import RiskLevel, AnalysisResponse
-from ..core.pattern_matcher import detect_pii, calculate_risk, get_risk_action
-from ..llm.kanana import LLMManager
-from ..prompts.outgoing_agent import get_outgoing_system_prompt
+from ..core.pattern_matcher import detect_pii, calculate_risk, get_risk_action, get_pii_engine
+from ..prompts.outgoing_agent import (
+    build_preanalyzed_message,
+    get_outgoing_preanalyzed_system_prompt,
+    get_outgoing_system_prompt,
+)
+from ..prompts.prompt_builder import pii_hits
+from ..llm.scheduler import LLMLoadShed, get_llm_scheduler
+
+# AI 분석 방식 (single: 규칙 결과 주입 + 1회 호출, react: MCP ReAct 반복)
+OUTGOING_AI_MODE = os.getenv("KAT_OUTGOING_AI_MODE", "single")
+
+
+def _analysis_hits(analysis: Dict[str, Any]) -> set:
+    """규칙 분석 결과 → 프롬프트 섹션 선택 키 (PII id / 카테고리 / 조합 규칙)"""
+    return pii_hits(analysis["pii_scan"]["found_pii"], analysis["risk_evaluation"]["matched_rules"])
 
 
 class OutgoingAgent(BaseAgent):
@@ -42,12 +58,7 @@ class OutgoingAgent(BaseAgent):
         # Tier 1: 빠른 필터링 - 숫자 패턴이 있는지 체크
         if not self._has_suspicious_pattern(text):
             # 의심스러운 패턴 없음 → 바로 통과
-            return AnalysisResponse(
-                risk_level=RiskLevel.LOW,
-                reasons=[],
-                recommended_action="전송",
-                is_secret_recommended=False
-            )
+            return self._pass_response()
 
         # Tier 2: 의심스러운 패턴 발견 → 정밀 분석
         if use_ai:
@@ -55,6 +66,53 @@ class OutgoingAgent(BaseAgent):
         else:
             return self._analyze_rule_based(text)
 
+    async def analyze_async(
+        self,
+        text: str,
+        use_ai: bool = True,
+        rule_analysis: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> AnalysisResponse:
+        """
+        발신 메시지 민감정보 분석 (비동기 버전)
+
+        Tier 1 / Rule-based는 동기 버전과 동일 (rule_analysis가 없으면 루프에서 바로 실행)
+        Tier 2 LLM 호출만 AsyncKananaLLM으로 대기 → 대기 중 다른 요청 처리
+
+        Args:
+            rule_analysis: 규칙 풀에서 미리 계산한 rule_tier() 결과 (주면 정규식 검사를 루프에서 다시 하지 않음)
+        """
+        if rule_analysis is None:
+            rule_analysis = self.rule_tier(text)
+        if not rule_analysis:
+            return self._pass_response()
+
+        if use_ai:
+            return await self._analyze_with_ai_async(text, rule_analysis)
+        else:
+            return self._convert_rule_result(rule_analysis)
+
+    def rule_tier(self, text: str) -> Dict[str, Any]:
+        """
+        Tier 1 필터 + 규칙 분석 (CPU 작업 - 규칙 풀 워커에서 실행 가능)
+
+        Returns:
+            PIIEngine.analyze() 결과 (의심 패턴이 없으면 빈 dict → 통과)
+        """
+        if not self._has_suspicious_pattern(text):
+            return {}
+        return get_pii_engine().analyze(text)
+
+    @staticmethod
+    def _pass_response() -> AnalysisResponse:
+        """의심 패턴 없음 → 바로 전송"""
+        return AnalysisResponse(
+            risk_level=RiskLevel.LOW,
+            reasons=[],
+            recommended_action="전송",
+            is_secret_recommended=False
+        )
+
     def _has_suspicious_pattern(self, text: str) -> bool:
         """
         빠른 필터링: 민감정보가 의심되는 패턴이 있는지 체크
@@ -89,14 +147,14 @@ class OutgoingAgent(BaseAgent):
         2. calculate_risk () - 조합 규칙 적용하여 최종 위험도 계산
         3. get_risk_action() - 권장 조치 반환
         """
-        # 1. PII 스캔
-        pii_result = detect_pii(text)
+        # 1~3. PII 스캔 → 위험도 계산 (조합 규칙 적용) → 권장 조치
+        return self._convert_rule_result(get_pii_engine().analyze(text))
 
-        # 2. 위험도 계산 (조합 규칙 적용)
-        risk_result = calculate_risk(pii_result["found_pii"])
-
-        # 3. 권장 조치
-        recommended_action = get_risk_action(risk_result["final_risk"])
+    def _convert_rule_result(self, result: Dict[str, Any]) -> AnalysisResponse:
+        """PIIEngine.analyze() 결과 → AnalysisResponse"""
+        pii_result = result["pii_scan"]
+        risk_result = result["risk_evaluation"]
+        recommended_action = result["recommended_action"]
 
         # 4. 감지 이유 생성
         reasons = []
@@ -118,7 +176,40 @@ class OutgoingAgent(BaseAgent):
         )
 
     def _analyze_with_ai(self, text: str) -> AnalysisResponse:
-        """Kanana LLM + MCP 프로토콜로 분석"""
+        """Kanana LLM 정밀 분석 (KAT_OUTGOING_AI_MODE: single / react)"""
+        if OUTGOING_AI_MODE == "react":
+            return self._analyze_with_mcp(text)
+
+        # LLM 스택(openai, dotenv)은 AI 모드에서만 로드 - 규칙 전용 워커 시작 시간 단축
+        from ..llm.kanana import LLMManager
+
+        # 도구(scan_pii + evaluate_risk)를 LLM 대신 먼저 실행 (~1ms) → LLM 왕복 1회
+        analysis = get_pii_engine().analyze(text)
+        try:
+            llm = LLMManager.get("instruct")
+            if not llm:
+                print("[OutgoingAgent] LLM not available, falling back to rule-based")
+                return self._convert_rule_result(analysis)
+
+            with get_llm_scheduler().slot("outgoing"):
+                result = llm.analyze_structured(
+                    user_message=build_preanalyzed_message(text, analysis),
+                    system_prompt=get_outgoing_preanalyzed_system_prompt(hits=_analysis_hits(analysis))
+                )
+            return self._convert_ai_result(result)
+
+        except LLMLoadShed as e:
+            print(f"[OutgoingAgent] {e}, falling back to rule-based")
+            return self._convert_rule_result(analysis)
+        except Exception as e:
+            print(f"[OutgoingAgent] AI analysis error: {e}, falling back to rule-based")
+            return self._convert_rule_result(analysis)
+
+    def _analyze_with_mcp(self, text: str) -> AnalysisResponse:
+        """Kanana LLM + MCP 프로토콜로 분석 (ReAct 반복)"""
+        # LLM 스택(openai, dotenv, MCP 클라이언트)은 AI 모드에서만 로드 - 규칙 전용 워커 시작 시간 단축
+        from ..llm.kanana import LLMManager
+
         try:
             # LLM 인스턴스 가져오기
             llm = LLMManager.get("instruct")
@@ -126,32 +217,92 @@ class OutgoingAgent(BaseAgent):
                 print("[OutgoingAgent] LLM not available, falling back to rule-based")
                 return self._analyze_rule_based(text)
 
-            # 시스템 프롬프트 가져오기 (JSON 데이터 동적 주입됨)
-            system_prompt = get_outgoing_system_prompt()
+            # 시스템 프롬프트 가져오기 (규칙 탐지 결과와 관련된 카탈로그/규칙/예시만)
+            system_prompt = get_outgoing_system_prompt(hits=_analysis_hits(get_pii_engine().analyze(text)))
 
             # MCP 프로토콜을 통해 도구 호출
             # Kanana LLM이 MCP 클라이언트로서 MCP 서버의 도구 사용
-            result = llm.analyze_with_mcp(
-                user_message=text,
-                system_prompt=system_prompt,
-                max_iterations=3
-            )
+            with get_llm_scheduler().slot("outgoing"):
+                result = llm.analyze_with_mcp(
+                    user_message=text,
+                    system_prompt=system_prompt,
+                    max_iterations=3
+                )
 
             # 결과를 AnalysisResponse로 변환
-            risk_level_str = result.get("risk_level", "LOW").upper()
-            risk_level = getattr(RiskLevel, risk_level_str, RiskLevel.LOW)
-
-            return AnalysisResponse(
-                risk_level=risk_level,
-                reasons=result.get("reasons", []),
-                recommended_action=result.get("recommended_action", "전송"),
-                is_secret_recommended=result.get("is_secret_recommended", False)
-            )
+            return self._convert_ai_result(result)
 
+        except LLMLoadShed as e:
+            print(f"[OutgoingAgent] {e}, falling back to rule-based")
+            return self._analyze_rule_based(text)
         except Exception as e:
             print(f"[OutgoingAgent] AI+MCP analysis error: {e}, falling back to rule-based")
             return self._analyze_rule_based(text)
 
+    async def _analyze_with_ai_async(self, text: str, analysis: Dict[str, Any]) -> AnalysisResponse:
+        """Kanana LLM 정밀 분석 (비동기 - 공유 연결 풀, 동시 호출 수 제한, analysis: 규칙 분석 결과)"""
+        if OUTGOING_AI_MODE == "react":
+            return await self._analyze_with_mcp_async(text, analysis)
+
+        from ..llm.kanana import AsyncLLMManager
+
+        try:
+            llm = await AsyncLLMManager.get("instruct")
+            if not llm:
+                print("[OutgoingAgent] LLM not available, falling back to rule-based")
+                return self._convert_rule_result(analysis)
+
+            async with get_llm_scheduler().aslot("outgoing"):
+                result = await llm.analyze_structured(
+                    user_message=build_preanalyzed_message(text, analysis),
+                    system_prompt=get_outgoing_preanalyzed_system_prompt(hits=_analysis_hits(analysis))
+                )
+            return self._convert_ai_result(result)
+
+        except LLMLoadShed as e:
+            print(f"[OutgoingAgent] {e}, falling back to rule-based")
+            return self._convert_rule_result(analysis)
+        except Exception as e:
+            print(f"[OutgoingAgent] AI analysis error: {e}, falling back to rule-based")
+            return self._convert_rule_result(analysis)
+
+    async def _analyze_with_mcp_async(self, text: str, analysis: Dict[str, Any]) -> AnalysisResponse:
+        """Kanana LLM + MCP 분석 (비동기 ReAct 반복, analysis: 규칙 분석 결과)"""
+        from ..llm.kanana import AsyncLLMManager
+
+        try:
+            llm = await AsyncLLMManager.get("instruct")
+            if not llm:
+                print("[OutgoingAgent] LLM not available, falling back to rule-based")
+                return self._convert_rule_result(analysis)
+
+            async with get_llm_scheduler().aslot("outgoing"):
+                result = await llm.analyze_with_mcp(
+                    user_message=text,
+                    system_prompt=get_outgoing_system_prompt(hits=_analysis_hits(analysis)),
+                    max_iterations=3
+                )
+            return self._convert_ai_result(result)
+
+        except LLMLoadShed as e:
+            print(f"[OutgoingAgent] {e}, falling back to rule-based")
+            return self._convert_rule_result(analysis)
+        except Exception as e:
+            print(f"[OutgoingAgent] AI+MCP analysis error: {e}, falling back to rule-based")
+            return self._convert_rule_result(analysis)
+
+    def _convert_ai_result(self, result: Dict[str, Any]) -> AnalysisResponse:
+        """LLM 분석 결과 dict → AnalysisResponse"""
+        risk_level_str = result.get("risk_level", "LOW").upper()
+        risk_level = getattr(RiskLevel, risk_level_str, RiskLevel.LOW)
+
+        return AnalysisResponse(
+            risk_level=risk_level,
+            reasons=result.get("reasons", []),
+            recommended_action=result.get("recommended_action", "전송"),
+            is_secret_recommended=result.get("is_secret_recommended", False)
+        )
+
     def _tool_scan_pii(self, text: str) -> Dict[str, Any]:
         """scan_pii 도구 - pattern_matcher.detect_pii 래퍼"""
         return detect_pii(text)
@@ -162,14 +313,10 @@ class OutgoingAgent(BaseAgent):
 
     def _tool_analyze_full(self, text: str) -> Dict[str, Any]:
         """analyze_full 도구 - 전체 분석 파이프라인"""
-        # 1. PII 스캔
-        pii_result = detect_pii(text)
-
-        # 2. 위험도 평가
-        risk_result = calculate_risk(pii_result["found_pii"])
-
-        # 3. 권장 조치
-        action = get_risk_action(risk_result["final_risk"])
+        # 1~3. PII 스캔 → 위험도 평가 → 권장 조치
+        result = get_pii_engine().analyze(text)
+        pii_result = result["pii_scan"]
+        action = result["recommended_action"]
 
         # 4. 요약
         if pii_result["count"] == 0:
@@ -178,9 +325,5 @@ class OutgoingAgent(BaseAgent):
             detected_names = list(set(item["name_ko"] for item in pii_result["found_pii"]))
             summary = f"{len(detected_names)}종의 민감정보 감지: {', '.join(detected_names)}. {action}"
 
-        return {
-            "pii_scan": pii_result,
-            "risk_evaluation": risk_result,
-            "recommended_action": action,
-            "summary": summary
-        }
+        result["summary"] = summary
+        return result
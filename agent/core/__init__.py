@@ -1,6 +1,32 @@
 """
 Core module - 핵심 데이터 모델과 유틸리티
+
+데이터 모델(pydantic)은 처음 접근할 때 import한다 - 규칙 엔진 모듈(pattern_matcher,
+threat_matcher, scam_checker)만 쓰는 경우 pydantic을 로드하지 않음.
 """
-from .models import RiskLevel, AnalysisRequest, AnalysisResponse
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .models import RiskLevel, AnalysisRequest, AnalysisResponse
+
+_LAZY_ATTRS = {
+    "RiskLevel": ".models",
+    "AnalysisRequest": ".models",
+    "AnalysisResponse": ".models",
+}
 
 __all__ = ["RiskLevel", "AnalysisRequest", "AnalysisResponse"]
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
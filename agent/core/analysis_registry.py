@@ -0,0 +1,227 @@
+"""
+Analysis Registry - 지연 예산 초과 분석의 후속 결과 보관
+분석 엔드포인트가 지연 예산 안에 Tier 1(규칙) 판정을 먼저 돌려주고,
+끝나지 않은 LLM 분석은 백그라운드에서 계속 실행할 때 사용
+
+흐름:
+1. run_with_budget(): 전체(LLM) 분석 태스크와 규칙 판정을 함께 시작 → 전체 분석은 예산만큼만 대기
+2. 예산 안에 끝나면 그 결과 반환 (analysis_id 없음, 규칙 판정은 버림)
+3. 초과하면 이미 계산된 규칙 판정 반환 + 태스크를 analysis_id로 등록
+4. 호출자는 analysis_id로 후속 결과 조회 (get / wait)
+
+항목은 TTL(기본 10분)이 지나거나 최대 개수를 넘으면 오래된 것부터 제거한다.
+제거되어도 실행 중인 태스크는 취소하지 않는다 (결과만 버림).
+asyncio는 태스크를 약한 참조로만 들고 있으므로, 끝날 때까지 _running에 강한 참조를 둔다.
+"""
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+
+# 기본 지연 예산 (ms) - 요청에 값이 없을 때 사용, 0이면 예산 없음 (LLM 완료까지 대기)
+DEFAULT_LATENCY_BUDGET_MS = int(os.getenv("KAT_LATENCY_BUDGET_MS", "0"))
+ANALYSIS_TTL_SECONDS = float(os.getenv("KAT_ANALYSIS_TTL", "600"))
+ANALYSIS_MAX_ENTRIES = int(os.getenv("KAT_ANALYSIS_MAX_ENTRIES", "10000"))
+
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_ERROR = "error"
+
+
+class _PendingAnalysis:
+    """등록된 분석 1건 (태스크 + 먼저 돌려준 규칙 판정)"""
+
+    __slots__ = ("task", "initial", "created")
+
+    def __init__(self, task: "asyncio.Future", initial: Any, created: float):
+        self.task = task
+        self.initial = initial
+        self.created = created
+
+
+class AnalysisRegistry:
+    """
+    analysis_id → 백그라운드 분석 태스크
+
+    모든 메서드는 이벤트 루프 스레드에서 호출한다 (내부 잠금 없음).
+    """
+
+    def __init__(self, ttl_seconds: float = ANALYSIS_TTL_SECONDS, max_entries: int = ANALYSIS_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _PendingAnalysis]" = OrderedDict()
+        # 실행 중인 태스크 (항목이 만료/제거되어도 완료까지 GC되지 않도록)
+        self._running: Set["asyncio.Future"] = set()
+        self.stats = {"registered": 0, "completed": 0, "failed": 0, "expired": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def register(self, task: "asyncio.Future", initial: Any = None) -> str:
+        """
+        백그라운드 태스크 등록
+
+        Args:
+            task: 실행 중인 전체 분석 태스크
+            initial: 먼저 돌려준 규칙 판정 (후속 조회 시 함께 반환)
+
+        Returns:
+            analysis_id
+        """
+        now = time.monotonic()
+        self._evict(now)
+
+        analysis_id = uuid.uuid4().hex
+        self._entries[analysis_id] = _PendingAnalysis(task, initial, now)
+        self.stats["registered"] += 1
+        self._running.add(task)
+        task.add_done_callback(self._on_done)
+        return analysis_id
+
+    def _on_done(self, task: "asyncio.Future") -> None:
+        self._running.discard(task)
+        if task.cancelled() or task.exception() is not None:
+            self.stats["failed"] += 1
+        else:
+            self.stats["completed"] += 1
+
+    def _evict(self, now: float) -> None:
+        """TTL 만료 + 최대 개수 초과 항목 제거 (등록 순서 = 생성 순서)"""
+        while self._entries:
+            analysis_id, entry = next(iter(self._entries.items()))
+            if now - entry.created < self.ttl_seconds and len(self._entries) < self.max_entries:
+                break
+            del self._entries[analysis_id]
+            self.stats["expired"] += 1
+
+    def _lookup(self, analysis_id: str) -> Optional[_PendingAnalysis]:
+        entry = self._entries.get(analysis_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created >= self.ttl_seconds:
+            del self._entries[analysis_id]
+            self.stats["expired"] += 1
+            return None
+        return entry
+
+    @staticmethod
+    def _describe(analysis_id: str, entry: _PendingAnalysis) -> Dict[str, Any]:
+        task = entry.task
+        info: Dict[str, Any] = {
+            "analysis_id": analysis_id,
+            "status": STATUS_PENDING,
+            "initial": entry.initial,
+            "result": None,
+            "error": None,
+        }
+        if not task.done():
+            return info
+        if task.cancelled():
+            info["status"] = STATUS_ERROR
+            info["error"] = "cancelled"
+        elif task.exception() is not None:
+            info["status"] = STATUS_ERROR
+            info["error"] = str(task.exception())
+        else:
+            info["status"] = STATUS_DONE
+            info["result"] = task.result()
+        return info
+
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """
+        현재 상태 조회 (대기 없음)
+
+        Returns:
+            {"analysis_id", "status", "initial", "result", "error"} 또는 None (없음/만료)
+        """
+        entry = self._lookup(analysis_id)
+        if entry is None:
+            return None
+        return self._describe(analysis_id, entry)
+
+    async def wait(self, analysis_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        완료될 때까지 최대 timeout초 대기 후 상태 조회 (롱 폴링용)
+
+        대기가 끝나도 태스크는 취소하지 않는다.
+        """
+        entry = self._lookup(analysis_id)
+        if entry is None:
+            return None
+        if timeout > 0 and not entry.task.done():
+            await asyncio.wait({entry.task}, timeout=timeout)
+        return self._describe(analysis_id, entry)
+
+    def get_stats(self) -> Dict[str, Any]:
+        pending = sum(1 for entry in self._entries.values() if not entry.task.done())
+        return {**self.stats, "entries": len(self._entries), "pending": pending, "running": len(self._running)}
+
+
+async def run_with_budget(
+    full: Callable[[], Awaitable[Any]],
+    fallback: Callable[[], Awaitable[Any]],
+    budget_ms: Optional[int],
+    registry: Optional[AnalysisRegistry] = None
+) -> Tuple[Any, Optional[str]]:
+    """
+    지연 예산 안에서 분석 실행
+
+    Args:
+        full: 전체 분석 (LLM 포함) 코루틴 함수
+        fallback: 예산 초과 시 돌려줄 규칙 판정 코루틴 함수 (full과 동시에 시작)
+        budget_ms: 지연 예산 (ms, None/0 이하면 full 완료까지 대기)
+        registry: 초과 시 태스크를 등록할 레지스트리 (기본: 전역)
+
+    Returns:
+        (결과, analysis_id) - 예산 안에 끝났으면 analysis_id는 None
+
+    규칙 판정을 예산 대기와 함께 돌리므로 응답 시간은 max(예산, 규칙 판정 시간)이다.
+    예산이 지났는데 규칙 판정이 아직이면 둘 중 먼저 끝난 쪽을 반환한다.
+    """
+    if not budget_ms or budget_ms <= 0:
+        return await full(), None
+
+    task = asyncio.ensure_future(full())
+    rule = asyncio.ensure_future(fallback())
+    try:
+        done, _ = await asyncio.wait({task}, timeout=budget_ms / 1000)
+        if not done and not rule.done():
+            done, _ = await asyncio.wait({task, rule}, return_when=asyncio.FIRST_COMPLETED)
+        if task in done:
+            _discard(rule)
+            return task.result(), None
+
+        # 예산 초과 → 규칙 판정 먼저 반환, LLM 분석은 계속 실행
+        initial = rule.result()
+    except BaseException:
+        # 규칙 판정 실패 / 요청 취소 → 등록되지 못한 태스크를 남기지 않음
+        task.cancel()
+        _discard(rule)
+        raise
+    if registry is None:
+        registry = get_analysis_registry()
+    analysis_id = registry.register(task, initial)
+    return initial, analysis_id
+
+
+def _discard(future: asyncio.Future) -> None:
+    """쓰지 않는 규칙 판정 정리 (실행 중이면 취소, 끝났으면 예외를 읽어 경고 방지)"""
+    if not future.done():
+        future.cancel()
+    elif not future.cancelled():
+        future.exception()
+
+
+# 전역 레지스트리
+_registry: Optional[AnalysisRegistry] = None
+
+
+def get_analysis_registry() -> AnalysisRegistry:
+    """분석 레지스트리 싱글톤"""
+    global _registry
+    if _registry is None:
+        _registry = AnalysisRegistry()
+    return _registry
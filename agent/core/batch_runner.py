@@ -0,0 +1,148 @@
+"""
+Batch Runner - 메시지 배치 처리 (중복 제거 + 작업자 풀 + 순서 보존)
+대량 백필, 단체방 fan-out처럼 한 번에 많은 메시지를 규칙 기반으로 분석할 때 사용
+
+흐름:
+1. 키(기본: 항목 자체)가 같은 항목은 한 번만 분석
+2. 고유 항목을 chunk_size 단위로 나눠 작업자 풀에서 실행
+   (고유 항목이 한 청크 이하이면 호출 스레드에서 바로 실행 - 풀 전환 비용 절약)
+3. 결과를 입력 순서대로 다시 펼쳐 반환 (중복 항목은 같은 결과 객체 공유)
+
+항목 하나가 실패해도 배치 전체를 실패시키지 않고, 해당 위치에 BatchItemError를 둔다.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+BATCH_WORKERS = int(os.getenv("KAT_BATCH_WORKERS", str(min(8, os.cpu_count() or 4))))
+BATCH_CHUNK_SIZE = int(os.getenv("KAT_BATCH_CHUNK", "64"))
+# 요청 1건에 받을 최대 항목 수
+BATCH_MAX_ITEMS = int(os.getenv("KAT_BATCH_MAX_ITEMS", "5000"))
+
+
+class BatchItemError:
+    """배치 항목 1개의 실패 (결과 목록에서 해당 위치를 채움)"""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"BatchItemError({self.error!r})"
+
+    @property
+    def detail(self) -> str:
+        return str(self.error) or type(self.error).__name__
+
+
+def dedupe(keys: Sequence[Hashable]) -> Tuple[List[int], List[int]]:
+    """
+    중복 제거
+
+    Returns:
+        (고유 항목의 첫 위치 목록, 항목별 고유 번호)
+    """
+    first_index: List[int] = []
+    slots: Dict[Hashable, int] = {}
+    mapping: List[int] = []
+    for i, key in enumerate(keys):
+        slot = slots.get(key)
+        if slot is None:
+            slot = slots[key] = len(first_index)
+            first_index.append(i)
+        mapping.append(slot)
+    return first_index, mapping
+
+
+def _run_chunk(func: Callable[[Any], Any], chunk: Sequence[Any]) -> List[Any]:
+    results = []
+    for item in chunk:
+        try:
+            results.append(func(item))
+        except Exception as e:
+            results.append(BatchItemError(e))
+    return results
+
+
+class BatchRun:
+    """배치 실행 결과 (입력 순서 결과 + 고유 항목 수)"""
+
+    __slots__ = ("results", "unique")
+
+    def __init__(self, results: List[Any], unique: int):
+        self.results = results
+        self.unique = unique
+
+    @property
+    def errors(self) -> List[Tuple[int, BatchItemError]]:
+        return [(i, r) for i, r in enumerate(self.results) if isinstance(r, BatchItemError)]
+
+
+def _plan(items: Sequence[Any], key: Optional[Callable[[Any], Hashable]], chunk_size: int):
+    keys = [key(item) for item in items] if key is not None else list(items)
+    first_index, mapping = dedupe(keys)
+    unique_items = [items[i] for i in first_index]
+    chunks = [unique_items[i:i + chunk_size] for i in range(0, len(unique_items), chunk_size)]
+    return unique_items, mapping, chunks
+
+
+def run_batch(
+    items: Sequence[Any],
+    func: Callable[[Any], Any],
+    key: Optional[Callable[[Any], Hashable]] = None,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    pool: Optional[ThreadPoolExecutor] = None
+) -> BatchRun:
+    """
+    배치 실행 (동기)
+
+    Args:
+        items: 입력 항목
+        func: 항목 1개 처리 함수
+        key: 중복 판정 키 (None이면 항목 자체)
+        chunk_size: 작업자 1회 처리 단위
+        pool: 작업자 풀 (기본: 공유 풀)
+
+    Returns:
+        BatchRun (results는 입력 순서)
+    """
+    unique_items, mapping, chunks = _plan(items, key, chunk_size)
+    if len(chunks) <= 1:
+        unique_results = _run_chunk(func, unique_items)
+    else:
+        pool = pool or get_batch_pool()
+        unique_results = [r for part in pool.map(lambda chunk: _run_chunk(func, chunk), chunks) for r in part]
+    return BatchRun([unique_results[slot] for slot in mapping], len(unique_items))
+
+
+async def run_batch_async(
+    items: Sequence[Any],
+    func: Callable[[Any], Any],
+    key: Optional[Callable[[Any], Hashable]] = None,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    pool: Optional[ThreadPoolExecutor] = None
+) -> BatchRun:
+    """
+    배치 실행 (비동기) - 모든 청크를 작업자 풀에서 실행하여 이벤트 루프를 막지 않음
+    """
+    unique_items, mapping, chunks = _plan(items, key, chunk_size)
+    loop = asyncio.get_running_loop()
+    pool = pool or get_batch_pool()
+    parts = await asyncio.gather(*(loop.run_in_executor(pool, _run_chunk, func, chunk) for chunk in chunks))
+    unique_results = [r for part in parts for r in part]
+    return BatchRun([unique_results[slot] for slot in mapping], len(unique_items))
+
+
+# 공유 작업자 풀
+_batch_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_batch_pool() -> ThreadPoolExecutor:
+    """배치 작업자 풀 싱글톤"""
+    global _batch_pool
+    if _batch_pool is None:
+        _batch_pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="kat-batch")
+    return _batch_pool
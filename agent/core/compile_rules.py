@@ -0,0 +1,39 @@
+"""
+규칙 검증 CLI - 규칙 JSON 파일을 오프라인으로 컴파일/검증 (서버와 같은 build_snapshot 경로)
+
+사용법:
+    python -m agent.core.compile_rules check [--data-dir DIR]
+
+check는 규칙 파일이 파싱/컴파일/샘플 메시지 검증을 통과하면 0, 실패하면 1을 반환한다 (배포 스크립트용).
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from .rule_snapshot import DATA_DIR, RuleSnapshotError, build_snapshot
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="규칙 파일 검증")
+    parser.add_argument("command", choices=["check"])
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="규칙 파일 디렉토리")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        snapshot = build_snapshot(args.data_dir)
+    except RuleSnapshotError as e:
+        print(f"[RuleCheck] 검증 실패: {e}")
+        return 1
+    elapsed = (time.perf_counter() - start) * 1000
+    info = snapshot.describe()
+    print(
+        f"[RuleCheck] 통과: {info['version']}, PII 패턴 {info['pii_patterns']}개, "
+        f"위협 패턴 {info['threat_patterns']}개, {elapsed:.0f}ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
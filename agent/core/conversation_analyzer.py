@@ -4,15 +4,37 @@ Conversation Analyzer - 대화관계 분석 모듈
 
 기능:
 - 대화 이력 조회 (첫 메시지인지 확인)
-- 발신자 신뢰도 계산
+- 발신자 신뢰도 계산 (감쇠 메시지 수 + 활동 일수, 오래 연락 없으면 감소)
 - 대화 패턴 분석 (갑작스러운 송금 요청 등)
+
+대화 이력은 SQLite(WAL) 저장소에 보관 (재시작/워커 간 공유)
+- 경로: 환경변수 KAT_CONVERSATION_DB (기본 agent/data/conversation_history.db)
 """
-from typing import Dict, Any, Optional, List
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
 from datetime import datetime, timedelta
 
+from .conversation_store import ConversationStore, decay_factor
+
+if TYPE_CHECKING:
+    from .message_features import MessageFeatures
+
+
+# 대화 이력 저장소 (실제로는 채팅 서버 DB 연동)
+_DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "conversation_history.db"
+_conversation_store: Optional[ConversationStore] = None
 
-# Mock 대화 이력 DB (실제로는 채팅 서버 DB 연동)
-_conversation_history: Dict[str, Dict] = {}
+
+def get_conversation_store() -> ConversationStore:
+    """대화 이력 저장소 (싱글톤)"""
+    global _conversation_store
+    if _conversation_store is None:
+        _conversation_store = ConversationStore(os.getenv("KAT_CONVERSATION_DB", str(_DEFAULT_DB_PATH)))
+    return _conversation_store
+
+# 갑작스러운 금융 요청 판단 키워드
+FINANCIAL_KEYWORDS = ("송금", "이체", "계좌", "돈", "급하게", "빨리", "입금")
 
 
 def register_conversation(user_id: int, sender_id: int, message: str, timestamp: datetime = None):
@@ -23,29 +45,16 @@ def register_conversation(user_id: int, sender_id: int, message: str, timestamp:
     if timestamp is None:
         timestamp = datetime.now()
 
-    key = f"{user_id}_{sender_id}"
-    if key not in _conversation_history:
-        _conversation_history[key] = {
-            "user_id": user_id,
-            "sender_id": sender_id,
-            "first_contact": timestamp,
-            "last_contact": timestamp,
-            "message_count": 0,
-            "messages": []
-        }
-
-    _conversation_history[key]["last_contact"] = timestamp
-    _conversation_history[key]["message_count"] += 1
-    _conversation_history[key]["messages"].append({
-        "content": message[:100],  # 앞 100자만 저장
-        "timestamp": timestamp.isoformat()
-    })
+    # 집계 갱신 + 최근 메시지 링 버퍼 (앞 100자만 저장)
+    get_conversation_store().register(user_id, sender_id, message, timestamp)
 
 
 def get_conversation_history(user_id: int, sender_id: int) -> Dict[str, Any]:
     """
     발신자와의 대화 이력 조회
 
+    저장소의 증분 집계를 1회 조회하여 계산 (메시지 목록/시각 문자열 재처리 없음)
+
     Args:
         user_id: 수신자 (현재 사용자) ID
         sender_id: 발신자 ID
@@ -55,11 +64,13 @@ def get_conversation_history(user_id: int, sender_id: int) -> Dict[str, Any]:
         is_first_message: 첫 메시지 여부
         conversation_days: 대화한 기간 (일)
         message_count: 총 메시지 수
+        active_days: 메시지를 주고받은 날 수
+        recent_message_count: 감쇠 적용 메시지 수 (최근 메시지일수록 큰 가중치)
         trust_score: 신뢰도 점수 (0-100)
         trust_level: 신뢰 레벨 (unknown/low/medium/high)
     """
-    key = f"{user_id}_{sender_id}"
-    history = _conversation_history.get(key)
+    store = get_conversation_store()
+    history = store.get_pair(user_id, sender_id)
 
     if history is None:
         return {
@@ -67,6 +78,8 @@ def get_conversation_history(user_id: int, sender_id: int) -> Dict[str, Any]:
             "is_first_message": True,
             "conversation_days": 0,
             "message_count": 0,
+            "active_days": 0,
+            "recent_message_count": 0.0,
             "trust_score": 0,
             "trust_level": "unknown",
             "first_contact": None,
@@ -74,14 +87,17 @@ def get_conversation_history(user_id: int, sender_id: int) -> Dict[str, Any]:
         }
 
     # 대화 기간 계산
-    first_contact = datetime.fromisoformat(history["first_contact"]) if isinstance(history["first_contact"], str) else history["first_contact"]
-    last_contact = datetime.fromisoformat(history["last_contact"]) if isinstance(history["last_contact"], str) else history["last_contact"]
+    first_contact = history["first_contact"]
+    last_contact = history["last_contact"]
     conversation_days = (last_contact - first_contact).days
 
     # 신뢰도 계산
     trust_score = calculate_trust_score(
-        message_count=history["message_count"],
-        conversation_days=conversation_days
+        message_count=history["decayed_count"],
+        conversation_days=conversation_days,
+        active_days=history["active_days"],
+        idle_days=history["idle_days"],
+        half_life_days=store.half_life_days
     )
 
     trust_level = get_trust_level(trust_score)
@@ -91,6 +107,8 @@ def get_conversation_history(user_id: int, sender_id: int) -> Dict[str, Any]:
         "is_first_message": history["message_count"] == 1,
         "conversation_days": conversation_days,
         "message_count": history["message_count"],
+        "active_days": history["active_days"],
+        "recent_message_count": round(history["decayed_count"], 2),
         "trust_score": trust_score,
         "trust_level": trust_level,
         "first_contact": first_contact.isoformat() if first_contact else None,
@@ -98,22 +116,30 @@ def get_conversation_history(user_id: int, sender_id: int) -> Dict[str, Any]:
     }
 
 
-def calculate_trust_score(message_count: int, conversation_days: int) -> int:
+def calculate_trust_score(
+    message_count: float,
+    conversation_days: int,
+    active_days: Optional[int] = None,
+    idle_days: float = 0.0,
+    half_life_days: Optional[float] = None
+) -> int:
     """
     신뢰도 점수 계산
 
     기준:
-    - 메시지 수: 많을수록 신뢰도 상승
-    - 대화 기간: 길수록 신뢰도 상승
+    - 메시지 수: 많을수록 신뢰도 상승 (감쇠 메시지 수를 넘기면 최근 대화 위주)
+    - 대화 기간: 활동 일수 기준 (없으면 첫~마지막 연락 기간), 길수록 상승
+    - 마지막 연락 후 오래 지나면 대화 기간 점수도 반감기에 따라 감소
     - 최대 100점
     """
     # 메시지 수 기반 점수 (최대 50점)
     message_score = min(50, message_count * 5)
 
     # 대화 기간 기반 점수 (최대 50점)
-    days_score = min(50, conversation_days * 2)
+    days = conversation_days if active_days is None else active_days
+    days_score = min(50, days * 2) * decay_factor(idle_days, half_life_days)
 
-    return message_score + days_score
+    return int(message_score + days_score)
 
 
 def get_trust_level(trust_score: int) -> str:
@@ -128,7 +154,12 @@ def get_trust_level(trust_score: int) -> str:
         return "unknown"
 
 
-def analyze_sender_risk(user_id: int, sender_id: int, current_message: str) -> Dict[str, Any]:
+def analyze_sender_risk(
+    user_id: int,
+    sender_id: int,
+    current_message: str,
+    features: Optional["MessageFeatures"] = None
+) -> Dict[str, Any]:
     """
     발신자 위험도 종합 분석
 
@@ -138,6 +169,7 @@ def analyze_sender_risk(user_id: int, sender_id: int, current_message: str) -> D
         user_id: 수신자 ID
         sender_id: 발신자 ID
         current_message: 현재 수신 메시지
+        features: 미리 추출한 메시지 특징 (선택)
 
     Returns:
         sender_trust: 발신자 신뢰 정보
@@ -181,8 +213,10 @@ def analyze_sender_risk(user_id: int, sender_id: int, current_message: str) -> D
         risk_adjustment -= 20
 
     # 4. 갑작스러운 금융 요청 패턴 감지
-    financial_keywords = ["송금", "이체", "계좌", "돈", "급하게", "빨리", "입금"]
-    has_financial_request = any(kw in current_message for kw in financial_keywords)
+    if features is not None:
+        has_financial_request = bool(features.financial_keywords)
+    else:
+        has_financial_request = any(kw in current_message for kw in FINANCIAL_KEYWORDS)
 
     if has_financial_request and history["trust_level"] in ["unknown", "low"]:
         risk_factors.append({
@@ -201,14 +235,21 @@ def analyze_sender_risk(user_id: int, sender_id: int, current_message: str) -> D
     }
 
 
+def get_recent_messages(user_id: int, sender_id: int) -> List[Dict[str, str]]:
+    """발신자와의 최근 메시지 (링 버퍼, 오래된 순)"""
+    return get_conversation_store().get_recent_messages(user_id, sender_id)
+
+
 def clear_conversation_history():
     """대화 이력 초기화 (테스트용)"""
-    global _conversation_history
-    _conversation_history = {}
+    get_conversation_store().clear()
 
 
 def seed_test_data():
-    """테스트용 대화 이력 시드 데이터 생성"""
+    """테스트용 대화 이력 시드 데이터 생성 (이미 있으면 건너뜀)"""
+    if get_conversation_store().get_pair(1, 2) is not None:
+        return
+
     # 신뢰할 수 있는 친구 (오래된 대화 이력)
     base_time = datetime.now() - timedelta(days=365)
     for i in range(100):
@@ -0,0 +1,335 @@
+"""
+Conversation Store - 대화 이력 저장소 (SQLite WAL)
+conversation_analyzer의 (수신자, 발신자) 쌍별 대화 이력 저장
+
+구조:
+- conversation_pairs: 쌍별 집계 (첫/마지막 연락, 메시지 수, 감쇠 메시지 수, 활동 일수)
+  → 기본키 1회 조회
+- conversation_messages: 쌍별 최근 메시지 고정 크기 링 버퍼 (slot = 순번 % ring_size)
+- TTL: 마지막 연락 후 ttl_days가 지난 쌍은 주기적으로 삭제 (last_contact 인덱스)
+
+감쇠 메시지 수:
+- 메시지마다 1씩 더하되 half_life_days마다 절반으로 줄어드는 값
+- 저장값은 last_contact 시점 기준, 조회 시점까지의 감쇠는 읽을 때 적용 (전체 재계산 없음)
+
+실제 운영에서는 채팅 서버 DB로 대체 (같은 인터페이스)
+"""
+import math
+import sqlite3
+import threading
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+
+# 시각은 naive datetime 기준 마이크로초 정수로 저장 (ISO 파싱/시간대 변환 없음)
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_DAY_MICROS = 86_400_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversation_pairs (
+    user_id INTEGER NOT NULL,
+    sender_id INTEGER NOT NULL,
+    first_contact INTEGER NOT NULL,
+    last_contact INTEGER NOT NULL,
+    message_count INTEGER NOT NULL,
+    decayed_count REAL NOT NULL DEFAULT 0,
+    active_days INTEGER NOT NULL DEFAULT 1,
+    last_active_day INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, sender_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS ix_conversation_pairs_last_contact
+    ON conversation_pairs (last_contact);
+
+CREATE TABLE IF NOT EXISTS conversation_messages (
+    user_id INTEGER NOT NULL,
+    sender_id INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    PRIMARY KEY (user_id, sender_id, slot)
+) WITHOUT ROWID;
+"""
+
+# 이전 스키마(집계 3개) DB에 추가할 열: (이름, 정의, 기존 행 초기값 SQL)
+_ADDED_COLUMNS = (
+    ("decayed_count", "REAL NOT NULL DEFAULT 0", "message_count"),
+    ("active_days", "INTEGER NOT NULL DEFAULT 1", "1"),
+    ("last_active_day", "INTEGER NOT NULL DEFAULT 0", f"last_contact / {_DAY_MICROS}"),
+)
+
+
+def to_micros(timestamp: datetime) -> int:
+    """datetime → 마이크로초 정수 (aware datetime은 로컬 naive로 변환)"""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def from_micros(micros: int) -> datetime:
+    """마이크로초 정수 → naive datetime"""
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+def decay_factor(elapsed_days: float, half_life_days: Optional[float]) -> float:
+    """경과 일수에 대한 감쇠 계수 (half_life_days마다 절반, None이면 감쇠 없음)"""
+    if half_life_days is None or elapsed_days <= 0:
+        return 1.0
+    return math.pow(0.5, elapsed_days / half_life_days)
+
+
+class ConversationStore:
+    """
+    (수신자, 발신자) 쌍별 대화 이력 저장소
+
+    파일 DB는 WAL 모드 + 스레드별 연결 (여러 워커 프로세스가 같은 파일 공유 가능).
+    ":memory:"는 단일 연결 + 잠금 (테스트/단일 프로세스용).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        ring_size: int = 20,
+        ttl_days: Optional[float] = 365,
+        evict_every: int = 1000,
+        half_life_days: Optional[float] = 90
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:"면 메모리 DB)
+            ring_size: 쌍별로 보관할 최근 메시지 수
+            ttl_days: 마지막 연락 후 이력 보관 기간 (None이면 삭제 안 함)
+            evict_every: 등록 N회마다 TTL 만료 쌍 삭제
+            half_life_days: 감쇠 메시지 수의 반감기 (None이면 감쇠 없음)
+        """
+        self.path = str(path)
+        self.ring_size = ring_size
+        self.ttl_days = ttl_days
+        self.evict_every = evict_every
+        self.half_life_days = half_life_days
+
+        self._memory = self.path == ":memory:"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shared: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+        conn = self._connect()
+        with self._guard():
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+
+    # ---------- 연결 ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._memory:
+            if self._shared is None:
+                self._shared = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+            return self._shared
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _guard(self):
+        """메모리 DB는 연결을 공유하므로 잠금, 파일 DB는 SQLite 잠금에 맡김"""
+        return self._lock if self._memory else nullcontext()
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """이전 스키마 DB에 집계 열 추가 (기존 쌍은 메시지 수/마지막 연락으로 초기화)"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(conversation_pairs)")}
+        missing = [column for column in _ADDED_COLUMNS if column[0] not in columns]
+        if not missing:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for name, definition, initial in missing:
+                conn.execute(f"ALTER TABLE conversation_pairs ADD COLUMN {name} {definition}")
+                conn.execute(f"UPDATE conversation_pairs SET {name} = {initial}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        print(f"[ConversationStore] 스키마 갱신: {', '.join(column[0] for column in missing)} 열 추가")
+
+    # ---------- 쓰기 ----------
+
+    def register(self, user_id: int, sender_id: int, message: str, timestamp: datetime) -> int:
+        """
+        메시지 1건 등록 (집계 갱신 + 링 버퍼 기록, 1 트랜잭션)
+
+        집계는 기존 값에서 증분 갱신한다:
+        - 감쇠 메시지 수: 이전 값을 새 메시지 시각까지 감쇠시킨 뒤 +1
+          (이전 시각의 메시지가 늦게 들어오면 그 시각 기준 기여분만 더함)
+        - 활동 일수: 마지막 활동일 이후 날짜면 +1
+          (늦게 들어온 과거 메시지는 첫 연락보다 이전 날짜일 때만 +1)
+
+        Returns:
+            갱신 후 메시지 수
+        """
+        micros = to_micros(timestamp)
+        day = micros // _DAY_MICROS
+        conn = self._connect()
+        with self._guard():
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    """
+                    SELECT first_contact, last_contact, message_count, decayed_count,
+                           active_days, last_active_day
+                    FROM conversation_pairs WHERE user_id = ? AND sender_id = ?
+                    """,
+                    (user_id, sender_id),
+                ).fetchone()
+
+                if row is None:
+                    first, last, count, decayed, active_days, last_day = micros, micros, 1, 1.0, 1, day
+                else:
+                    first, last, count, decayed, active_days, last_day = row
+                    count += 1
+                    elapsed = (micros - last) / _DAY_MICROS
+                    if elapsed >= 0:
+                        decayed = decayed * decay_factor(elapsed, self.half_life_days) + 1.0
+                        last = micros
+                    else:
+                        decayed += decay_factor(-elapsed, self.half_life_days)
+                    if day > last_day:
+                        active_days += 1
+                        last_day = day
+                    elif day < first // _DAY_MICROS:
+                        active_days += 1
+                    first = min(first, micros)
+
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO conversation_pairs
+                        (user_id, sender_id, first_contact, last_contact, message_count,
+                         decayed_count, active_days, last_active_day)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (user_id, sender_id, first, last, count, decayed, active_days, last_day),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO conversation_messages VALUES (?, ?, ?, ?, ?, ?)",
+                    (user_id, sender_id, (count - 1) % self.ring_size, count, message[:100], micros),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        self._writes += 1
+        if self.ttl_days is not None and self._writes % self.evict_every == 0:
+            self.evict_inactive()
+        return count
+
+    def evict_inactive(self, now: Optional[datetime] = None) -> int:
+        """
+        TTL이 지난 쌍 삭제
+
+        Returns:
+            삭제된 쌍 수
+        """
+        if self.ttl_days is None:
+            return 0
+        cutoff = to_micros((now or datetime.now()) - timedelta(days=self.ttl_days))
+        conn = self._connect()
+        with self._guard():
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    """
+                    DELETE FROM conversation_messages WHERE (user_id, sender_id) IN (
+                        SELECT user_id, sender_id FROM conversation_pairs WHERE last_contact < ?
+                    )
+                    """,
+                    (cutoff,),
+                )
+                deleted = conn.execute(
+                    "DELETE FROM conversation_pairs WHERE last_contact < ?", (cutoff,)
+                ).rowcount
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if deleted:
+            print(f"[ConversationStore] 비활성 대화 {deleted}건 삭제 (TTL {self.ttl_days}일)")
+        return deleted
+
+    def clear(self) -> None:
+        """전체 삭제 (테스트용)"""
+        conn = self._connect()
+        with self._guard():
+            conn.execute("DELETE FROM conversation_messages")
+            conn.execute("DELETE FROM conversation_pairs")
+
+    # ---------- 읽기 ----------
+
+    def get_pair(
+        self,
+        user_id: int,
+        sender_id: int,
+        now: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        쌍별 집계 조회 (기본키 1회 조회, 메시지 목록은 읽지 않음)
+
+        Args:
+            now: 감쇠 기준 시각 (기본: 현재 시각)
+
+        Returns:
+            {"first_contact", "last_contact", "message_count",
+             "decayed_count" (now 기준), "active_days", "idle_days"} 또는 None
+        """
+        conn = self._connect()
+        with self._guard():
+            row = conn.execute(
+                """
+                SELECT first_contact, last_contact, message_count, decayed_count, active_days
+                FROM conversation_pairs WHERE user_id = ? AND sender_id = ?
+                """,
+                (user_id, sender_id),
+            ).fetchone()
+        if row is None:
+            return None
+
+        first, last, count, decayed, active_days = row
+        # 저장된 감쇠 값은 last_contact 기준 → 조회 시점까지 감쇠 (지연 적용)
+        idle_days = max(0.0, (to_micros(now or datetime.now()) - last) / _DAY_MICROS)
+        return {
+            "first_contact": from_micros(first),
+            "last_contact": from_micros(last),
+            "message_count": count,
+            "decayed_count": decayed * decay_factor(idle_days, self.half_life_days),
+            "active_days": active_days,
+            "idle_days": idle_days,
+        }
+
+    def get_recent_messages(self, user_id: int, sender_id: int) -> List[Dict[str, str]]:
+        """링 버퍼의 최근 메시지 (오래된 순)"""
+        conn = self._connect()
+        with self._guard():
+            rows = conn.execute(
+                """
+                SELECT content, timestamp FROM conversation_messages
+                WHERE user_id = ? AND sender_id = ? ORDER BY seq
+                """,
+                (user_id, sender_id),
+            ).fetchall()
+        return [{"content": content, "timestamp": from_micros(ts).isoformat()} for content, ts in rows]
+
+    def count_pairs(self) -> int:
+        """저장된 쌍 수"""
+        conn = self._connect()
+        with self._guard():
+            return conn.execute("SELECT COUNT(*) FROM conversation_pairs").fetchone()[0]
@@ -10,11 +10,14 @@ Hybrid PII Analyzer - Rule-based + LLM 통합 분석기
 1. LLM이 직접 PII를 인식 (문맥 이해)
 2. Rule-based는 1차 필터 + 검증용
 3. 두 결과를 Union하여 최종 판단
+4. LLM 프롬프트는 규칙 탐지 결과와 관련된 감지 대상/예시만 토큰 예산 안에서 조립 (prompt_builder)
 """
 from typing import Dict, Any, List, Optional
 import json
 import re
 
+from ..llm.scheduler import LLMLoadShed, get_llm_scheduler
+from ..prompts.prompt_builder import PromptBuilder, PromptSection, pii_hits
 from .pattern_matcher import detect_pii, calculate_risk, get_risk_action
 
 
@@ -138,6 +141,76 @@ PII가 없으면:
 이제 다음 텍스트를 분석하세요:
 """
 
+# 감지 대상 카테고리 / 예시별 관련 PII (LLM_PII_DETECTION_PROMPT의 ### 순서)
+# 이름/주소/건강정보처럼 규칙이 놓치기 쉬운 카테고리는 탐지가 없어도 예산이 남으면 포함 (context)
+_PII_TARGET_TAGS = [
+    (PromptSection.RELEVANT, ("government_id", "resident_id", "foreigner_id", "passport")),
+    (PromptSection.RELEVANT, ("financial_info", "card", "account", "cvc", "card_expiry")),
+    (PromptSection.CONTEXT, ("personal_info", "phone", "email", "address")),
+    (PromptSection.RELEVANT, ("auth_credentials", "password", "login_id", "api_key")),
+    (PromptSection.CONTEXT, ("personal_info", "name", "birth_date", "driver_license", "vehicle_registration")),
+    (PromptSection.CONTEXT, ("health_info", "medical_history", "disability", "medication")),
+]
+_PII_EXAMPLE_TAGS = [
+    ("birth_date", "address"),
+    ("password", "login_id", "auth_credentials"),
+    ("name", "resident_id", "address", "government_id"),
+]
+_PII_PROMPT_TRAILER = "이제 다음 텍스트를 분석하세요:\n"
+
+_pii_prompt_builder: Optional[PromptBuilder] = None
+
+
+def get_pii_prompt_builder() -> PromptBuilder:
+    """
+    LLM_PII_DETECTION_PROMPT 섹션 빌더
+
+    "## 감지 대상" / "## 예시" 아래 ### 항목을 섹션으로 나누고 나머지는 필수 섹션.
+    모든 섹션을 넣으면 LLM_PII_DETECTION_PROMPT와 같은 문자열.
+    (상수 프롬프트에서 만들므로 규칙 리로드와 무관하게 한 번만 생성)
+
+    Raises:
+        ValueError: 프롬프트의 ### 항목 수가 _PII_TARGET_TAGS / _PII_EXAMPLE_TAGS와 다르거나
+                    _PII_PROMPT_TRAILER가 정확히 한 번 나오지 않음 (섹션이 조용히 빠지지 않도록)
+    """
+    global _pii_prompt_builder
+    if _pii_prompt_builder is not None:
+        return _pii_prompt_builder
+
+    sections, groups = [], {}
+    for block in re.split(r"(?m)(?=^## )", LLM_PII_DETECTION_PROMPT):
+        if block.startswith("## 감지 대상"):
+            title, *targets = re.split(r"(?m)(?=^### )", block)
+            groups["targets"] = title
+            if len(targets) != len(_PII_TARGET_TAGS):
+                raise ValueError(f"감지 대상 항목 {len(targets)}개 ≠ _PII_TARGET_TAGS {len(_PII_TARGET_TAGS)}개")
+            for n, (text, (kind, tags)) in enumerate(zip(targets, _PII_TARGET_TAGS)):
+                sections.append(PromptSection(f"target:{n + 1}", text, tags, kind, group="targets"))
+        elif block.startswith("## 예시"):
+            if block.count(_PII_PROMPT_TRAILER) != 1:
+                raise ValueError(f"예시 블록에 {_PII_PROMPT_TRAILER.strip()!r}가 정확히 한 번 있어야 함")
+            body, trailer = block.split(_PII_PROMPT_TRAILER)
+            title, *examples = re.split(r"(?m)(?=^### )", body)
+            groups["examples"] = title
+            if len(examples) != len(_PII_EXAMPLE_TAGS):
+                raise ValueError(f"예시 항목 {len(examples)}개 ≠ _PII_EXAMPLE_TAGS {len(_PII_EXAMPLE_TAGS)}개")
+            for n, (text, tags) in enumerate(zip(examples, _PII_EXAMPLE_TAGS)):
+                sections.append(PromptSection(f"example:{n + 1}", text, tags, group="examples"))
+            sections.append(PromptSection("trailer", _PII_PROMPT_TRAILER + trailer, kind=PromptSection.REQUIRED))
+        else:
+            sections.append(PromptSection(block.split("\n", 1)[0], block, kind=PromptSection.REQUIRED))
+
+    if set(groups) != {"targets", "examples"}:
+        raise ValueError(f"LLM_PII_DETECTION_PROMPT에 '## 감지 대상' / '## 예시' 블록 필요 (발견: {sorted(groups)})")
+    _pii_prompt_builder = PromptBuilder(sections, groups=groups)
+    return _pii_prompt_builder
+
+
+def build_pii_detection_prompt(text: str, found_pii: List[Dict[str, Any]]) -> str:
+    """LLM PII 감지 프롬프트 (규칙 탐지 결과 관련 섹션만 + 입력 텍스트)"""
+    instructions = get_pii_prompt_builder().build(pii_hits(found_pii)).text
+    return instructions + f"\n입력: \"{text}\"\n출력:"
+
 
 class HybridAnalyzer:
     """
@@ -153,15 +226,16 @@ class HybridAnalyzer:
         self._llm_initialized = False
 
     def _get_llm(self):
-        """LLM 인스턴스 가져오기 (Lazy Loading)"""
-        if not self._llm_initialized:
+        """LLM 인스턴스 가져오기 (Lazy Loading - 준비 전/초기화 실패 시 None, LLMManager가 백그라운드로 재초기화)"""
+        if self.llm is None and not self._llm_initialized:
             try:
                 from ..llm.kanana import LLMManager
                 self.llm = LLMManager.get("instruct")
-                self._llm_initialized = True
             except Exception as e:
                 print(f"[HybridAnalyzer] LLM 로드 실패: {e}")
                 self._llm_initialized = True  # 재시도 방지
+        if self.llm is not None and not self.llm.is_available():
+            return None  # 회로 차단 중 → 규칙 분석 결과만 사용
         return self.llm
 
     def analyze(self, text: str, use_llm: bool = True) -> Dict[str, Any]:
@@ -186,14 +260,58 @@ class HybridAnalyzer:
         if not llm:
             return rule_result
 
-        # 2단계: LLM 분석
-        llm_result = self._llm_analyze(text)
+        # 2단계: LLM 분석 (과부하 시 LLM 스케줄러가 차단 → 규칙 결과만 사용)
+        try:
+            with get_llm_scheduler().slot("pii"):
+                llm_result = self._llm_analyze(text, rule_result["found_pii"])
+        except LLMLoadShed:
+            rule_result["llm_shed"] = True
+            return rule_result
 
         # 3단계: 결과 병합
         merged = self._merge_results(rule_result, llm_result)
 
         return merged
 
+    async def analyze_async(self, text: str, use_llm: bool = True) -> Dict[str, Any]:
+        """
+        Hybrid 분석 수행 (비동기 버전 - LLM 응답 대기 중 이벤트 루프 비차단)
+
+        Args:
+            text: 분석할 텍스트
+            use_llm: LLM 분석 사용 여부 (기본: True)
+
+        Returns:
+            통합 분석 결과
+        """
+        rule_result = self._rule_based_analyze(text)
+        if not use_llm:
+            return rule_result
+
+        try:
+            from ..llm.kanana import AsyncLLMManager
+            llm = await AsyncLLMManager.get("instruct")
+        except Exception as e:
+            print(f"[HybridAnalyzer] 비동기 LLM 로드 실패: {e}")
+            llm = None
+        if not llm:
+            return rule_result
+
+        try:
+            async with get_llm_scheduler().aslot("pii"):
+                try:
+                    prompt = build_pii_detection_prompt(text, rule_result["found_pii"])
+                    response = await llm.analyze(text=prompt, system_prompt="")
+                    llm_result = self._process_llm_response(response)
+                except Exception as e:
+                    print(f"[HybridAnalyzer] 비동기 LLM 분석 오류: {e}")
+                    llm_result = None
+        except LLMLoadShed:
+            rule_result["llm_shed"] = True
+            return rule_result
+
+        return self._merge_results(rule_result, llm_result)
+
     def _rule_based_analyze(self, text: str) -> Dict[str, Any]:
         """Rule-based 정규식 분석"""
         pii_result = detect_pii(text)
@@ -210,31 +328,35 @@ class HybridAnalyzer:
             "is_secret_recommended": risk_result["is_secret_recommended"]
         }
 
-    def _llm_analyze(self, text: str) -> Optional[Dict[str, Any]]:
-        """LLM 직접 PII 분석"""
+    def _llm_analyze(self, text: str, found_pii: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """LLM 직접 PII 분석 (found_pii: 규칙 탐지 결과 - 프롬프트에 넣을 섹션 선택)"""
         llm = self._get_llm()
         if not llm:
             return None
 
         try:
             # LLM에게 직접 PII 감지 요청
-            prompt = LLM_PII_DETECTION_PROMPT + f"\n입력: \"{text}\"\n출력:"
+            if found_pii is None:
+                found_pii = detect_pii(text)["found_pii"]
+            prompt = build_pii_detection_prompt(text, found_pii)
 
             response = llm.analyze(text=prompt, system_prompt="")
-
-            # JSON 파싱
-            result = self._parse_llm_response(response)
-
-            if result:
-                result["method"] = "llm"
-                return result
-
-            return None
+            return self._process_llm_response(response)
 
         except Exception as e:
             print(f"[HybridAnalyzer] LLM 분석 오류: {e}")
             return None
 
+    def _process_llm_response(self, response: str) -> Optional[Dict[str, Any]]:
+        """LLM 응답 해석 (JSON 파싱 실패 시 None)"""
+        result = self._parse_llm_response(response)
+
+        if result:
+            result["method"] = "llm"
+            return result
+
+        return None
+
     def _parse_llm_response(self, response: str) -> Optional[Dict[str, Any]]:
         """LLM 응답에서 JSON 파싱"""
         # JSON 블록 찾기
@@ -399,3 +521,18 @@ def hybrid_analyze(text: str, use_llm: bool = True) -> Dict[str, Any]:
     """
     analyzer = get_hybrid_analyzer()
     return analyzer.analyze(text, use_llm=use_llm)
+
+
+async def hybrid_analyze_async(text: str, use_llm: bool = True) -> Dict[str, Any]:
+    """
+    Hybrid 분석 수행 (비동기 편의 함수)
+
+    Args:
+        text: 분석할 텍스트
+        use_llm: LLM 분석 사용 여부
+
+    Returns:
+        분석 결과
+    """
+    analyzer = get_hybrid_analyzer()
+    return await analyzer.analyze_async(text, use_llm=use_llm)
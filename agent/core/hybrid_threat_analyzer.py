@@ -6,6 +6,7 @@ Agent B (안심 가드)용 수신 메시지 피싱/사기 감지
 - Tier 1: Rule-based 빠른 필터 (~1ms) - 정상 메시지 빠르게 통과
 - Tier 2: Kanana Few-shot 분류 (~150ms) - 의심 메시지만 LLM 검증
 - Tier 3: 결과 병합 - Rule + LLM 교차 검증
+- 부하 시 SUSPICIOUS 빠른 분류는 짧은 시간 창 동안 모아 한 프롬프트로 일괄 분류
 
 참고 연구:
 - "Real-time Korean voice phishing detection" (Springer, 2021)
@@ -13,10 +14,16 @@ Agent B (안심 가드)용 수신 메시지 피싱/사기 감지
 - "NER with Key Tags for Korean Voice Phishing" (IEEE, 2024)
 """
 from typing import Dict, Any, List, Optional
+import asyncio
+import concurrent.futures
 import json
+import os
 import re
+import threading
 import time
+import weakref
 
+from ..llm.scheduler import LLMLoadShed, get_llm_scheduler, threat_priority
 from .threat_matcher import (
     detect_threats,
     detect_urls,
@@ -52,6 +59,17 @@ LLM_QUICK_CLASSIFY_PROMPT = """피싱/사기 메시지인지 판단하세요.
 판단 (피싱/정상):"""
 
 
+# 일괄 분류용 (빠른 분류와 같은 Few-shot 예시 + 번호 매긴 메시지 목록)
+LLM_QUICK_CLASSIFY_BATCH_PROMPT = LLM_QUICK_CLASSIFY_PROMPT.split('메시지: "{text}"')[0] + """메시지 목록:
+{messages}
+
+각 메시지마다 한 줄씩 "번호. 판단 (유형)" 형식으로 답하세요. (예: 1. 피싱 (가족사칭) / 2. 정상)
+판단:"""
+
+_BATCH_LINE_RE = re.compile(r'^\s*(\d+)\s*[.):\]]\s*(.+?)\s*$')
+_VERDICT_WORDS = ("피싱", "정상", "phishing", "normal")
+
+
 # 상세 분석용 (Rule이 놓친 위협 탐지)
 LLM_DETAILED_PROMPT = """수신 메시지를 분석하세요.
 
@@ -68,6 +86,259 @@ JSON으로 답하세요:
 {{"판단":"피싱/정상","유형":"","근거":"","위험도":"SAFE/SUSPICIOUS/DANGEROUS/CRITICAL"}}"""
 
 
+class _PendingBatch:
+    """모으는 중인 빠른 분류 요청 묶음"""
+
+    __slots__ = ("texts", "waiters", "closed")
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.waiters: list = []
+        self.closed = False
+
+
+class QuickClassifyBatcher:
+    """
+    빠른 분류 요청 묶음 처리 (Micro-batching)
+
+    다른 빠른 분류가 진행 중일 때(부하 시) 도착한 요청은 window_ms 동안(또는 max_batch개가
+    찰 때까지) 모은 뒤, 번호를 매긴 한 프롬프트로 LLM을 1회 호출하고 줄별 판단을 각 요청에
+    돌려준다. Few-shot 접두부를 메시지마다 반복하지 않으므로 LLM 호출/입력 토큰이 줄어든다.
+
+    - 진행 중인 분류가 없으면 기다리지 않고 바로 개별 호출 (한가할 때 지연 증가 없음)
+    - 혼자 묶인 요청 / 일괄 응답 파싱 실패 / 오류 → 각 요청이 개별 프롬프트로 분류
+    - 동기(스레드) 호출과 비동기 호출은 따로 묶고, 비동기 호출은 이벤트 루프별로 묶음
+      (waiter Future는 자기 루프에서만 완료)
+    - 통계 카운터는 여러 스레드/루프에서 갱신되므로 _cond 안에서만 변경
+    - LLM 스케줄러 suspicious 슬롯은 실제 LLM 호출(일괄 1회 / 개별 1회)마다 받는다.
+      묶음 결과를 기다리는 요청은 슬롯을 잡지 않으며, 일괄 호출이 차단되면 묶인 요청 모두 LLMLoadShed
+    """
+
+    def __init__(self, window_ms: float = 50, max_batch: int = 16):
+        """
+        Args:
+            window_ms: 요청을 모으는 최대 시간 (ms)
+            max_batch: 한 번에 분류할 최대 메시지 수
+        """
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._cond = threading.Condition()
+        self._pending: Optional[_PendingBatch] = None
+        self._active = 0
+        # 이벤트 루프별 모으는 중인 묶음 / 진행 중인 분류 수 (루프가 사라지면 함께 정리)
+        self._async_pending: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _PendingBatch]" = weakref.WeakKeyDictionary()
+        self._async_active: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int]" = weakref.WeakKeyDictionary()
+        self._tasks: set = set()  # 일괄 호출 태스크 (끝날 때까지 강한 참조 유지)
+        self.stats = {
+            "requests": 0,
+            "single_calls": 0,
+            "batches": 0,
+            "batched_messages": 0,
+            "parse_failures": 0
+        }
+
+    def _count(self, **deltas: int) -> None:
+        """통계 카운터 증가 (잠금 안에서)"""
+        with self._cond:
+            for key, value in deltas.items():
+                self.stats[key] += value
+
+    # ---------- 프롬프트 / 파싱 ----------
+
+    @staticmethod
+    def build_prompt(texts: List[str]) -> str:
+        """번호 매긴 일괄 분류 프롬프트"""
+        lines = [f'{i}. "{" ".join(text.split())}"' for i, text in enumerate(texts, 1)]
+        return LLM_QUICK_CLASSIFY_BATCH_PROMPT.format(messages="\n".join(lines))
+
+    @staticmethod
+    def parse_response(response: str, count: int) -> Optional[List[str]]:
+        """
+        줄별 판단 파싱
+
+        Returns:
+            메시지 순서대로의 판단 문자열 (모든 번호가 판단을 포함해야 함) 또는 None
+        """
+        verdicts: Dict[int, str] = {}
+        for line in (response or "").splitlines():
+            match = _BATCH_LINE_RE.match(line)
+            if not match:
+                continue
+            number = int(match.group(1))
+            if 1 <= number <= count and number not in verdicts:
+                verdicts[number] = match.group(2)
+
+        if len(verdicts) != count:
+            return None
+        ordered = [verdicts[i] for i in range(1, count + 1)]
+        for verdict in ordered:
+            lowered = verdict.lower()
+            if not any(word in lowered for word in _VERDICT_WORDS):
+                return None
+        return ordered
+
+    def _finish(self, batch: _PendingBatch, response: Optional[str]) -> None:
+        """일괄 응답을 각 요청에 전달 (None이면 각자 개별 분류)"""
+        verdicts = None
+        if response is not None:
+            verdicts = self.parse_response(response, len(batch.texts))
+            if verdicts is None:
+                self._count(parse_failures=1)
+                print(f"[QuickClassifyBatcher] 일괄 응답 파싱 실패 ({len(batch.texts)}건) → 개별 분류")
+        for i, waiter in enumerate(batch.waiters):
+            if not waiter.done():
+                waiter.set_result(verdicts[i] if verdicts else None)
+
+    @staticmethod
+    def _abort(batch: _PendingBatch, shed: LLMLoadShed) -> None:
+        """일괄 호출이 부하 차단됨 → 묶인 요청 모두 규칙 분석 결과 사용"""
+        for waiter in batch.waiters:
+            if not waiter.done():
+                waiter.set_exception(shed)
+
+    # ---------- 동기 (스레드) ----------
+
+    def classify(self, llm, text: str, user=None) -> str:
+        """
+        빠른 분류 (호출 스레드는 결과가 나올 때까지 대기)
+
+        Args:
+            user: LLM 스케줄러 공정성 키 (개별 호출 시)
+
+        Returns:
+            이 메시지에 대한 LLM 판단 문자열 (일괄 응답의 해당 줄 또는 개별 응답)
+
+        Raises:
+            LLMLoadShed: 스케줄러가 이 요청(또는 묶음)의 LLM 호출을 차단
+        """
+        with self._cond:
+            self.stats["requests"] += 1
+            self._active += 1
+        try:
+            verdict = self._join_batch(llm, text)
+            if verdict is not None:
+                return verdict
+            self._count(single_calls=1)
+            with get_llm_scheduler().slot("suspicious", user):
+                return llm.analyze(text=LLM_QUICK_CLASSIFY_PROMPT.format(text=text), system_prompt="")
+        finally:
+            with self._cond:
+                self._active -= 1
+
+    def _join_batch(self, llm, text: str) -> Optional[str]:
+        waiter: concurrent.futures.Future = concurrent.futures.Future()
+        with self._cond:
+            batch = self._pending
+            leader = batch is None or batch.closed or len(batch.texts) >= self.max_batch
+            if leader:
+                if self._active == 1:
+                    # 진행 중인 다른 분류 없음 → 기다리지 않고 개별 호출
+                    return None
+                batch = self._pending = _PendingBatch()
+            batch.texts.append(text)
+            batch.waiters.append(waiter)
+            if len(batch.texts) >= self.max_batch:
+                self._cond.notify_all()
+
+        if leader:
+            # 창이 끝나거나 묶음이 찰 때까지 대기 후 이 스레드가 일괄 호출
+            deadline = time.monotonic() + self.window
+            with self._cond:
+                while len(batch.texts) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch.closed = True
+                if self._pending is batch:
+                    self._pending = None
+            self._run_batch(llm, batch)
+
+        return waiter.result()
+
+    def _run_batch(self, llm, batch: _PendingBatch) -> None:
+        if len(batch.texts) == 1:
+            self._finish(batch, None)
+            return
+        self._count(batches=1, batched_messages=len(batch.texts))
+        try:
+            with get_llm_scheduler().slot("suspicious"):
+                response = llm.analyze(text=self.build_prompt(batch.texts), system_prompt="")
+        except LLMLoadShed as e:
+            self._abort(batch, e)
+            return
+        except Exception as e:
+            print(f"[QuickClassifyBatcher] 일괄 분류 오류: {e}")
+            response = None
+        self._finish(batch, response)
+
+    # ---------- 비동기 (이벤트 루프) ----------
+
+    async def classify_async(self, llm, text: str, user=None) -> str:
+        """빠른 분류 (비동기 버전, llm은 AsyncKananaLLM)"""
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            self.stats["requests"] += 1
+            active = self._async_active[loop] = self._async_active.get(loop, 0) + 1
+            pending = self._async_pending.get(loop)
+        try:
+            verdict = None
+            if active > 1 or pending is not None:
+                verdict = await self._join_batch_async(loop, llm, text)
+            if verdict is not None:
+                return verdict
+            self._count(single_calls=1)
+            async with get_llm_scheduler().aslot("suspicious", user):
+                return await llm.analyze(text=LLM_QUICK_CLASSIFY_PROMPT.format(text=text), system_prompt="")
+        finally:
+            with self._cond:
+                self._async_active[loop] -= 1
+
+    async def _join_batch_async(self, loop: asyncio.AbstractEventLoop, llm, text: str) -> Optional[str]:
+        waiter = loop.create_future()
+
+        with self._cond:
+            batch = self._async_pending.get(loop)
+            leader = batch is None or batch.closed
+            if leader:
+                batch = self._async_pending[loop] = _PendingBatch()
+        if leader:
+            loop.call_later(self.window, self._flush_async, loop, llm, batch)
+        batch.texts.append(text)
+        batch.waiters.append(waiter)
+        if len(batch.texts) >= self.max_batch:
+            self._flush_async(loop, llm, batch)
+
+        return await waiter
+
+    def _flush_async(self, loop: asyncio.AbstractEventLoop, llm, batch: _PendingBatch) -> None:
+        if batch.closed:
+            return
+        batch.closed = True
+        with self._cond:
+            if self._async_pending.get(loop) is batch:
+                del self._async_pending[loop]
+        task = loop.create_task(self._run_batch_async(llm, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch_async(self, llm, batch: _PendingBatch) -> None:
+        if len(batch.texts) == 1:
+            self._finish(batch, None)
+            return
+        self._count(batches=1, batched_messages=len(batch.texts))
+        try:
+            async with get_llm_scheduler().aslot("suspicious"):
+                response = await llm.analyze(text=self.build_prompt(batch.texts), system_prompt="")
+        except LLMLoadShed as e:
+            self._abort(batch, e)
+            return
+        except Exception as e:
+            print(f"[QuickClassifyBatcher] 일괄 분류 오류: {e}")
+            response = None
+        self._finish(batch, response)
+
+
 class HybridThreatAnalyzer:
     """
     Smart Tiered 위협 분석기 (Kanana 3B 최적화)
@@ -85,38 +356,152 @@ class HybridThreatAnalyzer:
     def __init__(self):
         self.llm = None
         self._llm_initialized = False
+        # SUSPICIOUS 빠른 분류 묶음 처리 (KAT_LLM_BATCH_WINDOW_MS=0이면 비활성)
+        window_ms = float(os.getenv("KAT_LLM_BATCH_WINDOW_MS", "50"))
+        self.quick_batcher: Optional[QuickClassifyBatcher] = None
+        if window_ms > 0:
+            self.quick_batcher = QuickClassifyBatcher(
+                window_ms=window_ms,
+                max_batch=int(os.getenv("KAT_LLM_BATCH_MAX", "16"))
+            )
         # 성능 통계
         self.stats = {
             "total_calls": 0,
             "llm_calls": 0,
             "llm_skipped": 0,
+            "llm_shed": 0,
             "avg_time_ms": 0
         }
 
     def _get_llm(self):
-        """LLM 인스턴스 가져오기 (Lazy Loading)"""
-        if not self._llm_initialized:
+        """LLM 인스턴스 가져오기 (Lazy Loading - 준비 전/초기화 실패 시 None, LLMManager가 백그라운드로 재초기화)"""
+        if self.llm is None and not self._llm_initialized:
             try:
                 from ..llm.kanana import LLMManager
                 self.llm = LLMManager.get("instruct")
-                self._llm_initialized = True
             except Exception as e:
                 print(f"[HybridThreatAnalyzer] LLM 로드 실패: {e}")
                 self._llm_initialized = True
+        if self.llm is not None and not self.llm.is_available():
+            return None  # 회로 차단 중 → 규칙 분석 결과만 사용
         return self.llm
 
-    def analyze(self, text: str, use_llm: bool = True) -> Dict[str, Any]:
+    def analyze(self, text: str, use_llm: bool = True, user_id=None) -> Dict[str, Any]:
         """
         Smart Tiered 위협 분석 수행
 
         Args:
             text: 분석할 수신 메시지
             use_llm: LLM 분석 사용 여부
+            user_id: LLM 스케줄러 공정성 키 (사용자별 라운드 로빈)
 
         Returns:
             통합 분석 결과
         """
         start_time = time.time()
+        rule_result, done = self._tier1(text, use_llm, start_time)
+        if done:
+            return rule_result
+
+        # ========================================
+        # Tier 2: Kanana LLM 분석 (의심 메시지만)
+        # ========================================
+        llm = self._get_llm()
+        if not llm:
+            rule_result["analysis_time_ms"] = (time.time() - start_time) * 1000
+            rule_result["llm_used"] = False
+            return rule_result
+
+        # 규칙 판정이 위험할수록 LLM 슬롯을 먼저 받음 (SUSPICIOUS는 과부하 시 규칙 결과만 사용)
+        rule_level = rule_result.get("threat_level", "SAFE")
+        priority_class = threat_priority(rule_level)
+        try:
+            if priority_class == "suspicious" and self.quick_batcher is not None:
+                # 묶음 처리: 슬롯은 batcher가 실제 LLM 호출마다 받음 (묶음을 기다리는 동안 슬롯을 잡지 않음)
+                self.stats["llm_calls"] += 1
+                llm_result = self._llm_quick_classify(text, user_id)
+            else:
+                with get_llm_scheduler().slot(priority_class, user_id):
+                    self.stats["llm_calls"] += 1
+
+                    # 위험도에 따라 프롬프트 선택
+                    if rule_level in ["DANGEROUS", "CRITICAL"]:
+                        # 상세 분석 (이미 위험 감지됨)
+                        llm_result = self._llm_detailed_analyze(text)
+                    else:
+                        # 빠른 분류 (SUSPICIOUS 케이스)
+                        llm_result = self._llm_quick_classify(text)
+        except LLMLoadShed as e:
+            return self._shed_result(rule_result, e, start_time)
+
+        return self._tier3(rule_result, llm_result, start_time)
+
+    async def analyze_async(self, text: str, use_llm: bool = True, user_id=None) -> Dict[str, Any]:
+        """
+        Smart Tiered 위협 분석 (비동기 버전)
+
+        Tier 1/3은 동일하고, Tier 2 LLM 호출만 AsyncKananaLLM으로 대기
+        (LLM 응답을 기다리는 동안 이벤트 루프가 다른 요청을 처리)
+        """
+        start_time = time.time()
+        rule_result, done = self._tier1(text, use_llm, start_time)
+        if done:
+            return rule_result
+
+        llm = await self._get_async_llm()
+        if not llm:
+            rule_result["analysis_time_ms"] = (time.time() - start_time) * 1000
+            rule_result["llm_used"] = False
+            return rule_result
+
+        rule_level = rule_result.get("threat_level", "SAFE")
+        priority_class = threat_priority(rule_level)
+        try:
+            if priority_class == "suspicious" and self.quick_batcher is not None:
+                # 묶음 처리: 슬롯은 batcher가 실제 LLM 호출마다 받음
+                self.stats["llm_calls"] += 1
+                try:
+                    response = await self.quick_batcher.classify_async(llm, text, user_id)
+                    llm_result = self._process_quick_response(response)
+                except LLMLoadShed:
+                    raise
+                except Exception as e:
+                    print(f"[HybridThreatAnalyzer] 비동기 LLM 분석 오류: {e}")
+                    llm_result = None
+            else:
+                async with get_llm_scheduler().aslot(priority_class, user_id):
+                    self.stats["llm_calls"] += 1
+                    try:
+                        if rule_level in ["DANGEROUS", "CRITICAL"]:
+                            response = await llm.analyze(text=LLM_DETAILED_PROMPT.format(text=text), system_prompt="")
+                            llm_result = self._process_detailed_response(response)
+                        else:
+                            response = await llm.analyze(text=LLM_QUICK_CLASSIFY_PROMPT.format(text=text), system_prompt="")
+                            llm_result = self._process_quick_response(response)
+                    except Exception as e:
+                        print(f"[HybridThreatAnalyzer] 비동기 LLM 분석 오류: {e}")
+                        llm_result = None
+        except LLMLoadShed as e:
+            return self._shed_result(rule_result, e, start_time)
+
+        return self._tier3(rule_result, llm_result, start_time)
+
+    async def _get_async_llm(self):
+        """비동기 LLM 인스턴스 (이벤트 루프별 연결 풀 공유)"""
+        try:
+            from ..llm.kanana import AsyncLLMManager
+            return await AsyncLLMManager.get("instruct")
+        except Exception as e:
+            print(f"[HybridThreatAnalyzer] 비동기 LLM 로드 실패: {e}")
+            return None
+
+    def _tier1(self, text: str, use_llm: bool, start_time: float):
+        """
+        Tier 1 Rule-based 분석 + LLM 스킵 판단
+
+        Returns:
+            (rule_result, 완료 여부) - 완료면 LLM 없이 그대로 반환
+        """
         self.stats["total_calls"] += 1
 
         # ========================================
@@ -129,7 +514,7 @@ class HybridThreatAnalyzer:
         if not use_llm:
             rule_result["analysis_time_ms"] = (time.time() - start_time) * 1000
             rule_result["llm_used"] = False
-            return rule_result
+            return rule_result, True
 
         # ========================================
         # Smart Skip: SAFE면 LLM 호출 안함 (최적화 핵심)
@@ -139,30 +524,26 @@ class HybridThreatAnalyzer:
             rule_result["analysis_time_ms"] = (time.time() - start_time) * 1000
             rule_result["llm_used"] = False
             rule_result["skip_reason"] = "Rule-based SAFE, LLM 스킵"
-            return rule_result
+            return rule_result, True
 
-        # ========================================
-        # Tier 2: Kanana LLM 분석 (의심 메시지만)
-        # ========================================
-        llm = self._get_llm()
-        if not llm:
-            rule_result["analysis_time_ms"] = (time.time() - start_time) * 1000
-            rule_result["llm_used"] = False
-            return rule_result
-
-        self.stats["llm_calls"] += 1
+        return rule_result, False
 
-        # 위험도에 따라 프롬프트 선택
-        if rule_level in ["DANGEROUS", "CRITICAL"]:
-            # 상세 분석 (이미 위험 감지됨)
-            llm_result = self._llm_detailed_analyze(text)
-        else:
-            # 빠른 분류 (SUSPICIOUS 케이스)
-            llm_result = self._llm_quick_classify(text)
+    def _shed_result(self, rule_result: Dict[str, Any], shed: LLMLoadShed, start_time: float) -> Dict[str, Any]:
+        """LLM 부하 차단 → 규칙 분석 결과만 반환"""
+        self.stats["llm_shed"] += 1
+        rule_result["analysis_time_ms"] = (time.time() - start_time) * 1000
+        rule_result["llm_used"] = False
+        rule_result["llm_shed"] = True
+        rule_result["skip_reason"] = f"LLM 과부하 (대기 {shed.wait_ms:.0f}ms) - Rule-based 결과 사용"
+        return rule_result
 
-        # ========================================
-        # Tier 3: 결과 병합
-        # ========================================
+    def _tier3(
+        self,
+        rule_result: Dict[str, Any],
+        llm_result: Optional[Dict[str, Any]],
+        start_time: float
+    ) -> Dict[str, Any]:
+        """Tier 3: 결과 병합"""
         merged = self._merge_results(rule_result, llm_result)
         merged["analysis_time_ms"] = (time.time() - start_time) * 1000
         merged["llm_used"] = True
@@ -172,75 +553,116 @@ class HybridThreatAnalyzer:
     def _rule_based_analyze(self, text: str) -> Dict[str, Any]:
         """Rule-based 위협 분석 (~1ms)"""
         result = analyze_incoming_message(text)
+        assessment = result["final_assessment"]
+        detection = result["threat_detection"]
+
+        # v3 결과(risk_level/scam_probability)를 Hybrid 형식(threat_level/threat_score)으로 변환
+        level_map = {
+            "safe": "SAFE",
+            "low": "SAFE",
+            "medium": "SUSPICIOUS",
+            "high": "DANGEROUS",
+            "critical": "CRITICAL"
+        }
+        threat_score = assessment.get("scam_probability", 0)
+        detected_threats = [
+            {
+                "id": p["id"],
+                "category": p["category"],
+                "category_name_ko": p.get("category_name_ko", ""),
+                "name_ko": p.get("pattern_name_ko", p["id"]),
+                "risk_score": p.get("risk_score", 0),
+                "source": "rule"
+            }
+            for p in detection.get("matched_patterns", [])
+        ]
+        scenario_match = {}
+        if detection.get("primary_pattern"):
+            scenario_match = {"matched_scenario": {
+                "id": detection["primary_pattern"],
+                "name_ko": detection.get("primary_pattern_name", "")
+            }}
 
         return {
             "method": "rule_based",
-            "threat_level": result["final_assessment"]["threat_level"],
-            "threat_score": result["final_assessment"]["threat_score"],
-            "is_likely_scam": result["final_assessment"]["is_likely_scam"],
-            "detected_threats": result["threat_detection"]["found_threats"],
+            "threat_level": level_map.get(assessment.get("risk_level", "safe"), "SAFE"),
+            "threat_score": threat_score,
+            "is_likely_scam": threat_score >= 60,
+            "detected_threats": detected_threats,
             "url_analysis": result["url_analysis"],
-            "scenario_match": result["scenario_match"],
-            "warning_message": result["final_assessment"]["warning_message"],
-            "recommended_action": result["final_assessment"]["recommended_action"]
+            "scenario_match": scenario_match,
+            "warning_message": assessment["warning_message"],
+            "recommended_action": assessment["recommended_action"]
         }
 
-    def _llm_quick_classify(self, text: str) -> Optional[Dict[str, Any]]:
+    def _llm_quick_classify(self, text: str, user_id=None) -> Optional[Dict[str, Any]]:
         """
         Kanana Few-shot 빠른 분류 (~150ms)
         - 짧은 프롬프트로 이진 분류
         - 출력 토큰 최소화
+
+        Raises:
+            LLMLoadShed: 묶음 처리 중 스케줄러가 LLM 호출을 차단 (규칙 결과 사용)
         """
         llm = self._get_llm()
         if not llm:
             return None
 
         try:
+            # 부하 시 같은 창에 들어온 요청과 묶어서 분류 (실패 시 개별 분류)
+            if self.quick_batcher is not None:
+                return self._process_quick_response(self.quick_batcher.classify(llm, text, user_id))
+
             prompt = LLM_QUICK_CLASSIFY_PROMPT.format(text=text)
             response = llm.analyze(text=prompt, system_prompt="")
+            return self._process_quick_response(response)
 
-            # 응답 파싱 (피싱/정상)
-            response_lower = response.strip().lower()
-
-            if "피싱" in response_lower or "phishing" in response_lower:
-                # 피싱 유형 추출 시도
-                threat_type = "unknown"
-                if "가족" in response_lower:
-                    threat_type = "family_impersonate"
-                elif "기관" in response_lower or "검찰" in response_lower:
-                    threat_type = "authority_impersonate"
-                elif "링크" in response_lower:
-                    threat_type = "link_phishing"
-                elif "정보" in response_lower or "탈취" in response_lower:
-                    threat_type = "info_extraction"
-                elif "대출" in response_lower:
-                    threat_type = "loan_offer"
-
-                return {
-                    "method": "llm_quick",
-                    "threat_level": "DANGEROUS",  # LLM이 피싱으로 판단
-                    "is_likely_scam": True,
-                    "detected_threats": [{
-                        "id": threat_type,
-                        "name_ko": "LLM 피싱 감지",
-                        "source": "llm",
-                        "raw_response": response[:100]
-                    }],
-                    "llm_raw_response": response
-                }
-            else:
-                return {
-                    "method": "llm_quick",
-                    "threat_level": "SAFE",
-                    "is_likely_scam": False,
-                    "detected_threats": [],
-                    "llm_raw_response": response
-                }
-
+        except LLMLoadShed:
+            raise
         except Exception as e:
             print(f"[HybridThreatAnalyzer] LLM 빠른분류 오류: {e}")
             return None
 
+    def _process_quick_response(self, response: str) -> Dict[str, Any]:
+        """빠른 분류 응답 해석 (피싱/정상 + 유형)"""
+        # 응답 파싱 (피싱/정상)
+        response_lower = response.strip().lower()
+
+        if "피싱" in response_lower or "phishing" in response_lower:
+            # 피싱 유형 추출 시도
+            threat_type = "unknown"
+            if "가족" in response_lower:
+                threat_type = "family_impersonate"
+            elif "기관" in response_lower or "검찰" in response_lower:
+                threat_type = "authority_impersonate"
+            elif "링크" in response_lower:
+                threat_type = "link_phishing"
+            elif "정보" in response_lower or "탈취" in response_lower:
+                threat_type = "info_extraction"
+            elif "대출" in response_lower:
+                threat_type = "loan_offer"
+
+            return {
+                "method": "llm_quick",
+                "threat_level": "DANGEROUS",  # LLM이 피싱으로 판단
+                "is_likely_scam": True,
+                "detected_threats": [{
+                    "id": threat_type,
+                    "name_ko": "LLM 피싱 감지",
+                    "source": "llm",
+                    "raw_response": response[:100]
+                }],
+                "llm_raw_response": response
+            }
+        else:
+            return {
+                "method": "llm_quick",
+                "threat_level": "SAFE",
+                "is_likely_scam": False,
+                "detected_threats": [],
+                "llm_raw_response": response
+            }
+
     def _llm_detailed_analyze(self, text: str) -> Optional[Dict[str, Any]]:
         """
         Kanana 상세 분석 (~200ms)
@@ -254,19 +676,22 @@ class HybridThreatAnalyzer:
         try:
             prompt = LLM_DETAILED_PROMPT.format(text=text)
             response = llm.analyze(text=prompt, system_prompt="")
-
-            result = self._parse_llm_json(response)
-            if result:
-                result["method"] = "llm_detailed"
-                return result
-
-            # JSON 파싱 실패 시 텍스트 분석
-            return self._parse_llm_text(response)
+            return self._process_detailed_response(response)
 
         except Exception as e:
             print(f"[HybridThreatAnalyzer] LLM 상세분석 오류: {e}")
             return None
 
+    def _process_detailed_response(self, response: str) -> Optional[Dict[str, Any]]:
+        """상세 분석 응답 해석 (JSON 우선, 실패 시 텍스트)"""
+        result = self._parse_llm_json(response)
+        if result:
+            result["method"] = "llm_detailed"
+            return result
+
+        # JSON 파싱 실패 시 텍스트 분석
+        return self._parse_llm_text(response)
+
     def _parse_llm_json(self, response: str) -> Optional[Dict[str, Any]]:
         """LLM JSON 응답 파싱"""
         # JSON 블록 찾기
@@ -433,16 +858,33 @@ def get_hybrid_threat_analyzer() -> HybridThreatAnalyzer:
     return _threat_analyzer_instance
 
 
-def hybrid_threat_analyze(text: str, use_llm: bool = True) -> Dict[str, Any]:
+def hybrid_threat_analyze(text: str, use_llm: bool = True, user_id=None) -> Dict[str, Any]:
     """
     Hybrid 위협 분석 수행 (편의 함수)
 
     Args:
         text: 분석할 수신 메시지
         use_llm: LLM 분석 사용 여부
+        user_id: LLM 스케줄러 공정성 키
+
+    Returns:
+        분석 결과
+    """
+    analyzer = get_hybrid_threat_analyzer()
+    return analyzer.analyze(text, use_llm=use_llm, user_id=user_id)
+
+
+async def hybrid_threat_analyze_async(text: str, use_llm: bool = True, user_id=None) -> Dict[str, Any]:
+    """
+    Hybrid 위협 분석 수행 (비동기 편의 함수)
+
+    Args:
+        text: 분석할 수신 메시지
+        use_llm: LLM 분석 사용 여부
+        user_id: LLM 스케줄러 공정성 키
 
     Returns:
         분석 결과
     """
     analyzer = get_hybrid_threat_analyzer()
-    return analyzer.analyze(text, use_llm=use_llm)
+    return await analyzer.analyze_async(text, use_llm=use_llm, user_id=user_id)
@@ -0,0 +1,139 @@
+"""
+Keyword Automaton - Aho-Corasick 다중 키워드 매칭
+threat_patterns.json의 키워드/컨텍스트/인디케이터를 한 번에 검색
+
+특징:
+- 메시지를 한 번만 순회 (비용 ∝ 메시지 길이, 키워드 수와 무관)
+- 키워드별 대소문자 구분/무시 지정 가능 (URL 인디케이터는 무시)
+- 외부 의존성 없음 (순수 Python)
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# 출력 모드
+_EXACT = 0          # 대소문자 구분, 대소문자가 없는 키워드 (한글 등) → 재확인 불필요
+_EXACT_CHECK = 1    # 대소문자 구분, 영문 등 대소문자가 있는 키워드 → 원문 위치 재확인
+_IGNORE_CASE = 2    # 대소문자 무시
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick 오토마톤
+
+    모든 키워드를 소문자로 접은 형태로 트라이에 넣고, 메시지도 소문자로 접어
+    한 번 순회한다. 대소문자를 구분하는 키워드는 매칭 위치에서 원문과 재확인한다.
+    """
+
+    def __init__(self, keywords: Iterable[str] = (), ignore_case: Iterable[str] = ()):
+        """
+        Args:
+            keywords: 대소문자를 구분하는 키워드
+            ignore_case: 대소문자를 무시하는 키워드 (예: URL 인디케이터)
+        """
+        entries: Dict[Tuple[str, bool], None] = {}
+        for keyword in keywords:
+            if keyword:
+                entries[(keyword, False)] = None
+        for keyword in ignore_case:
+            if keyword:
+                entries[(keyword, True)] = None
+
+        # 상태별 전이 / 실패 링크 / 출력 (접힌 키워드 길이, 원본 키워드, 모드)
+        goto: List[Dict[str, int]] = [{}]
+        fail: List[int] = [0]
+        outputs: List[List[Tuple[int, str, int]]] = [[]]
+
+        for keyword, ignore in entries:
+            folded = keyword.lower()
+            state = 0
+            for ch in folded:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    outputs.append([])
+                state = nxt
+
+            if ignore:
+                mode = _IGNORE_CASE
+            elif folded != keyword.upper():
+                mode = _EXACT_CHECK
+            else:
+                mode = _EXACT
+            outputs[state].append((len(folded), keyword, mode))
+
+        # BFS로 실패 링크 구성 + 실패 경로의 출력 병합
+        order: List[int] = []
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                outputs[nxt].extend(outputs[fail[nxt]])
+
+        # 실패 링크를 펼쳐 완전한 DFA 전이표 생성 (순회 시 실패 링크 추적 불필요)
+        # 루트로 돌아가는 전이는 저장하지 않음 (get(ch, 0))
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in range(len(goto) - 1)]
+        for state in order:
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+        self.size = len(entries)
+
+    def scan(self, text: str, lowered: Optional[str] = None) -> Tuple[Set[str], Set[str]]:
+        """
+        메시지를 한 번 순회하여 포함된 키워드 반환
+
+        Args:
+            text: 검색할 메시지
+            lowered: 미리 계산한 text.lower() (없으면 내부에서 계산)
+
+        Returns:
+            (대소문자 구분 매칭 키워드 집합, 대소문자 무시 매칭 키워드 집합)
+        """
+        exact: Set[str] = set()
+        ignore_case: Set[str] = set()
+        if not text or not self.size:
+            return exact, ignore_case
+
+        if lowered is None:
+            lowered = text.lower()
+        delta = self._delta
+        outputs = self._outputs
+
+        # 1) 메시지 1회 순회: 출력이 있는 (끝 위치, 상태)만 기록
+        ends = []
+        state = 0
+        for i, ch in enumerate(lowered):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                ends.append((i, state))
+
+        # 2) 출력 해석 (대소문자 구분 키워드는 원문 재확인)
+        # lower()로 길이가 바뀌는 문자가 있으면 위치 재확인 불가 → 포함 여부로 확인
+        same_length = len(lowered) == len(text)
+        for i, state in ends:
+            for length, keyword, mode in outputs[state]:
+                if mode == _EXACT:
+                    exact.add(keyword)
+                elif mode == _IGNORE_CASE:
+                    ignore_case.add(keyword)
+                elif same_length:
+                    if text[i - length + 1:i + 1] == keyword:
+                        exact.add(keyword)
+                elif keyword in text:
+                    exact.add(keyword)
+
+        return exact, ignore_case
@@ -0,0 +1,158 @@
+"""
+Message Features - 수신 메시지 특징 1회 추출
+IncomingAgent 4단계 파이프라인의 모든 단계가 공유하는 메시지 특징
+
+추출 항목:
+- 정규화 텍스트 (소문자)
+- 위협 키워드 / URL 인디케이터 히트 집합 (Aho-Corasick 1회 순회)
+- URL / 단축 URL 목록
+- 계좌번호 후보 / 전화번호 (사기 신고 DB 조회용)
+- 금액 표현, 전화번호/URL 포함 여부 (사기 확률 보정용)
+- 금융 요청 키워드 (발신자 위험도 분석용)
+
+각 단계는 원문을 다시 검색하지 않고 이 객체를 사용한다.
+IncomingAgent는 메시지당 1회 생성하여 Stage 1~3에 전달한다.
+"""
+from typing import FrozenSet, Optional, Tuple
+
+from .threat_matcher import (
+    CompiledThreatEngine,
+    get_threat_engine,
+    _extract_urls,
+    _URL_PRESENT_RE,
+    _PHONE_PRESENT_RE,
+    _MONEY_PRESENT_RE,
+)
+from .scam_checker import extract_identifiers_from_text
+from .conversation_analyzer import FINANCIAL_KEYWORDS
+
+
+class MessageFeatures:
+    """
+    메시지 1건의 추출 결과
+
+    키워드 히트는 생성 시 바로 계산하고, 나머지 항목은 처음 사용할 때 한 번만
+    계산하여 보관한다 (단독 MCP 도구 호출 시 불필요한 추출 생략).
+    """
+
+    __slots__ = (
+        "text", "normalized", "engine", "keyword_hits", "url_indicator_hits",
+        "_urls", "_identifiers", "_money_amounts", "_has_url", "_has_phone",
+        "_financial_keywords",
+    )
+
+    def __init__(self, text: str, engine: CompiledThreatEngine):
+        self.text = text
+        self.normalized = text.lower()
+        # 특징 추출에 사용한 규칙 스냅샷 (단계 간 규칙 버전 일치)
+        self.engine = engine
+
+        # 위협/긴급성/안전 컨텍스트 키워드 (1회 순회)
+        hits, url_hits = engine.scan(text, self.normalized)
+        self.keyword_hits: FrozenSet[str] = frozenset(hits)
+        self.url_indicator_hits: FrozenSet[str] = frozenset(url_hits)
+
+        self._urls: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
+        self._identifiers: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
+        self._money_amounts: Optional[Tuple[str, ...]] = None
+        self._has_url: Optional[bool] = None
+        self._has_phone: Optional[bool] = None
+        self._financial_keywords: Optional[FrozenSet[str]] = None
+
+    # ---------- URL ----------
+
+    def _get_urls(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        if self._urls is None:
+            urls, short_urls = _extract_urls(self.text)
+            self._urls = (tuple(urls), tuple(short_urls))
+        return self._urls
+
+    @property
+    def urls(self) -> Tuple[str, ...]:
+        """http(s) URL 목록"""
+        return self._get_urls()[0]
+
+    @property
+    def short_urls(self) -> Tuple[str, ...]:
+        """단축 URL 목록 (스킴 없음)"""
+        return self._get_urls()[1]
+
+    # ---------- 계좌번호 / 전화번호 ----------
+
+    def _get_identifiers(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        if self._identifiers is None:
+            identifiers = extract_identifiers_from_text(self.text)
+            self._identifiers = (tuple(identifiers["accounts"]), tuple(identifiers["phones"]))
+        return self._identifiers
+
+    @property
+    def accounts(self) -> Tuple[str, ...]:
+        """계좌번호 후보 (정규화, 중복 제거)"""
+        return self._get_identifiers()[0]
+
+    @property
+    def phones(self) -> Tuple[str, ...]:
+        """전화번호 (정규화, 중복 제거)"""
+        return self._get_identifiers()[1]
+
+    # ---------- 사기 확률 보정용 ----------
+
+    @property
+    def money_amounts(self) -> Tuple[str, ...]:
+        """금액 표현 목록 (50만원, $100 등)"""
+        if self._money_amounts is None:
+            self._money_amounts = tuple(_MONEY_PRESENT_RE.findall(self.text))
+        return self._money_amounts
+
+    @property
+    def has_url(self) -> bool:
+        """URL/단축 URL 포함 여부"""
+        if self._has_url is None:
+            self._has_url = _URL_PRESENT_RE.search(self.text) is not None
+        return self._has_url
+
+    @property
+    def has_phone(self) -> bool:
+        """하이픈 형식 전화번호 포함 여부"""
+        if self._has_phone is None:
+            self._has_phone = _PHONE_PRESENT_RE.search(self.text) is not None
+        return self._has_phone
+
+    # ---------- 발신자 위험도용 ----------
+
+    @property
+    def financial_keywords(self) -> FrozenSet[str]:
+        """포함된 금융 요청 키워드"""
+        if self._financial_keywords is None:
+            self._financial_keywords = frozenset(
+                kw for kw in FINANCIAL_KEYWORDS if kw in self.text
+            )
+        return self._financial_keywords
+
+    def to_dict(self) -> dict:
+        """디버깅/로그용 dict 변환"""
+        return {
+            "keyword_hits": sorted(self.keyword_hits),
+            "url_indicator_hits": sorted(self.url_indicator_hits),
+            "urls": list(self.urls),
+            "short_urls": list(self.short_urls),
+            "accounts": list(self.accounts),
+            "phones": list(self.phones),
+            "money_amounts": list(self.money_amounts),
+            "has_url": self.has_url,
+            "has_phone": self.has_phone,
+            "financial_keywords": sorted(self.financial_keywords),
+        }
+
+
+def extract_message_features(text: str) -> MessageFeatures:
+    """
+    메시지 특징 1회 추출 (현재 규칙 스냅샷 사용)
+
+    Args:
+        text: 수신 메시지
+
+    Returns:
+        MessageFeatures
+    """
+    return MessageFeatures(text, get_threat_engine())
@@ -2,26 +2,270 @@
 Pattern Matcher - sensitive_patterns.json 기반 패턴 매칭
 AI가 MCP 도구를 통해 호출하는 핵심 분석 모듈
 """
-import json
 import re
-from pathlib import Path
+from bisect import bisect_right
 from typing import Dict, List, Optional, Tuple, Any
-from functools import lru_cache
-from ..core.models import RiskLevel
 
-
-# JSON 데이터 캐시
-_patterns_cache: Optional[Dict] = None
+from .result_cache import get_result_cache, text_key
+from .rule_snapshot import get_rule_snapshot
 
 
 def _get_patterns_data() -> Dict:
-    """sensitive_patterns.json 로드 (캐시 사용)"""
-    global _patterns_cache
-    if _patterns_cache is None:
-        json_path = Path(__file__).parent.parent / "data" / "sensitive_patterns.json"
-        with open(json_path, "r", encoding="utf-8") as f:
-            _patterns_cache = json.load(f)
-    return _patterns_cache
+    """sensitive_patterns.json 데이터 (현재 규칙 스냅샷)"""
+    return get_pii_engine().source
+
+
+# 위험도 순위 (정수 비교용)
+RISK_ORDER = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+RISK_NAMES = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+# 패턴 우선순위 정의 (높은 것 먼저 매칭)
+# 숫자가 낮을수록 먼저 매칭됨
+PII_PRIORITY_ORDER = {
+    "resident_id": 1,      # 주민번호
+    "foreigner_id": 1,     # 외국인등록번호
+    "card": 2,             # 신용카드
+    "passport": 3,         # 여권
+    "driver_license": 3,   # 운전면허
+    "phone": 4,            # 전화번호 (계좌번호보다 먼저 - 010 패턴 구분)
+    "account": 5,          # 계좌번호
+    "birth_date": 10,      # 생년월일 (가장 낮은 우선순위)
+}
+DEFAULT_PII_PRIORITY = 10
+
+
+class SpanIndex:
+    """
+    이미 매칭된 [start, end) 범위 집합 (시작 위치순 정렬 유지)
+
+    저장된 범위끼리는 겹치지 않으므로 시작/끝 위치가 모두 정렬되어 있고,
+    새 범위의 겹침 여부는 bisect로 찾은 바로 앞/뒤 범위만 보면 된다.
+    긴 OCR 텍스트에서 매칭이 수십~수백 개여도 O(log n)으로 판정.
+    """
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """이미 저장된 범위와 겹치는지 확인"""
+        idx = bisect_right(self._starts, start)
+        # 앞 범위: 시작 <= start, 끝이 start를 넘으면 교차
+        if idx > 0 and self._ends[idx - 1] > start:
+            return True
+        # 뒤 범위: 시작 > start, 시작이 end보다 앞이면 교차
+        if idx < len(self._starts) and self._starts[idx] < end:
+            return True
+        return False
+
+    def add(self, start: int, end: int) -> bool:
+        """겹치지 않으면 범위를 추가하고 True, 겹치면 False"""
+        idx = bisect_right(self._starts, start)
+        if idx > 0 and self._ends[idx - 1] > start:
+            return False
+        if idx < len(self._starts) and self._starts[idx] < end:
+            return False
+        self._starts.insert(idx, start)
+        self._ends.insert(idx, end)
+        return True
+
+
+class CompiledPIIPattern:
+    """컴파일된 단일 PII 패턴"""
+
+    __slots__ = ("regex", "id", "category", "risk_level", "risk_ord", "name_ko", "priority")
+
+    def __init__(self, regex, item: Dict, category: str, priority: int):
+        self.regex = regex
+        self.id = item["id"]
+        self.category = category
+        self.risk_level = item["risk_level"]
+        self.risk_ord = RISK_ORDER[item["risk_level"]]
+        self.name_ko = item["name_ko"]
+        self.priority = priority
+
+
+class CompiledPIIEngine:
+    """
+    sensitive_patterns.json 컴파일 결과 (규칙 스냅샷당 1회 생성)
+
+    detect_pii()/calculate_risk()가 매 호출마다 하던 작업을 미리 수행:
+    - 정규식 컴파일 + 우선순위 정렬
+    - 위험도 문자열 → 정수 순위 변환
+    - 조합 규칙/자동 상향 규칙을 frozenset 기반으로 변환
+    """
+
+    def __init__(self, data: Dict):
+        self.source = data
+        self.version = data.get("version")
+
+        # 1. 패턴 컴파일 (우선순위순, 동순위는 JSON 순서 유지)
+        patterns = []
+        for cat_id, cat_info in data["categories"].items():
+            for item in cat_info["items"]:
+                if not item.get("regex"):
+                    continue
+                try:
+                    compiled = re.compile(item["regex"])
+                except re.error:
+                    continue
+                priority = PII_PRIORITY_ORDER.get(item["id"], DEFAULT_PII_PRIORITY)
+                patterns.append(CompiledPIIPattern(compiled, item, cat_id, priority))
+        patterns.sort(key=lambda p: p.priority)
+        self.patterns: Tuple[CompiledPIIPattern, ...] = tuple(patterns)
+
+        # 2. 카테고리 메타데이터
+        self.categories: Dict[str, Dict[str, Any]] = {
+            cat_id: {
+                "name_ko": cat_info["name_ko"],
+                "item_ids": frozenset(item["id"] for item in cat_info["items"]),
+            }
+            for cat_id, cat_info in data["categories"].items()
+        }
+
+        # 3. 조합 규칙: (rule_id, name_ko, required, any_of, result_ord, reason)
+        self.combination_rules = tuple(
+            (
+                rule_id,
+                rule_info["name_ko"],
+                frozenset(pattern["required"]),
+                frozenset(pattern.get("any_of", [])),
+                RISK_ORDER[pattern["result_risk"]],
+                pattern["reason"],
+            )
+            for rule_id, rule_info in data["combination_rules"].items()
+            for pattern in rule_info["patterns"]
+        )
+
+        # 4. 자동 상향 규칙: (min_items, escalate_ord, reason), (categories, escalate_ord, reason)
+        auto_escalation = data["auto_escalation"]
+        self.count_escalations = tuple(
+            (esc["min_items"], RISK_ORDER[esc["escalate_to"]], esc["reason"])
+            for esc in auto_escalation["count_based"]
+        )
+        self.category_escalations = tuple(
+            (frozenset(combo["categories"]), RISK_ORDER[combo["escalate_to"]], combo["reason"])
+            for combo in auto_escalation["category_combination"]
+        )
+
+        # 5. 위험도별 권장 조치
+        self.risk_actions: Dict[str, str] = {
+            level: info.get("action", "전송")
+            for level, info in data["risk_levels"].items()
+        }
+
+    def detect(self, text: str) -> Dict[str, Any]:
+        """detect_pii() 본체 - 우선순위순 매칭 + 중복 범위 제거"""
+        found_pii = []
+        categories_found = set()
+        highest_ord = 0
+
+        # 이미 매칭된 위치 추적 (중복 방지)
+        matched_spans = SpanIndex()
+
+        for pattern in self.patterns:
+            for match in pattern.regex.finditer(text):
+                start, end = match.span()
+
+                # 이미 매칭된 범위와 겹치면 스킵 (빈 매칭은 PII가 아니므로 제외)
+                if start == end or not matched_spans.add(start, end):
+                    continue
+
+                found_pii.append({
+                    "id": pattern.id,
+                    "category": pattern.category,
+                    "value": match.group(),
+                    "risk_level": pattern.risk_level,
+                    "name_ko": pattern.name_ko
+                })
+                categories_found.add(pattern.category)
+                if pattern.risk_ord > highest_ord:
+                    highest_ord = pattern.risk_ord
+
+        return {
+            "found_pii": found_pii,
+            "categories_found": list(categories_found),
+            "highest_risk": RISK_NAMES[highest_ord],
+            "count": len(found_pii)
+        }
+
+    def calculate_risk(self, detected_items: List[Dict]) -> Dict[str, Any]:
+        """calculate_risk() 본체 - 조합 규칙 + 자동 상향 규칙 적용"""
+        if not detected_items:
+            return {
+                "final_risk": "LOW",
+                "base_risk": "LOW",
+                "escalation_reason": None,
+                "is_secret_recommended": False,
+                "matched_rules": []
+            }
+
+        # 1. 기본 위험도 (가장 높은 개별 항목)
+        base_ord = max(RISK_ORDER[item["risk_level"]] for item in detected_items)
+
+        final_ord = base_ord
+        escalation_reason = None
+        matched_rules = []
+
+        detected_ids = {item["id"] for item in detected_items}
+        detected_categories = {item["category"] for item in detected_items}
+
+        # 2. 조합 규칙 체크
+        for rule_id, rule_name_ko, required, any_of, result_ord, reason in self.combination_rules:
+            # required 모두 충족 + any_of가 있으면 하나 이상 충족 필요
+            if required <= detected_ids and (not any_of or not any_of.isdisjoint(detected_ids)):
+                if result_ord > final_ord:
+                    final_ord = result_ord
+                    escalation_reason = f"{rule_name_ko} - {reason}"
+                    matched_rules.append(rule_id)
+
+        # 3. 자동 상향 규칙 (count_based)
+        count = len(detected_items)
+        for min_items, escalate_ord, reason in self.count_escalations:
+            if count >= min_items and escalate_ord > final_ord:
+                final_ord = escalate_ord
+                escalation_reason = reason
+
+        # 4. 카테고리 조합 상향
+        for required_cats, escalate_ord, reason in self.category_escalations:
+            if required_cats <= detected_categories and escalate_ord > final_ord:
+                final_ord = escalate_ord
+                escalation_reason = reason
+
+        return {
+            "final_risk": RISK_NAMES[final_ord],
+            "base_risk": RISK_NAMES[base_ord],
+            "escalation_reason": escalation_reason,
+            # 시크릿 전송 권장 여부 (MEDIUM 이상)
+            "is_secret_recommended": final_ord >= RISK_ORDER["MEDIUM"],
+            "matched_rules": matched_rules,
+            "detected_count": count
+        }
+
+    def get_risk_action(self, risk_level: str) -> str:
+        """위험도에 따른 권장 조치 반환"""
+        return self.risk_actions.get(risk_level, "전송")
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """PII 스캔 → 위험도 평가 → 권장 조치 (동일 스냅샷으로 일괄 수행)"""
+        pii_result = self.detect(text)
+        risk_result = self.calculate_risk(pii_result["found_pii"])
+        action = self.get_risk_action(risk_result["final_risk"])
+        return {
+            "pii_scan": pii_result,
+            "risk_evaluation": risk_result,
+            "recommended_action": action
+        }
+
+
+def get_pii_engine() -> CompiledPIIEngine:
+    """현재 규칙 스냅샷의 CompiledPIIEngine 반환 (리로드 시 스냅샷 단위로 교체)"""
+    return get_rule_snapshot().pii_engine
 
 
 def get_pii_patterns() -> Dict[str, List[Dict]]:
@@ -106,88 +350,8 @@ def detect_pii(text: str) -> Dict[str, Any]:
             "highest_risk": "MEDIUM"
         }
     """
-    data = _get_patterns_data()
-    found_pii = []
-    categories_found = set()
-    highest_risk = RiskLevel.LOW
-
-    risk_order = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
-
-    # 패턴 우선순위 정의 (높은 것 먼저 매칭)
-    # 숫자가 낮을수록 먼저 매칭됨
-    priority_order = {
-        "resident_id": 1,      # 주민번호
-        "foreigner_id": 1,     # 외국인등록번호
-        "card": 2,             # 신용카드
-        "passport": 3,         # 여권
-        "driver_license": 3,   # 운전면허
-        "phone": 4,            # 전화번호 (계좌번호보다 먼저 - 010 패턴 구분)
-        "account": 5,          # 계좌번호
-        "birth_date": 10,      # 생년월일 (가장 낮은 우선순위)
-    }
-
-    # 모든 패턴 수집
-    all_patterns = []
-    for cat_id, cat_info in data["categories"].items():
-        for item in cat_info["items"]:
-            if item.get("regex"):
-                priority = priority_order.get(item["id"], 10)
-                all_patterns.append({
-                    "item": item,
-                    "category": cat_id,
-                    "priority": priority
-                })
-
-    # 우선순위순 정렬
-    all_patterns.sort(key=lambda x: x["priority"])
-
-    # 이미 매칭된 위치 추적 (중복 방지)
-    matched_ranges = []
-
-    def is_overlapping(start: int, end: int) -> bool:
-        """이미 매칭된 범위와 겹치는지 확인"""
-        for m_start, m_end in matched_ranges:
-            # 겹치는 경우: 새 범위가 기존 범위 안에 포함되거나 교차
-            if not (end <= m_start or start >= m_end):
-                return True
-        return False
-
-    # 우선순위순 매칭
-    for pattern_info in all_patterns:
-        item = pattern_info["item"]
-        cat_id = pattern_info["category"]
-        regex = item["regex"]
-
-        try:
-            for match in re.finditer(regex, text):
-                start, end = match.start(), match.end()
-                matched_value = match.group()
-
-                # 이미 매칭된 범위와 겹치면 스킵
-                if is_overlapping(start, end):
-                    continue
-
-                # 새 매칭 추가
-                matched_ranges.append((start, end))
-                found_pii.append({
-                    "id": item["id"],
-                    "category": cat_id,
-                    "value": matched_value,
-                    "risk_level": item["risk_level"],
-                    "name_ko": item["name_ko"]
-                })
-                categories_found.add(cat_id)
-                if risk_order[item["risk_level"]] > risk_order[highest_risk.value]:
-                    highest_risk = RiskLevel(item["risk_level"])
-        except re.error:
-            continue
-
-    return {
-        "found_pii": found_pii,
-        "categories_found": list(categories_found),
-        "highest_risk": highest_risk.value,
-        "count": len(found_pii)
-    }
+    engine = get_pii_engine()
+    return get_result_cache("detect_pii").get_or_compute(engine, text_key(text), lambda: engine.detect(text))
 
 
 def detect_document_type(text: str) -> Dict[str, Any]:
@@ -256,79 +420,12 @@ def calculate_risk(detected_items: List[Dict]) -> Dict[str, Any]:
             "matched_rules": ["identity_theft"]
         }
     """
-    if not detected_items:
-        return {
-            "final_risk": "LOW",
-            "base_risk": "LOW",
-            "escalation_reason": None,
-            "is_secret_recommended": False,
-            "matched_rules": []
-        }
-
-    data = _get_patterns_data()
-    risk_order = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
-
-    # 1. 기본 위험도 (가장 높은 개별 항목)
-    base_risk = "LOW"
-    for item in detected_items:
-        if risk_order[item["risk_level"]] > risk_order[base_risk]:
-            base_risk = item["risk_level"]
-
-    final_risk = base_risk
-    escalation_reason = None
-    matched_rules = []
-
-    # 감지된 항목 ID 집합
-    detected_ids = {item["id"] for item in detected_items}
-    detected_categories = {item["category"] for item in detected_items}
-
-    # 2. 조합 규칙 체크
-    for rule_id, rule_info in data["combination_rules"].items():
-        for pattern in rule_info["patterns"]:
-            required = set(pattern["required"])
-            any_of = set(pattern.get("any_of", []))
-
-            # required 모두 충족
-            if required.issubset(detected_ids):
-                # any_of가 있으면 하나 이상 충족 필요
-                if not any_of or any_of.intersection(detected_ids):
-                    result_risk = pattern["result_risk"]
-                    if risk_order[result_risk] > risk_order[final_risk]:
-                        final_risk = result_risk
-                        escalation_reason = f"{rule_info['name_ko']} - {pattern['reason']}"
-                        matched_rules.append(rule_id)
-
-    # 3. 자동 상향 규칙 (count_based)
-    count = len(detected_items)
-    for escalation in data["auto_escalation"]["count_based"]:
-        if count >= escalation["min_items"]:
-            if risk_order[escalation["escalate_to"]] > risk_order[final_risk]:
-                final_risk = escalation["escalate_to"]
-                escalation_reason = escalation["reason"]
-
-    # 4. 카테고리 조합 상향
-    for combo in data["auto_escalation"]["category_combination"]:
-        required_cats = set(combo["categories"])
-        if required_cats.issubset(detected_categories):
-            if risk_order[combo["escalate_to"]] > risk_order[final_risk]:
-                final_risk = combo["escalate_to"]
-                escalation_reason = combo["reason"]
-
-    # 시크릿 전송 권장 여부
-    is_secret_recommended = risk_order[final_risk] >= risk_order["MEDIUM"]
-
-    return {
-        "final_risk": final_risk,
-        "base_risk": base_risk,
-        "escalation_reason": escalation_reason,
-        "is_secret_recommended": is_secret_recommended,
-        "matched_rules": matched_rules,
-        "detected_count": count
-    }
+    engine = get_pii_engine()
+    # 위험도 계산에 쓰이는 필드(id, category, risk_level)만 키로 사용
+    key = tuple((item["id"], item["category"], item["risk_level"]) for item in detected_items)
+    return get_result_cache("calculate_risk").get_or_compute(engine, key, lambda: engine.calculate_risk(detected_items))
 
 
 def get_risk_action(risk_level: str) -> str:
     """위험도에 따른 권장 조치 반환"""
-    data = _get_patterns_data()
-    risk_info = data["risk_levels"].get(risk_level, {})
-    return risk_info.get("action", "전송")
+    return get_pii_engine().get_risk_action(risk_level)
@@ -0,0 +1,137 @@
+"""
+Result Cache - 동일 메시지 규칙 분석 결과 메모이제이션 (LRU)
+채팅 트래픽은 "ㅋㅋㅋ", "ㅇㅋ", 이모티콘 대체 텍스트, 대량 발송 스팸처럼 같은 텍스트가
+반복되므로, detect_pii / calculate_risk / analyze_incoming_message 결과를 재사용한다.
+
+키:
+- (규칙 스냅샷, 텍스트 해시) - 해시는 blake2b 128bit (긴 텍스트도 키 크기 고정)
+- 텍스트는 정규화하지 않는다: 결과에 원문 값(PII value, 메시지 앞부분)이 들어가므로
+  정규화하면 다른 텍스트의 결과를 돌려주게 됨
+
+무효화:
+- 조회 시 넘긴 규칙 스냅샷(컴파일된 엔진 객체)이 바뀌면 캐시 전체를 비움 (규칙 재로드 자동 반영)
+
+결과는 호출자가 수정할 수 있으므로 저장/반환 시 복사본을 사용한다.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+# 캐시별 최대 항목 수 (0이면 캐시 사용 안 함)
+RESULT_CACHE_SIZE = int(os.getenv("KAT_RESULT_CACHE_SIZE", "4096"))
+
+
+def text_key(text: str) -> bytes:
+    """텍스트 해시 키 (blake2b 128bit)"""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _clone(value: Any, _dict=dict, _list=list) -> Any:
+    """JSON 형태 결과 복사 (dict/list만 재귀 복사, 스칼라는 공유 - copy.deepcopy보다 빠름)"""
+    kind = type(value)
+    if kind is _dict:
+        out = {}
+        for k, v in value.items():
+            kind = type(v)
+            out[k] = _clone(v) if kind is _dict or kind is _list else v
+        return out
+    if kind is _list:
+        return [_clone(v) if type(v) in (_dict, _list) else v for v in value]
+    return value
+
+
+class ResultCache:
+    """규칙 스냅샷 단위로 무효화되는 LRU 결과 캐시 (스레드 안전)"""
+
+    def __init__(self, name: str, max_entries: int = RESULT_CACHE_SIZE):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._snapshot: Any = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, snapshot: Any, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        캐시 조회, 없으면 compute() 결과 저장
+
+        Args:
+            snapshot: 결과를 만든 규칙 스냅샷 (바뀌면 캐시 전체 무효화)
+            key: 입력 키
+            compute: 결과 계산 함수
+        """
+        if self.max_entries <= 0:
+            return compute()
+
+        with self._lock:
+            if snapshot is not self._snapshot:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._snapshot = snapshot
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _clone(cached)
+            self.misses += 1
+
+        result = compute()
+        stored = _clone(result)
+        with self._lock:
+            if snapshot is self._snapshot:
+                self._entries[key] = stored
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._snapshot = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# 분석 함수별 캐시
+_caches: Dict[str, ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(name: str) -> ResultCache:
+    """이름별 결과 캐시 싱글톤"""
+    cache = _caches.get(name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(name, ResultCache(name))
+    return cache
+
+
+def get_result_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """전체 캐시 적중률 지표 (크기 조정용)"""
+    return {name: cache.get_stats() for name, cache in _caches.items()}
+
+
+def clear_result_caches() -> None:
+    for cache in _caches.values():
+        cache.clear()
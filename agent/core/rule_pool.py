@@ -0,0 +1,283 @@
+"""
+Rule Pool - 규칙 기반 분석(CPU 작업)을 이벤트 루프 밖에서 실행
+긴 텍스트의 정규식/키워드 검사가 async 핸들러 안에서 돌면 그동안 다른 연결이
+모두 멈추므로, 규칙 분석 함수를 설정한 풀에서 실행한다.
+
+모드 (KAT_RULE_POOL):
+- "inline": 기존처럼 이벤트 루프에서 바로 실행 (풀 없음)
+- "thread": 스레드 풀 (기본) - 루프는 GIL 전환 주기마다 다른 요청 처리
+- "process": 프로세스 풀 - 규칙 엔진을 부모에서 미리 컴파일한 뒤 fork하여
+             워커가 컴파일된 규칙 페이지를 copy-on-write로 공유 (gc.freeze로 GC가
+             공유 페이지를 건드리지 않게 함). fork를 지원하지 않는 플랫폼은 spawn +
+             워커별 미리 컴파일.
+             fork는 다른 스레드가 없을 때 해야 하므로 서버는 lifespan 시작 직후 start()를 호출한다.
+             워커는 각자 규칙 파일을 감시하므로 파일 변경은 반영되지만, 부모 프로세스의
+             rollback()/API 리로드는 워커에 전달되지 않는다.
+
+배압:
+- 풀에 들어간(대기+실행) 작업이 max_pending에 도달하면 새 작업은 자리가 날 때까지
+  최대 admission_timeout 동안 기다리고, 그래도 없으면 RulePoolSaturated
+  (HTTP 핸들러는 503 + Retry-After로 응답)
+
+지표:
+- admission_wait: 배압으로 자리를 기다린 시간
+- queue_wait: 풀에 제출한 뒤 워커가 실행을 시작하기까지의 시간
+- exec: 워커 실행 시간
+"""
+import asyncio
+import gc
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+RULE_POOL_MODE = os.getenv("KAT_RULE_POOL", "thread")
+RULE_POOL_WORKERS = int(os.getenv("KAT_RULE_POOL_WORKERS", str(min(4, os.cpu_count() or 2))))
+# 풀 안에 둘 수 있는 최대 작업 수 (대기 + 실행, 기본 워커당 8개)
+RULE_POOL_MAX_PENDING = int(os.getenv("KAT_RULE_POOL_MAX_PENDING", str(RULE_POOL_WORKERS * 8)))
+RULE_POOL_ADMISSION_TIMEOUT_MS = int(os.getenv("KAT_RULE_POOL_ADMISSION_TIMEOUT_MS", "200"))
+
+# 지표용 최근 표본 수
+_SAMPLE_SIZE = 2048
+
+
+class RulePoolSaturated(Exception):
+    """풀이 가득 차서 작업을 받을 수 없음 (배압)"""
+
+
+def preload_rules() -> Dict[str, Any]:
+    """
+    규칙 스냅샷 미리 로드/컴파일 (PII 엔진, 위협 엔진, 사기 신고 색인)
+
+    Returns:
+        로드된 규칙 요약
+    """
+    from .rule_snapshot import get_rule_snapshot
+
+    start = time.perf_counter()
+    snapshot = get_rule_snapshot()
+    return {
+        **snapshot.describe(),
+        "scam_reports": len(snapshot.scam_store.index()),
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def _worker_init() -> None:
+    """
+    프로세스 워커 초기화
+
+    fork로 물려받은 스레드 풀/SQLite 연결은 자식에서 쓸 수 없으므로 버리고
+    (파일 DB는 자식이 새로 연결), 규칙은 없으면 로드한다 (spawn 모드).
+    감시 스레드는 fork로 이어지지 않으므로 워커마다 규칙 파일 감시를 새로 시작한다.
+    """
+    from . import conversation_analyzer, stage_executor, batch_runner
+    from .rule_snapshot import get_rule_manager
+
+    store = conversation_analyzer._conversation_store
+    if store is not None and store.path != ":memory:":
+        conversation_analyzer._conversation_store = None
+    stage_executor._stage_pool = None
+    batch_runner._batch_pool = None
+    preload_rules()
+    get_rule_manager().watch()
+
+
+def _timed_call(func: Callable, args: Tuple, kwargs: Dict) -> Tuple[Any, float, float]:
+    """워커에서 실행 - (결과, 시작 시각, 종료 시각) 반환 (monotonic 시계는 프로세스 간 공통)"""
+    started = time.monotonic()
+    result = func(*args, **kwargs)
+    return result, started, time.monotonic()
+
+
+def _percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RulePool:
+    """
+    규칙 분석 작업 풀 (배압 + 대기/실행 시간 지표)
+
+    run()은 이벤트 루프에서 호출한다.
+    """
+
+    def __init__(
+        self,
+        mode: str = RULE_POOL_MODE,
+        workers: int = RULE_POOL_WORKERS,
+        max_pending: int = RULE_POOL_MAX_PENDING,
+        admission_timeout: float = RULE_POOL_ADMISSION_TIMEOUT_MS / 1000
+    ):
+        if mode not in ("inline", "thread", "process"):
+            raise ValueError(f"알 수 없는 규칙 풀 모드: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self.max_pending = max_pending
+        self.admission_timeout = admission_timeout
+
+        self._executor = None
+        self._pending = 0
+        self._slot_waiters: Deque["asyncio.Future"] = deque()
+
+        self.stats = {"submitted": 0, "completed": 0, "errors": 0, "rejected": 0, "max_pending": 0}
+        self._admission_wait: Deque[float] = deque(maxlen=_SAMPLE_SIZE)
+        self._queue_wait: Deque[float] = deque(maxlen=_SAMPLE_SIZE)
+        self._exec_time: Deque[float] = deque(maxlen=_SAMPLE_SIZE)
+        self.preloaded: Optional[Dict[str, Any]] = None
+
+    # ---------- 풀 ----------
+
+    def start(self) -> None:
+        """규칙 미리 로드 + 풀 생성 (서버는 lifespan에서 호출, 그 외에는 첫 run()에서 자동 호출)"""
+        if self._executor is not None or self.mode == "inline":
+            if self.preloaded is None:
+                self.preloaded = preload_rules()
+            return
+
+        self.preloaded = preload_rules()
+        if self.mode == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="kat-rule")
+        else:
+            if "fork" in multiprocessing.get_all_start_methods():
+                # 컴파일된 규칙을 영구 세대로 옮겨 fork 후 GC가 공유 페이지를 쓰지 않게 함
+                gc.collect()
+                gc.freeze()
+                context = multiprocessing.get_context("fork")
+            else:
+                context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context, initializer=_worker_init
+            )
+            # 워커를 지금 fork (첫 요청이 fork 비용을 치르지 않도록)
+            self._executor.submit(int).result()
+        print(
+            f"[RulePool] {self.mode} 풀 시작: workers={self.workers}, max_pending={self.max_pending}, "
+            f"규칙 {self.preloaded['version']} 로드 {self.preloaded['elapsed_ms']:.0f}ms"
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            if self.mode == "process":
+                gc.unfreeze()
+
+    # ---------- 배압 ----------
+
+    async def _acquire(self) -> None:
+        if self._pending < self.max_pending and not self._slot_waiters:
+            self._pending += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._slot_waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.admission_timeout)
+        except asyncio.TimeoutError:
+            self.stats["rejected"] += 1
+            raise RulePoolSaturated(
+                f"규칙 풀 포화: 대기 작업 {self._pending}/{self.max_pending}"
+            ) from None
+        finally:
+            if waiter in self._slot_waiters:
+                self._slot_waiters.remove(waiter)
+        # 자리는 _release()가 넘겨줌 (_pending 유지)
+
+    def _release(self) -> None:
+        while self._slot_waiters:
+            waiter = self._slot_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # 자리를 그대로 넘김
+                return
+        self._pending -= 1
+
+    # ---------- 실행 ----------
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        규칙 분석 함수 실행
+
+        process 모드에서 func/인자/결과는 pickle 가능해야 한다 (모듈 수준 함수).
+
+        Raises:
+            RulePoolSaturated: 배압 대기 시간 초과
+        """
+        if self.mode == "inline":
+            if self.preloaded is None:
+                self.start()
+            started = time.monotonic()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exec_time.append(time.monotonic() - started)
+                self.stats["completed"] += 1
+
+        if self._executor is None:
+            self.start()
+
+        admission_start = time.monotonic()
+        await self._acquire()
+        submitted = time.monotonic()
+        self._admission_wait.append(submitted - admission_start)
+        self.stats["submitted"] += 1
+        self.stats["max_pending"] = max(self.stats["max_pending"], self._pending)
+
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(
+                self._executor, _timed_call, func, args, kwargs
+            )
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self._release()
+
+        self._queue_wait.append(max(0.0, started - submitted))
+        self._exec_time.append(finished - started)
+        self.stats["completed"] += 1
+        return result
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def get_stats(self) -> Dict[str, Any]:
+        """대기/실행 시간 지표 (ms)"""
+        def summary(samples):
+            values = [v * 1000 for v in samples]
+            return {
+                "avg": round(sum(values) / len(values), 3) if values else 0.0,
+                "p50": round(_percentile(values, 0.5), 3),
+                "p95": round(_percentile(values, 0.95), 3),
+                "max": round(max(values), 3) if values else 0.0,
+            }
+
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "pending": self._pending,
+            "waiting_for_slot": len(self._slot_waiters),
+            **self.stats,
+            "admission_wait_ms": summary(self._admission_wait),
+            "queue_wait_ms": summary(self._queue_wait),
+            "exec_ms": summary(self._exec_time),
+        }
+
+
+# 전역 풀
+_rule_pool: Optional[RulePool] = None
+
+
+def get_rule_pool() -> RulePool:
+    """규칙 분석 풀 싱글톤 (KAT_RULE_POOL 설정)"""
+    global _rule_pool
+    if _rule_pool is None:
+        _rule_pool = RulePool()
+    return _rule_pool
@@ -0,0 +1,400 @@
+"""
+Rule Snapshot - 규칙 데이터 버전 스냅샷 + 원자적 핫 리로드
+
+sensitive_patterns.json / threat_patterns.json / scam_db.json을 하나의 RuleSnapshot으로 묶는다.
+- 새 스냅샷은 요청 경로 밖(감시 스레드 / 시그널 처리 스레드 / 관리 호출)에서 JSON 파싱 →
+  엔진 컴파일 → 검증까지 마친 뒤 참조 1개 교체로 한 번에 적용
+- 조회(get_rule_snapshot)는 잠금 없이 현재 참조만 읽음
+- 컴파일/검증이 실패하면 기존 스냅샷을 그대로 유지 (last_error에 기록), rollback()으로
+  직전 스냅샷 복귀 가능
+- 버전 id: "r<순번>-<세 파일 내용 해시 12자리>" (내용이 같으면 교체하지 않음)
+
+트리거:
+- 파일 감시: watch() - KAT_RULE_WATCH_INTERVAL초마다 파일 (mtime, size) 확인
+- 시그널: install_signal_handler() - SIGHUP 수신 시 리로드
+
+바뀌지 않은 파일의 컴파일 결과(엔진/사기 신고 저장소)는 새 스냅샷에서 재사용한다.
+배포 전 오프라인 검증: python -m agent.core.compile_rules check
+"""
+import hashlib
+import json
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .scam_delta import ScamReportStore
+
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+PII_FILE = "sensitive_patterns.json"
+THREAT_FILE = "threat_patterns.json"
+SCAM_FILE = "scam_db.json"
+RULE_FILES = (PII_FILE, THREAT_FILE, SCAM_FILE)
+
+# 파일 감시 주기 (초, 0이면 감시 안 함)
+RULE_WATCH_INTERVAL = float(os.getenv("KAT_RULE_WATCH_INTERVAL", "2"))
+# 사기 신고 오버레이가 이 건수 이상이면 새 기본 스냅샷으로 컴팩션 (0이면 안 함, 델타 기록 프로세스에서만)
+SCAM_COMPACT_THRESHOLD = int(os.getenv("KAT_SCAM_COMPACT_THRESHOLD", "1000"))
+# 보관할 이전 스냅샷 수 (rollback 용)
+RULE_HISTORY_SIZE = 3
+
+# 검증용 샘플 (컴파일된 엔진이 예외 없이 동작하는지 확인)
+_CANARY_TEXTS = (
+    "",
+    "오늘 저녁 뭐 먹을까?",
+    "엄마 나 폰 액정 깨져서 그런데 이 계좌로 50만원 보내줘 110-123-456789 급해",
+    "주민번호 900101-1234567 연락처 010-1234-5678 https://bit.ly/abc",
+)
+
+_EMPTY_SCAM_DB = {"reported_accounts": {"data": []}, "reported_phones": {"data": []}}
+
+
+class RuleSnapshotError(Exception):
+    """규칙 스냅샷 컴파일/검증 실패"""
+
+
+class RuleSnapshot:
+    """규칙 데이터 + 컴파일 결과 묶음 (생성 후 변경하지 않음)"""
+
+    def __init__(
+        self,
+        version: str,
+        digests: Dict[str, str],
+        pii_engine,
+        threat_engine,
+        scam_db: Dict,
+        scam_store: ScamReportStore,
+        file_stats: Dict[str, Optional[Tuple[int, int]]]
+    ):
+        self.version = version
+        self.digests = digests
+        self.pii_engine = pii_engine
+        self.threat_engine = threat_engine
+        self.scam_db = scam_db
+        self.scam_store = scam_store
+        self.file_stats = file_stats
+        self.loaded_at = time.time()
+
+    @property
+    def pii_data(self) -> Dict:
+        return self.pii_engine.source
+
+    @property
+    def threat_data(self) -> Dict:
+        return self.threat_engine.source
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "pii_patterns": len(self.pii_engine.patterns),
+            "threat_patterns": len(self.threat_engine.patterns),
+            "pii_data_version": self.pii_engine.version,
+            "threat_data_version": self.threat_engine.version,
+        }
+
+
+def _file_stat(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_rule_sources(data_dir: Path) -> Tuple[Dict[str, Optional[bytes]], Dict[str, str], Dict[str, Optional[Tuple[int, int]]]]:
+    """규칙 파일 원문 읽기 → (원문, 내용 해시, 파일 상태) - 원문 None은 파일 없음"""
+    data_dir = Path(data_dir)
+    # 읽기 전에 상태를 기록 (읽는 중 수정되면 다음 감시 주기에 다시 리로드)
+    file_stats = {name: _file_stat(data_dir / name) for name in RULE_FILES}
+    raws: Dict[str, Optional[bytes]] = {}
+    digests: Dict[str, str] = {}
+    for name in RULE_FILES:
+        try:
+            raws[name] = (data_dir / name).read_bytes()
+            digests[name] = hashlib.sha256(raws[name]).hexdigest()
+        except FileNotFoundError:
+            raws[name] = None
+            digests[name] = ""
+    return raws, digests, file_stats
+
+
+def _parse_json(raw: Optional[bytes], name: str) -> Dict:
+    if raw is None:
+        if name == SCAM_FILE:
+            return _EMPTY_SCAM_DB
+        raise RuleSnapshotError(f"{name} 없음")
+    try:
+        return json.loads(raw.decode("utf-8"))
+    except ValueError as e:
+        raise RuleSnapshotError(f"{name} 파싱 실패: {e}") from e
+
+
+def build_snapshot(
+    data_dir: Path = DATA_DIR,
+    seq: int = 1,
+    previous: Optional[RuleSnapshot] = None
+) -> RuleSnapshot:
+    """
+    규칙 파일 읽기 → 컴파일 → 검증
+
+    Args:
+        data_dir: 규칙 파일 디렉토리
+        seq: 버전 순번
+        previous: 이전 스냅샷 (내용이 같은 파일의 컴파일 결과 재사용)
+
+    Raises:
+        RuleSnapshotError: 파싱/컴파일/검증 실패
+    """
+    from .pattern_matcher import CompiledPIIEngine
+    from .threat_matcher import CompiledThreatEngine
+
+    data_dir = Path(data_dir)
+    raws, digests, file_stats = read_rule_sources(data_dir)
+
+    pii_data = _parse_json(raws[PII_FILE], PII_FILE)
+    threat_data = _parse_json(raws[THREAT_FILE], THREAT_FILE)
+    scam_db = _parse_json(raws[SCAM_FILE], SCAM_FILE)
+
+    def reusable(name: str) -> bool:
+        return previous is not None and previous.digests.get(name) == digests[name]
+
+    try:
+        pii_engine = previous.pii_engine if reusable(PII_FILE) else CompiledPIIEngine(pii_data)
+        threat_engine = previous.threat_engine if reusable(THREAT_FILE) else CompiledThreatEngine(threat_data)
+        if reusable(SCAM_FILE):
+            scam_db, scam_store = previous.scam_db, previous.scam_store
+        else:
+            if not isinstance(scam_db.get("reported_accounts", {}).get("data"), list) or \
+                    not isinstance(scam_db.get("reported_phones", {}).get("data"), list):
+                raise RuleSnapshotError(f"{SCAM_FILE} 형식 오류: reported_accounts/reported_phones.data 필요")
+            scam_store = ScamReportStore(
+                base_path=data_dir / SCAM_FILE,
+                snapshot_path=data_dir / "scam_db.snapshot",
+                delta_path=data_dir / "scam_db.delta.jsonl",
+                base_data=scam_db,
+                base_digest=digests[SCAM_FILE],
+                compact_threshold=SCAM_COMPACT_THRESHOLD or None,
+            )
+            scam_store.index()
+    except RuleSnapshotError:
+        raise
+    except Exception as e:
+        raise RuleSnapshotError(f"규칙 컴파일 실패: {type(e).__name__}: {e}") from e
+
+    _validate(pii_engine, threat_engine)
+
+    combined = hashlib.sha256("".join(digests[name] for name in RULE_FILES).encode()).hexdigest()
+    return RuleSnapshot(
+        version=f"r{seq}-{combined[:12]}",
+        digests=digests,
+        pii_engine=pii_engine,
+        threat_engine=threat_engine,
+        scam_db=scam_db,
+        scam_store=scam_store,
+        file_stats=file_stats,
+    )
+
+
+def _validate(pii_engine, threat_engine) -> None:
+    """컴파일된 엔진 검증 - 패턴이 있고 샘플 메시지를 예외 없이 처리해야 함"""
+    if not pii_engine.patterns:
+        raise RuleSnapshotError(f"{PII_FILE}: 컴파일된 정규식 패턴이 없음")
+    if not threat_engine.patterns:
+        raise RuleSnapshotError(f"{THREAT_FILE}: 위협 패턴이 없음")
+
+    from .message_features import MessageFeatures
+    from .threat_matcher import _analyze_incoming_message
+
+    for text in _CANARY_TEXTS:
+        try:
+            pii_engine.analyze(text)
+            _analyze_incoming_message(text, MessageFeatures(text, threat_engine))
+        except Exception as e:
+            raise RuleSnapshotError(f"샘플 메시지 검증 실패 ({text[:20]!r}): {type(e).__name__}: {e}") from e
+
+
+class RuleSnapshotManager:
+    """
+    현재 규칙 스냅샷 관리 (원자적 교체 + 롤백 + 파일 감시 / 시그널 트리거)
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, watch_interval: float = RULE_WATCH_INTERVAL):
+        self.data_dir = Path(data_dir)
+        self.watch_interval = watch_interval
+        self._current: Optional[RuleSnapshot] = None
+        self._history: List[RuleSnapshot] = []
+        self._seq = 0
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._watcher_pid: Optional[int] = None
+        self._stop = threading.Event()
+        self.last_error: Optional[str] = None
+        self.stats = {"reloads": 0, "unchanged": 0, "failures": 0, "rollbacks": 0}
+
+    def current(self) -> RuleSnapshot:
+        """현재 스냅샷 (첫 호출 시에만 로드, 이후 잠금 없음)"""
+        snapshot = self._current
+        if snapshot is None:
+            with self._reload_lock:
+                if self._current is None:
+                    self._seq += 1
+                    start = time.perf_counter()
+                    self._current = build_snapshot(self.data_dir, self._seq)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(f"[RuleSnapshot] 규칙 로드: {self._current.version} ({elapsed:.1f}ms)")
+                snapshot = self._current
+        return snapshot
+
+    def reload(self, force: bool = False, reason: str = "manual") -> bool:
+        """
+        규칙 파일 다시 읽어 교체
+
+        Args:
+            force: 내용이 같아도 새 스냅샷으로 교체 (엔진 재컴파일)
+            reason: 로그용 트리거 이름
+
+        Returns:
+            교체 여부 (실패/변경 없음이면 False - 기존 스냅샷 유지)
+        """
+        with self._reload_lock:
+            previous = self._current
+            start = time.perf_counter()
+            try:
+                snapshot = build_snapshot(
+                    self.data_dir, self._seq + 1, previous=None if force else previous
+                )
+            except RuleSnapshotError as e:
+                self.last_error = str(e)
+                self.stats["failures"] += 1
+                kept = previous.version if previous else "없음"
+                print(f"[RuleSnapshot] 리로드 실패 ({reason}) - 기존 규칙 유지 ({kept}): {e}")
+                return False
+
+            self.last_error = None
+            if previous is not None and not force and snapshot.digests == previous.digests:
+                # 파일 시각만 바뀜 → 상태만 갱신하고 기존 스냅샷 유지 (결과 캐시도 유지)
+                previous.file_stats = snapshot.file_stats
+                self.stats["unchanged"] += 1
+                return False
+
+            self._seq += 1
+            self._swap(snapshot, previous)
+            self.stats["reloads"] += 1
+            elapsed = (time.perf_counter() - start) * 1000
+            old_version = previous.version if previous else "없음"
+            print(f"[RuleSnapshot] 규칙 교체 ({reason}): {old_version} → {snapshot.version}, {elapsed:.0f}ms")
+            return True
+
+    def _swap(self, snapshot: RuleSnapshot, previous: Optional[RuleSnapshot]) -> None:
+        if previous is not None:
+            self._history.append(previous)
+            del self._history[:-RULE_HISTORY_SIZE]
+        self._current = snapshot
+
+    def rollback(self) -> Optional[str]:
+        """
+        직전 스냅샷으로 복귀 (새 규칙이 컴파일은 되지만 오탐이 많을 때 등)
+
+        Returns:
+            복귀한 버전 (이전 스냅샷이 없으면 None)
+        """
+        with self._reload_lock:
+            if not self._history:
+                return None
+            snapshot = self._history.pop()
+            current = self._current
+            self._current = snapshot
+            self.stats["rollbacks"] += 1
+            print(f"[RuleSnapshot] 롤백: {current.version if current else '없음'} → {snapshot.version}")
+            return snapshot.version
+
+    # ---------- 트리거 ----------
+
+    def files_changed(self) -> bool:
+        snapshot = self._current
+        if snapshot is None:
+            return False
+        return any(_file_stat(self.data_dir / name) != snapshot.file_stats.get(name) for name in RULE_FILES)
+
+    def watch(self) -> None:
+        """파일 감시 스레드 시작 (프로세스당 1개, fork된 자식에서 호출하면 새로 시작)"""
+        if self.watch_interval <= 0:
+            return
+        pid = os.getpid()
+        if self._watcher is not None and self._watcher_pid == pid and self._watcher.is_alive():
+            return
+        self.current()
+        self._stop = threading.Event()
+        self._watcher_pid = pid
+        self._watcher = threading.Thread(target=self._watch_loop, name="kat-rule-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+
+    def _watch_loop(self) -> None:
+        stop = self._stop
+        while not stop.wait(self.watch_interval):
+            try:
+                if self.files_changed():
+                    self.reload(reason="file-watch")
+            except Exception as e:
+                print(f"[RuleSnapshot] 파일 감시 오류: {e}")
+
+    def install_signal_handler(self, signum: int = getattr(signal, "SIGHUP", 0)) -> bool:
+        """
+        시그널 수신 시 리로드 (메인 스레드에서만 설치 가능)
+
+        핸들러는 리로드 스레드만 띄우고 바로 반환한다 (컴파일은 시그널 처리 밖에서).
+        """
+        if not signum or threading.current_thread() is not threading.main_thread():
+            return False
+
+        def handler(_signum, _frame):
+            threading.Thread(target=self.reload, kwargs={"reason": "signal"}, daemon=True).start()
+
+        signal.signal(signum, handler)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._current
+        return {
+            **(snapshot.describe() if snapshot else {"version": None}),
+            "history": [s.version for s in self._history],
+            "last_error": self.last_error,
+            "watching": self._watcher is not None and self._watcher.is_alive(),
+            **self.stats,
+        }
+
+
+# 전역 관리자
+_rule_manager: Optional[RuleSnapshotManager] = None
+_rule_manager_lock = threading.Lock()
+
+
+def get_rule_manager() -> RuleSnapshotManager:
+    """규칙 스냅샷 관리자 싱글톤"""
+    global _rule_manager
+    if _rule_manager is None:
+        with _rule_manager_lock:
+            if _rule_manager is None:
+                _rule_manager = RuleSnapshotManager()
+    return _rule_manager
+
+
+def get_rule_snapshot() -> RuleSnapshot:
+    """현재 규칙 스냅샷"""
+    manager = _rule_manager
+    if manager is None:
+        manager = get_rule_manager()
+    snapshot = manager._current
+    return snapshot if snapshot is not None else manager.current()
+
+
+def reload_rules(force: bool = False) -> bool:
+    """규칙 리로드 (실패 시 기존 규칙 유지)"""
+    return get_rule_manager().reload(force=force)
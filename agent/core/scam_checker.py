@@ -5,38 +5,99 @@ Scam Checker - 사기 신고 DB 조회 모듈
 실제 운영 환경에서는 경찰청/금감원 API와 연동
 현재는 Mock DB (scam_db.json) 사용
 """
-import json
 import re
-from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
 
+from .scam_index import (
+    ScamReportIndex,
+    KIND_ACCOUNT,
+    KIND_PHONE,
+    normalize_identifier,
+)
+from .scam_delta import ScamReportStore
+from .rule_snapshot import get_rule_snapshot
 
-# 데이터 로드
-_DATA_DIR = Path(__file__).parent.parent / "data"
-_scam_db: Optional[Dict] = None
+if TYPE_CHECKING:
+    from .message_features import MessageFeatures
 
 
 def _load_scam_db() -> Dict:
-    """사기 신고 DB 로드 (lazy loading)"""
-    global _scam_db
-    if _scam_db is None:
-        db_path = _DATA_DIR / "scam_db.json"
-        if db_path.exists():
-            with open(db_path, "r", encoding="utf-8") as f:
-                _scam_db = json.load(f)
-        else:
-            _scam_db = {"reported_accounts": {"data": []}, "reported_phones": {"data": []}}
-    return _scam_db
+    """사기 신고 DB 원본 데이터 (현재 규칙 스냅샷)"""
+    return get_rule_snapshot().scam_db
+
+
+def get_scam_store() -> ScamReportStore:
+    """사기 신고 색인 저장소 (기본 스냅샷 + 델타 로그 - 현재 규칙 스냅샷에 포함)"""
+    return get_rule_snapshot().scam_store
+
+
+def get_scam_index() -> ScamReportIndex:
+    """현재 사기 신고 색인 (새 델타가 있으면 반영된 상태)"""
+    return get_rule_snapshot().scam_store.index()
 
 
 def normalize_account_number(account: str) -> str:
     """계좌번호 정규화 (하이픈 제거)"""
-    return re.sub(r'[-\s]', '', account)
+    return normalize_identifier(account)
 
 
 def normalize_phone_number(phone: str) -> str:
     """전화번호 정규화 (하이픈 제거)"""
-    return re.sub(r'[-\s]', '', phone)
+    return normalize_identifier(phone)
+
+
+def _account_result(record: Optional[Dict], status_definitions: Dict) -> Dict[str, Any]:
+    """계좌 신고 레코드 → 조회 결과"""
+    if record is None:
+        return {
+            "is_reported": False,
+            "report_info": None,
+            "risk_score": 0,
+            "recommended_action": "none"
+        }
+
+    status_info = status_definitions.get(record["status"], {})
+    return {
+        "is_reported": True,
+        "report_info": {
+            "account_number": record["account_number"],
+            "bank": record.get("bank", "알 수 없음"),
+            "report_count": record["report_count"],
+            "report_type": record["report_type"],
+            "status": record["status"],
+            "status_name_ko": status_info.get("name_ko", record["status"]),
+            "last_reported": record.get("last_reported", "")
+        },
+        "risk_score": record["risk_score"],
+        "recommended_action": status_info.get("action", "warn")
+    }
+
+
+def _phone_result(record: Optional[Dict], status_definitions: Dict) -> Dict[str, Any]:
+    """전화번호 신고 레코드 → 조회 결과"""
+    if record is None:
+        return {
+            "is_reported": False,
+            "report_info": None,
+            "risk_score": 0,
+            "recommended_action": "none"
+        }
+
+    status_info = status_definitions.get(record["status"], {})
+    return {
+        "is_reported": True,
+        "report_info": {
+            "phone_number": record["phone_number"],
+            "report_count": record["report_count"],
+            "report_type": record["report_type"],
+            "caller_claim": record.get("caller_claim", ""),
+            "status": record["status"],
+            "status_name_ko": status_info.get("name_ko", record["status"]),
+            "last_reported": record.get("last_reported", "")
+        },
+        "risk_score": record["risk_score"],
+        "recommended_action": status_info.get("action", "warn")
+    }
 
 
 def check_reported_account(account_number: str) -> Dict[str, Any]:
@@ -52,34 +113,9 @@ def check_reported_account(account_number: str) -> Dict[str, Any]:
         risk_score: 위험 점수 (0-100)
         recommended_action: 권장 조치
     """
-    db = _load_scam_db()
-    normalized = normalize_account_number(account_number)
-
-    for record in db.get("reported_accounts", {}).get("data", []):
-        record_normalized = normalize_account_number(record["account_number"])
-        if record_normalized == normalized:
-            status_info = db.get("status_definitions", {}).get(record["status"], {})
-            return {
-                "is_reported": True,
-                "report_info": {
-                    "account_number": record["account_number"],
-                    "bank": record.get("bank", "알 수 없음"),
-                    "report_count": record["report_count"],
-                    "report_type": record["report_type"],
-                    "status": record["status"],
-                    "status_name_ko": status_info.get("name_ko", record["status"]),
-                    "last_reported": record.get("last_reported", "")
-                },
-                "risk_score": record["risk_score"],
-                "recommended_action": status_info.get("action", "warn")
-            }
-
-    return {
-        "is_reported": False,
-        "report_info": None,
-        "risk_score": 0,
-        "recommended_action": "none"
-    }
+    index = get_scam_index()
+    record = index.lookup(KIND_ACCOUNT, normalize_account_number(account_number))
+    return _account_result(record, index.status_definitions)
 
 
 def check_reported_phone(phone_number: str) -> Dict[str, Any]:
@@ -95,71 +131,61 @@ def check_reported_phone(phone_number: str) -> Dict[str, Any]:
         risk_score: 위험 점수 (0-100)
         recommended_action: 권장 조치
     """
-    db = _load_scam_db()
-    normalized = normalize_phone_number(phone_number)
-
-    for record in db.get("reported_phones", {}).get("data", []):
-        record_normalized = normalize_phone_number(record["phone_number"])
-        if record_normalized == normalized:
-            status_info = db.get("status_definitions", {}).get(record["status"], {})
-            return {
-                "is_reported": True,
-                "report_info": {
-                    "phone_number": record["phone_number"],
-                    "report_count": record["report_count"],
-                    "report_type": record["report_type"],
-                    "caller_claim": record.get("caller_claim", ""),
-                    "status": record["status"],
-                    "status_name_ko": status_info.get("name_ko", record["status"]),
-                    "last_reported": record.get("last_reported", "")
-                },
-                "risk_score": record["risk_score"],
-                "recommended_action": status_info.get("action", "warn")
-            }
+    index = get_scam_index()
+    record = index.lookup(KIND_PHONE, normalize_phone_number(phone_number))
+    return _phone_result(record, index.status_definitions)
 
-    return {
-        "is_reported": False,
-        "report_info": None,
-        "risk_score": 0,
-        "recommended_action": "none"
-    }
 
+_DIGIT_RE = re.compile(r'\d')
+
+# 계좌번호 패턴 (3-4자리-2-6자리-6-7자리)
+_ACCOUNT_PATTERNS = [
+    re.compile(r'\d{3,4}[-\s]?\d{2,6}[-\s]?\d{6,7}'),  # 일반적인 계좌번호
+    re.compile(r'\d{11,14}'),  # 하이픈 없는 계좌번호
+]
+
+# 전화번호 패턴
+_PHONE_PATTERNS = [
+    re.compile(r'010[-\s]?\d{4}[-\s]?\d{4}'),  # 휴대폰
+    re.compile(r'02[-\s]?\d{3,4}[-\s]?\d{4}'),  # 서울
+    re.compile(r'0\d{1,2}[-\s]?\d{3,4}[-\s]?\d{4}'),  # 지역번호
+    re.compile(r'070[-\s]?\d{4}[-\s]?\d{4}'),  # 인터넷전화
+]
 
-def extract_identifiers_from_text(text: str) -> Dict[str, List[str]]:
+
+def extract_identifiers_from_text(
+    text: str,
+    features: Optional["MessageFeatures"] = None
+) -> Dict[str, List[str]]:
     """
     텍스트에서 계좌번호와 전화번호 추출
 
     Args:
         text: 분석할 텍스트
+        features: 미리 추출한 메시지 특징 (있으면 재검색하지 않음)
 
     Returns:
         accounts: 추출된 계좌번호 목록
         phones: 추출된 전화번호 목록
     """
-    # 계좌번호 패턴 (3-4자리-2-6자리-6-7자리)
-    account_patterns = [
-        r'\d{3,4}[-\s]?\d{2,6}[-\s]?\d{6,7}',  # 일반적인 계좌번호
-        r'\d{11,14}',  # 하이픈 없는 계좌번호
-    ]
-
-    # 전화번호 패턴
-    phone_patterns = [
-        r'010[-\s]?\d{4}[-\s]?\d{4}',  # 휴대폰
-        r'02[-\s]?\d{3,4}[-\s]?\d{4}',  # 서울
-        r'0\d{1,2}[-\s]?\d{3,4}[-\s]?\d{4}',  # 지역번호
-        r'070[-\s]?\d{4}[-\s]?\d{4}',  # 인터넷전화
-    ]
+    if features is not None:
+        return {
+            "accounts": list(features.accounts),
+            "phones": list(features.phones)
+        }
+
+    # 숫자가 없으면 식별자도 없음
+    if not _DIGIT_RE.search(text):
+        return {"accounts": [], "phones": []}
 
     accounts = []
     phones = []
 
-    for pattern in account_patterns:
-        matches = re.findall(pattern, text)
-        accounts.extend(matches)
+    for pattern in _ACCOUNT_PATTERNS:
+        accounts.extend(pattern.findall(text))
 
-    for pattern in phone_patterns:
-        matches = re.findall(pattern, text)
-        phones.extend(matches)
+    for pattern in _PHONE_PATTERNS:
+        phones.extend(pattern.findall(text))
 
     # 중복 제거 및 정규화
     accounts = list(set(normalize_account_number(a) for a in accounts))
@@ -174,12 +200,13 @@ def extract_identifiers_from_text(text: str) -> Dict[str, List[str]]:
     }
 
 
-def check_scam_in_message(text: str) -> Dict[str, Any]:
+def check_scam_in_message(text: str, features: Optional["MessageFeatures"] = None) -> Dict[str, Any]:
     """
     메시지 내 계좌번호/전화번호의 신고 이력 일괄 조회
 
     Args:
         text: 분석할 메시지
+        features: 미리 추출한 메시지 특징 (선택)
 
     Returns:
         has_reported_identifier: 신고된 식별자 포함 여부
@@ -188,25 +215,32 @@ def check_scam_in_message(text: str) -> Dict[str, Any]:
         max_risk_score: 최대 위험 점수
         recommended_action: 권장 조치
     """
-    identifiers = extract_identifiers_from_text(text)
+    identifiers = extract_identifiers_from_text(text, features)
 
     reported_accounts = []
     reported_phones = []
     max_risk_score = 0
     recommended_action = "none"
 
-    # 계좌번호 조회
+    # 모든 식별자를 한 번에 조회
+    index = get_scam_index()
+    found = index.lookup_many(
+        [(KIND_ACCOUNT, a) for a in identifiers["accounts"]]
+        + [(KIND_PHONE, p) for p in identifiers["phones"]]
+    )
+
+    # 계좌번호 결과
     for account in identifiers["accounts"]:
-        result = check_reported_account(account)
+        result = _account_result(found.get((KIND_ACCOUNT, account)), index.status_definitions)
         if result["is_reported"]:
             reported_accounts.append(result["report_info"])
             if result["risk_score"] > max_risk_score:
                 max_risk_score = result["risk_score"]
                 recommended_action = result["recommended_action"]
 
-    # 전화번호 조회
+    # 전화번호 결과
     for phone in identifiers["phones"]:
-        result = check_reported_phone(phone)
+        result = _phone_result(found.get((KIND_PHONE, phone)), index.status_definitions)
         if result["is_reported"]:
             reported_phones.append(result["report_info"])
             if result["risk_score"] > max_risk_score:
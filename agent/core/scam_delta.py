@@ -0,0 +1,341 @@
+"""
+Scam Delta - 사기 신고 데이터 증분 반영
+재시작/전체 JSON 재파싱 없이 신규 신고, 상태 변경, 삭제를 반영
+
+구성:
+- DeltaLog: 추가 전용 델타 로그 (JSON Lines, 항목마다 seq 증가)
+- ScamReportStore: 기본 색인 + 델타 로그 → 현재 ScamReportIndex 관리
+    * 워커: 주기적으로 새 델타만 읽어 색인 오버레이에 반영 (조회는 잠금 없음)
+    * 수집기(writer): 델타 기록 + 오버레이가 커지면 바이너리 스냅샷으로 컴팩션
+
+파일:
+- scam_db.json: 기본 데이터 (스냅샷이 없거나 오래됐을 때만 파싱, 이미 파싱한 데이터가 있으면 다시 읽지 않음)
+- scam_db.snapshot: 컴팩션된 기본 색인 (last_seq + 기본 데이터 sha256 포함)
+- scam_db.delta.jsonl: last_seq 이후 델타
+
+scam_db.json이 바뀌면(규칙 핫 리로드) 스냅샷의 기본 데이터 sha256이 맞지 않으므로
+스냅샷을 버리고 새 기본 데이터에서 색인을 다시 만든 뒤 로그에 남은 델타를 재생한다.
+(스냅샷에 이미 병합된 델타는 새 기본 데이터에 반영된 것으로 본다 - 다음 컴팩션이 스냅샷을 다시 씀)
+
+델타 기록과 컴팩션은 한 프로세스(수집기)에서만 수행한다.
+다른 프로세스는 로그가 교체된 것을 감지하면 스냅샷부터 다시 연다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .scam_index import ScamReportIndex, KIND_NAMES
+
+
+class DeltaLog:
+    """
+    추가 전용 델타 로그 (JSON Lines)
+
+    read_new()는 마지막으로 읽은 위치 이후의 완전한 줄만 반환한다.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._offset = 0
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._last_seq: Optional[int] = None
+
+    def reset(self) -> None:
+        """처음부터 다시 읽도록 위치 초기화"""
+        self._offset = 0
+        self._file_id = None
+
+    def _read_all(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def append(
+        self,
+        op: str,
+        kind: str,
+        record: Optional[Dict] = None,
+        number: Optional[str] = None,
+        fields: Optional[Dict] = None
+    ) -> Dict:
+        """
+        델타 1건 기록
+
+        Args:
+            op: "add" (신규/덮어쓰기) / "update" (필드 변경) / "remove" (삭제)
+            kind: "account" / "phone"
+            record: add 시 전체 레코드
+            number: update/remove 대상 번호
+            fields: update 시 변경할 필드 (예: {"status": "confirmed_scam"})
+
+        Returns:
+            기록된 항목 (seq 포함)
+        """
+        if kind not in KIND_NAMES:
+            raise ValueError(f"알 수 없는 종류: {kind}")
+        if op == "add":
+            if not record:
+                raise ValueError("add에는 record가 필요합니다")
+        elif op in ("update", "remove"):
+            if not number:
+                raise ValueError(f"{op}에는 number가 필요합니다")
+        else:
+            raise ValueError(f"알 수 없는 델타 op: {op}")
+
+        if self._last_seq is None:
+            self._last_seq = max((entry.get("seq", 0) for entry in self._read_all()), default=0)
+
+        entry: Dict[str, Any] = {"seq": self._last_seq + 1, "op": op, "kind": kind, "ts": time.time()}
+        if op == "add":
+            entry["record"] = record
+        else:
+            entry["number"] = number
+            if op == "update":
+                entry["fields"] = fields or {}
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._last_seq = entry["seq"]
+        return entry
+
+    def read_new(self) -> Tuple[List[Dict], bool]:
+        """
+        마지막 위치 이후 새 항목 읽기
+
+        Returns:
+            (새 항목 목록, 로그 교체 여부) - 교체되었으면 처음부터 읽은 결과
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            replaced = self._offset > 0
+            self.reset()
+            return [], replaced
+
+        file_id = (stat.st_dev, stat.st_ino)
+        replaced = False
+        if self._file_id is not None and (file_id != self._file_id or stat.st_size < self._offset):
+            # 컴팩션으로 로그가 다시 쓰였음
+            replaced = True
+            self._offset = 0
+        self._file_id = file_id
+
+        if stat.st_size <= self._offset:
+            return [], replaced
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(stat.st_size - self._offset)
+
+        # 기록 중인 마지막 줄(개행 없음)은 다음에 읽음
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return [], replaced
+        self._offset += end + 1
+        entries = [json.loads(line) for line in chunk[:end + 1].splitlines() if line.strip()]
+        return entries, replaced
+
+    def truncate_through(self, seq: int) -> List[Dict]:
+        """
+        seq 이하 항목을 제거하여 로그 재작성 (임시 파일 → 원자적 교체)
+
+        Returns:
+            남은 항목 (seq 초과)
+        """
+        remaining = [entry for entry in self._read_all() if entry.get("seq", 0) > seq]
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in remaining:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        # 자신이 쓴 교체는 '다른 프로세스의 컴팩션'으로 보지 않음
+        stat = os.stat(self.path)
+        self._file_id = (stat.st_dev, stat.st_ino)
+        self._offset = stat.st_size
+        return remaining
+
+
+class ScamReportStore:
+    """
+    사기 신고 색인 관리 (기본 스냅샷 + 델타 로그)
+
+    index()는 잠금 없이 현재 색인을 반환하며, poll_interval마다 한 스레드만
+    (비차단 잠금 획득에 성공한 경우) 새 델타를 읽어 색인에 반영한다.
+    """
+
+    def __init__(
+        self,
+        base_path: Union[str, Path],
+        snapshot_path: Union[str, Path],
+        delta_path: Union[str, Path],
+        poll_interval: float = 1.0,
+        compact_threshold: Optional[int] = None,
+        base_data: Optional[Dict] = None,
+        base_digest: Optional[str] = None
+    ):
+        """
+        Args:
+            base_path: 초기 JSON DB (scam_db.json)
+            snapshot_path: 바이너리 스냅샷 경로
+            delta_path: 델타 로그 경로
+            poll_interval: 델타 확인 주기 (초)
+            compact_threshold: append() 후 오버레이 항목이 이 수 이상이면 자동 컴팩션
+                               (None/0이면 자동 컴팩션 안 함. 델타를 기록하는 프로세스에서만
+                               동작하므로 읽기 전용 워커는 로그 교체를 감지해 다시 연다)
+            base_data: 이미 파싱한 base_path 내용 (규칙 스냅샷/아티팩트 - 주면 JSON을 다시 읽지 않음)
+            base_digest: base_data의 원본 파일 sha256 (규칙 스냅샷 digests - 없으면 base_path에서 계산)
+        """
+        self.base_path = Path(base_path)
+        self.snapshot_path = Path(snapshot_path)
+        self.log = DeltaLog(delta_path)
+        self.poll_interval = poll_interval
+        self.compact_threshold = compact_threshold
+        self.base_data = base_data
+        self.base_digest = base_digest
+
+        self._index: Optional[ScamReportIndex] = None
+        self._snapshot_id: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self._next_poll = 0.0
+        self.stats = {"applied": 0, "reloads": 0, "compactions": 0}
+
+    def index(self) -> ScamReportIndex:
+        """현재 색인 (조회 경로는 잠금 대기 없음)"""
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._open()
+                return self._index
+
+        now = time.monotonic()
+        if now >= self._next_poll and self._lock.acquire(blocking=False):
+            try:
+                self._next_poll = now + self.poll_interval
+                self._refresh_locked()
+            finally:
+                self._lock.release()
+        return self._index
+
+    def _current_snapshot_id(self) -> Optional[Tuple[int, int]]:
+        """스냅샷 파일 식별값 (inode, 수정 시각) - 없으면 None"""
+        try:
+            stat = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _read_base(self) -> Tuple[Optional[bytes], str]:
+        """기본 JSON 원문과 sha256 (base_data를 받았으면 원문은 None, 파일이 없으면 digest "")"""
+        raw = None
+        if self.base_data is None or self.base_digest is None:
+            try:
+                raw = self.base_path.read_bytes()
+            except FileNotFoundError:
+                return None, self.base_digest or ""
+        digest = self.base_digest if self.base_digest is not None else hashlib.sha256(raw).hexdigest()
+        return (None if self.base_data is not None else raw), digest
+
+    def _open(self) -> ScamReportIndex:
+        """스냅샷(없거나 기본 데이터가 바뀌었으면 JSON) 로드 후 그 이후 델타 재생"""
+        self._snapshot_id = self._current_snapshot_id()
+        raw, base_digest = self._read_base()
+        index = None
+        if self._snapshot_id is not None:
+            index = ScamReportIndex.from_snapshot(self.snapshot_path)
+            # 기본 데이터가 없으면 스냅샷이 유일한 기준
+            if base_digest and index.base_digest != base_digest:
+                print(f"[ScamStore] 스냅샷이 이전 {self.base_path.name} 기준 → 새 기본 데이터에서 색인 재생성")
+                index = None
+        if index is None:
+            if self.base_data is not None:
+                index = ScamReportIndex(self.base_data)
+            elif raw is not None:
+                index = ScamReportIndex(json.loads(raw))
+            else:
+                index = ScamReportIndex({"reported_accounts": {"data": []}, "reported_phones": {"data": []}})
+            index.base_digest = base_digest or None
+
+        self.log.reset()
+        entries, _ = self.log.read_new()
+        applied = self._apply(index, entries)
+        print(f"[ScamStore] 색인 로드: {len(index)}건 + 델타 {applied}건 (last_seq={index.last_seq})")
+        return index
+
+    def _apply(self, index: ScamReportIndex, entries: List[Dict]) -> int:
+        applied = 0
+        for entry in entries:
+            if entry.get("seq", 0) > index.last_seq:
+                index.apply_delta(entry)
+                applied += 1
+        self.stats["applied"] += applied
+        return applied
+
+    def _refresh_locked(self) -> int:
+        entries, replaced = self.log.read_new()
+        if replaced or self._current_snapshot_id() != self._snapshot_id:
+            # 다른 프로세스가 컴팩션함 → 새 스냅샷부터 다시 (교체 전까지는 기존 색인으로 조회)
+            self._index = self._open()
+            self.stats["reloads"] += 1
+            return 0
+
+        return self._apply(self._index, entries)
+
+    def refresh(self) -> int:
+        """새 델타 즉시 반영 (반영 건수 반환)"""
+        with self._lock:
+            if self._index is None:
+                self._index = self._open()
+                return 0
+            return self._refresh_locked()
+
+    def append(self, op: str, kind: str, **kwargs) -> Dict:
+        """
+        델타 기록 후 즉시 반영 (수집기용)
+
+        Args:
+            op: "add" / "update" / "remove"
+            kind: "account" / "phone"
+            **kwargs: record / number / fields (DeltaLog.append 참고)
+        """
+        entry = self.log.append(op, kind, **kwargs)
+        with self._lock:
+            if self._index is None:
+                self._index = self._open()
+            else:
+                self._refresh_locked()
+            if self.compact_threshold and self._index.overlay_size >= self.compact_threshold:
+                self._compact_locked()
+        return entry
+
+    def compact(self) -> None:
+        """오버레이를 기본 색인에 병합하여 새 스냅샷 저장"""
+        with self._lock:
+            if self._index is None:
+                self._index = self._open()
+            else:
+                self._refresh_locked()
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        index = self._index
+        start = time.perf_counter()
+        count = index.save_snapshot(self.snapshot_path)
+        remaining = self.log.truncate_through(index.last_seq)
+        compacted = ScamReportIndex.from_snapshot(self.snapshot_path)
+        self._snapshot_id = self._current_snapshot_id()
+        self._apply(compacted, remaining)
+        self._index = compacted
+        self.stats["compactions"] += 1
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"[ScamStore] 컴팩션 완료: {count}건, last_seq={index.last_seq}, {elapsed:.0f}ms")
@@ -0,0 +1,521 @@
+"""
+Scam Index - 사기 신고 식별자 색인
+계좌번호/전화번호 신고 이력을 정렬된 int64 배열로 색인하여 조회
+
+구조:
+- 식별자 키: 정규화된 숫자열 → int64 (숫자값 + 자릿수 + 종류)
+- 정렬된 array('q') 키 배열 + 레코드 번호 배열 → bisect 이진 탐색
+- Bloom filter: 신고되지 않은 번호(대부분의 경우)는 배열 탐색 없이 즉시 제외
+- 일괄 조회: 메시지 내 모든 식별자를 정렬 후 한 번에 조회
+- 델타 오버레이: 신규 신고/상태 변경/삭제를 색인 재생성 없이 반영
+- 바이너리 스냅샷: 배열을 그대로 저장/로드 (JSON 재파싱 없음, 레코드는 조회 시에만 파싱)
+
+외부 의존성 없음 (표준 라이브러리 array/bisect/mmap)
+"""
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+# 식별자 종류 (키 최하위 비트)
+KIND_ACCOUNT = 0
+KIND_PHONE = 1
+
+# 델타 로그의 종류 이름 / 레코드의 번호 필드
+KIND_NAMES = {"account": KIND_ACCOUNT, "phone": KIND_PHONE}
+NUMBER_FIELDS = {KIND_ACCOUNT: "account_number", KIND_PHONE: "phone_number"}
+
+# int64에 들어가는 최대 자릿수 (10^17 << 6 < 2^63)
+MAX_DIGITS = 17
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+_SEPARATOR_RE = re.compile(r'[-\s]')
+
+
+def normalize_identifier(value: str) -> str:
+    """식별자 정규화 (하이픈/공백 제거)"""
+    # 대부분은 숫자와 하이픈뿐 → 정규식 없이 처리
+    stripped = value.replace("-", "")
+    if stripped.isdigit():
+        return stripped
+    return _SEPARATOR_RE.sub('', value)
+
+
+def identifier_key(kind: int, normalized: str) -> Optional[int]:
+    """
+    정규화된 식별자 → int64 키
+
+    자릿수를 키에 포함하여 앞자리 0이 다른 번호("010..." vs "10...")를 구분한다.
+
+    Args:
+        kind: KIND_ACCOUNT / KIND_PHONE
+        normalized: 하이픈/공백을 제거한 식별자
+
+    Returns:
+        int64 키 (숫자가 아니거나 너무 길면 None)
+    """
+    length = len(normalized)
+    if not 0 < length <= MAX_DIGITS or not normalized.isdigit() or not normalized.isascii():
+        return None
+    return (int(normalized) << 6) | (length << 1) | kind
+
+
+class BloomFilter:
+    """
+    int64 키용 Bloom filter (bytearray 비트맵, double hashing)
+
+    대부분의 조회 대상(신고되지 않은 번호)은 첫 몇 비트에서 제외된다.
+    """
+
+    __slots__ = ("_bits", "_mask", "_hashes", "capacity", "count")
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        # 최적 비트 수 m = -n ln p / (ln 2)^2 → 2의 거듭제곱으로 올림
+        optimal_bits = -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        size = 1 << max(int(math.ceil(math.log2(optimal_bits))), 6)
+        self._bits = bytearray(size >> 3)
+        self._mask = size - 1
+        # 해시 수는 목표 오탐률 기준 (2의 거듭제곱 올림으로 남는 비트는 오탐률을 더 낮춤)
+        self._hashes = max(1, math.ceil(-math.log2(error_rate)))
+        self.count = 0
+
+    def add(self, key: int) -> None:
+        """키 추가"""
+        bits = self._bits
+        mask = self._mask
+        mixed = (key * _GOLDEN) & _MASK64
+        pos = mixed & mask
+        step = (mixed >> 32) | 1
+        for _ in range(self._hashes):
+            bits[pos >> 3] |= 1 << (pos & 7)
+            pos = (pos + step) & mask
+        self.count += 1
+
+    def __contains__(self, key: int) -> bool:
+        bits = self._bits
+        mask = self._mask
+        mixed = (key * _GOLDEN) & _MASK64
+        pos = mixed & mask
+        step = (mixed >> 32) | 1
+        for _ in range(self._hashes):
+            if not (bits[pos >> 3] >> (pos & 7)) & 1:
+                return False
+            pos = (pos + step) & mask
+        return True
+
+    def copy(self) -> "BloomFilter":
+        """비트맵 복사본"""
+        clone = BloomFilter.__new__(BloomFilter)
+        clone._bits = bytearray(self._bits)
+        clone._mask = self._mask
+        clone._hashes = self._hashes
+        clone.capacity = self.capacity
+        clone.count = self.count
+        return clone
+
+    def state(self) -> Dict[str, int]:
+        """스냅샷 헤더용 파라미터"""
+        return {"capacity": self.capacity, "hashes": self._hashes, "count": self.count}
+
+    @classmethod
+    def from_state(cls, bits: bytes, state: Dict[str, int]) -> "BloomFilter":
+        """스냅샷에서 복원"""
+        bloom = cls.__new__(cls)
+        bloom._bits = bytearray(bits)
+        bloom._mask = len(bits) * 8 - 1
+        bloom._hashes = state["hashes"]
+        bloom.capacity = state["capacity"]
+        bloom.count = state["count"]
+        return bloom
+
+
+# 오버레이 조회 결과 없음 표시
+_MISSING = object()
+
+# 스냅샷 파일 매직 (포맷 변경 시 마지막 바이트 증가)
+_SNAPSHOT_MAGIC = b"KATSCAM\x01"
+
+
+class _RecordBlob:
+    """스냅샷의 레코드 영역 (레코드별 JSON 바이트, 조회 시에만 파싱)"""
+
+    __slots__ = ("_blob", "_offsets")
+
+    def __init__(self, blob: "_MappedSlice", offsets: array):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, record_no: int) -> Dict:
+        return json.loads(self.raw(record_no))
+
+    def raw(self, record_no: int) -> bytes:
+        offsets = self._offsets
+        return self._blob[offsets[record_no]:offsets[record_no + 1]]
+
+
+def _overlay_key(kind: int, normalized: str) -> Union[int, Tuple[int, str]]:
+    """오버레이 dict 키 (숫자 키가 없으면 (종류, 식별자))"""
+    key = identifier_key(kind, normalized)
+    return (kind, normalized) if key is None else key
+
+
+class ScamReportIndex:
+    """
+    사기 신고 식별자 색인 (scam_db 스냅샷당 1회 생성)
+
+    계좌번호와 전화번호를 하나의 키 공간(종류 비트로 구분)에 담아
+    메시지 1건의 모든 식별자를 한 번의 일괄 조회로 처리한다.
+
+    델타(신규 신고/상태 변경/삭제)는 apply_delta()로 오버레이 dict에 반영하며,
+    조회는 오버레이 → Bloom filter → 정렬 배열 순으로 확인한다.
+    오버레이 갱신은 dict 항목 단위 교체라 조회 쪽에는 잠금이 필요 없다.
+    (apply_delta 호출은 한 스레드에서만 - ScamReportStore가 직렬화)
+    """
+
+    def __init__(self, db: Dict):
+        self.source = db
+        self.version = db.get("version")
+        self.status_definitions: Dict[str, Dict] = db.get("status_definitions", {})
+        self.last_seq = 0
+        # 기본 데이터(scam_db.json) sha256 - 스냅샷이 어떤 기본 데이터에서 만들어졌는지 (ScamReportStore가 설정)
+        self.base_digest: Optional[str] = None
+        self._overlay: Dict[Any, Optional[Dict]] = {}
+
+        # 레코드 목록 (키 배열의 값은 이 목록의 인덱스)
+        self.records: Union[List[Dict], _RecordBlob] = []
+        entries: Dict[int, int] = {}
+        # 숫자로 표현할 수 없는 식별자 (비정상 데이터) → 문자열 키 dict
+        self._fallback: Dict[Tuple[int, str], int] = {}
+
+        for kind, section in (
+            (KIND_ACCOUNT, "reported_accounts"),
+            (KIND_PHONE, "reported_phones"),
+        ):
+            field = NUMBER_FIELDS[kind]
+            for record in db.get(section, {}).get("data", []):
+                normalized = normalize_identifier(record[field])
+                record_no = len(self.records)
+                self.records.append(record)
+                key = identifier_key(kind, normalized)
+                if key is None:
+                    self._fallback.setdefault((kind, normalized), record_no)
+                else:
+                    # 같은 번호가 여러 번 있으면 기존 선형 검색처럼 첫 레코드 사용
+                    entries.setdefault(key, record_no)
+
+        sorted_keys = sorted(entries)
+        self._keys = array("q", sorted_keys)
+        self._record_nos: Optional[array] = array("q", (entries[key] for key in sorted_keys))
+
+        self._bloom = BloomFilter(len(sorted_keys))
+        for key in sorted_keys:
+            self._bloom.add(key)
+
+    def __len__(self) -> int:
+        """기본 색인 항목 수 (오버레이 제외)"""
+        return len(self._keys) + len(self._fallback)
+
+    @property
+    def overlay_size(self) -> int:
+        """아직 기본 색인에 병합되지 않은 델타 항목 수"""
+        return len(self._overlay)
+
+    def _find(self, key: int, lo: int = 0) -> Tuple[Optional[int], int]:
+        """키 이진 탐색 → (레코드 번호 또는 None, 탐색 위치)"""
+        keys = self._keys
+        pos = bisect_left(keys, key, lo)
+        if pos < len(keys) and keys[pos] == key:
+            record_nos = self._record_nos
+            # 스냅샷 색인은 레코드가 키 순서로 저장됨 (위치 == 레코드 번호)
+            return (pos if record_nos is None else record_nos[pos]), pos
+        return None, pos
+
+    def _raw_record(self, record_no: int) -> bytes:
+        """레코드 JSON 바이트 (스냅샷 저장용)"""
+        records = self.records
+        if isinstance(records, _RecordBlob):
+            return records.raw(record_no)
+        return json.dumps(records[record_no], ensure_ascii=False).encode("utf-8")
+
+    def lookup(self, kind: int, normalized: str) -> Optional[Dict]:
+        """
+        단건 조회
+
+        Args:
+            kind: KIND_ACCOUNT / KIND_PHONE
+            normalized: 정규화된 식별자
+
+        Returns:
+            신고 레코드 (없으면 None)
+        """
+        key = identifier_key(kind, normalized)
+        overlay = self._overlay
+        if overlay:
+            record = overlay.get((kind, normalized) if key is None else key, _MISSING)
+            if record is not _MISSING:
+                return record
+
+        if key is None:
+            record_no = self._fallback.get((kind, normalized))
+        elif key not in self._bloom:
+            return None
+        else:
+            record_no, _ = self._find(key)
+        return None if record_no is None else self.records[record_no]
+
+    def lookup_many(self, identifiers: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], Dict]:
+        """
+        일괄 조회 (Bloom filter 통과 키만 정렬 후 순차 이진 탐색)
+
+        Args:
+            identifiers: (종류, 정규화된 식별자) 목록
+
+        Returns:
+            {(종류, 식별자): 신고 레코드} - 신고된 식별자만 포함
+        """
+        found: Dict[Tuple[int, str], Dict] = {}
+        candidates = []
+        bloom = self._bloom
+        overlay = self._overlay
+        for ident in identifiers:
+            key = identifier_key(*ident)
+            if overlay:
+                record = overlay.get(ident if key is None else key, _MISSING)
+                if record is not _MISSING:
+                    if record is not None:
+                        found[ident] = record
+                    continue
+            if key is None:
+                record_no = self._fallback.get(ident)
+                if record_no is not None:
+                    found[ident] = self.records[record_no]
+            elif key in bloom:
+                candidates.append((key, ident))
+
+        # 정렬된 질의는 이전 위치부터 탐색 (탐색 범위가 점점 줄어듦)
+        lo = 0
+        for key, ident in sorted(candidates):
+            record_no, lo = self._find(key, lo)
+            if record_no is not None:
+                found[ident] = self.records[record_no]
+        return found
+
+    # ---------- 델타 반영 ----------
+
+    def apply_delta(self, entry: Dict) -> bool:
+        """
+        델타 1건을 오버레이에 반영 (기본 색인은 변경하지 않음)
+
+        Args:
+            entry: 델타 로그 항목
+                {"seq": 1, "op": "add", "kind": "account", "record": {...}}
+                {"seq": 2, "op": "update", "kind": "phone", "number": "...", "fields": {...}}
+                {"seq": 3, "op": "remove", "kind": "account", "number": "..."}
+
+        Returns:
+            반영 여부 (없는 번호의 update는 무시)
+        """
+        op = entry["op"]
+        kind = KIND_NAMES[entry["kind"]]
+        if op == "add":
+            record = dict(entry["record"])
+            number = record[NUMBER_FIELDS[kind]]
+        elif op in ("update", "remove"):
+            record = None
+            number = entry["number"]
+        else:
+            raise ValueError(f"알 수 없는 델타 op: {op}")
+
+        normalized = normalize_identifier(number)
+        if op == "update":
+            current = self.lookup(kind, normalized)
+            if current is None:
+                self.last_seq = max(self.last_seq, entry.get("seq", 0))
+                return False
+            # 기존 dict를 수정하지 않고 새 dict로 교체 (조회 중인 쪽은 이전 값을 그대로 봄)
+            record = dict(current)
+            record.update(entry.get("fields", {}))
+
+        self._overlay[_overlay_key(kind, normalized)] = record
+        self.last_seq = max(self.last_seq, entry.get("seq", 0))
+        return True
+
+    # ---------- 스냅샷 ----------
+
+    def _merged_entries(self) -> Iterator[Tuple[int, Any]]:
+        """기본 색인 + 오버레이 병합 결과 (키 순서, (키, 레코드 번호 또는 dict))"""
+        overlay = self._overlay
+        keys = self._keys
+        record_nos = self._record_nos
+
+        def base() -> Iterator[Tuple[int, Any]]:
+            for pos in range(len(keys)):
+                key = keys[pos]
+                if key not in overlay:
+                    yield key, (pos if record_nos is None else record_nos[pos])
+
+        updates = sorted(
+            (key, record) for key, record in overlay.items()
+            if isinstance(key, int) and record is not None
+        )
+        return heapq.merge(base(), updates, key=lambda entry: entry[0])
+
+    def save_snapshot(self, path: Union[str, Path]) -> int:
+        """
+        기본 색인 + 오버레이를 바이너리 스냅샷으로 저장 (임시 파일 → 원자적 교체)
+
+        Args:
+            path: 스냅샷 경로
+
+        Returns:
+            저장한 항목 수
+        """
+        keys = array("q")
+        offsets = array("q", [0])
+        chunks: List[bytes] = []
+        size = 0
+
+        def append_record(raw: bytes) -> None:
+            nonlocal size
+            chunks.append(raw)
+            size += len(raw)
+            offsets.append(size)
+
+        for key, value in self._merged_entries():
+            keys.append(key)
+            if isinstance(value, dict):
+                append_record(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+            else:
+                append_record(self._raw_record(value))
+
+        fallback = []
+        overlay = self._overlay
+        for (kind, normalized), record_no in self._fallback.items():
+            if (kind, normalized) not in overlay:
+                fallback.append([kind, normalized, len(offsets) - 1])
+                append_record(self._raw_record(record_no))
+        for okey, record in overlay.items():
+            if isinstance(okey, tuple) and record is not None:
+                fallback.append([okey[0], okey[1], len(offsets) - 1])
+                append_record(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+
+        # Bloom filter: 용량 안이면 기존 비트맵에 추가 키만 반영 (삭제 키는 오탐으로만 남음)
+        if self._bloom.capacity >= len(keys):
+            bloom = self._bloom.copy()
+            for key, record in overlay.items():
+                if isinstance(key, int) and record is not None:
+                    bloom.add(key)
+        else:
+            bloom = BloomFilter(len(keys) * 2)
+            for key in keys:
+                bloom.add(key)
+
+        sections = [keys.tobytes(), offsets.tobytes(), bytes(bloom._bits)]
+        header = json.dumps({
+            "version": self.version,
+            "last_seq": self.last_seq,
+            "base_digest": self.base_digest,
+            "status_definitions": self.status_definitions,
+            "byteorder": sys.byteorder,
+            "bloom": bloom.state(),
+            "fallback": fallback,
+            "sections": [len(section) for section in sections] + [size],
+        }, ensure_ascii=False).encode("utf-8")
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_SNAPSHOT_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for section in sections:
+                f.write(section)
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return len(keys) + len(fallback)
+
+    @classmethod
+    def from_snapshot(cls, path: Union[str, Path]) -> "ScamReportIndex":
+        """
+        바이너리 스냅샷 로드 (배열 복사 + 레코드 영역 mmap, 레코드별 파싱 없음)
+
+        Args:
+            path: 스냅샷 경로
+
+        Returns:
+            ScamReportIndex (오버레이 비어 있음, last_seq는 스냅샷 기준)
+        """
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if data[:len(_SNAPSHOT_MAGIC)] != _SNAPSHOT_MAGIC:
+            raise ValueError(f"사기 신고 스냅샷 형식이 아닙니다: {path}")
+        pos = len(_SNAPSHOT_MAGIC)
+        (header_len,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        header = json.loads(data[pos:pos + header_len])
+        pos += header_len
+
+        keys_len, offsets_len, bloom_len, blob_len = header["sections"]
+        keys = array("q")
+        keys.frombytes(data[pos:pos + keys_len])
+        pos += keys_len
+        offsets = array("q")
+        offsets.frombytes(data[pos:pos + offsets_len])
+        pos += offsets_len
+        if header["byteorder"] != sys.byteorder:
+            keys.byteswap()
+            offsets.byteswap()
+        bloom = BloomFilter.from_state(data[pos:pos + bloom_len], header["bloom"])
+        pos += bloom_len
+
+        # 레코드 영역은 복사하지 않고 mmap 구간으로 사용 (조회된 레코드만 읽음)
+        blob = _MappedSlice(data, pos, blob_len)
+
+        index = cls.__new__(cls)
+        index.source = None
+        index.version = header.get("version")
+        index.status_definitions = header.get("status_definitions", {})
+        index.last_seq = header.get("last_seq", 0)
+        index.base_digest = header.get("base_digest")
+        index._overlay = {}
+        index.records = _RecordBlob(blob, offsets)
+        index._fallback = {(kind, normalized): record_no for kind, normalized, record_no in header["fallback"]}
+        index._keys = keys
+        index._record_nos = None
+        index._bloom = bloom
+        return index
+
+
+class _MappedSlice:
+    """mmap의 일부 구간 (슬라이스 시 구간 기준 오프셋 사용)"""
+
+    __slots__ = ("_data", "_start", "_length")
+
+    def __init__(self, data: mmap.mmap, start: int, length: int):
+        self._data = data
+        self._start = start
+        self._length = length
+
+    def __getitem__(self, item: slice) -> bytes:
+        start = self._start
+        return self._data[start + item.start:start + item.stop]
@@ -0,0 +1,352 @@
+"""
+Stage Executor - 분석 단계 DAG 동시 실행기
+IncomingAgent처럼 여러 단계로 된 분석에서 서로 의존하지 않는 단계를 동시에 실행
+
+구성:
+- Stage: 이름 + 함수 + 의존 단계 + 시간 제한 + 실패 시 기본값
+- StageExecutor: 의존 관계가 풀린 단계부터 실행, 끝나는 순서대로 결과 반환
+    * blocking=True 단계: 공유 스레드 풀에서 실행 (DB/네트워크 I/O 대기 중 다른 단계 진행)
+    * blocking=False 단계: 호출 스레드(이벤트 루프)에서 바로 실행 (수 us짜리 메모리 연산)
+    * async 함수 단계: 비동기 실행기에서는 태스크로, 동기 실행기에서는 스레드 풀에서 실행
+
+부분 결과:
+- 시간 제한 초과/예외가 난 단계는 default 값으로 채우고 status에 기록
+  (required=True 단계의 예외는 그대로 전파)
+- 시간 초과된 스레드 작업은 중단할 수 없으므로 결과만 버린다
+
+단계 함수는 ctx(dict) 하나를 받는다. ctx에는 실행 입력과 완료된 의존 단계의
+결과(단계 이름 키)가 들어 있다.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+STAGE_WORKERS = int(os.getenv("KAT_STAGE_WORKERS", "8"))
+# blocking 단계 기본 시간 제한 (ms)
+STAGE_TIMEOUT_MS = int(os.getenv("KAT_STAGE_TIMEOUT_MS", "3000"))
+
+STATUS_OK = "ok"
+STATUS_SKIPPED = "skipped"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+
+
+class Stage:
+    """분석 단계 1개"""
+
+    __slots__ = ("name", "func", "depends_on", "timeout", "default", "blocking", "required", "enabled", "is_async")
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Dict[str, Any]], Any],
+        depends_on: Iterable[str] = (),
+        timeout: Optional[float] = None,
+        default: Any = None,
+        blocking: bool = False,
+        required: bool = False,
+        enabled: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ):
+        """
+        Args:
+            name: 단계 이름 (결과 키)
+            func: func(ctx) → 결과 (async 함수 가능)
+            depends_on: 먼저 끝나야 하는 단계 이름
+            timeout: 시간 제한 (초, None이면 blocking 단계만 STAGE_TIMEOUT_MS 적용)
+            default: 시간 초과/실패/건너뜀 시 결과
+            blocking: 스레드 풀에서 실행할지 여부 (I/O 대기 단계)
+            required: True면 예외를 부분 결과로 바꾸지 않고 전파
+            enabled: enabled(ctx)가 False면 실행하지 않고 default 사용
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        if timeout is None and blocking:
+            timeout = STAGE_TIMEOUT_MS / 1000
+        self.timeout = timeout
+        self.default = default
+        self.blocking = blocking
+        self.required = required
+        self.enabled = enabled
+        self.is_async = asyncio.iscoroutinefunction(func)
+
+
+class StageRun:
+    """실행 1회의 결과 (단계별 결과/상태/소요 시간)"""
+
+    def __init__(self):
+        self.results: Dict[str, Any] = {}
+        self.status: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self.elapsed_ms: Dict[str, float] = {}
+
+    @property
+    def partial(self) -> List[str]:
+        """시간 초과/실패로 기본값이 들어간 단계"""
+        return [name for name, status in self.status.items() if status in (STATUS_TIMEOUT, STATUS_ERROR)]
+
+    def summary(self) -> str:
+        """로그용 한 줄 요약"""
+        return ", ".join(
+            f"{name}={status}({self.elapsed_ms.get(name, 0.0):.1f}ms)" for name, status in self.status.items()
+        )
+
+
+def _run_coroutine(func: Callable, ctx: Dict[str, Any]) -> Any:
+    """동기 실행기에서 async 단계 실행 (스레드 풀 작업 안에서 새 이벤트 루프)"""
+    return asyncio.run(func(ctx))
+
+
+class StageExecutor:
+    """
+    단계 DAG 실행기
+
+    단계는 add()로 추가하며, 같은 이름으로 추가하면 기존 단계를 교체한다.
+    순환/미등록 의존은 add() 시점이 아니라 실행 전 검증에서 ValueError.
+    """
+
+    def __init__(self, stages: Iterable[Stage] = (), pool: Optional[ThreadPoolExecutor] = None):
+        self._stages: "OrderedDict[str, Stage]" = OrderedDict()
+        self._order: Optional[List[Stage]] = None
+        self._pool = pool
+        for stage in stages:
+            self.add(stage)
+
+    @property
+    def stages(self) -> List[Stage]:
+        return list(self._stages.values())
+
+    def add(self, stage: Stage) -> None:
+        """단계 추가 (같은 이름이면 교체)"""
+        self._stages[stage.name] = stage
+        self._order = None
+
+    def remove(self, name: str) -> None:
+        """단계 제거"""
+        del self._stages[name]
+        self._order = None
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        return self._pool or get_stage_pool()
+
+    def _ordered(self) -> List[Stage]:
+        """위상 정렬 (등록 순서 유지) - 순환/미등록 의존 검증"""
+        if self._order is not None:
+            return self._order
+
+        order: List[Stage] = []
+        placed = set()
+        remaining = list(self._stages.values())
+        for stage in remaining:
+            for dep in stage.depends_on:
+                if dep not in self._stages:
+                    raise ValueError(f"단계 '{stage.name}'의 의존 단계 '{dep}'가 없습니다")
+        while remaining:
+            ready = [stage for stage in remaining if all(dep in placed for dep in stage.depends_on)]
+            if not ready:
+                names = ", ".join(stage.name for stage in remaining)
+                raise ValueError(f"단계 의존 관계에 순환이 있습니다: {names}")
+            for stage in ready:
+                order.append(stage)
+                placed.add(stage.name)
+                remaining.remove(stage)
+        self._order = order
+        return order
+
+    # ---------- 공통 ----------
+
+    @staticmethod
+    def _record(
+        run: StageRun,
+        ctx: Dict[str, Any],
+        stage: Stage,
+        status: str,
+        result: Any,
+        start: float,
+        error: Optional[BaseException] = None
+    ) -> Tuple[str, Any]:
+        if error is not None:
+            if stage.required:
+                raise error
+            print(f"[StageExecutor] {stage.name} 실패 → 기본값 사용: {error!r}")
+            run.errors[stage.name] = str(error) or type(error).__name__
+        elif status == STATUS_TIMEOUT:
+            if stage.required:
+                raise TimeoutError(f"필수 단계 '{stage.name}' 시간 초과")
+            print(f"[StageExecutor] {stage.name} 시간 초과 ({stage.timeout}s) → 기본값 사용")
+            run.errors[stage.name] = "timeout"
+        if status != STATUS_OK:
+            result = stage.default
+        run.results[stage.name] = result
+        run.status[stage.name] = status
+        run.elapsed_ms[stage.name] = (time.perf_counter() - start) * 1000
+        ctx[stage.name] = result
+        return stage.name, result
+
+    @staticmethod
+    def _take_ready(waiting: List[Stage], run: StageRun) -> List[Stage]:
+        """의존 단계가 모두 끝난 단계를 꺼냄 (스레드 풀/async 단계 먼저)"""
+        status = run.status
+        offloaded, inline = [], []
+        for stage in waiting:
+            if all(dep in status for dep in stage.depends_on):
+                (offloaded if stage.blocking or stage.is_async else inline).append(stage)
+        if not offloaded and not inline:
+            return offloaded
+        for stage in offloaded + inline:
+            waiting.remove(stage)
+        # 스레드 풀 단계를 먼저 보내고 나서 인라인 단계를 실행해야 겹쳐서 진행됨
+        return offloaded + inline
+
+    # ---------- 동기 실행 ----------
+
+    def iter(self, context: Dict[str, Any], run: Optional[StageRun] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        단계 실행 (동기) - 끝나는 순서대로 (단계 이름, 결과) 반환
+
+        Args:
+            context: 단계 함수에 전달할 입력
+            run: 결과를 기록할 StageRun (상태/소요 시간 확인용)
+        """
+        run = run if run is not None else StageRun()
+        ctx = dict(context)
+        waiting = list(self._ordered())
+        running: Dict[Any, Tuple[Stage, float]] = {}
+
+        while waiting or running:
+            ready = self._take_ready(waiting, run)
+            for stage in ready:
+                start = time.perf_counter()
+                if stage.enabled is not None and not stage.enabled(ctx):
+                    yield self._record(run, ctx, stage, STATUS_SKIPPED, None, start)
+                elif stage.is_async:
+                    running[self.pool.submit(_run_coroutine, stage.func, dict(ctx))] = (stage, start)
+                elif stage.blocking:
+                    running[self.pool.submit(stage.func, dict(ctx))] = (stage, start)
+                else:
+                    try:
+                        result = stage.func(ctx)
+                    except Exception as e:
+                        yield self._record(run, ctx, stage, STATUS_ERROR, None, start, e)
+                    else:
+                        yield self._record(run, ctx, stage, STATUS_OK, result, start)
+
+            # 인라인 단계가 끝나서 새로 풀린 단계가 있을 수 있으므로 먼저 다시 확인
+            if ready:
+                continue
+            if not running:
+                break
+
+            now = time.perf_counter()
+            deadlines = [start + stage.timeout for stage, start in running.values() if stage.timeout is not None]
+            timeout = max(0.0, min(deadlines) - now) if deadlines else None
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage, start = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    yield self._record(run, ctx, stage, STATUS_ERROR, None, start, error)
+                else:
+                    yield self._record(run, ctx, stage, STATUS_OK, future.result(), start)
+
+            now = time.perf_counter()
+            for future, (stage, start) in list(running.items()):
+                if stage.timeout is not None and now - start >= stage.timeout:
+                    running.pop(future)
+                    future.cancel()
+                    yield self._record(run, ctx, stage, STATUS_TIMEOUT, None, start)
+
+    def run(self, context: Dict[str, Any]) -> StageRun:
+        """모든 단계 실행 (동기)"""
+        run = StageRun()
+        for _ in self.iter(context, run):
+            pass
+        return run
+
+    # ---------- 비동기 실행 ----------
+
+    async def iter_async(self, context: Dict[str, Any], run: Optional[StageRun] = None):
+        """
+        단계 실행 (비동기 제너레이터) - 끝나는 순서대로 (단계 이름, 결과) 반환
+
+        blocking 단계는 스레드 풀, async 단계는 태스크로 실행하므로
+        대기 중에도 이벤트 루프는 다른 요청을 처리한다.
+        """
+        run = run if run is not None else StageRun()
+        ctx = dict(context)
+        waiting = list(self._ordered())
+        running: Dict["asyncio.Future", Tuple[Stage, float]] = {}
+        loop = asyncio.get_running_loop()
+
+        try:
+            while waiting or running:
+                ready = self._take_ready(waiting, run)
+                for stage in ready:
+                    start = time.perf_counter()
+                    if stage.enabled is not None and not stage.enabled(ctx):
+                        yield self._record(run, ctx, stage, STATUS_SKIPPED, None, start)
+                    elif stage.is_async:
+                        running[asyncio.ensure_future(stage.func(dict(ctx)))] = (stage, start)
+                    elif stage.blocking:
+                        running[loop.run_in_executor(self.pool, stage.func, dict(ctx))] = (stage, start)
+                    else:
+                        try:
+                            result = stage.func(ctx)
+                        except Exception as e:
+                            yield self._record(run, ctx, stage, STATUS_ERROR, None, start, e)
+                        else:
+                            yield self._record(run, ctx, stage, STATUS_OK, result, start)
+
+                if ready:
+                    continue
+                if not running:
+                    break
+
+                now = time.perf_counter()
+                deadlines = [start + stage.timeout for stage, start in running.values() if stage.timeout is not None]
+                timeout = max(0.0, min(deadlines) - now) if deadlines else None
+                done, _ = await asyncio.wait(list(running), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for future in done:
+                    stage, start = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        yield self._record(run, ctx, stage, STATUS_ERROR, None, start, error)
+                    else:
+                        yield self._record(run, ctx, stage, STATUS_OK, future.result(), start)
+
+                now = time.perf_counter()
+                for future, (stage, start) in list(running.items()):
+                    if stage.timeout is not None and now - start >= stage.timeout:
+                        running.pop(future)
+                        future.cancel()
+                        yield self._record(run, ctx, stage, STATUS_TIMEOUT, None, start)
+        finally:
+            # 필수 단계 실패 등으로 중단되면 남은 태스크 정리
+            for future in running:
+                future.cancel()
+
+    async def run_async(self, context: Dict[str, Any]) -> StageRun:
+        """모든 단계 실행 (비동기)"""
+        run = StageRun()
+        async for _ in self.iter_async(context, run):
+            pass
+        return run
+
+
+# 공유 스레드 풀 (blocking 단계용)
+_stage_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_stage_pool() -> ThreadPoolExecutor:
+    """단계 실행용 스레드 풀 싱글톤"""
+    global _stage_pool
+    if _stage_pool is None:
+        _stage_pool = ThreadPoolExecutor(max_workers=STAGE_WORKERS, thread_name_prefix="kat-stage")
+    return _stage_pool
@@ -7,30 +7,112 @@ AI(Agent B)가 MCP 도구를 통해 호출하는 수신 메시지 분석 모듈
 - B: 공포/권위 악용형 (Targeting Fear & Authority)
 - C: 욕망/감정 자극형 (Targeting Desire & Emotion)
 """
-import json
 import re
-from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple, TYPE_CHECKING
 
+from .keyword_automaton import KeywordAutomaton
+from .result_cache import get_result_cache, text_key
+from .rule_snapshot import get_rule_snapshot, reload_rules
 
-# JSON 데이터 캐시
-_threat_cache: Optional[Dict] = None
+if TYPE_CHECKING:
+    from .message_features import MessageFeatures
 
 
 def _get_threat_data() -> Dict:
-    """threat_patterns.json 로드 (캐시 사용)"""
-    global _threat_cache
-    if _threat_cache is None:
-        json_path = Path(__file__).parent.parent / "data" / "threat_patterns.json"
-        with open(json_path, "r", encoding="utf-8") as f:
-            _threat_cache = json.load(f)
-    return _threat_cache
+    """threat_patterns.json 데이터 (현재 규칙 스냅샷)"""
+    return get_threat_engine().source
 
 
-def reload_threat_data() -> None:
-    """캐시 초기화 (패턴 파일 수정 시 호출)"""
-    global _threat_cache
-    _threat_cache = None
+class CompiledThreatPattern:
+    """컴파일된 단일 위협 패턴 (A-1, B-2 등)"""
+
+    __slots__ = (
+        "id", "category", "category_name_ko", "name_ko", "risk_score",
+        "keywords", "context_keywords", "url_indicators", "phone_indicators",
+    )
+
+    def __init__(self, pattern_id: str, pattern: Dict, cat_id: str, cat_info: Dict):
+        self.id = pattern_id
+        self.category = cat_id
+        self.category_name_ko = cat_info["name_ko"]
+        self.name_ko = pattern["name_ko"]
+        self.risk_score = pattern["risk_score"]
+        self.keywords = tuple(pattern.get("keywords", []))
+        self.context_keywords = tuple(pattern.get("context_keywords", []))
+        self.url_indicators = tuple(pattern.get("url_indicators", []))
+        self.phone_indicators = tuple(pattern.get("phone_indicators", []))
+
+
+class CompiledThreatEngine:
+    """
+    threat_patterns.json 컴파일 결과 (규칙 스냅샷당 1회 생성)
+
+    모든 패턴의 keywords / context_keywords / url_indicators / phone_indicators와
+    긴급성/안전 컨텍스트 키워드를 하나의 Aho-Corasick 오토마톤으로 묶어,
+    메시지를 한 번만 순회하고 패턴별 매칭은 히트 집합에서 계산한다.
+    """
+
+    def __init__(self, data: Dict):
+        self.source = data
+        self.version = data.get("version")
+
+        self.patterns = tuple(
+            CompiledThreatPattern(pattern_id, pattern, cat_id, cat_info)
+            for cat_id, cat_info in data["categories"].items()
+            for pattern_id, pattern in cat_info["patterns"].items()
+        )
+
+        scoring = data["scoring"]
+        self.multipliers: Dict[str, float] = scoring["multipliers"]
+        self.urgency_keywords = tuple(scoring["urgency_keywords"])
+        self.safe_contexts = tuple(
+            (tuple(safe_ctx["keywords"]), safe_ctx["factor"])
+            for safe_ctx in data["safe_patterns"]["safe_contexts"]
+        )
+        self.whitelist_domains = tuple(data.get("safe_patterns", {}).get("whitelist_domains", []))
+
+        exact_keywords = []
+        ignore_case_keywords = []
+        for pattern in self.patterns:
+            exact_keywords.extend(pattern.keywords)
+            exact_keywords.extend(pattern.context_keywords)
+            exact_keywords.extend(pattern.phone_indicators)
+            ignore_case_keywords.extend(pattern.url_indicators)
+        exact_keywords.extend(self.urgency_keywords)
+        for keywords, _factor in self.safe_contexts:
+            exact_keywords.extend(keywords)
+
+        self.automaton = KeywordAutomaton(exact_keywords, ignore_case=ignore_case_keywords)
+
+        # 키워드 → 해당 키워드를 가진 패턴 인덱스 (키워드 히트가 없는 패턴은 검사 생략)
+        keyword_index: Dict[str, List[int]] = {}
+        for index, pattern in enumerate(self.patterns):
+            for keyword in pattern.keywords:
+                keyword_index.setdefault(keyword, []).append(index)
+        self.keyword_index = {k: tuple(v) for k, v in keyword_index.items()}
+
+    def scan(self, text: str, lowered: Optional[str] = None) -> Tuple[Set[str], Set[str]]:
+        """메시지 1회 순회 → (키워드 히트, URL 인디케이터 히트)"""
+        return self.automaton.scan(text, lowered)
+
+    def candidate_patterns(self, hits: Set[str]) -> List[CompiledThreatPattern]:
+        """키워드가 1개 이상 히트한 패턴만 원래 순서대로 반환"""
+        keyword_index = self.keyword_index
+        indices = set()
+        for keyword in hits:
+            indices.update(keyword_index.get(keyword, ()))
+        patterns = self.patterns
+        return [patterns[i] for i in sorted(indices)]
+
+
+def get_threat_engine() -> CompiledThreatEngine:
+    """현재 규칙 스냅샷의 CompiledThreatEngine 반환 (리로드 시 스냅샷 단위로 교체)"""
+    return get_rule_snapshot().threat_engine
+
+
+def reload_threat_data() -> bool:
+    """규칙 파일 리로드 (컴파일/검증 후 원자적 교체, 실패 시 기존 규칙 유지)"""
+    return reload_rules(force=True)
 
 
 def get_all_categories() -> Dict[str, Any]:
@@ -78,12 +160,13 @@ def get_pattern_details(pattern_id: str) -> Optional[Dict]:
     return None
 
 
-def detect_threats(text: str) -> Dict[str, Any]:
+def detect_threats(text: str, features: Optional["MessageFeatures"] = None) -> Dict[str, Any]:
     """
     MCP Tool: 텍스트에서 위협 패턴 감지 (MECE 카테고리 기반)
 
     Args:
         text: 분석할 수신 메시지
+        features: 미리 추출한 메시지 특징 (없으면 내부에서 추출)
 
     Returns:
         {
@@ -94,26 +177,34 @@ def detect_threats(text: str) -> Dict[str, Any]:
             "matched_keywords": ["엄마", "폰 고장"]
         }
     """
-    data = _get_threat_data()
+    if features is None:
+        from .message_features import extract_message_features
+        features = extract_message_features(text)
+
+    engine = features.engine
+    data = engine.source
     matched_patterns = []
     all_matched_keywords = []
 
-    # 각 카테고리의 패턴 검사
-    for cat_id, cat_info in data["categories"].items():
-        for pattern_id, pattern in cat_info["patterns"].items():
-            match_result = _check_pattern_match(text, pattern)
-
-            if match_result["matched"]:
-                matched_patterns.append({
-                    "id": pattern_id,
-                    "category": cat_id,
-                    "category_name_ko": cat_info["name_ko"],
-                    "pattern_name_ko": pattern["name_ko"],
-                    "risk_score": pattern["risk_score"],
-                    "matched_keywords": match_result["keywords"],
-                    "match_strength": match_result["strength"]
-                })
-                all_matched_keywords.extend(match_result["keywords"])
+    # 메시지 1회 순회로 수집된 키워드 히트
+    hits = features.keyword_hits
+    url_hits = features.url_indicator_hits
+
+    # 키워드가 히트한 패턴만 검사 (히트 집합 기반)
+    for pattern in engine.candidate_patterns(hits):
+        match_result = _check_pattern_match(pattern, hits, url_hits)
+
+        if match_result["matched"]:
+            matched_patterns.append({
+                "id": pattern.id,
+                "category": pattern.category,
+                "category_name_ko": pattern.category_name_ko,
+                "pattern_name_ko": pattern.name_ko,
+                "risk_score": pattern.risk_score,
+                "matched_keywords": match_result["keywords"],
+                "match_strength": match_result["strength"]
+            })
+            all_matched_keywords.extend(match_result["keywords"])
 
     # 매칭 결과가 없으면
     if not matched_patterns:
@@ -134,7 +225,7 @@ def detect_threats(text: str) -> Dict[str, Any]:
     primary = matched_patterns[0]
 
     # 사기 확률 계산
-    scam_probability = _calculate_scam_probability(text, matched_patterns, data)
+    scam_probability = _calculate_scam_probability(matched_patterns, features)
 
     # 위험 레벨 결정
     risk_level = _get_risk_level(scam_probability, data)
@@ -150,28 +241,32 @@ def detect_threats(text: str) -> Dict[str, Any]:
     }
 
 
-def _check_pattern_match(text: str, pattern: Dict) -> Dict[str, Any]:
-    """패턴 매칭 체크"""
+def _check_pattern_match(
+    pattern: CompiledThreatPattern,
+    hits: Set[str],
+    url_hits: Set[str]
+) -> Dict[str, Any]:
+    """패턴 매칭 체크 (오토마톤 히트 집합 기반)"""
     matched_keywords = []
     strength = 0.0
 
     # 키워드 체크
-    keywords = pattern.get("keywords", [])
-    found_keywords = [k for k in keywords if k in text]
+    keywords = pattern.keywords
+    found_keywords = [k for k in keywords if k in hits]
 
     if not found_keywords:
         return {"matched": False, "keywords": [], "strength": 0}
 
     matched_keywords.extend(found_keywords)
     # 키워드 1개 이상 매칭되면 기본 0.3 + 추가 매칭에 따른 보너스
-    keyword_base = 0.3 if found_keywords else 0
+    keyword_base = 0.3
     keyword_bonus = min(len(found_keywords) / len(keywords), 0.5) * 0.4
     strength += keyword_base + keyword_bonus
 
     # 컨텍스트 키워드 체크
-    context_keywords = pattern.get("context_keywords", [])
+    context_keywords = pattern.context_keywords
+    found_context = [k for k in context_keywords if k in hits]
     if context_keywords:
-        found_context = [k for k in context_keywords if k in text]
         if found_context:
             matched_keywords.extend(found_context)
             # 컨텍스트 2개 이상이면 강한 매칭
@@ -181,28 +276,23 @@ def _check_pattern_match(text: str, pattern: Dict) -> Dict[str, Any]:
             # 컨텍스트 없이 키워드만 있으면 약한 매칭
             strength *= 0.5
 
-    # URL 인디케이터 체크 (B 카테고리)
-    url_indicators = pattern.get("url_indicators", [])
-    if url_indicators:
-        for indicator in url_indicators:
-            if indicator.lower() in text.lower():
-                matched_keywords.append(f"[URL:{indicator}]")
-                strength += 0.2
-                break
+    # URL 인디케이터 체크 (B 카테고리, 대소문자 무시)
+    for indicator in pattern.url_indicators:
+        if indicator in url_hits:
+            matched_keywords.append(f"[URL:{indicator}]")
+            strength += 0.2
+            break
 
     # 전화번호 인디케이터 체크 (B-3)
-    phone_indicators = pattern.get("phone_indicators", [])
-    if phone_indicators:
-        for indicator in phone_indicators:
-            if indicator in text:
-                matched_keywords.append(f"[Phone:{indicator}]")
-                strength += 0.15
-                break
+    for indicator in pattern.phone_indicators:
+        if indicator in hits:
+            matched_keywords.append(f"[Phone:{indicator}]")
+            strength += 0.15
+            break
 
     # 최소 강도 이상이면 매칭 (키워드 + 컨텍스트 2개 이상이면 매칭)
-    has_keyword = len(found_keywords) >= 1
-    has_context = len([k for k in context_keywords if k in text]) >= 2 if context_keywords else True
-    matched = has_keyword and has_context and strength >= 0.3
+    has_context = len(found_context) >= 2 if context_keywords else True
+    matched = has_context and strength >= 0.3
 
     return {
         "matched": matched,
@@ -211,11 +301,18 @@ def _check_pattern_match(text: str, pattern: Dict) -> Dict[str, Any]:
     }
 
 
-def _calculate_scam_probability(
-    text: str,
-    matched_patterns: List[Dict],
-    data: Dict
-) -> int:
+# 점수 보정 / URL 추출용 정규식 (모듈 로드 시 1회 컴파일)
+_URL_PRESENT_RE = re.compile(r'https?://|bit\.ly|tinyurl|url\.kr|han\.gl', re.IGNORECASE)
+_PHONE_PRESENT_RE = re.compile(r'02-\d{3,4}-\d{4}|0\d{2}-\d{3,4}-\d{4}|1[56]\d{2}-\d{4}|070-\d{4}-\d{4}')
+_MONEY_PRESENT_RE = re.compile(r'\d{2,3}만\s?원|\d{1,3},?\d{3},?\d{3}원|\$\d+|USD|JPY')
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+_SHORT_URL_RE = re.compile(
+    r'(?:bit\.ly|tinyurl\.com|goo\.gl|t\.co|is\.gd|v\.gd|me2\.do|vo\.la|url\.kr|han\.gl)/[\w]+',
+    re.IGNORECASE
+)
+
+
+def _calculate_scam_probability(matched_patterns: List[Dict], features: "MessageFeatures") -> int:
     """사기 확률(%) 계산"""
     if not matched_patterns:
         return 0
@@ -228,33 +325,34 @@ def _calculate_scam_probability(
     score = base_score * primary_strength
 
     # 멀티플라이어 적용
-    multipliers = data["scoring"]["multipliers"]
+    engine = features.engine
+    hits = features.keyword_hits
+    multipliers = engine.multipliers
 
     # 여러 패턴 매칭
     if len(matched_patterns) > 1:
         score *= multipliers["multiple_patterns"]
 
     # URL 포함
-    if re.search(r'https?://|bit\.ly|tinyurl|url\.kr|han\.gl', text, re.IGNORECASE):
+    if features.has_url:
         score *= multipliers["url_present"]
 
     # 전화번호 포함
-    if re.search(r'02-\d{3,4}-\d{4}|0\d{2}-\d{3,4}-\d{4}|1[56]\d{2}-\d{4}|070-\d{4}-\d{4}', text):
+    if features.has_phone:
         score *= multipliers["phone_number_present"]
 
     # 금액 포함
-    if re.search(r'\d{2,3}만\s?원|\d{1,3},?\d{3},?\d{3}원|\$\d+|USD|JPY', text):
+    if features.money_amounts:
         score *= multipliers["money_amount_present"]
 
     # 긴급성 언어
-    urgency_keywords = data["scoring"]["urgency_keywords"]
-    if any(uk in text for uk in urgency_keywords):
+    if any(uk in hits for uk in engine.urgency_keywords):
         score *= multipliers["urgency_language"]
 
     # 안전 컨텍스트 체크 (false positive 방지)
-    for safe_ctx in data["safe_patterns"]["safe_contexts"]:
-        if any(k in text for k in safe_ctx["keywords"]):
-            score *= safe_ctx["factor"]
+    for keywords, factor in engine.safe_contexts:
+        if any(k in hits for k in keywords):
+            score *= factor
 
     # 0-100 범위로 제한
     return min(int(score), 100)
@@ -276,29 +374,28 @@ def _get_risk_level(probability: int, data: Dict) -> str:
         return "critical"
 
 
-def detect_urls(text: str) -> Dict[str, Any]:
+def detect_urls(text: str, features: Optional["MessageFeatures"] = None) -> Dict[str, Any]:
     """
     MCP Tool: 텍스트에서 URL 감지 및 안전성 분석
 
     Args:
         text: 분석할 텍스트
+        features: 미리 추출한 메시지 특징 (없으면 URL만 추출)
 
     Returns:
         URL 분석 결과
     """
-    data = _get_threat_data()
-
-    # URL 추출 정규식
-    url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-    urls_found = re.findall(url_pattern, text)
+    if features is None:
+        urls, short_urls = _extract_urls(text)
+        safe_domains = get_threat_engine().whitelist_domains
+    else:
+        urls, short_urls = features.urls, features.short_urls
+        safe_domains = features.engine.whitelist_domains
 
-    # 단축 URL 패턴도 추가
-    short_url_pattern = r'(?:bit\.ly|tinyurl\.com|goo\.gl|t\.co|is\.gd|v\.gd|me2\.do|vo\.la|url\.kr|han\.gl)/[\w]+'
-    short_urls = re.findall(short_url_pattern, text, re.IGNORECASE)
+    # 단축 URL은 https:// 접두어를 붙여 추가
+    urls_found = list(urls)
     urls_found.extend([f"https://{u}" for u in short_urls])
 
-    safe_domains = data.get("safe_patterns", {}).get("whitelist_domains", [])
-
     suspicious_urls = []
     safe_urls = []
 
@@ -318,22 +415,43 @@ def detect_urls(text: str) -> Dict[str, Any]:
     }
 
 
-def analyze_incoming_message(text: str) -> Dict[str, Any]:
+def _extract_urls(text: str) -> Tuple[List[str], List[str]]:
+    """텍스트에서 (일반 URL 목록, 단축 URL 목록) 추출"""
+    # 두 패턴 모두 '/'를 포함해야 매칭
+    if "/" not in text:
+        return [], []
+    return _URL_RE.findall(text), _SHORT_URL_RE.findall(text)
+
+
+def analyze_incoming_message(text: str, features: Optional["MessageFeatures"] = None) -> Dict[str, Any]:
     """
     MCP Tool: 수신 메시지 종합 분석 (원스톱)
     모든 분석을 한 번에 수행
 
     Args:
         text: 분석할 수신 메시지
+        features: 미리 추출한 메시지 특징 (없으면 내부에서 1회 추출)
 
     Returns:
         종합 분석 결과 (scam_probability % 포함)
     """
+    engine = features.engine if features is not None else get_threat_engine()
+    return get_result_cache("analyze_incoming_message").get_or_compute(
+        engine, text_key(text), lambda: _analyze_incoming_message(text, features)
+    )
+
+
+def _analyze_incoming_message(text: str, features: Optional["MessageFeatures"]) -> Dict[str, Any]:
+    """analyze_incoming_message() 본체 (캐시 미적중 시 실행)"""
+    if features is None:
+        from .message_features import extract_message_features
+        features = extract_message_features(text)
+
     # 1. 위협 패턴 감지
-    threats = detect_threats(text)
+    threats = detect_threats(text, features)
 
     # 2. URL 분석
-    urls = detect_urls(text)
+    urls = detect_urls(text, features)
 
     # URL이 있으면 확률 조정
     if urls["has_suspicious_url"] and threats["scam_probability"] > 0:
@@ -343,7 +461,7 @@ def analyze_incoming_message(text: str) -> Dict[str, Any]:
         )
 
     # 3. 응답 템플릿 가져오기
-    data = _get_threat_data()
+    data = features.engine.source
     risk_level = threats["risk_level"]
     response_template = data["response_templates"].get(risk_level, data["response_templates"]["safe"])
 
@@ -1,6 +1,40 @@
 """
 LLM module - Kanana LLM 관리
+
+kanana 모듈(.env 로드, openai 클라이언트)은 처음 접근할 때 import한다.
 """
-from .kanana import KananaLLM, LLMManager
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .kanana import KananaLLM, LLMManager, AsyncKananaLLM, AsyncLLMManager, LLMResponseCache, get_llm_cache
+    from .scheduler import LLMScheduler, LLMLoadShed, LLMSlotTimeout, get_llm_scheduler
+
+__all__ = [
+    "KananaLLM",
+    "LLMManager",
+    "AsyncKananaLLM",
+    "AsyncLLMManager",
+    "LLMResponseCache",
+    "get_llm_cache",
+    "LLMScheduler",
+    "LLMLoadShed",
+    "LLMSlotTimeout",
+    "get_llm_scheduler",
+]
+
+_LAZY_ATTRS = {name: ".kanana" for name in __all__}
+_LAZY_ATTRS.update({name: ".scheduler" for name in ("LLMScheduler", "LLMLoadShed", "LLMSlotTimeout", "get_llm_scheduler")})
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["KananaLLM", "LLMManager"]
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
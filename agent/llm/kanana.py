@@ -8,12 +8,30 @@ LLM 인스턴스를 딕셔너리로 관리하는 Singleton 패턴
 - 확장성: 새 모델 타입 추가 용이
 - API 방식: Kanana-2-30b OpenAI 호환 API 사용 (Tool Call 지원)
 - Vision: API 호출 방식 (Kanana-1.5-v-3b)
+- Async: AsyncKananaLLM (AsyncOpenAI) - FastAPI 핸들러에서 이벤트 루프를 막지 않음
+  * 공유 연결 풀 + 동시 호출 수 제한 (세마포어)
+- 응답 캐시: 같은 프롬프트는 LLM 재호출 없이 응답 (메모리 LRU + SQLite, 재시작/워커 간 공유)
+- 전송 계층: 호출별 기한, 멱등 호출(analyze) jitter 재시도, 엔드포인트별 회로 차단,
+  복제본 헤징 (KANANA_LLM_REPLICAS) - 엔드포인트 장애 시 규칙 분석으로 바로 대체
+- 초기화: 서버 시작 시 백그라운드 워밍업 (warm_up_llms), 실패한 인스턴스는 지수 백오프로 재초기화,
+  모델 ID는 프로세스 단위로 캐시 → 요청 경로에서 모델 목록 조회(models.list)를 하지 않음
+- 단일 호출 분석 (analyze_structured): 도구 결과를 프롬프트에 미리 넣고 JSON 판정 1회 요청,
+  Tool Call 반복에서 한 턴에 여러 도구를 요청하면 동시에 실행
 """
-from typing import Dict, Optional, Callable, Any, List
+from typing import Dict, Optional, Callable, Any, List, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
 import re
 import json
 import os
+import random
 import base64
+import sqlite3
+import threading
+import time
+import unicodedata
+import weakref
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -32,186 +50,776 @@ VISION_API_KEY = os.getenv("KANANA_VISION_API_KEY") or os.getenv("OPENAI_API_KEY
 VISION_API_BASE = os.getenv("KANANA_VISION_BASE_URL") or os.getenv("OPENAI_API_BASE")
 VISION_MODEL = os.getenv("KANANA_VISION_MODEL", "kanana-1.5-v-3b")
 
+# 비동기 클라이언트 설정 (워커 1개당)
+LLM_MAX_CONCURRENCY = int(os.getenv("KANANA_LLM_MAX_CONCURRENCY", "64"))    # 동시 LLM 호출 수
+LLM_MAX_CONNECTIONS = int(os.getenv("KANANA_LLM_MAX_CONNECTIONS", "100"))   # 연결 풀 크기
+LLM_TIMEOUT = float(os.getenv("KANANA_LLM_TIMEOUT", "30"))                  # 요청 타임아웃 (초)
+
+# 전송 계층 설정 - 엔드포인트 장애 시 요청이 쌓이지 않도록 채팅 서버 타임아웃(30초)보다 먼저 포기
+LLM_CONNECT_TIMEOUT = float(os.getenv("KANANA_LLM_CONNECT_TIMEOUT", "3"))       # 연결 타임아웃 (초)
+LLM_CLASSIFY_DEADLINE = float(os.getenv("KANANA_LLM_CLASSIFY_DEADLINE", "8"))   # analyze() 기한 (재시도 포함, 초)
+LLM_DEADLINE = float(os.getenv("KANANA_LLM_DEADLINE", "25"))                    # Tool Call 분석 전체 기한 (초)
+LLM_RETRIES = int(os.getenv("KANANA_LLM_RETRIES", "2"))                         # 멱등 호출(analyze) 재시도 횟수
+LLM_RETRY_BASE = float(os.getenv("KANANA_LLM_RETRY_BASE_MS", "100")) / 1000     # 재시도 대기 (지수 백오프 + jitter)
+LLM_RETRY_MAX = float(os.getenv("KANANA_LLM_RETRY_MAX_MS", "1000")) / 1000
+LLM_BREAKER_FAILURES = int(os.getenv("KANANA_LLM_BREAKER_FAILURES", "5"))       # 연속 실패 → 회로 차단
+LLM_BREAKER_COOLDOWN = float(os.getenv("KANANA_LLM_BREAKER_COOLDOWN", "15"))    # 차단 유지 (초) → 이후 시험 요청 1건
+LLM_REPLICAS = [u.strip() for u in os.getenv("KANANA_LLM_REPLICAS", "").split(",") if u.strip()]  # 추가 복제본 base URL
+LLM_HEDGE_DELAY = float(os.getenv("KANANA_LLM_HEDGE_DELAY_MS", "500")) / 1000   # 응답 지연 시 다음 복제본에 중복 요청 (0: 끔)
+
+# 단일 호출 분석 설정
+LLM_JSON_MODE = os.getenv("KANANA_LLM_JSON_MODE", "on") != "off"              # response_format=json_object로 JSON 출력 제한
+LLM_JSON_MAX_TOKENS = int(os.getenv("KANANA_LLM_JSON_MAX_TOKENS", "384"))     # JSON 판정 최대 토큰
+
+# 초기화 설정
+LLM_MODEL = os.getenv("KANANA_LLM_MODEL")                                       # 지정 시 모델 목록 조회 생략
+LLM_INIT_RETRY_BASE = float(os.getenv("KANANA_LLM_INIT_RETRY_BASE", "1"))       # 초기화 실패 → 재시도 대기 (지수 백오프, 초)
+LLM_INIT_RETRY_MAX = float(os.getenv("KANANA_LLM_INIT_RETRY_MAX", "60"))
+LLM_WARMUP_MODELS = [  # 서버 시작 시 워밍업할 모델 (off: 워밍업 안 함)
+    m.strip() for m in os.getenv("KANANA_LLM_WARMUP", "instruct,vision").split(",") if m.strip() and m.strip() != "off"
+]
+
+# 응답 캐시 설정 (KANANA_LLM_CACHE=off 이면 비활성)
+LLM_CACHE_PATH = os.getenv("KANANA_LLM_CACHE", str(Path(__file__).parent.parent / "data" / "llm_cache.db"))
+LLM_CACHE_TTL = float(os.getenv("KANANA_LLM_CACHE_TTL", "86400"))             # 보관 기간 (초)
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("KANANA_LLM_CACHE_MEMORY", "4096"))  # 메모리 LRU 항목 수
+LLM_CACHE_DISK_ENTRIES = int(os.getenv("KANANA_LLM_CACHE_MAX_ROWS", "100000"))  # SQLite 최대 행 수
+
+
+def normalize_prompt(text: str) -> str:
+    """캐시 키용 프롬프트 정규화 (유니코드 NFC + 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class LLMResponseCache:
+    """
+    LLM 응답 캐시 (2단계)
 
-class KananaLLM:
-    """Kanana LLM Wrapper - API 방식"""
+    키: sha256(model_id, sha256(system_prompt), 정규화된 사용자 프롬프트, temperature)
+
+    - 메모리 tier: LRU (memory_entries개), 프로세스 내 조회 ~us
+    - SQLite tier: WAL 파일 DB, 재시작/여러 워커 간 공유
+      * TTL이 지난 항목은 조회 시 무시, trim_every회 저장마다 삭제
+      * max_entries 초과 시 오래 저장된 순으로 삭제
+    """
 
-    def __init__(self, model_type: str = "instruct"):
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: float = LLM_CACHE_TTL,
+        memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+        max_entries: int = LLM_CACHE_DISK_ENTRIES,
+        trim_every: int = 256
+    ):
         """
-        Initialize Kanana LLM
         Args:
-            model_type: "instruct" for general chat with tool call, "vision" for OCR
+            path: SQLite 파일 경로 (None이면 메모리 tier만 사용)
+            ttl_seconds: 항목 보관 기간 (초)
+            memory_entries: 메모리 LRU 최대 항목 수
+            max_entries: SQLite 최대 행 수
+            trim_every: 저장 N회마다 만료/초과 행 정리
         """
-        self.model_type = model_type
-        self.client = None
-        self.model_id = None
-        self.is_vision = model_type == "vision"
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.trim_every = trim_every
+
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._puts = 0
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "puts": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "expired": 0,
+        }
 
-        if self.is_vision:
-            # Vision API 클라이언트
-            print(f"[KananaLLM] Vision API 초기화 중...")
+        if self.path is not None:
             try:
-                from openai import OpenAI
-                self.client = OpenAI(
-                    api_key=VISION_API_KEY,
-                    base_url=VISION_API_BASE,
-                )
-                self.model_id = VISION_MODEL
-                print(f"[KananaLLM] Vision API 초기화 성공!")
-            except Exception as e:
-                print(f"[KananaLLM] Vision API 초기화 실패: {e}")
-        else:
-            # LLM API 클라이언트 (Kanana-2-30b)
-            print(f"[KananaLLM] LLM API 초기화 중 (Kanana-2-30b)...")
+                self._connect()
+            except sqlite3.Error as e:
+                print(f"[LLMCache] SQLite 캐시 열기 실패, 메모리만 사용: {e}")
+                self.path = None
+
+    # ---------- 키 ----------
+
+    @staticmethod
+    def make_key(model_id: str, system_prompt: str, prompt: str, temperature: float) -> str:
+        """캐시 키 생성"""
+        system_hash = hashlib.sha256((system_prompt or "").encode("utf-8")).hexdigest()
+        payload = json.dumps(
+            [model_id, system_hash, normalize_prompt(prompt), round(float(temperature), 4)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ---------- SQLite ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    expires REAL NOT NULL
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS ix_llm_cache_created ON llm_cache (created);
+            """)
+            self._local.conn = conn
+        return conn
+
+    # ---------- 조회 / 저장 ----------
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시 조회 (메모리 → SQLite 순, 없으면 None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+                self.stats["expired"] += 1
+
+        if self.path is not None:
+            try:
+                row = self._connect().execute(
+                    "SELECT response, expires FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[LLMCache] 조회 실패: {e}")
+                row = None
+            if row is not None and row[1] > now:
+                with self._lock:
+                    self.stats["disk_hits"] += 1
+                    self._remember(key, row[0], row[1])
+                return row[0]
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, response: str) -> None:
+        """응답 저장 (두 tier 모두)"""
+        now = time.time()
+        expires = now + self.ttl_seconds
+        with self._lock:
+            self.stats["puts"] += 1
+            self._remember(key, response, expires)
+            self._puts += 1
+            trim = self._puts % self.trim_every == 0
+
+        if self.path is not None:
             try:
-                from openai import OpenAI
-                self.client = OpenAI(
-                    api_key=LLM_API_KEY,
-                    base_url=LLM_API_BASE,
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)",
+                    (key, response, now, expires),
                 )
-                # 모델 ID 자동 감지
-                models = self.client.models.list()
-                if models.data:
-                    self.model_id = models.data[0].id
-                    print(f"[KananaLLM] LLM API 초기화 성공! Model: {self.model_id}")
-                else:
-                    print(f"[KananaLLM] 모델 목록이 비어있음")
-            except Exception as e:
-                print(f"[KananaLLM] LLM API 초기화 실패: {e}")
+                if trim:
+                    self.trim(now)
+            except sqlite3.Error as e:
+                print(f"[LLMCache] 저장 실패: {e}")
+
+    def _remember(self, key: str, response: str, expires: float) -> None:
+        """메모리 LRU에 추가 (잠금 안에서 호출)"""
+        self._memory[key] = (response, expires)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["memory_evictions"] += 1
+
+    def trim(self, now: Optional[float] = None) -> int:
+        """
+        SQLite tier 정리 (만료 삭제 + 최대 행 수 초과분 삭제)
 
-    def is_ready(self) -> bool:
-        """API 클라이언트가 준비되었는지 확인"""
-        return self.client is not None and self.model_id is not None
+        Returns:
+            삭제된 행 수
+        """
+        if self.path is None:
+            return 0
+        now = time.time() if now is None else now
+        conn = self._connect()
+        deleted = conn.execute("DELETE FROM llm_cache WHERE expires <= ?", (now,)).rowcount
+        (count,) = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        if count > self.max_entries:
+            deleted += conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY created LIMIT ?
+                )
+                """,
+                (count - self.max_entries,),
+            ).rowcount
+        with self._lock:
+            self.stats["disk_evictions"] += deleted
+        return deleted
+
+    def clear(self) -> None:
+        """전체 삭제 (테스트용)"""
+        with self._lock:
+            self._memory.clear()
+        if self.path is not None:
+            self._connect().execute("DELETE FROM llm_cache")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """히트/미스/삭제 카운터 + 히트율"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_size"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """LLM 응답 캐시 (싱글톤, KANANA_LLM_CACHE=off면 None)"""
+    global _llm_cache
+    if LLM_CACHE_PATH.lower() in ("off", "0", "false", "none"):
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                path = None if LLM_CACHE_PATH == ":memory:" else LLM_CACHE_PATH
+                _llm_cache = LLMResponseCache(path)
+    return _llm_cache
 
-    def analyze(self, text: str, system_prompt: str = None) -> str:
-        """일반 텍스트 분석 (API 방식)"""
-        if not self.is_ready():
-            return "Kanana Analysis: API not ready (Fallback)"
 
-        if system_prompt is None:
-            system_prompt = "당신은 카카오에서 개발된 친절한 AI입니다."
+# ==================== 전송 계층 (기한 / 재시도 / 회로 차단 / 헤징) ====================
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model_id,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": text}
-                ],
-                temperature=0.1,
-                max_tokens=512
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"Kanana Analysis Error: {str(e)}"
+class LLMUnavailableError(RuntimeError):
+    """모든 엔드포인트가 회로 차단 중 (호출하지 않음 → 호출자는 규칙 분석으로 대체)"""
 
-    def analyze_with_tools(
+
+class LLMDeadlineExceeded(TimeoutError):
+    """호출 기한 초과"""
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """재시도/회로 차단 대상 오류 (타임아웃, 연결 실패, 408/429/5xx) - 그 외 4xx는 요청 문제이므로 제외"""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    try:
+        from openai import APIConnectionError  # APITimeoutError 포함
+    except ImportError:
+        return False
+    return isinstance(exc, APIConnectionError)
+
+
+class CircuitBreaker:
+    """
+    엔드포인트별 회로 차단기
+
+    closed → (연속 실패 failure_threshold회) → open: 호출하지 않고 바로 거절
+    open → (cooldown 경과) → half_open: 시험 요청 1건만 허용 → 성공 closed / 실패 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
         self,
-        user_message: str,
-        system_prompt: str,
-        tools: Dict[str, Callable[..., Any]],
-        max_iterations: int = 3
-    ) -> Dict[str, Any]:
-        """
-        OpenAI Tool Call 방식으로 도구를 호출하며 분석
+        name: str,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        cooldown: float = LLM_BREAKER_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.stats = {"opened": 0, "rejected": 0}
+
+    def available(self) -> bool:
+        """요청을 보낼 수 있는 상태인지 (상태 변경 없음)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                return self._clock() - self._opened_at >= self.cooldown
+            return not self._probing
+
+    def allow(self) -> bool:
+        """요청 허용 여부 (차단 시간이 지났으면 시험 요청 1건 허용)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self._clock() - self._opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.stats["rejected"] += 1
+            return False
 
-        Args:
-            user_message: 사용자 메시지
-            system_prompt: 시스템 프롬프트
-            tools: 사용 가능한 도구들 {"tool_name": callable}
-            max_iterations: 최대 반복 횟수
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"[CircuitBreaker] {self.name} 복구 → closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+                self.stats["opened"] += 1
+                print(f"[CircuitBreaker] {self.name} 차단 (연속 실패 {self.failures}회) → "
+                      f"{self.cooldown:.0f}초 동안 규칙 분석만 사용")
+
+    def release(self) -> None:
+        """결과 없이 취소된 시험 요청 반납 (헤징에서 진 요청 등)"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, **self.stats}
+
+
+class _Endpoint:
+    """복제본 1개 (OpenAI 호환 클라이언트 + 회로 차단기)"""
+
+    def __init__(self, base_url: Optional[str], client, breaker: CircuitBreaker):
+        self.base_url = base_url
+        self.client = client
+        self.breaker = breaker
+
+
+class _TransportBase:
+    """
+    동기/비동기 전송 계층 공통
+
+    - 기한(deadline): 호출 전체(재시도/헤징 포함)의 절대 시각 (time.monotonic 기준),
+      시도마다 남은 시간을 요청 타임아웃으로 사용
+    - 재시도: 멱등 호출(analyze)만, 일시적 오류일 때 지수 백오프 + full jitter
+    - 회로 차단: 엔드포인트별, 모두 차단되면 LLMUnavailableError (호출하지 않음)
+    - 헤징: 복제본이 2개 이상이고 멱등 호출일 때, hedge_delay 안에 응답이 없거나 실패하면
+      다음 복제본에 같은 요청 → 먼저 온 응답 사용
+    """
 
-        Returns:
-            최종 분석 결과 딕셔너리
-        """
-        if not self.is_ready():
-            return {
-                "risk_level": "LOW",
-                "detected_pii": [],
-                "reasons": ["API not ready"],
-                "is_secret_recommended": False,
-                "recommended_action": "전송"
-            }
+    def __init__(
+        self,
+        endpoints: List[_Endpoint],
+        timeout: float = LLM_TIMEOUT,
+        retries: int = LLM_RETRIES,
+        retry_base: float = LLM_RETRY_BASE,
+        retry_max: float = LLM_RETRY_MAX,
+        hedge_delay: float = LLM_HEDGE_DELAY
+    ):
+        self.endpoints = endpoints
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.hedge_delay = hedge_delay
+        self.stats = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "failures": 0,
+            "deadline_exceeded": 0,
+            "rejected": 0,
+        }
 
-        # OpenAI 형식의 도구 정의
-        tool_definitions = self._build_tool_definitions(tools)
+    def available(self) -> bool:
+        """요청을 보낼 수 있는 엔드포인트가 있는지"""
+        return any(endpoint.breaker.available() for endpoint in self.endpoints)
 
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message}
-        ]
+    def _hedging(self, idempotent: bool) -> bool:
+        return idempotent and self.hedge_delay > 0 and len(self.endpoints) > 1
 
-        try:
-            for iteration in range(max_iterations):
-                # API 호출
-                response = self.client.chat.completions.create(
-                    model=self.model_id,
-                    messages=messages,
-                    tools=tool_definitions if tool_definitions else None,
-                    tool_choice="auto" if tool_definitions else None,
-                    temperature=0.1,
-                    max_tokens=1024
-                )
+    def _next_endpoint(self, tried: List[_Endpoint]) -> Optional[_Endpoint]:
+        for endpoint in self.endpoints:
+            if endpoint not in tried and endpoint.breaker.allow():
+                return endpoint
+        return None
 
-                assistant_message = response.choices[0].message
+    def _has_spare(self, tried: List[_Endpoint]) -> bool:
+        return any(endpoint not in tried and endpoint.breaker.available() for endpoint in self.endpoints)
+
+    def _pick(self) -> _Endpoint:
+        endpoint = self._next_endpoint([])
+        if endpoint is None:
+            self.stats["rejected"] += 1
+            raise LLMUnavailableError("모든 LLM 엔드포인트 회로 차단 중")
+        return endpoint
+
+    def _attempt_timeout(self, deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self.stats["deadline_exceeded"] += 1
+            raise LLMDeadlineExceeded("LLM 호출 기한 초과")
+        return min(self.timeout, remaining)
+
+    def _backoff(self, retry: int, deadline: float) -> Optional[float]:
+        """retry번째 재시도 전 대기 시간 (기한 안에 못 끝나면 None)"""
+        delay = random.uniform(0, min(self.retry_max, self.retry_base * (2 ** retry)))
+        if time.monotonic() + delay >= deadline:
+            return None
+        self.stats["retries"] += 1
+        return delay
 
-                # Tool call이 있는 경우
-                if assistant_message.tool_calls:
-                    messages.append(assistant_message)
+    def _record(self, endpoint: _Endpoint, exc: BaseException) -> None:
+        # 엔드포인트가 응답한 요청 오류(4xx)는 정상 동작으로 본다
+        if _is_transient(exc):
+            endpoint.breaker.record_failure()
+        else:
+            endpoint.breaker.record_success()
 
-                    for tool_call in assistant_message.tool_calls:
-                        tool_name = tool_call.function.name
-                        try:
-                            tool_args = json.loads(tool_call.function.arguments)
-                        except json.JSONDecodeError:
-                            tool_args = {}
-
-                        # 도구 실행
-                        if tool_name in tools:
-                            try:
-                                tool_result = tools[tool_name](**tool_args)
-                                result_str = json.dumps(tool_result, ensure_ascii=False)
-                            except Exception as e:
-                                result_str = f"Error: {str(e)}"
-                        else:
-                            result_str = f"Unknown tool: {tool_name}"
-
-                        # 도구 결과 추가
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": result_str
-                        })
-                else:
-                    # 최종 응답
-                    content = assistant_message.content or ""
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "available": self.available(),
+            "endpoints": [
+                {"base_url": endpoint.base_url, **endpoint.breaker.get_stats()}
+                for endpoint in self.endpoints
+            ],
+        }
 
-                    # JSON 파싱 시도
-                    result = self._parse_response(content)
-                    if result:
-                        return result
 
-                    # JSON이 없으면 내용 기반으로 결과 생성
-                    return self._extract_result_from_text(content, user_message)
+class LLMTransport(_TransportBase):
+    """동기 전송 계층 (KananaLLM) - 헤징은 스레드로 병렬 요청, 진 요청은 타임아웃까지 두고 결과만 버림"""
 
-            # max_iterations 초과
-            return {
-                "risk_level": "LOW",
-                "detected_pii": [],
-                "reasons": ["분석 완료 (max iterations)"],
-                "is_secret_recommended": False,
-                "recommended_action": "전송"
-            }
+    def __init__(self, endpoints: List[_Endpoint], **options):
+        super().__init__(endpoints, **options)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def create(self, deadline: float, idempotent: bool = False, **kwargs):
+        """
+        chat.completions.create
+
+        Args:
+            deadline: 호출 기한 (time.monotonic 기준 절대 시각)
+            idempotent: 재시도/헤징 허용 여부
+            **kwargs: chat.completions.create 인자
 
+        Raises:
+            LLMUnavailableError: 모든 엔드포인트 회로 차단 중
+            LLMDeadlineExceeded: 기한 초과
+        """
+        self.stats["calls"] += 1
+        attempts = 1 + (self.retries if idempotent else 0)
+        last_error: Optional[BaseException] = None
+        for attempt in range(attempts):
+            if attempt:
+                delay = self._backoff(attempt - 1, deadline)
+                if delay is None:
+                    break
+                time.sleep(delay)
+            try:
+                if self._hedging(idempotent):
+                    return self._call_hedged(deadline, kwargs)
+                return self._call(self._pick(), deadline, kwargs)
+            except LLMUnavailableError:
+                raise
+            except Exception as e:
+                if not _is_transient(e):
+                    raise
+                last_error = e
+        self.stats["failures"] += 1
+        raise last_error or LLMDeadlineExceeded("LLM 호출 기한 초과")
+
+    def _call(self, endpoint: _Endpoint, deadline: float, kwargs: Dict[str, Any]):
+        timeout = self._attempt_timeout(deadline)
+        self.stats["attempts"] += 1
+        try:
+            response = endpoint.client.chat.completions.create(timeout=timeout, **kwargs)
         except Exception as e:
-            print(f"[KananaLLM] analyze_with_tools 오류: {e}")
-            return {
-                "risk_level": "LOW",
-                "detected_pii": [],
-                "reasons": [f"분석 오류: {str(e)}"],
-                "is_secret_recommended": False,
-                "recommended_action": "전송"
-            }
+            self._record(endpoint, e)
+            raise
+        endpoint.breaker.record_success()
+        return response
+
+    def _call_hedged(self, deadline: float, kwargs: Dict[str, Any]):
+        import concurrent.futures
+
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=max(4, 2 * len(self.endpoints)), thread_name_prefix="kanana-hedge"
+                    )
+
+        first = self._pick()
+        tried = [first]
+        futures = {self._executor.submit(self._call, first, deadline, kwargs): first}
+        last_error: Optional[BaseException] = None
+        while futures:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            wait_for = min(self.hedge_delay, remaining) if self._has_spare(tried) else remaining
+            done, _ = concurrent.futures.wait(futures, timeout=wait_for, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                endpoint = futures.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if endpoint is not first:
+                    self.stats["hedge_wins"] += 1
+                return response
+            # 응답 지연 또는 실패 → 다음 복제본에 같은 요청
+            endpoint = self._next_endpoint(tried)
+            if endpoint is not None:
+                tried.append(endpoint)
+                self.stats["hedged"] += 1
+                futures[self._executor.submit(self._call, endpoint, deadline, kwargs)] = endpoint
+        if futures:
+            self.stats["deadline_exceeded"] += 1
+            raise LLMDeadlineExceeded("LLM 호출 기한 초과")
+        raise last_error or LLMDeadlineExceeded("LLM 호출 기한 초과")
+
+
+class AsyncLLMTransport(_TransportBase):
+    """비동기 전송 계층 (AsyncKananaLLM) - 기한은 asyncio.wait_for로 강제, 헤징에서 진 요청은 취소"""
+
+    async def create(self, deadline: float, idempotent: bool = False, **kwargs):
+        """chat.completions.create (LLMTransport.create의 비동기 버전)"""
+        self.stats["calls"] += 1
+        attempts = 1 + (self.retries if idempotent else 0)
+        last_error: Optional[BaseException] = None
+        for attempt in range(attempts):
+            if attempt:
+                delay = self._backoff(attempt - 1, deadline)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+            try:
+                if self._hedging(idempotent):
+                    return await self._call_hedged(deadline, kwargs)
+                return await self._call(self._pick(), deadline, kwargs)
+            except LLMUnavailableError:
+                raise
+            except Exception as e:
+                if not _is_transient(e):
+                    raise
+                last_error = e
+        self.stats["failures"] += 1
+        raise last_error or LLMDeadlineExceeded("LLM 호출 기한 초과")
+
+    async def _call(self, endpoint: _Endpoint, deadline: float, kwargs: Dict[str, Any]):
+        timeout = self._attempt_timeout(deadline)
+        self.stats["attempts"] += 1
+        try:
+            response = await asyncio.wait_for(
+                endpoint.client.chat.completions.create(timeout=timeout, **kwargs), timeout
+            )
+        except asyncio.CancelledError:
+            endpoint.breaker.release()
+            raise
+        except asyncio.TimeoutError as e:
+            endpoint.breaker.record_failure()
+            self.stats["deadline_exceeded"] += 1
+            raise LLMDeadlineExceeded(f"LLM 응답 없음 ({timeout:.1f}초)") from e
+        except Exception as e:
+            self._record(endpoint, e)
+            raise
+        endpoint.breaker.record_success()
+        return response
+
+    async def _call_hedged(self, deadline: float, kwargs: Dict[str, Any]):
+        first = self._pick()
+        tried = [first]
+        tasks = {asyncio.ensure_future(self._call(first, deadline, kwargs)): first}
+        last_error: Optional[BaseException] = None
+        try:
+            while tasks:
+                wait_for = self.hedge_delay if self._has_spare(tried) else None
+                done, _ = await asyncio.wait(tasks, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    endpoint = tasks.pop(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    if endpoint is not first:
+                        self.stats["hedge_wins"] += 1
+                    return task.result()
+                endpoint = self._next_endpoint(tried)
+                if endpoint is not None:
+                    tried.append(endpoint)
+                    self.stats["hedged"] += 1
+                    tasks[asyncio.ensure_future(self._call(endpoint, deadline, kwargs))] = endpoint
+        finally:
+            for task in tasks:
+                task.cancel()
+        raise last_error or LLMDeadlineExceeded("LLM 호출 기한 초과")
+
+
+def _build_endpoints(
+    base_urls: List[Optional[str]],
+    api_key: Optional[str],
+    asynchronous: bool,
+    http_client=None,
+    timeout: float = LLM_TIMEOUT,
+    failure_threshold: int = LLM_BREAKER_FAILURES,
+    cooldown: float = LLM_BREAKER_COOLDOWN
+) -> List[_Endpoint]:
+    """
+    복제본별 OpenAI 호환 클라이언트 생성
+
+    라이브러리 기본값(타임아웃 10분, 내부 재시도 2회) 대신 전송 계층이 타임아웃/재시도를 관리한다.
+    비동기 클라이언트는 http_client(연결 풀)를 공유한다.
+    """
+    import httpx
+    from openai import AsyncOpenAI, OpenAI
+
+    client_class = AsyncOpenAI if asynchronous else OpenAI
+    client_timeout = httpx.Timeout(timeout, connect=min(LLM_CONNECT_TIMEOUT, timeout))
+    endpoints = []
+    for i, base_url in enumerate(base_urls):
+        client = client_class(
+            api_key=api_key or "EMPTY",
+            base_url=base_url,
+            timeout=client_timeout,
+            max_retries=0,
+            http_client=http_client,
+        )
+        name = base_url or f"endpoint-{i}"
+        endpoints.append(_Endpoint(base_url, client, CircuitBreaker(name, failure_threshold, cooldown)))
+    return endpoints
+
+
+def _split_transport_options(options: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """생성자 옵션 → (회로 차단기 옵션, 전송 계층 옵션)"""
+    breaker_options = {key: options.pop(key) for key in ("failure_threshold", "cooldown") if key in options}
+    return breaker_options, options
+
+
+# base URL → 모델 ID (프로세스 단위, 동기/비동기 인스턴스와 재초기화가 공유)
+_model_ids: Dict[str, str] = {}
+
+
+def _cached_model_id(base_url: Optional[str]) -> Optional[str]:
+    return LLM_MODEL or _model_ids.get(str(base_url))
+
+
+def _remember_model_id(base_url: Optional[str], model_id: str) -> None:
+    _model_ids[str(base_url)] = model_id
+
+
+class _KananaInitMixin:
+    """동기/비동기 Kanana 클라이언트 공통: 초기화 실패 기록 + 재초기화 백오프"""
+
+    def _reset_init_state(self) -> None:
+        self.init_failures = 0
+        self.init_error: Optional[str] = None
+        self.next_init_at = 0.0
+        self.initializing = False
+
+    def _record_init(self, error: Optional[BaseException] = None) -> bool:
+        """초기화 결과 기록 - 실패하면 다음 재시도 시각을 지수 백오프(jitter)로 정함"""
+        self.initializing = False
+        if self.is_ready():
+            self.init_failures = 0
+            self.init_error = None
+            return True
+        self.init_failures += 1
+        self.init_error = str(error) if error is not None else "모델 목록이 비어있음"
+        delay = min(LLM_INIT_RETRY_BASE * 2 ** (self.init_failures - 1), LLM_INIT_RETRY_MAX)
+        self.next_init_at = time.monotonic() + delay * random.uniform(0.5, 1.0)
+        return False
+
+    def init_due(self) -> bool:
+        """재초기화할 차례인지 (준비 안 됨 + 진행 중 아님 + 백오프 경과)"""
+        return not self.is_ready() and not self.initializing and time.monotonic() >= self.next_init_at
+
+    def get_init_status(self) -> Dict[str, Any]:
+        """준비 상태 (헬스체크용)"""
+        status = {
+            "ready": self.is_ready(),
+            "model_id": self.model_id,
+            "initializing": self.initializing,
+            "failures": self.init_failures,
+        }
+        if not status["ready"] and not self.initializing:
+            status["last_error"] = self.init_error
+            status["retry_in_s"] = round(max(0.0, self.next_init_at - time.monotonic()), 1)
+        return status
+
+
+class _KananaResponseMixin:
+    """동기/비동기 Kanana 클라이언트 공통: 도구 정의 변환, 도구 호출 파싱, 응답 파싱"""
+
+    @staticmethod
+    def _fallback_result(reason: str) -> Dict[str, Any]:
+        return {
+            "risk_level": "LOW",
+            "detected_pii": [],
+            "reasons": [reason],
+            "is_secret_recommended": False,
+            "recommended_action": "전송"
+        }
+
+    @staticmethod
+    def _structured_request(system_prompt: str, user_message: str) -> Dict[str, Any]:
+        """단일 호출 JSON 판정 요청 인자 (도구 없음, JSON 모드면 response_format으로 출력 제한)"""
+        request = {
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            "temperature": 0.1,
+            "max_tokens": LLM_JSON_MAX_TOKENS,
+        }
+        if LLM_JSON_MODE:
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    @staticmethod
+    def _parse_tool_calls(tool_calls) -> List[Tuple[Any, str, Dict[str, Any]]]:
+        """assistant 메시지의 tool_calls → [(tool_call, 도구 이름, 인자)]"""
+        parsed = []
+        for tool_call in tool_calls:
+            try:
+                tool_args = json.loads(tool_call.function.arguments)
+            except json.JSONDecodeError:
+                tool_args = {}
+            parsed.append((tool_call, tool_call.function.name, tool_args))
+        return parsed
+
+    @staticmethod
+    def _tool_messages(parsed: List[Tuple[Any, str, Dict[str, Any]]], results: List[str]) -> List[dict]:
+        """도구 실행 결과 → tool 메시지 (요청 순서대로)"""
+        return [
+            {"role": "tool", "tool_call_id": tool_call.id, "content": result_str}
+            for (tool_call, _, _), result_str in zip(parsed, results)
+        ]
 
     def _build_tool_definitions(self, tools: Dict[str, Callable]) -> List[dict]:
         """도구 정의를 OpenAI 형식으로 변환"""
@@ -312,6 +920,231 @@ class KananaLLM:
             "recommended_action": "시크릿 전송 권장" if is_secret else "전송"
         }
 
+
+class KananaLLM(_KananaInitMixin, _KananaResponseMixin):
+    """Kanana LLM Wrapper - API 방식"""
+
+    def __init__(
+        self,
+        model_type: str = "instruct",
+        base_urls: Optional[List[str]] = None,
+        http_client=None,
+        initialize: bool = True,
+        **transport_options
+    ):
+        """
+        Initialize Kanana LLM
+        Args:
+            model_type: "instruct" for general chat with tool call, "vision" for OCR
+            base_urls: API base URL 목록 (기본: KANANA_LLM_BASE_URL + KANANA_LLM_REPLICAS, 첫 번째가 주 엔드포인트)
+            http_client: 직접 지정할 httpx.Client (테스트용)
+            initialize: False면 클라이언트 생성/모델 ID 확인을 initialize() 호출 시점으로 미룸 (워밍업용)
+            **transport_options: 전송 계층 설정 (timeout, retries, hedge_delay, failure_threshold, cooldown 등)
+        """
+        self.model_type = model_type
+        self.client = None
+        self.transport: Optional[LLMTransport] = None
+        self.model_id = None
+        self.is_vision = model_type == "vision"
+        # 응답 캐시 (analyze 전용, 같은 프롬프트 재호출 방지)
+        self.cache = get_llm_cache()
+        self._base_urls = base_urls
+        self._http_client = http_client
+        self._tool_executor = None
+        self._tool_executor_lock = threading.Lock()
+        self._breaker_options, self._transport_options = _split_transport_options(transport_options)
+        self._reset_init_state()
+        if initialize:
+            self.initialize()
+
+    def initialize(self) -> bool:
+        """
+        클라이언트 생성 + 모델 ID 확인 (실패 시 재호출 가능 - LLMManager가 백오프로 재시도)
+
+        모델 ID는 캐시(_model_ids / KANANA_LLM_MODEL)에 있으면 목록 조회 없이 사용한다.
+        """
+        self.initializing = True
+        name = "Vision API" if self.is_vision else "LLM API"
+        print(f"[KananaLLM] {name} 초기화 중{'' if self.is_vision else ' (Kanana-2-30b)'}...")
+        try:
+            if self.transport is None:
+                if self.is_vision:
+                    base_urls, api_key = self._base_urls or [VISION_API_BASE], VISION_API_KEY
+                else:
+                    base_urls, api_key = self._base_urls or [LLM_API_BASE] + LLM_REPLICAS, LLM_API_KEY
+                endpoints = _build_endpoints(
+                    base_urls, api_key, asynchronous=False,
+                    http_client=self._http_client, **self._breaker_options
+                )
+                self.transport = LLMTransport(endpoints, **self._transport_options)
+                self.client = endpoints[0].client
+
+            if self.is_vision:
+                self.model_id = VISION_MODEL
+                print(f"[KananaLLM] Vision API 초기화 성공!")
+                return self._record_init()
+
+            # 모델 ID 자동 감지 (주 엔드포인트 - 복제본은 같은 모델을 서빙)
+            base_url = self.transport.endpoints[0].base_url
+            model_id = _cached_model_id(base_url)
+            if model_id is None:
+                models = self.client.models.list()
+                if models.data:
+                    model_id = models.data[0].id
+                    _remember_model_id(base_url, model_id)
+            self.model_id = model_id
+            if model_id is None:
+                print(f"[KananaLLM] 모델 목록이 비어있음")
+            else:
+                print(f"[KananaLLM] LLM API 초기화 성공! Model: {self.model_id} (엔드포인트 {len(self.transport.endpoints)}개)")
+            return self._record_init()
+        except Exception as e:
+            print(f"[KananaLLM] {name} 초기화 실패: {e}")
+            return self._record_init(e)
+
+    def is_ready(self) -> bool:
+        """API 클라이언트가 준비되었는지 확인"""
+        return self.client is not None and self.model_id is not None
+
+    def is_available(self) -> bool:
+        """지금 호출할 수 있는지 (준비됨 + 회로 차단 중이 아님) - False면 규칙 분석으로 대체"""
+        return self.is_ready() and self.transport.available()
+
+    def analyze(self, text: str, system_prompt: str = None, timeout: Optional[float] = None) -> str:
+        """
+        일반 텍스트 분석 (API 방식)
+
+        멱등 호출이므로 일시적 오류는 기한(timeout, 기본 KANANA_LLM_CLASSIFY_DEADLINE) 안에서
+        재시도하고, 복제본이 있으면 헤징한다.
+        """
+        if not self.is_ready():
+            return "Kanana Analysis: API not ready (Fallback)"
+
+        if system_prompt is None:
+            system_prompt = "당신은 카카오에서 개발된 친절한 AI입니다."
+
+        temperature = 0.1
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.model_id, system_prompt, text, temperature)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            response = self.transport.create(
+                deadline=time.monotonic() + (timeout or LLM_CLASSIFY_DEADLINE),
+                idempotent=True,
+                model=self.model_id,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text}
+                ],
+                temperature=temperature,
+                max_tokens=512
+            )
+            content = response.choices[0].message.content
+            if cache_key is not None and content is not None:
+                self.cache.put(cache_key, content)
+            return content
+        except Exception as e:
+            return f"Kanana Analysis Error: {str(e)}"
+
+    def analyze_with_tools(
+        self,
+        user_message: str,
+        system_prompt: str,
+        tools: Dict[str, Callable[..., Any]],
+        max_iterations: int = 3
+    ) -> Dict[str, Any]:
+        """
+        OpenAI Tool Call 방식으로 도구를 호출하며 분석
+
+        Args:
+            user_message: 사용자 메시지
+            system_prompt: 시스템 프롬프트
+            tools: 사용 가능한 도구들 {"tool_name": callable}
+            max_iterations: 최대 반복 횟수
+
+        Returns:
+            최종 분석 결과 딕셔너리
+        """
+        if not self.is_ready():
+            return {
+                "risk_level": "LOW",
+                "detected_pii": [],
+                "reasons": ["API not ready"],
+                "is_secret_recommended": False,
+                "recommended_action": "전송"
+            }
+
+        # OpenAI 형식의 도구 정의
+        tool_definitions = self._build_tool_definitions(tools)
+
+        def call_tool(tool_name: str, tool_args: Dict[str, Any]) -> str:
+            if tool_name not in tools:
+                return f"Unknown tool: {tool_name}"
+            try:
+                return json.dumps(tools[tool_name](**tool_args), ensure_ascii=False)
+            except Exception as e:
+                return f"Error: {str(e)}"
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+
+        deadline = time.monotonic() + LLM_DEADLINE
+        try:
+            for iteration in range(max_iterations):
+                # API 호출
+                response = self.transport.create(
+                    deadline=deadline,
+                    model=self.model_id,
+                    messages=messages,
+                    tools=tool_definitions if tool_definitions else None,
+                    tool_choice="auto" if tool_definitions else None,
+                    temperature=0.1,
+                    max_tokens=1024
+                )
+
+                assistant_message = response.choices[0].message
+
+                # Tool call이 있는 경우 (한 턴에 여러 개면 동시에 실행)
+                if assistant_message.tool_calls:
+                    messages.append(assistant_message)
+                    messages.extend(self._run_tool_calls(assistant_message.tool_calls, call_tool, "KananaLLM"))
+                else:
+                    # 최종 응답
+                    content = assistant_message.content or ""
+
+                    # JSON 파싱 시도
+                    result = self._parse_response(content)
+                    if result:
+                        return result
+
+                    # JSON이 없으면 내용 기반으로 결과 생성
+                    return self._extract_result_from_text(content, user_message)
+
+            # max_iterations 초과
+            return {
+                "risk_level": "LOW",
+                "detected_pii": [],
+                "reasons": ["분석 완료 (max iterations)"],
+                "is_secret_recommended": False,
+                "recommended_action": "전송"
+            }
+
+        except Exception as e:
+            print(f"[KananaLLM] analyze_with_tools 오류: {e}")
+            return {
+                "risk_level": "LOW",
+                "detected_pii": [],
+                "reasons": [f"분석 오류: {str(e)}"],
+                "is_secret_recommended": False,
+                "recommended_action": "전송"
+            }
+
     def analyze_with_mcp(
         self,
         user_message: str,
@@ -349,17 +1182,25 @@ class KananaLLM:
         mcp_client = get_mcp_client()
         tool_definitions = mcp_client.get_openai_tools_schema()
 
+        def call_tool(tool_name: str, tool_args: Dict[str, Any]) -> str:
+            # MCP 클라이언트를 통해 도구 호출
+            result_str = json.dumps(mcp_client.call_tool(tool_name, tool_args), ensure_ascii=False)
+            print(f"[KananaLLM+MCP] Tool Result: {result_str[:200]}...")
+            return result_str
+
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_message}
         ]
 
+        deadline = time.monotonic() + LLM_DEADLINE
         try:
             for iteration in range(max_iterations):
                 print(f"[KananaLLM+MCP] Iteration {iteration + 1}/{max_iterations}")
 
                 # API 호출
-                response = self.client.chat.completions.create(
+                response = self.transport.create(
+                    deadline=deadline,
                     model=self.model_id,
                     messages=messages,
                     tools=tool_definitions if tool_definitions else None,
@@ -370,31 +1211,10 @@ class KananaLLM:
 
                 assistant_message = response.choices[0].message
 
-                # Tool call이 있는 경우 - MCP를 통해 도구 호출
+                # Tool call이 있는 경우 - MCP를 통해 도구 호출 (한 턴에 여러 개면 동시에 실행)
                 if assistant_message.tool_calls:
                     messages.append(assistant_message)
-
-                    for tool_call in assistant_message.tool_calls:
-                        tool_name = tool_call.function.name
-                        try:
-                            tool_args = json.loads(tool_call.function.arguments)
-                        except json.JSONDecodeError:
-                            tool_args = {}
-
-                        print(f"[KananaLLM+MCP] Tool Call: {tool_name}({tool_args})")
-
-                        # MCP 클라이언트를 통해 도구 호출
-                        tool_result = mcp_client.call_tool(tool_name, tool_args)
-                        result_str = json.dumps(tool_result, ensure_ascii=False)
-
-                        print(f"[KananaLLM+MCP] Tool Result: {result_str[:200]}...")
-
-                        # 도구 결과 추가
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": result_str
-                        })
+                    messages.extend(self._run_tool_calls(assistant_message.tool_calls, call_tool, "KananaLLM+MCP"))
                 else:
                     # 최종 응답
                     content = assistant_message.content or ""
@@ -426,6 +1246,79 @@ class KananaLLM:
                 "recommended_action": "전송"
             }
 
+    def _run_tool_calls(
+        self,
+        tool_calls,
+        call_tool: Callable[[str, Dict[str, Any]], str],
+        log_prefix: str
+    ) -> List[dict]:
+        """한 턴의 Tool Call 실행 - 여러 개면 스레드 풀에서 동시에 (결과는 요청 순서대로)"""
+        import concurrent.futures
+
+        parsed = self._parse_tool_calls(tool_calls)
+        for _, tool_name, tool_args in parsed:
+            print(f"[{log_prefix}] Tool Call: {tool_name}({tool_args})")
+        if len(parsed) == 1:
+            return self._tool_messages(parsed, [call_tool(parsed[0][1], parsed[0][2])])
+
+        if self._tool_executor is None:
+            with self._tool_executor_lock:
+                if self._tool_executor is None:
+                    self._tool_executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=4, thread_name_prefix="kanana-tool"
+                    )
+        results = list(self._tool_executor.map(lambda call: call_tool(call[1], call[2]), parsed))
+        return self._tool_messages(parsed, results)
+
+    def analyze_structured(
+        self,
+        user_message: str,
+        system_prompt: str,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        단일 호출 JSON 판정 (도구 결과를 user_message에 미리 넣은 경우 - ReAct 반복 없음)
+
+        도구 정의 없이 1회 호출하고 JSON 출력만 요청한다 (멱등 → 재시도/헤징, 응답 캐시 사용).
+
+        Args:
+            user_message: 원문 + 미리 계산한 도구 결과
+            system_prompt: 시스템 프롬프트
+            timeout: 기한 (초, 기본 KANANA_LLM_DEADLINE)
+
+        Returns:
+            분석 결과 딕셔너리 (risk_level, reasons, is_secret_recommended, recommended_action)
+
+        Raises:
+            호출 실패 시 예외 - 호출자는 규칙 분석 결과로 대체
+        """
+        if not self.is_ready():
+            raise LLMUnavailableError("API not ready")
+
+        request = self._structured_request(system_prompt, user_message)
+        cache_key = None
+        content = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.model_id, system_prompt, user_message, request["temperature"])
+            content = self.cache.get(cache_key)
+        cached = content is not None
+
+        if not cached:
+            response = self.transport.create(
+                deadline=time.monotonic() + (timeout or LLM_DEADLINE),
+                idempotent=True,
+                model=self.model_id,
+                **request
+            )
+            content = response.choices[0].message.content or ""
+
+        result = self._parse_response(content)
+        if result is None:
+            return self._extract_result_from_text(content, user_message)
+        if cache_key is not None and not cached:
+            self.cache.put(cache_key, content)
+        return result
+
     def analyze_image(self, image_path: str, prompt: str = None) -> str:
         """
         Kanana Vision API로 이미지 분석 (OCR)
@@ -468,7 +1361,8 @@ class KananaLLM:
             mime_type = mime_types.get(ext, "image/png")
 
             # API 호출
-            response = self.client.chat.completions.create(
+            response = self.transport.create(
+                deadline=time.monotonic() + LLM_DEADLINE,
                 messages=[{
                     "role": "user",
                     "content": [
@@ -497,33 +1391,82 @@ class LLMManager:
     LLM 인스턴스 관리자
     Singleton 패턴으로 모델 재사용
     API 방식이므로 메모리 부담 없음
+
+    서버는 시작 시 warm_up()으로 백그라운드 초기화한다. 워밍업 전 첫 get()과 초기화에 실패한
+    인스턴스는 (백오프가 지났으면) 백그라운드 스레드에서 초기화하고, 그동안 None을 반환
+    (호출자는 규칙 분석으로 대체) → 요청 경로에서 초기화를 기다리지 않는다.
     """
 
     _instances: Dict[str, KananaLLM] = {}
+    _lock = threading.Lock()
 
     @classmethod
     def get(cls, model_type: str = "instruct") -> Optional[KananaLLM]:
         """
-        LLM 인스턴스 가져오기 (Lazy Loading)
+        LLM 인스턴스 가져오기 (워밍업하지 않은 경우 첫 호출에서 백그라운드 초기화 시작)
 
         Args:
             model_type: "instruct" (Kanana-2-30b) or "vision" (Kanana-1.5-v-3b)
 
         Returns:
-            KananaLLM 인스턴스 또는 None (초기화 실패 시)
+            KananaLLM 인스턴스 또는 None (초기화 전/실패 / 회로 차단 중)
         """
-        if model_type not in cls._instances:
-            print(f"[LLMManager] {model_type} API 클라이언트 초기화 중...")
-            cls._instances[model_type] = KananaLLM(model_type=model_type)
-
-        llm = cls._instances[model_type]
+        llm = cls._instances.get(model_type)
+        if llm is None:
+            with cls._lock:
+                llm = cls._instances.get(model_type)
+                if llm is None:
+                    print(f"[LLMManager] {model_type} API 클라이언트 백그라운드 초기화 시작")
+                    llm = cls._instances[model_type] = KananaLLM(model_type=model_type, initialize=False)
 
         if not llm.is_ready():
-            print(f"[LLMManager] {model_type} API가 준비되지 않음")
+            cls._retry_in_background(model_type, llm)
             return None
+        if not llm.is_available():
+            return None  # 회로 차단 중 → 호출자는 규칙 분석으로 대체
 
         return llm
 
+    @classmethod
+    def warm_up(cls, model_types: Optional[List[str]] = None) -> List[threading.Thread]:
+        """
+        백그라운드 초기화 시작 (서버 시작 시) - 초기화가 끝날 때까지 get()은 None
+
+        Returns:
+            초기화 스레드 목록 (기다려야 하면 join)
+        """
+        threads = []
+        for model_type in LLM_WARMUP_MODELS if model_types is None else model_types:
+            with cls._lock:
+                if model_type in cls._instances:
+                    continue
+                llm = cls._instances[model_type] = KananaLLM(model_type=model_type, initialize=False)
+                llm.initializing = True
+            threads.append(cls._start_initialize(model_type, llm))
+        return threads
+
+    @classmethod
+    def _retry_in_background(cls, model_type: str, llm: KananaLLM) -> None:
+        """백오프가 지났으면 (재)초기화 스레드 시작 (동시에 1개만)"""
+        with cls._lock:
+            if not llm.init_due():
+                return
+            llm.initializing = True
+        if llm.init_failures:
+            print(f"[LLMManager] {model_type} API 재초기화 시도 ({llm.init_failures}회 실패)")
+        cls._start_initialize(model_type, llm)
+
+    @staticmethod
+    def _start_initialize(model_type: str, llm: KananaLLM) -> threading.Thread:
+        thread = threading.Thread(target=llm.initialize, name=f"kanana-init-{model_type}", daemon=True)
+        thread.start()
+        return thread
+
+    @classmethod
+    def get_status(cls) -> Dict[str, Any]:
+        """모델별 준비 상태"""
+        return {model_type: llm.get_init_status() for model_type, llm in list(cls._instances.items())}
+
     @classmethod
     def is_loaded(cls, model_type: str) -> bool:
         """특정 모델이 로드되었는지 확인"""
@@ -543,3 +1486,452 @@ class LLMManager:
         """모든 모델 인스턴스 제거"""
         cls._instances.clear()
         print("[LLMManager] 모든 인스턴스 제거됨")
+
+
+class AsyncKananaLLM(_KananaInitMixin, _KananaResponseMixin):
+    """
+    Kanana LLM 비동기 Wrapper (AsyncOpenAI)
+
+    - 인스턴스 하나가 연결 풀(httpx)을 공유 → 요청마다 TCP/TLS 연결을 새로 맺지 않음
+    - 세마포어로 동시 호출 수 제한 → 초과 요청은 이벤트 루프를 막지 않고 대기
+    - 이벤트 루프에 묶이므로 AsyncLLMManager가 루프별로 관리
+
+    사용법:
+        llm = await AsyncLLMManager.get("instruct")
+        if llm:
+            text = await llm.analyze("메시지")
+    """
+
+    def __init__(
+        self,
+        model_type: str = "instruct",
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+        timeout: float = LLM_TIMEOUT,
+        http_client=None,
+        base_urls: Optional[List[str]] = None,
+        **transport_options
+    ):
+        """
+        Args:
+            model_type: "instruct" (Kanana-2-30b) or "vision" (Kanana-1.5-v-3b)
+            max_concurrency: 동시에 진행할 수 있는 LLM 호출 수
+            max_connections: 연결 풀 최대 연결 수
+            timeout: 요청(시도 1회) 타임아웃 상한 (초)
+            http_client: 직접 지정할 httpx.AsyncClient (테스트용, 복제본이 공유)
+            base_urls: API base URL 목록 (기본: KANANA_LLM_BASE_URL + KANANA_LLM_REPLICAS)
+            **transport_options: 전송 계층 설정 (retries, hedge_delay, failure_threshold, cooldown 등)
+        """
+        self.model_type = model_type
+        self.is_vision = model_type == "vision"
+        self.client = None
+        self.transport: Optional[AsyncLLMTransport] = None
+        self.model_id = None
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self.stats = {"calls": 0, "errors": 0, "max_in_flight": 0}
+        # 응답 캐시 (동기 KananaLLM과 공유)
+        self.cache = get_llm_cache()
+        self._reset_init_state()
+
+        breaker_options, transport_options = _split_transport_options(transport_options)
+        try:
+            from openai import DefaultAsyncHttpxClient
+            import httpx
+
+            if http_client is None:
+                http_client = DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_connections
+                    ),
+                    timeout=httpx.Timeout(timeout, connect=min(LLM_CONNECT_TIMEOUT, timeout))
+                )
+            if base_urls is None:
+                base_urls = [VISION_API_BASE] if self.is_vision else [LLM_API_BASE] + LLM_REPLICAS
+            endpoints = _build_endpoints(
+                base_urls, VISION_API_KEY if self.is_vision else LLM_API_KEY, asynchronous=True,
+                http_client=http_client, timeout=timeout, **breaker_options
+            )
+            self.transport = AsyncLLMTransport(endpoints, timeout=timeout, **transport_options)
+            self.client = endpoints[0].client
+        except Exception as e:
+            print(f"[AsyncKananaLLM] {model_type} 클라이언트 생성 실패: {e}")
+
+    def initialize_cached(self) -> bool:
+        """네트워크 없이 끝나는 초기화 (vision / 동기 워밍업이 캐시한 모델 ID) - 준비되면 True"""
+        if self.client is None:
+            return False
+        if self.is_vision:
+            self.model_id = VISION_MODEL
+        else:
+            self.model_id = _cached_model_id(self.transport.endpoints[0].base_url)
+        return self.model_id is not None and self._record_init()
+
+    async def initialize(self) -> bool:
+        """모델 ID 확인 (instruct는 캐시에 없으면 API에서 자동 감지, 실패 시 재호출 가능)"""
+        if self.client is None:
+            return self._record_init(RuntimeError("클라이언트 생성 실패"))
+        if self.initialize_cached():
+            return True
+
+        base_url = self.transport.endpoints[0].base_url
+
+        self.initializing = True
+        print(f"[AsyncKananaLLM] LLM API 초기화 중 (Kanana-2-30b)...")
+        try:
+            models = await self.client.models.list()
+            if models.data:
+                self.model_id = models.data[0].id
+                _remember_model_id(base_url, self.model_id)
+                print(f"[AsyncKananaLLM] LLM API 초기화 성공! Model: {self.model_id} "
+                      f"(동시 호출 {self.max_concurrency})")
+            else:
+                print(f"[AsyncKananaLLM] 모델 목록이 비어있음")
+        except Exception as e:
+            print(f"[AsyncKananaLLM] LLM API 초기화 실패: {e}")
+            return self._record_init(e)
+        return self._record_init()
+
+    def is_ready(self) -> bool:
+        """API 클라이언트가 준비되었는지 확인"""
+        return self.client is not None and self.model_id is not None
+
+    def is_available(self) -> bool:
+        """지금 호출할 수 있는지 (준비됨 + 회로 차단 중이 아님) - False면 규칙 분석으로 대체"""
+        return self.is_ready() and self.transport.available()
+
+    @property
+    def in_flight(self) -> int:
+        """현재 진행 중인 LLM 호출 수"""
+        return self._in_flight
+
+    async def _create(self, deadline: float, idempotent: bool = False, **kwargs):
+        """chat.completions.create (동시 호출 수 제한, 기한은 세마포어 대기 시간 포함)"""
+        async with self._semaphore:
+            self._in_flight += 1
+            self.stats["calls"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+            try:
+                return await self.transport.create(deadline, idempotent, model=self.model_id, **kwargs)
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            finally:
+                self._in_flight -= 1
+
+    async def aclose(self) -> None:
+        """연결 풀 종료"""
+        if self.client is not None:
+            await self.client.close()
+
+    async def analyze(self, text: str, system_prompt: str = None, timeout: Optional[float] = None) -> str:
+        """일반 텍스트 분석 (KananaLLM.analyze의 비동기 버전 - 기한 안에서 재시도/헤징)"""
+        if not self.is_ready():
+            return "Kanana Analysis: API not ready (Fallback)"
+
+        if system_prompt is None:
+            system_prompt = "당신은 카카오에서 개발된 친절한 AI입니다."
+
+        temperature = 0.1
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.model_id, system_prompt, text, temperature)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            response = await self._create(
+                deadline=time.monotonic() + (timeout or LLM_CLASSIFY_DEADLINE),
+                idempotent=True,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text}
+                ],
+                temperature=temperature,
+                max_tokens=512
+            )
+            content = response.choices[0].message.content
+            if cache_key is not None and content is not None:
+                self.cache.put(cache_key, content)
+            return content
+        except Exception as e:
+            return f"Kanana Analysis Error: {str(e)}"
+
+    async def analyze_structured(
+        self,
+        user_message: str,
+        system_prompt: str,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """단일 호출 JSON 판정 (KananaLLM.analyze_structured의 비동기 버전 - 실패 시 예외)"""
+        if not self.is_ready():
+            raise LLMUnavailableError("API not ready")
+
+        request = self._structured_request(system_prompt, user_message)
+        cache_key = None
+        content = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.model_id, system_prompt, user_message, request["temperature"])
+            content = self.cache.get(cache_key)
+        cached = content is not None
+
+        if not cached:
+            response = await self._create(
+                deadline=time.monotonic() + (timeout or LLM_DEADLINE),
+                idempotent=True,
+                **request
+            )
+            content = response.choices[0].message.content or ""
+
+        result = self._parse_response(content)
+        if result is None:
+            return self._extract_result_from_text(content, user_message)
+        if cache_key is not None and not cached:
+            self.cache.put(cache_key, content)
+        return result
+
+    async def _run_tool_loop(
+        self,
+        user_message: str,
+        system_prompt: str,
+        tool_definitions: List[dict],
+        call_tool: Callable[[str, Dict[str, Any]], Any],
+        max_iterations: int,
+        log_prefix: str
+    ) -> Dict[str, Any]:
+        """Tool Call 반복 (LLM 응답 대기 중에는 다른 요청 처리)"""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+
+        deadline = time.monotonic() + LLM_DEADLINE
+        try:
+            for iteration in range(max_iterations):
+                response = await self._create(
+                    deadline=deadline,
+                    messages=messages,
+                    tools=tool_definitions if tool_definitions else None,
+                    tool_choice="auto" if tool_definitions else None,
+                    temperature=0.1,
+                    max_tokens=1024
+                )
+                assistant_message = response.choices[0].message
+
+                if not assistant_message.tool_calls:
+                    content = assistant_message.content or ""
+                    result = self._parse_response(content)
+                    if result:
+                        return result
+                    return self._extract_result_from_text(content, user_message)
+
+                # 한 턴에 여러 도구를 요청하면 동시에 실행 (결과는 요청 순서대로)
+                messages.append(assistant_message)
+                parsed = self._parse_tool_calls(assistant_message.tool_calls)
+                for _, tool_name, tool_args in parsed:
+                    print(f"[{log_prefix}] Tool Call: {tool_name}({tool_args})")
+                results = await asyncio.gather(*(call_tool(tool_name, tool_args) for _, tool_name, tool_args in parsed))
+                messages.extend(self._tool_messages(parsed, results))
+
+            return self._fallback_result("분석 완료 (max iterations)")
+
+        except Exception as e:
+            print(f"[{log_prefix}] 오류: {e}")
+            return self._fallback_result(f"분석 오류: {str(e)}")
+
+    async def analyze_with_tools(
+        self,
+        user_message: str,
+        system_prompt: str,
+        tools: Dict[str, Callable[..., Any]],
+        max_iterations: int = 3
+    ) -> Dict[str, Any]:
+        """OpenAI Tool Call 방식 분석 (KananaLLM.analyze_with_tools의 비동기 버전)"""
+        if not self.is_ready():
+            return self._fallback_result("API not ready")
+
+        async def call_tool(tool_name: str, tool_args: Dict[str, Any]) -> str:
+            if tool_name not in tools:
+                return f"Unknown tool: {tool_name}"
+            try:
+                result = tools[tool_name](**tool_args)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                return json.dumps(result, ensure_ascii=False)
+            except Exception as e:
+                return f"Error: {str(e)}"
+
+        return await self._run_tool_loop(
+            user_message, system_prompt, self._build_tool_definitions(tools),
+            call_tool, max_iterations, "AsyncKananaLLM"
+        )
+
+    async def analyze_with_mcp(
+        self,
+        user_message: str,
+        system_prompt: str,
+        max_iterations: int = 3
+    ) -> Dict[str, Any]:
+        """
+        MCP 도구 호출 분석 (KananaLLM.analyze_with_mcp의 비동기 버전)
+
+        동기 버전과 달리 MCP 도구도 비동기 클라이언트로 호출
+        (요청마다 스레드 + 새 이벤트 루프를 만들지 않음)
+        """
+        if not self.is_ready():
+            return self._fallback_result("API not ready")
+
+        from ..mcp.client import get_async_mcp_client
+        mcp_client = get_async_mcp_client()
+        tool_definitions = await mcp_client.get_openai_tools_schema()
+
+        async def call_tool(tool_name: str, tool_args: Dict[str, Any]) -> str:
+            tool_result = await mcp_client.call_tool(tool_name, tool_args)
+            return json.dumps(tool_result, ensure_ascii=False)
+
+        return await self._run_tool_loop(
+            user_message, system_prompt, tool_definitions,
+            call_tool, max_iterations, "AsyncKananaLLM+MCP"
+        )
+
+
+class AsyncLLMManager:
+    """
+    AsyncKananaLLM 인스턴스 관리자
+
+    연결 풀과 세마포어는 이벤트 루프에 묶이므로 루프별로 모델 타입당 1개씩 보관.
+    uvicorn 워커는 루프가 1개이므로 모든 요청이 같은 인스턴스(연결 풀)를 공유한다.
+    인스턴스 생성(openai 클라이언트, 스레드에서)과 모델 ID 조회(models.list)는 요청 경로에서
+    기다리지 않고 백그라운드 태스크로 실행하며, 그동안 get()은 None (호출자는 규칙 분석으로 대체).
+    초기화에 실패하면 백오프 후 다시 시도한다. 서버는 시작 시 warm_up()으로 미리 준비한다.
+
+    루프는 약한 참조 키로 보관한다. 인스턴스의 세마포어가 루프를 참조할 수 있으므로
+    새 루프를 등록할 때 닫힌 루프의 항목도 정리한다.
+    """
+
+    # 루프 → {모델 타입: 인스턴스} / 생성 중인 모델 타입
+    _instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncKananaLLM]]" = weakref.WeakKeyDictionary()
+    _creating: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, set]" = weakref.WeakKeyDictionary()
+    _tasks: set = set()
+
+    @classmethod
+    def _loop_instances(cls, loop: asyncio.AbstractEventLoop) -> Dict[str, AsyncKananaLLM]:
+        instances = cls._instances.get(loop)
+        if instances is None:
+            for other in [other for other in list(cls._instances.keys()) if other.is_closed()]:
+                cls._instances.pop(other, None)
+            instances = cls._instances[loop] = {}
+        return instances
+
+    @classmethod
+    def _spawn(cls, coro) -> None:
+        """백그라운드 태스크 (끝날 때까지 강한 참조 유지)"""
+        task = asyncio.ensure_future(coro)
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+
+    @classmethod
+    async def _create(cls, loop: asyncio.AbstractEventLoop, model_type: str) -> AsyncKananaLLM:
+        """인스턴스 생성 (클라이언트 생성은 스레드에서) + 초기화 - 백그라운드 태스크 / 워밍업"""
+        try:
+            llm = await asyncio.to_thread(AsyncKananaLLM, model_type=model_type)
+        finally:
+            cls._creating.get(loop, set()).discard(model_type)
+        cls._loop_instances(loop)[model_type] = llm
+        if not llm.initialize_cached():
+            await llm.initialize()
+        return llm
+
+    @classmethod
+    async def get(cls, model_type: str = "instruct") -> Optional[AsyncKananaLLM]:
+        """
+        비동기 LLM 인스턴스 가져오기 (생성/초기화를 기다리지 않음)
+
+        Returns:
+            AsyncKananaLLM 인스턴스 또는 None (초기화 전/실패 / 회로 차단 중)
+        """
+        loop = asyncio.get_running_loop()
+        llm = cls._loop_instances(loop).get(model_type)
+        if llm is None:
+            creating = cls._creating.setdefault(loop, set())
+            if model_type not in creating:
+                creating.add(model_type)
+                print(f"[AsyncLLMManager] {model_type} API 클라이언트 백그라운드 초기화 시작")
+                cls._spawn(cls._create(loop, model_type))
+            return None
+        if not llm.is_ready():
+            if llm.init_due():
+                # 요청은 기다리지 않고 규칙 분석으로 대체, 재초기화는 백그라운드에서
+                print(f"[AsyncLLMManager] {model_type} API 재초기화 시도 ({llm.init_failures}회 실패)")
+                llm.initializing = True
+                cls._spawn(llm.initialize())
+            return None
+        if not llm.is_available():
+            return None  # 회로 차단 중 → 호출자는 규칙 분석으로 대체
+        return llm
+
+    @classmethod
+    async def warm_up(cls, model_types: Optional[List[str]] = None) -> None:
+        """현재 루프의 인스턴스를 미리 생성/초기화 (서버 시작 시, 모델 ID는 동기 워밍업 캐시 사용)"""
+        loop = asyncio.get_running_loop()
+        for model_type in LLM_WARMUP_MODELS if model_types is None else model_types:
+            llm = cls._loop_instances(loop).get(model_type)
+            if llm is None:
+                await cls._create(loop, model_type)
+            elif llm.init_due():
+                await llm.initialize()
+
+    @classmethod
+    def _items(cls) -> List[Tuple[str, AsyncKananaLLM]]:
+        return [
+            (model_type, llm)
+            for instances in list(cls._instances.values())
+            for model_type, llm in list(instances.items())
+        ]
+
+    @classmethod
+    def get_status(cls) -> Dict[str, Any]:
+        """모델별 준비 상태"""
+        return {f"{model_type}_async": llm.get_init_status() for model_type, llm in cls._items()}
+
+    @classmethod
+    async def unload_all(cls) -> None:
+        """현재 루프의 인스턴스 연결 종료 후 전체 제거"""
+        loop = asyncio.get_running_loop()
+        for llm in list(cls._instances.get(loop, {}).values()):
+            await llm.aclose()
+        cls._instances.clear()
+        cls._creating.clear()
+        print("[AsyncLLMManager] 모든 인스턴스 제거됨")
+
+
+def warm_up_llms() -> None:
+    """
+    LLM 워밍업 (블로킹 - 서버 시작 시 스레드에서 호출)
+
+    동기 인스턴스를 초기화해 모델 ID를 캐시해 두면 이후 비동기 인스턴스는 목록 조회 없이 준비된다.
+    """
+    for thread in LLMManager.warm_up():
+        thread.join()
+
+
+def get_llm_readiness() -> Dict[str, Any]:
+    """LLM 준비 상태 (헬스체크용) - ready: 워밍업 대상 모델이 모두 준비됨"""
+    models = {**LLMManager.get_status(), **AsyncLLMManager.get_status()}
+    ready = all(models.get(m, {}).get("ready", False) for m in LLM_WARMUP_MODELS)
+    return {"ready": ready, "models": models}
+
+
+def get_llm_transport_stats() -> Dict[str, Any]:
+    """로드된 LLM 인스턴스의 전송 계층 지표 (헬스체크용: 회로 상태, 재시도/헤징 횟수)"""
+    stats = {}
+    for model_type, llm in list(LLMManager._instances.items()):
+        if llm.transport is not None:
+            stats[model_type] = llm.transport.get_stats()
+    for model_type, llm in AsyncLLMManager._items():
+        if llm.transport is not None:
+            stats[f"{model_type}_async"] = llm.transport.get_stats()
+    return stats
@@ -0,0 +1,323 @@
+"""
+LLM Scheduler - LLM 호출 우선순위 / 사용자 공정성 / 부하 차단 (load shedding)
+
+발신 ReAct(analyze_with_mcp), 수신 빠른/상세 분류, Vision OCR, Hybrid PII 분석이
+같은 LLM 엔드포인트를 쓰므로, 호출 전에 슬롯을 받아 순서를 정한다.
+
+- 우선순위 클래스: 규칙 판정 CRITICAL/DANGEROUS 수신 메시지가 먼저, SUSPICIOUS 빠른 분류는 나중
+- 공정성: 같은 클래스 안에서는 사용자별 라운드 로빈 (한 사용자의 대량 요청이 다른 사용자를 밀어내지 않음)
+- 부하 차단: 차단 가능 클래스(기본 suspicious, pii)는 큐 대기 시간이 임계값을 넘으면
+  LLM을 포기하고 규칙 분석 결과만 사용 (LLMLoadShed)
+  * 입장 시: 슬롯이 없고 최근 대기 시간(EWMA)이 임계값 초과 → 바로 차단
+  * 대기 중: 임계값까지 슬롯을 못 받으면 차단
+- 차단 불가 클래스도 슬롯 대기는 LLM 기한(KANANA_LLM_DEADLINE)까지만 - 넘으면 LLMSlotTimeout
+  (LLMLoadShed 하위 클래스라 호출자의 규칙 분석 대체 경로를 그대로 탐)
+- 차단된 요청은 클래스/사유별로 지표에 남는다 (get_stats, 헬스체크)
+
+동기(스레드)와 비동기(이벤트 루프) 호출이 같은 슬롯을 나눠 쓴다.
+
+사용법:
+    scheduler = get_llm_scheduler()
+    try:
+        with scheduler.slot("suspicious", user_id):        # 비동기: async with scheduler.aslot(...)
+            response = llm.analyze(...)
+    except LLMLoadShed:
+        ...  # 규칙 분석 결과 사용
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+
+# 우선순위 클래스 (앞에 있을수록 먼저)
+PRIORITY_CLASSES = (
+    "critical",    # 수신 - 규칙 판정 CRITICAL (상세 분석)
+    "dangerous",   # 수신 - 규칙 판정 DANGEROUS (상세 분석)
+    "outgoing",    # 발신 ReAct (사용자가 전송 대기 중)
+    "vision",      # 이미지 OCR (규칙 대체 없음)
+    "suspicious",  # 수신 - 규칙 판정 SUSPICIOUS 빠른 분류
+    "pii",         # 발신 Hybrid PII 보조 분석
+)
+
+# 동시에 진행할 LLM 작업 수 (0이면 스케줄러 사용 안 함)
+LLM_SCHED_SLOTS = int(os.getenv("KANANA_LLM_SCHED_SLOTS", os.getenv("KANANA_LLM_MAX_CONCURRENCY", "64")))
+# 차단 가능 클래스의 큐 대기 임계값 (ms)
+LLM_SHED_WAIT_MS = float(os.getenv("KANANA_LLM_SHED_WAIT_MS", "500"))
+# 차단 가능 클래스 (규칙 분석으로 대체할 수 있는 요청)
+LLM_SHED_CLASSES = frozenset(
+    c.strip() for c in os.getenv("KANANA_LLM_SHED_CLASSES", "suspicious,pii").split(",") if c.strip()
+)
+# 차단 불가 클래스의 최대 슬롯 대기 (초) - LLM 전송 기한과 같은 값
+LLM_SLOT_DEADLINE = float(os.getenv("KANANA_LLM_DEADLINE", "25"))
+# 대기 시간 EWMA 가중치
+_EWMA_ALPHA = 0.2
+
+
+class LLMLoadShed(RuntimeError):
+    """부하 차단 - LLM 호출 없이 규칙 분석 결과를 사용"""
+
+    def __init__(self, priority_class: str, reason: str, wait_ms: float):
+        super().__init__(f"LLM 부하 차단 ({priority_class}, {reason}, 대기 {wait_ms:.0f}ms)")
+        self.priority_class = priority_class
+        self.reason = reason
+        self.wait_ms = wait_ms
+
+
+class LLMSlotTimeout(LLMLoadShed):
+    """차단 불가 클래스가 기한까지 슬롯을 못 받음 (부하 차단 지표와 별도 집계)"""
+
+
+class _Waiter:
+    """슬롯 대기 항목 (동기: Event, 비동기: 루프 Future)"""
+
+    __slots__ = ("priority_class", "user", "enqueued_at", "granted", "event", "loop", "future")
+
+    def __init__(self, priority_class: str, user: Hashable, enqueued_at: float, loop=None):
+        self.priority_class = priority_class
+        self.user = user
+        self.enqueued_at = enqueued_at
+        self.granted = False
+        self.loop = loop
+        if loop is None:
+            self.event = threading.Event()
+            self.future = None
+        else:
+            self.event = None
+            self.future = loop.create_future()
+
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future) -> None:
+    if not future.done():
+        future.set_result(True)
+
+
+def _class_stats() -> Dict[str, Any]:
+    return {"submitted": 0, "admitted": 0, "shed_admission": 0, "shed_timeout": 0, "deadline_timeout": 0,
+            "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+
+
+class LLMScheduler:
+    """우선순위 큐 + 사용자별 라운드 로빈 + 부하 차단 (스레드 안전)"""
+
+    def __init__(
+        self,
+        slots: int = LLM_SCHED_SLOTS,
+        shed_wait_ms: float = LLM_SHED_WAIT_MS,
+        shed_classes=LLM_SHED_CLASSES,
+        clock: Callable[[], float] = time.monotonic,
+        deadline: float = LLM_SLOT_DEADLINE
+    ):
+        """
+        Args:
+            slots: 동시에 진행할 LLM 작업 수 (0 이하면 대기 없이 통과)
+            shed_wait_ms: 차단 가능 클래스의 큐 대기 임계값 (ms)
+            shed_classes: 차단 가능 클래스 (규칙 분석으로 대체 가능)
+            clock: 시계 (테스트용)
+            deadline: 차단 불가 클래스의 최대 슬롯 대기 (초)
+        """
+        self.slots = slots
+        self.shed_wait = shed_wait_ms / 1000
+        self.shed_classes = frozenset(shed_classes)
+        self.deadline = deadline
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._active = 0
+        # 클래스별 {사용자: 대기열} - OrderedDict 순서가 라운드 로빈 순서
+        self._queues: Dict[str, "OrderedDict[Hashable, Deque[_Waiter]]"] = {
+            name: OrderedDict() for name in PRIORITY_CLASSES
+        }
+        self._queued = 0
+        self._wait_ewma = 0.0
+        self.stats: Dict[str, Dict[str, Any]] = {name: _class_stats() for name in PRIORITY_CLASSES}
+
+    # ---------- 진입점 ----------
+
+    @contextmanager
+    def slot(self, priority_class: str, user: Optional[Hashable] = None):
+        """
+        LLM 작업 슬롯 (동기, 호출 스레드는 슬롯을 받을 때까지 대기)
+
+        Raises:
+            LLMLoadShed: 차단 가능 클래스가 임계값 이상 대기
+            LLMSlotTimeout: 차단 불가 클래스가 기한까지 슬롯을 못 받음
+        """
+        if self.slots <= 0:
+            yield
+            return
+        waiter = self._enqueue(priority_class, user, None)
+        if not waiter.granted:
+            if not waiter.event.wait(self._wait_limit(priority_class)) and self._withdraw(waiter):
+                raise self._timeout(waiter)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self, priority_class: str, user: Optional[Hashable] = None):
+        """LLM 작업 슬롯 (비동기, 대기 중 이벤트 루프 비차단)"""
+        if self.slots <= 0:
+            yield
+            return
+        waiter = self._enqueue(priority_class, user, asyncio.get_running_loop())
+        if not waiter.granted:
+            try:
+                await asyncio.wait_for(waiter.future, self._wait_limit(priority_class))
+            except asyncio.TimeoutError:
+                if self._withdraw(waiter):
+                    raise self._timeout(waiter)
+                # 타임아웃과 동시에 슬롯을 받음 → 그대로 진행
+            except asyncio.CancelledError:
+                if not self._withdraw(waiter):
+                    self.release()
+                raise
+        try:
+            yield
+        finally:
+            self.release()
+
+    # ---------- 큐 ----------
+
+    def _enqueue(self, priority_class: str, user: Optional[Hashable], loop) -> _Waiter:
+        if priority_class not in self._queues:
+            raise ValueError(f"알 수 없는 우선순위 클래스: {priority_class}")
+        now = self._clock()
+        waiter = _Waiter(priority_class, user, now, loop)
+        with self._lock:
+            stats = self.stats[priority_class]
+            stats["submitted"] += 1
+            if self._active < self.slots and self._queued == 0:
+                self._grant(waiter, now)
+                return waiter
+            if priority_class in self.shed_classes and self._wait_ewma > self.shed_wait:
+                # 최근 대기 시간이 임계값 초과 → 줄 서지 않고 바로 규칙 분석
+                stats["shed_admission"] += 1
+                raise LLMLoadShed(priority_class, "admission", self._wait_ewma * 1000)
+            self._queues[priority_class].setdefault(user, deque()).append(waiter)
+            self._queued += 1
+            self._dispatch(now)
+        return waiter
+
+    def _withdraw(self, waiter: _Waiter) -> bool:
+        """대기 취소 (큐에서 뺐으면 True, 이미 슬롯을 받았으면 False)"""
+        with self._lock:
+            if waiter.granted:
+                return False
+            users = self._queues[waiter.priority_class]
+            pending = users.get(waiter.user)
+            if pending is not None:
+                pending.remove(waiter)
+                if not pending:
+                    del users[waiter.user]
+                self._queued -= 1
+            return True
+
+    def _wait_limit(self, priority_class: str) -> float:
+        """최대 슬롯 대기 (차단 가능 클래스: 차단 임계값, 나머지: 기한)"""
+        return self.shed_wait if priority_class in self.shed_classes else self.deadline
+
+    def _timeout(self, waiter: _Waiter) -> LLMLoadShed:
+        if waiter.priority_class in self.shed_classes:
+            return self._shed(waiter, "timeout")
+        wait_ms = (self._clock() - waiter.enqueued_at) * 1000
+        with self._lock:
+            self.stats[waiter.priority_class]["deadline_timeout"] += 1
+        return LLMSlotTimeout(waiter.priority_class, "deadline", wait_ms)
+
+    def _shed(self, waiter: _Waiter, reason: str) -> LLMLoadShed:
+        wait_ms = (self._clock() - waiter.enqueued_at) * 1000
+        with self._lock:
+            self.stats[waiter.priority_class][f"shed_{reason}"] += 1
+        return LLMLoadShed(waiter.priority_class, reason, wait_ms)
+
+    def release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            self._dispatch(self._clock())
+
+    def _dispatch(self, now: float) -> None:
+        """빈 슬롯을 우선순위 순서로 배정 (클래스 안에서는 사용자별 라운드 로빈) - 잠금 안에서 호출"""
+        while self._active < self.slots and self._queued:
+            for name in PRIORITY_CLASSES:
+                users = self._queues[name]
+                if users:
+                    break
+            user, pending = next(iter(users.items()))
+            waiter = pending.popleft()
+            if pending:
+                users.move_to_end(user)   # 다음 차례는 다른 사용자
+            else:
+                del users[user]
+            self._queued -= 1
+            self._grant(waiter, now)
+
+    def _grant(self, waiter: _Waiter, now: float) -> None:
+        waited = now - waiter.enqueued_at
+        stats = self.stats[waiter.priority_class]
+        stats["admitted"] += 1
+        stats["wait_ms_total"] += waited * 1000
+        stats["wait_ms_max"] = max(stats["wait_ms_max"], waited * 1000)
+        self._wait_ewma += _EWMA_ALPHA * (waited - self._wait_ewma)
+        self._active += 1
+        waiter.granted = True
+        waiter.wake()
+
+    # ---------- 지표 ----------
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            classes = {}
+            for name in PRIORITY_CLASSES:
+                stats = self.stats[name]
+                classes[name] = {
+                    "submitted": stats["submitted"],
+                    "admitted": stats["admitted"],
+                    "shed_admission": stats["shed_admission"],
+                    "shed_timeout": stats["shed_timeout"],
+                    "deadline_timeout": stats["deadline_timeout"],
+                    "queued": sum(len(pending) for pending in self._queues[name].values()),
+                    "avg_wait_ms": round(stats["wait_ms_total"] / stats["admitted"], 2) if stats["admitted"] else 0.0,
+                    "max_wait_ms": round(stats["wait_ms_max"], 2),
+                }
+            return {
+                "slots": self.slots,
+                "active": self._active,
+                "queued": self._queued,
+                "wait_ewma_ms": round(self._wait_ewma * 1000, 2),
+                "shed_wait_ms": self.shed_wait * 1000,
+                "shed_total": sum(c["shed_admission"] + c["shed_timeout"] for c in classes.values()),
+                "classes": classes,
+            }
+
+
+def threat_priority(threat_level: str) -> str:
+    """규칙 판정(threat_level) → 수신 분석 우선순위 클래스"""
+    if threat_level == "CRITICAL":
+        return "critical"
+    if threat_level == "DANGEROUS":
+        return "dangerous"
+    return "suspicious"
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """LLM 스케줄러 싱글톤 (프로세스당 1개 - 동기/비동기 호출 공유)"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
@@ -1,28 +1,34 @@
 """
 MCP module - Model Context Protocol 도구 및 서버
+
+도구는 처음 접근할 때 import한다 (FastMCP 로드 비용은 MCP를 실제로 쓸 때만).
 """
-from .tools import (
-    mcp,
-    # 기존 Agent 기반 도구
-    analyze_outgoing,
-    analyze_incoming,
-    analyze_image,
-    # 새 Pattern Matcher 기반 MCP 도구
-    list_pii_patterns,
-    list_document_types,
-    get_risk_rules,
-    scan_pii,
-    identify_document,
-    evaluate_risk,
-    get_action_for_risk,
-    analyze_full,
-)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .tools import (
+        mcp,
+        analyze_outgoing,
+        analyze_incoming,
+        analyze_image,
+        list_pii_patterns,
+        list_document_types,
+        get_risk_rules,
+        scan_pii,
+        identify_document,
+        evaluate_risk,
+        get_action_for_risk,
+        analyze_full,
+    )
 
 __all__ = [
     "mcp",
+    # 기존 Agent 기반 도구
     "analyze_outgoing",
     "analyze_incoming",
     "analyze_image",
+    # 새 Pattern Matcher 기반 MCP 도구
     "list_pii_patterns",
     "list_document_types",
     "get_risk_rules",
@@ -32,3 +38,18 @@ __all__ = [
     "get_action_for_risk",
     "analyze_full",
 ]
+
+_LAZY_ATTRS = {name: ".tools" for name in __all__}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
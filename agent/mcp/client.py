@@ -102,14 +102,14 @@ class MCPClient:
         from ..core.pattern_matcher import (
             detect_pii, calculate_risk, get_risk_action,
             get_pii_patterns, get_document_types, get_combination_rules,
-            detect_document_type
+            detect_document_type, get_pii_engine
         )
 
         def analyze_full_impl(text: str) -> Dict[str, Any]:
             """analyze_full 구현"""
-            pii_result = detect_pii(text)
-            risk_result = calculate_risk(pii_result["found_pii"])
-            action = get_risk_action(risk_result["final_risk"])
+            result = get_pii_engine().analyze(text)
+            pii_result = result["pii_scan"]
+            action = result["recommended_action"]
 
             if pii_result["count"] == 0:
                 summary = "민감정보가 감지되지 않았습니다."
@@ -117,12 +117,8 @@ class MCPClient:
                 detected_names = list(set(item["name_ko"] for item in pii_result["found_pii"]))
                 summary = f"{len(detected_names)}종의 민감정보 감지: {', '.join(detected_names)}. {action}"
 
-            return {
-                "pii_scan": pii_result,
-                "risk_evaluation": risk_result,
-                "recommended_action": action,
-                "summary": summary
-            }
+            result["summary"] = summary
+            return result
 
         tool_map = {
             "scan_pii": detect_pii,
@@ -149,6 +145,21 @@ class MCPClient:
         except Exception as e:
             return {"error": str(e)}
 
+    async def get_openai_tools_schema(self) -> List[Dict]:
+        """OpenAI API 형식의 도구 스키마 반환 (AsyncKananaLLM의 Tool Call에서 사용)"""
+        tools = await self.list_tools()
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": tool["name"],
+                    "description": tool["description"],
+                    "parameters": tool["parameters"]
+                }
+            }
+            for tool in tools
+        ]
+
     async def __aenter__(self):
         await self.connect()
         return self
@@ -204,18 +215,7 @@ class SyncMCPClient:
         OpenAI API 형식의 도구 스키마 반환
         Kanana LLM의 Tool Call에서 사용
         """
-        tools = self.list_tools()
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": tool["name"],
-                    "description": tool["description"],
-                    "parameters": tool["parameters"]
-                }
-            }
-            for tool in tools
-        ]
+        return self._run_async(self._async_client.get_openai_tools_schema())
 
 
 # 싱글톤 MCP 클라이언트
@@ -228,3 +228,8 @@ def get_mcp_client() -> SyncMCPClient:
     if _mcp_client is None:
         _mcp_client = SyncMCPClient()
     return _mcp_client
+
+
+def get_async_mcp_client() -> MCPClient:
+    """비동기 MCP 클라이언트 싱글톤 (동기 클라이언트와 도구 캐시 공유)"""
+    return get_mcp_client()._async_client
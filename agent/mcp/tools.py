@@ -17,7 +17,8 @@ from ..core.pattern_matcher import (
     detect_pii,
     detect_document_type,
     calculate_risk,
-    get_risk_action
+    get_risk_action,
+    get_pii_engine
 )
 
 # Agent B (수신 보호) - 위협 패턴 매칭
@@ -32,6 +33,9 @@ from ..core.threat_matcher import (
     get_threat_response
 )
 
+from ..core.batch_runner import run_batch, run_batch_async
+from ..core.rule_pool import get_rule_pool
+
 # NOTE: Agent와 LLM은 순환 import 방지를 위해 함수 내부에서 lazy import
 
 # MCP 서버 인스턴스
@@ -86,6 +90,123 @@ def analyze_incoming(text: str, sender_id: str = None, use_ai: bool = False) ->
     return agent.analyze(text, sender_id=sender_id, use_ai=use_ai)
 
 
+# 규칙 기반 분석 (규칙 풀 워커에서 실행 - process 모드에서 pickle 가능하도록 모듈 수준 함수)
+def _rule_outgoing(text: str) -> AnalysisResponse:
+    return _get_outgoing_agent().analyze(text, use_ai=False)
+
+
+def _rule_incoming(text: str, sender_id: str = None, use_ai: bool = False) -> AnalysisResponse:
+    return _get_incoming_agent().analyze(text, sender_id=sender_id, use_ai=use_ai)
+
+
+def _rule_outgoing_tier(text: str) -> Dict[str, Any]:
+    return _get_outgoing_agent().rule_tier(text)
+
+
+# 비동기 버전 (FastAPI 핸들러용 - LLM 응답 대기 중 이벤트 루프 비차단)
+# 규칙 단계는 use_ai와 관계없이 규칙 풀에서 실행 → 긴 텍스트 정규식 검사 중에도 루프 비차단
+# (풀 포화 시 RulePoolSaturated)
+async def analyze_outgoing_async(text: str, use_ai: bool = False) -> AnalysisResponse:
+    """analyze_outgoing의 비동기 버전 (use_ai: 풀에서 계산한 규칙 분석 결과를 LLM 단계에 전달)"""
+    if not use_ai:
+        return await get_rule_pool().run(_rule_outgoing, text)
+    rule_analysis = await get_rule_pool().run(_rule_outgoing_tier, text)
+    agent = _get_outgoing_agent()
+    return await agent.analyze_async(text, use_ai=True, rule_analysis=rule_analysis)
+
+
+async def analyze_incoming_async(text: str, sender_id: str = None, use_ai: bool = False) -> AnalysisResponse:
+    """
+    analyze_incoming의 비동기 버전
+
+    4단계 판정은 모두 규칙 기반이므로(LLM 보정은 analyze_incoming_stream) use_ai와 관계없이 풀에서 실행
+    """
+    return await get_rule_pool().run(_rule_incoming, text, sender_id, use_ai)
+
+
+# 배치 버전 (대량 백필 / 단체방 fan-out - 규칙 기반만, 중복 제거 + 작업자 풀, 입력 순서 결과)
+def _incoming_batch_args():
+    agent = _get_incoming_agent()
+    agent.verbose = False
+
+    def analyze_one(message: Dict[str, Any]) -> AnalysisResponse:
+        return agent.analyze(
+            message["text"],
+            sender_id=message.get("sender_id"),
+            user_id=message.get("user_id"),
+            use_ai=False
+        )
+
+    def key(message: Dict[str, Any]):
+        # 발신자 신뢰도(3단계)가 발신자/수신자에 따라 달라지므로 함께 비교
+        return message["text"], message.get("sender_id"), message.get("user_id")
+
+    return analyze_one, key
+
+
+def _outgoing_batch_func():
+    agent = _get_outgoing_agent()
+    return lambda text: agent.analyze(text, use_ai=False)
+
+
+def _unwrap_batch(run) -> List[Any]:
+    for index, error in run.errors:
+        raise RuntimeError(f"배치 항목 {index} 분석 실패: {error.detail}") from error.error
+    return run.results
+
+
+@mcp.tool()
+def scan_pii_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Scan many texts for PII in one call.
+    여러 텍스트의 개인정보(PII)를 한 번에 스캔합니다.
+
+    같은 텍스트는 한 번만 스캔하며, 결과는 입력 순서와 같습니다.
+
+    Args:
+        texts: 분석할 텍스트 목록
+
+    Returns:
+        텍스트별 scan_pii 결과 목록
+    """
+    return _unwrap_batch(run_batch(texts, detect_pii))
+
+
+@mcp.tool()
+def analyze_incoming_batch(messages: List[Dict[str, Any]]) -> List[AnalysisResponse]:
+    """
+    Analyze many incoming messages for phishing or scams in one call (rule-based).
+    여러 수신 메시지의 피싱/사기 위협을 한 번에 탐지합니다 (규칙 기반 4단계).
+
+    같은 (텍스트, 발신자, 수신자)는 한 번만 분석하며, 결과는 입력 순서와 같습니다.
+
+    Args:
+        messages: [{"text": 메시지, "sender_id": 발신자 ID(선택), "user_id": 수신자 ID(선택)}]
+
+    Returns:
+        메시지별 AnalysisResponse 목록
+    """
+    analyze_one, key = _incoming_batch_args()
+    return _unwrap_batch(run_batch(messages, analyze_one, key=key))
+
+
+async def analyze_incoming_batch_async(messages: List[Dict[str, Any]]):
+    """analyze_incoming_batch의 비동기 버전 (BatchRun 반환 - 항목별 실패 포함)"""
+    analyze_one, key = _incoming_batch_args()
+    return await run_batch_async(messages, analyze_one, key=key)
+
+
+async def analyze_outgoing_batch_async(texts: List[str]):
+    """발신 메시지 배치 분석 (규칙 기반, BatchRun 반환 - 항목별 실패 포함)"""
+    return await run_batch_async(texts, _outgoing_batch_func())
+
+
+def analyze_incoming_stream(text: str, sender_id: str = None, user_id: str = None, use_ai: bool = False):
+    """analyze_incoming의 단계별 스트리밍 버전 (비동기 제너레이터, IncomingAgent.analyze_stream 참고)"""
+    agent = _get_incoming_agent()
+    return agent.analyze_stream(text, sender_id=sender_id, user_id=user_id, use_ai=use_ai)
+
+
 @mcp.tool()
 def analyze_image(image_path: str, use_ai: bool = True) -> AnalysisResponse:
     """
@@ -118,8 +239,10 @@ def analyze_image(image_path: str, use_ai: bool = True) -> AnalysisResponse:
                 is_secret_recommended=False
             )
 
-        # Extract text using Kanana Vision
-        extracted_text = vision_model.analyze_image(image_path)
+        # Extract text using Kanana Vision (LLM 스케줄러 vision 클래스 슬롯)
+        from ..llm.scheduler import get_llm_scheduler
+        with get_llm_scheduler().slot("vision"):
+            extracted_text = vision_model.analyze_image(image_path)
         print(f"[analyze_image] OCR Result: {extracted_text[:200]}..." if len(extracted_text) > 200 else f"[analyze_image] OCR Result: {extracted_text}")
 
         # Step 2: 텍스트 분석 (2-Tier 방식)
@@ -283,14 +406,10 @@ def analyze_full(text: str) -> Dict[str, Any]:
         recommended_action: 권장 조치
         summary: 분석 요약 (한글)
     """
-    # 1. PII 스캔
-    pii_result = detect_pii(text)
-
-    # 2. 위험도 평가
-    risk_result = calculate_risk(pii_result["found_pii"])
-
-    # 3. 권장 조치
-    action = get_risk_action(risk_result["final_risk"])
+    # 1~3. PII 스캔 → 위험도 평가 → 권장 조치 (컴파일된 엔진으로 일괄 수행)
+    result = get_pii_engine().analyze(text)
+    pii_result = result["pii_scan"]
+    action = result["recommended_action"]
 
     # 4. 요약 생성
     if pii_result["count"] == 0:
@@ -300,12 +419,8 @@ def analyze_full(text: str) -> Dict[str, Any]:
         unique_names = list(set(detected_names))
         summary = f"{len(unique_names)}종의 민감정보 감지: {', '.join(unique_names)}. {action}"
 
-    return {
-        "pii_scan": pii_result,
-        "risk_evaluation": risk_result,
-        "recommended_action": action,
-        "summary": summary
-    }
+    result["summary"] = summary
+    return result
 
 
 # ============================================================
@@ -671,12 +786,16 @@ def analyze_incoming_full(
         recommended_action: 권장 조치
     """
     from ..core.threat_matcher import analyze_incoming_message
+    from ..core.message_features import extract_message_features
     from ..core.scam_checker import check_scam_in_message
     from ..core.conversation_analyzer import analyze_sender_risk
     from ..core.action_policy import get_combined_policy, format_warning_for_ui
 
+    # 메시지 특징 1회 추출 (모든 단계 공유)
+    features = extract_message_features(text)
+
     # Stage 1: 텍스트 패턴 분석
-    stage1 = analyze_incoming_message(text)
+    stage1 = analyze_incoming_message(text, features)
     # threat_matcher는 소문자(safe/low/medium/high/critical) 반환
     # action_policy는 대문자(LOW/MEDIUM/HIGH/CRITICAL) 사용
     level_map = {"safe": "LOW", "low": "LOW", "medium": "MEDIUM", "high": "HIGH", "critical": "CRITICAL"}
@@ -684,12 +803,12 @@ def analyze_incoming_full(
     threat_level = level_map.get(raw_level, "LOW")
 
     # Stage 2: 신고 DB 조회
-    stage2 = check_scam_in_message(text)
+    stage2 = check_scam_in_message(text, features)
 
     # Stage 3: 발신자 신뢰도 (user_id, sender_id 있는 경우)
     stage3 = None
     if user_id and sender_id:
-        stage3 = analyze_sender_risk(user_id, sender_id, text)
+        stage3 = analyze_sender_risk(user_id, sender_id, text, features)
 
     # Stage 4: 종합 정책 결정
     scenario_match = None
@@ -4,6 +4,11 @@ Prompt Templates for KAT Security Agents
 from .outgoing_agent import (
     OUTGOING_AGENT_SYSTEM_PROMPT_TEMPLATE,
     OUTGOING_TOOLS_DESCRIPTION,
+    OUTGOING_PREANALYZED_SYSTEM_PROMPT_TEMPLATE,
     get_outgoing_system_prompt,
+    get_outgoing_preanalyzed_system_prompt,
+    build_preanalyzed_message,
+    get_outgoing_prompt_builder,
     clear_prompt_cache,
 )
+from .prompt_builder import PromptBuilder, PromptSection, BuiltPrompt, count_tokens, pii_hits
@@ -3,12 +3,27 @@ Outgoing Agent Prompts - 안심 전송 Agent 프롬프트
 Kanana LLM이 먼저 판단하고, 민감정보가 있으면 MCP 도구를 호출하는 ReAct 패턴
 
 v2.0 - sensitive_patterns.json 동적 로드 지원
+v2.1 - 단일 호출 모드: 규칙 분석(scan_pii + evaluate_risk) 결과를 프롬프트에 미리 넣고 JSON 판정 1회 요청
+v2.2 - 규칙 탐지 결과(hits)를 주면 관련 카탈로그/조합 규칙/예시만 토큰 예산 안에서 조립 (prompt_builder)
 """
-from typing import Dict, Any
+import json
+from typing import Dict, Any, Iterable, List, Optional
 from ..core.pattern_matcher import (
     get_pii_patterns,
     get_combination_rules,
 )
+from ..core.rule_snapshot import get_rule_snapshot
+from . import prompt_builder
+from .prompt_builder import PromptBuilder, PromptSection
+
+
+def _pii_category_lines(cat_id: str, cat_info: Dict[str, Any]) -> List[str]:
+    """PII 카테고리 1개의 프롬프트용 줄"""
+    lines = [f"\n### {cat_info['name_ko']} ({cat_id})", f"{cat_info['description']}"]
+    for item in cat_info['items']:
+        ai_tag = " [AI분석필요]" if item.get('requires_ai') else ""
+        lines.append(f"- **{item['name_ko']}** ({item['id']}): {item['risk_level']}{ai_tag}")
+    return lines
 
 
 def _build_pii_reference() -> str:
@@ -17,11 +32,7 @@ def _build_pii_reference() -> str:
     lines = []
 
     for cat_id, cat_info in patterns.items():
-        lines.append(f"\n### {cat_info['name_ko']} ({cat_id})")
-        lines.append(f"{cat_info['description']}")
-        for item in cat_info['items']:
-            ai_tag = " [AI분석필요]" if item.get('requires_ai') else ""
-            lines.append(f"- **{item['name_ko']}** ({item['id']}): {item['risk_level']}{ai_tag}")
+        lines.extend(_pii_category_lines(cat_id, cat_info))
 
     return "\n".join(lines)
 
@@ -151,6 +162,30 @@ Thought: 주민등록번호는 단독으로도 CRITICAL입니다.
 Answer: {{"risk_level": "CRITICAL", "detected_pii": ["주민등록번호"], "reasons": ["주민등록번호 패턴이 감지되었습니다."], "is_secret_recommended": true, "recommended_action": "시크릿 전송 필수"}}
 """
 
+# 단일 호출 시스템 프롬프트 (도구 결과를 사용자 메시지에 미리 주입 - 도구 설명/ReAct 예시 없음)
+OUTGOING_PREANALYZED_SYSTEM_PROMPT_TEMPLATE = """당신은 카카오톡 보안 에이전트 "안심 전송"입니다.
+
+사용자가 보내려는 메시지와 규칙 엔진의 분석 결과(scan_pii + evaluate_risk, 조합 규칙 적용 완료)가 함께 주어집니다.
+도구를 호출하지 말고, 분석 결과와 메시지 맥락을 검토하여 최종 판정을 JSON 하나로만 답하세요.
+
+## 민감정보 유형 및 위험도
+{pii_reference}
+
+## 위험도 조합 규칙
+{combination_rules}
+
+## 판단 기준
+1. 규칙 분석 결과(final_risk)를 기본으로 판정
+2. [AI분석필요] 항목(이름, 주소, 비밀번호 등)은 맥락을 보고 실제 민감정보인지 판단
+3. 규칙이 놓친 민감정보가 맥락상 분명하면 조합 규칙에 따라 위험도를 올림
+4. 패턴만 비슷하고 민감정보가 아니면(주문번호, 날짜 등) 위험도를 낮출 수 있음 - reasons에 이유 명시
+5. MEDIUM 이상이면 시크릿 전송 권장
+6. 항상 한국어로 응답
+
+## 응답 형식 (JSON 객체만 출력, 다른 텍스트 금지)
+{{"risk_level": "LOW|MEDIUM|HIGH|CRITICAL", "detected_pii": ["민감정보 이름"], "reasons": ["판정 이유"], "is_secret_recommended": true/false, "recommended_action": "전송|시크릿 전송 권장|시크릿 전송 강력 권장|시크릿 전송 필수"}}
+"""
+
 # 이미지 분석용 프롬프트 (Vision -> Instruct 체인용)
 IMAGE_ANALYSIS_PROMPT = """이미지에서 추출된 텍스트를 분석합니다.
 
@@ -161,22 +196,135 @@ IMAGE_ANALYSIS_PROMPT = """이미지에서 추출된 텍스트를 분석합니
 """
 
 
+# 예시별 관련 PII (태그가 탐지 결과와 겹치면 포함, 태그가 없으면 예산이 남을 때 포함)
+_EXAMPLE_TAGS = {
+    "예시 1": (),
+    "예시 2": ("name", "account", "financial_info"),
+    "예시 3": ("resident_id", "government_id"),
+}
+
+_CATALOG_MARK = "\x00catalog\x00"
+_RULES_MARK = "\x00rules\x00"
+
+
+def _catalog_sections() -> List[PromptSection]:
+    """PII 카테고리별 섹션 (맥락 판단 항목이 있는 카테고리는 context)"""
+    sections = []
+    for cat_id, cat_info in get_pii_patterns().items():
+        tags = {cat_id} | {item["id"] for item in cat_info["items"]}
+        kind = PromptSection.CONTEXT if any(item.get("requires_ai") for item in cat_info["items"]) else PromptSection.RELEVANT
+        text = "\n" + "\n".join(_pii_category_lines(cat_id, cat_info))
+        sections.append(PromptSection(f"catalog:{cat_id}", text, tags, kind))
+    return sections
+
+
+def _rule_sections(groups: Dict[str, str]) -> List[PromptSection]:
+    """조합 규칙 패턴별 섹션 (규칙 그룹 제목은 그룹의 첫 패턴 앞에 한 번)"""
+    rules = get_combination_rules()
+    sections = []
+    for rule_id, rule_info in rules['combination_rules'].items():
+        group = f"rule:{rule_id}"
+        groups[group] = f"\n\n### {rule_info['name_ko']}\n{rule_info['description']}"
+        for n, pattern in enumerate(rule_info['patterns']):
+            required = " + ".join(pattern['required'])
+            tags = set(pattern['required']) | set(pattern.get('any_of', ()))
+            text = f"\n- {required} → **{pattern['result_risk']}** ({pattern['reason']})"
+            sections.append(PromptSection(f"{group}:{n}", text, tags, group=group))
+
+    groups["escalation"] = "\n\n### 자동 위험도 상향"
+    for n, esc in enumerate(rules['auto_escalation']['count_based']):
+        text = f"\n- {esc['min_items']}개 이상 감지 → **{esc['escalate_to']}** ({esc['reason']})"
+        sections.append(PromptSection(f"escalation:count:{n}", text, kind=PromptSection.CONTEXT, group="escalation"))
+    for n, combo in enumerate(rules['auto_escalation']['category_combination']):
+        text = f"\n- {' + '.join(combo['categories'])} 동시 노출 → **{combo['escalate_to']}** ({combo['reason']})"
+        sections.append(PromptSection(f"escalation:category:{n}", text, combo['categories'], group="escalation"))
+    return sections
+
+
+def _template_builder(template: str, **kwargs) -> PromptBuilder:
+    """
+    시스템 프롬프트 템플릿 → 섹션 빌더
+
+    카탈로그 / 조합 규칙 자리는 항목별 섹션으로, "## 예시" 아래는 예시별 섹션으로 나누고
+    나머지 지시문은 필수 섹션으로 둔다. 모든 섹션을 넣으면 기존 프롬프트와 같은 문자열.
+    """
+    formatted = template.format(pii_reference=_CATALOG_MARK, combination_rules=_RULES_MARK, **kwargs)
+    head, rest = formatted.split(_CATALOG_MARK)
+    middle, tail = rest.split(_RULES_MARK)
+    instructions, marker, examples = tail.partition("## 예시\n")
+
+    groups = {}
+    # 카탈로그 섹션이 각자 앞 줄바꿈을 가지므로 머리말 끝 줄바꿈 1개를 뗀다
+    sections = [PromptSection("head", head[:-1], kind=PromptSection.REQUIRED)]
+    sections += _catalog_sections()
+    sections.append(PromptSection("rules", middle, kind=PromptSection.REQUIRED))
+    sections += _rule_sections(groups)
+    sections.append(PromptSection("instructions", instructions, kind=PromptSection.REQUIRED))
+    if marker:
+        lead, *blocks = examples.split("### ")
+        groups["examples"] = marker + lead
+        for block in blocks:
+            title = block.split(":", 1)[0]
+            tags = _EXAMPLE_TAGS.get(title, ())
+            kind = PromptSection.RELEVANT if tags else PromptSection.CONTEXT
+            sections.append(PromptSection(f"example:{title}", "### " + block, tags, kind, group="examples"))
+    return PromptBuilder(sections, groups=groups)
+
+
 # 캐시된 프롬프트 (JSON 로드 비용 절감)
 _cached_prompt: str = None
+_cached_preanalyzed_prompt: str = None
+_cached_builders: Dict[str, PromptBuilder] = {}
+# 캐시를 만든 규칙 스냅샷 버전 (핫 리로드 / 롤백으로 바뀌면 캐시 초기화)
+_cached_rule_version: Optional[str] = None
+
 
+def _check_rule_version() -> None:
+    """규칙 스냅샷이 바뀌었으면 프롬프트 캐시 초기화"""
+    global _cached_rule_version
+    version = get_rule_snapshot().version
+    if version != _cached_rule_version:
+        clear_prompt_cache()
+        _cached_rule_version = version
 
-def get_outgoing_system_prompt(use_cache: bool = True) -> str:
+
+def get_outgoing_prompt_builder(preanalyzed: bool = False) -> PromptBuilder:
+    """
+    관련 섹션만 조립하는 빌더 (ReAct / 단일 호출 시스템 프롬프트)
+
+    Args:
+        preanalyzed: True면 단일 호출 모드 프롬프트
+    """
+    _check_rule_version()
+    name = "preanalyzed" if preanalyzed else "react"
+    builder = _cached_builders.get(name)
+    if builder is None:
+        if preanalyzed:
+            builder = _template_builder(OUTGOING_PREANALYZED_SYSTEM_PROMPT_TEMPLATE)
+        else:
+            builder = _template_builder(OUTGOING_AGENT_SYSTEM_PROMPT_TEMPLATE, tools_description=OUTGOING_TOOLS_DESCRIPTION)
+        _cached_builders[name] = builder
+    return builder
+
+
+def get_outgoing_system_prompt(use_cache: bool = True, hits: Optional[Iterable[str]] = None) -> str:
     """
     전체 시스템 프롬프트 반환 (JSON 데이터 동적 주입)
 
     Args:
         use_cache: 캐시 사용 여부 (기본: True)
+        hits: 규칙 탐지 결과 (prompt_builder.pii_hits) - 주면 관련 섹션만 토큰 예산 안에서 조립
 
     Returns:
         완성된 시스템 프롬프트
     """
     global _cached_prompt
 
+    if hits is not None and prompt_builder.PROMPT_PRUNING:
+        return get_outgoing_prompt_builder().build(hits).text
+
+    _check_rule_version()
+
     if use_cache and _cached_prompt:
         return _cached_prompt
 
@@ -196,7 +344,70 @@ def get_outgoing_system_prompt(use_cache: bool = True) -> str:
     return prompt
 
 
+def get_outgoing_preanalyzed_system_prompt(use_cache: bool = True, hits: Optional[Iterable[str]] = None) -> str:
+    """
+    단일 호출 모드 시스템 프롬프트 반환 (JSON 데이터 동적 주입)
+
+    Args:
+        use_cache: 캐시 사용 여부 (기본: True)
+        hits: 규칙 탐지 결과 (prompt_builder.pii_hits) - 주면 관련 섹션만 토큰 예산 안에서 조립
+
+    Returns:
+        완성된 시스템 프롬프트
+    """
+    global _cached_preanalyzed_prompt
+
+    if hits is not None and prompt_builder.PROMPT_PRUNING:
+        return get_outgoing_prompt_builder(preanalyzed=True).build(hits).text
+
+    _check_rule_version()
+
+    if use_cache and _cached_preanalyzed_prompt:
+        return _cached_preanalyzed_prompt
+
+    prompt = OUTGOING_PREANALYZED_SYSTEM_PROMPT_TEMPLATE.format(
+        pii_reference=_build_pii_reference(),
+        combination_rules=_build_combination_rules_reference()
+    )
+
+    if use_cache:
+        _cached_preanalyzed_prompt = prompt
+
+    return prompt
+
+
+def build_preanalyzed_message(text: str, analysis: Dict[str, Any]) -> str:
+    """
+    단일 호출 모드 사용자 메시지 (원문 + 규칙 분석 결과)
+
+    Args:
+        text: 발신 메시지
+        analysis: PIIEngine.analyze() 결과 (pii_scan, risk_evaluation, recommended_action)
+
+    Returns:
+        LLM에 보낼 사용자 메시지
+    """
+    pii_scan = analysis["pii_scan"]
+    risk = analysis["risk_evaluation"]
+    observation = {
+        "found_pii": [
+            {key: item[key] for key in ("id", "name_ko", "category", "risk_level", "value") if key in item}
+            for item in pii_scan["found_pii"]
+        ],
+        "final_risk": risk["final_risk"],
+        "escalation_reason": risk["escalation_reason"],
+        "is_secret_recommended": risk["is_secret_recommended"],
+        "recommended_action": analysis["recommended_action"],
+    }
+    return (
+        f"메시지: {json.dumps(text, ensure_ascii=False)}\n\n"
+        f"규칙 분석 결과:\n{json.dumps(observation, ensure_ascii=False)}"
+    )
+
+
 def clear_prompt_cache():
     """프롬프트 캐시 초기화 (JSON 업데이트 후 호출)"""
-    global _cached_prompt
+    global _cached_prompt, _cached_preanalyzed_prompt
     _cached_prompt = None
+    _cached_preanalyzed_prompt = None
+    _cached_builders.clear()
@@ -0,0 +1,185 @@
+"""
+Prompt Builder - 규칙 탐지 결과에 맞춰 프롬프트를 토큰 예산 안에서 조립
+
+LLM 지연은 프리필(입력 토큰)이 대부분이므로, 전체 PII 카탈로그 / 조합 규칙 / few-shot 예시를
+매번 보내지 않고 메시지의 규칙 탐지 결과(PII id, 카테고리)와 관련된 섹션만 넣는다.
+
+섹션 종류:
+- required: 항상 포함 (역할, 응답 형식 등 - 예산을 넘어도 포함)
+- relevant: 태그가 탐지 결과와 겹치면 우선 포함 (겹치는 태그가 많은 순)
+- context: 규칙이 놓치기 쉬운 맥락 판단 항목 (이름, 주소, 건강정보 등) - 관련 섹션을 넣고 예산이 남으면 포함
+- 탐지 결과와 겹치지 않는 relevant 섹션은 가장 낮은 순위로 남은 예산을 채운다
+  (탐지 결과가 없어도 예산이 충분하면 전체 프롬프트와 같음)
+
+예산을 넘는 섹션은 건너뛰고 다음 후보를 계속 검사하며, 출력은 원래 섹션 순서를 유지한다.
+group이 같은 섹션은 처음 포함될 때 그룹 제목을 한 번 붙인다.
+
+토큰 수는 토크나이저 없이 추정한다 (한글 음절 1토큰, 그 외 4자당 1토큰).
+섹션별 추정치의 합으로 예산을 판단하므로 전체 문자열 추정보다 약간 크다 (보수적).
+실제 토크나이저가 있으면 PromptBuilder(counter=...)로 교체한다.
+
+KAT_PROMPT_PRUNING=off 이면 모든 섹션을 넣은 전체 프롬프트 (기존과 동일).
+"""
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+# 지시문(사용자 메시지 제외) 토큰 예산
+PROMPT_TOKEN_BUDGET = int(os.getenv("KAT_PROMPT_TOKEN_BUDGET", "1400"))
+# 관련 섹션만 포함 (off: 전체 프롬프트)
+PROMPT_PRUNING = os.getenv("KAT_PROMPT_PRUNING", "on") != "off"
+
+_HANGUL_RE = re.compile(r"[가-힣]")
+
+
+def count_tokens(text: str) -> int:
+    """토큰 수 추정 (한글 음절 1토큰, 그 외 문자 4자당 1토큰)"""
+    hangul = len(_HANGUL_RE.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def pii_hits(found_pii: Iterable[Dict], matched_rules: Iterable = ()) -> Set[str]:
+    """규칙 탐지 결과 → 섹션 태그와 비교할 키 (PII id + 카테고리 + 적용된 조합 규칙)"""
+    hits = set()
+    for item in found_pii:
+        hits.add(item["id"])
+        if item.get("category"):
+            hits.add(item["category"])
+    for rule in matched_rules:
+        hits.add(rule if isinstance(rule, str) else rule.get("rule_id", ""))
+    hits.discard("")
+    return hits
+
+
+class PromptSection:
+    """프롬프트 조각 (태그: 관련 PII id / 카테고리)"""
+
+    __slots__ = ("key", "text", "tags", "kind", "group", "tokens")
+
+    REQUIRED = "required"
+    RELEVANT = "relevant"
+    CONTEXT = "context"
+
+    def __init__(self, key: str, text: str, tags: Iterable[str] = (), kind: str = RELEVANT, group: Optional[str] = None):
+        self.key = key
+        self.text = text
+        self.tags = frozenset(tags)
+        self.kind = kind
+        self.group = group
+        self.tokens = 0
+
+
+class BuiltPrompt:
+    """조립 결과"""
+
+    __slots__ = ("text", "tokens", "full_tokens", "included", "dropped")
+
+    def __init__(self, text: str, tokens: int, full_tokens: int, included: List[str], dropped: List[str]):
+        self.text = text
+        self.tokens = tokens
+        self.full_tokens = full_tokens
+        self.included = included
+        self.dropped = dropped
+
+
+class PromptBuilder:
+    """
+    섹션 목록 → 탐지 결과 관련 섹션만 예산 안에서 조립
+
+    사용법:
+        builder = PromptBuilder(sections, groups={"catalog": "## 민감정보 유형\\n"})
+        prompt = builder.build(pii_hits(found_pii)).text
+    """
+
+    def __init__(
+        self,
+        sections: List[PromptSection],
+        groups: Optional[Dict[str, str]] = None,
+        separator: str = "",
+        token_budget: Optional[int] = None,
+        counter: Callable[[str], int] = count_tokens
+    ):
+        """
+        Args:
+            sections: 출력 순서대로 나열한 섹션
+            groups: 그룹 이름 → 그룹 제목 (그룹의 첫 섹션 앞에 한 번 출력)
+            separator: 조각 사이 구분자
+            token_budget: 토큰 예산 (기본: 조립 시점의 PROMPT_TOKEN_BUDGET)
+            counter: 토큰 수 계산 함수
+        """
+        self.sections = sections
+        self.groups = groups or {}
+        self.separator = separator
+        self.token_budget = token_budget
+        self._separator_tokens = counter(separator) if separator else 0
+        self._group_tokens = {name: counter(title) + self._separator_tokens for name, title in self.groups.items()}
+        for section in sections:
+            section.tokens = counter(section.text) + self._separator_tokens
+        self._full = self._render(sections)
+        self.full_tokens = sum(s.tokens for s in sections) + sum(self._group_tokens.values())
+
+    def _render(self, sections: List[PromptSection]) -> str:
+        parts = []
+        seen_groups = set()
+        for section in sections:
+            if section.group is not None and section.group not in seen_groups:
+                seen_groups.add(section.group)
+                parts.append(self.groups[section.group])
+            parts.append(section.text)
+        return self.separator.join(parts)
+
+    def full(self) -> BuiltPrompt:
+        """전체 프롬프트 (모든 섹션)"""
+        return BuiltPrompt(self._full, self.full_tokens, self.full_tokens, [s.key for s in self.sections], [])
+
+    def build(self, hits: Iterable[str], token_budget: Optional[int] = None, prune: Optional[bool] = None) -> BuiltPrompt:
+        """
+        탐지 결과와 관련된 섹션만 예산 안에서 조립
+
+        Args:
+            hits: 규칙 탐지 키 (pii_hits 결과)
+            token_budget: 이번 조립의 토큰 예산 (기본: 생성 시 예산 → PROMPT_TOKEN_BUDGET)
+            prune: False면 전체 프롬프트 (기본: KAT_PROMPT_PRUNING)
+        """
+        if not (PROMPT_PRUNING if prune is None else prune):
+            return self.full()
+
+        hits = set(hits)
+        if token_budget is None:
+            token_budget = PROMPT_TOKEN_BUDGET if self.token_budget is None else self.token_budget
+        required, relevant, context, fill = [], [], [], []
+        for index, section in enumerate(self.sections):
+            if section.kind == PromptSection.REQUIRED:
+                required.append(index)
+            elif section.tags & hits:
+                relevant.append(index)
+            elif section.kind == PromptSection.CONTEXT:
+                context.append(index)
+            else:
+                fill.append(index)
+        # 겹치는 태그가 많은 섹션 먼저 (같으면 원래 순서)
+        relevant.sort(key=lambda i: -len(self.sections[i].tags & hits))
+
+        chosen = set()
+        groups = set()
+        used = 0
+        for index in required + relevant + context + fill:
+            section = self.sections[index]
+            cost = section.tokens
+            if section.group is not None and section.group not in groups:
+                cost += self._group_tokens[section.group]
+            if section.kind != PromptSection.REQUIRED and used + cost > token_budget:
+                continue
+            chosen.add(index)
+            used += cost
+            if section.group is not None:
+                groups.add(section.group)
+
+        included = [s for i, s in enumerate(self.sections) if i in chosen]
+        return BuiltPrompt(
+            self._render(included),
+            used,
+            self.full_tokens,
+            [s.key for s in included],
+            [s.key for i, s in enumerate(self.sections) if i not in chosen],
+        )
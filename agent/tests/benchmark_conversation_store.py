@@ -0,0 +1,84 @@
+"""
+ConversationStore 벤치마크
+- 쌍 N개 저장 후 register / get_pair / get_conversation_history 지연 측정
+- 링 버퍼로 쌍별 메시지 행 수가 ring_size를 넘지 않는지 확인
+
+실행:
+    python agent/tests/benchmark_conversation_store.py [N]
+"""
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.core import conversation_analyzer
+from agent.core.conversation_store import ConversationStore
+
+
+def main(pairs: int = 200_000):
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ConversationStore(Path(tmp) / "history.db", ring_size=20, ttl_days=None)
+        conn = store._connect()
+        base = datetime.now() - timedelta(days=200)
+
+        # 대량 적재는 한 트랜잭션으로 (측정 대상 아님)
+        start = time.perf_counter()
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO conversation_pairs (user_id, sender_id, first_contact, last_contact, message_count) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                (i // 100, i, 0, 0, rng.randint(1, 500))
+                for i in range(pairs)
+            ),
+        )
+        conn.execute("COMMIT")
+        print("=" * 64)
+        print(f"대화 이력 저장소 벤치마크 (쌍 {pairs:,}개, 적재 {time.perf_counter() - start:.1f}s)")
+        print("=" * 64)
+
+        keys = [(i // 100, i) for i in rng.sample(range(pairs), 5000)]
+
+        start = time.perf_counter()
+        for user_id, sender_id in keys:
+            store.register(user_id, sender_id, "테스트 메시지", base + timedelta(days=rng.randint(0, 199)))
+        elapsed = time.perf_counter() - start
+        print(f"  register              {elapsed / len(keys) * 1e6:10.1f} us/call")
+
+        start = time.perf_counter()
+        for user_id, sender_id in keys:
+            store.get_pair(user_id, sender_id)
+        elapsed = time.perf_counter() - start
+        print(f"  get_pair              {elapsed / len(keys) * 1e6:10.1f} us/call")
+
+        conversation_analyzer._conversation_store = store
+        start = time.perf_counter()
+        for user_id, sender_id in keys:
+            conversation_analyzer.get_conversation_history(user_id, sender_id)
+        elapsed = time.perf_counter() - start
+        print(f"  get_conversation_history {elapsed / len(keys) * 1e6:7.1f} us/call")
+
+        start = time.perf_counter()
+        for user_id, sender_id in keys:
+            conversation_analyzer.analyze_sender_risk(user_id, sender_id, "급하게 송금 부탁해")
+        elapsed = time.perf_counter() - start
+        print(f"  analyze_sender_risk   {elapsed / len(keys) * 1e6:10.1f} us/call")
+
+        # 한 쌍에 메시지를 많이 보내도 메시지 행 수는 ring_size로 고정
+        for i in range(1000):
+            store.register(1, 1, f"메시지 {i}", base + timedelta(minutes=i))
+        rows = conn.execute(
+            "SELECT COUNT(*) FROM conversation_messages WHERE user_id = 1 AND sender_id = 1"
+        ).fetchone()[0]
+        print(f"  1,000건 등록 후 메시지 행 수: {rows} (ring_size={store.ring_size})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,113 @@
+"""
+발신 AI 분석 지연 벤치마크
+ReAct 반복 (LLM이 scan_pii → evaluate_risk 호출 후 판정, 3회 왕복) vs 단일 호출 (규칙 결과 주입 + JSON 1회)
+
+실제 API 대신 지연을 흉내 내는 가짜 엔드포인트(httpx.MockTransport)를 사용한다.
+호출 1회 지연 = 기본 지연 + 프롬프트 길이 비례 지연 (시스템 프롬프트를 매번 다시 보내는 비용 반영)
+
+실행:
+    python agent/tests/benchmark_outgoing_ai.py [반복 횟수] [기본 지연 ms] [프롬프트 1000자당 지연 ms]
+"""
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.agents import outgoing
+from agent.agents.outgoing import OutgoingAgent
+from agent.llm.kanana import KananaLLM, LLMManager
+
+
+MESSAGES = [
+    "홍길동 110-123-456789로 보내줘",
+    "내 주민번호 900101-1234567 이고 주소는 서울시 강남구 테헤란로 123",
+    "카드번호 1234-5678-9012-3456 유효기간 12/27",
+    "여권번호 M12345678 로 예약해줘",
+]
+
+_ANSWER = json.dumps({
+    "risk_level": "HIGH", "detected_pii": ["계좌번호"], "reasons": ["계좌번호 감지"],
+    "is_secret_recommended": True, "recommended_action": "시크릿 전송 강력 권장",
+}, ensure_ascii=False)
+
+
+class FakeEndpoint:
+    """ReAct면 scan_pii → evaluate_risk → 판정, 도구가 없으면 바로 판정"""
+
+    def __init__(self, base_ms: float, per_kchar_ms: float):
+        self.base = base_ms / 1000
+        self.per_char = per_kchar_ms / 1000 / 1000
+        self.calls = 0
+        self.prompt_chars = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/models"):
+            return httpx.Response(200, json={"object": "list", "data": [
+                {"id": "kanana-bench", "object": "model", "created": 0, "owned_by": "bench"}]})
+        body = json.loads(request.content)
+        chars = sum(len(m.get("content") or "") for m in body["messages"])
+        self.calls += 1
+        self.prompt_chars += chars
+        time.sleep(self.base + chars * self.per_char)
+
+        tool_turns = sum(1 for m in body["messages"] if m["role"] == "tool")
+        message = {"role": "assistant", "content": _ANSWER}
+        if body.get("tools") and tool_turns < 2:
+            user = body["messages"][1]["content"]
+            name, args = ("scan_pii", {"text": user}) if tool_turns == 0 else ("evaluate_risk", {"detected_items": []})
+            message = {"role": "assistant", "content": None, "tool_calls": [{
+                "id": f"call_{tool_turns}", "type": "function",
+                "function": {"name": name, "arguments": json.dumps(args, ensure_ascii=False)}}]}
+        return httpx.Response(200, json={
+            "id": "chatcmpl-bench", "object": "chat.completion", "created": 0, "model": "kanana-bench",
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+        })
+
+
+def measure(mode: str, runs: int, base_ms: float, per_kchar_ms: float) -> dict:
+    endpoint = FakeEndpoint(base_ms, per_kchar_ms)
+    llm = KananaLLM(http_client=httpx.Client(transport=httpx.MockTransport(endpoint.handle)),
+                    base_urls=["http://bench.llm/v1"])
+    llm.cache = None  # 캐시 적중 없이 호출 지연만 비교
+    LLMManager._instances["instruct"] = llm
+    outgoing.OUTGOING_AI_MODE = mode
+    agent = OutgoingAgent()
+
+    samples = []
+    for i in range(runs):
+        text = MESSAGES[i % len(MESSAGES)]
+        start = time.perf_counter()
+        agent.analyze(text, use_ai=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    LLMManager._instances.clear()
+    return {
+        "p50_ms": statistics.median(samples),
+        "max_ms": max(samples),
+        "calls": endpoint.calls / runs,
+        "prompt_chars": endpoint.prompt_chars / runs,
+    }
+
+
+def main(runs: int = 8, base_ms: float = 200, per_kchar_ms: float = 20):
+    print("=" * 60)
+    print(f"발신 AI 분석 지연 (기본 {base_ms:.0f}ms + 프롬프트 1000자당 {per_kchar_ms:.0f}ms, {runs}회)")
+    print("=" * 60)
+    results = {}
+    for mode in ("react", "single"):
+        results[mode] = measure(mode, runs, base_ms, per_kchar_ms)
+        r = results[mode]
+        print(f"{mode:>7}: p50 {r['p50_ms']:7.1f}ms  max {r['max_ms']:7.1f}ms  "
+              f"호출 {r['calls']:.1f}회  프롬프트 {r['prompt_chars']:,.0f}자")
+    saved = 1 - results["single"]["p50_ms"] / results["react"]["p50_ms"]
+    print(f"\n단일 호출 모드: 지연 {saved:.0%} 감소")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) if i else int(arg) for i, arg in enumerate(sys.argv[1:])))
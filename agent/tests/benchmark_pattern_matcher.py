@@ -0,0 +1,236 @@
+"""
+Pattern Matcher 마이크로벤치마크
+- 레거시 detect_pii/calculate_risk (매 호출마다 패턴 목록 재구성) vs CompiledPIIEngine
+- 50KB 합성 OCR 텍스트 (가족관계증명서/주민등록등본 형태)에서 중복 범위 판정 비용
+
+실행:
+    python agent/tests/benchmark_pattern_matcher.py
+"""
+import csv
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.core.pattern_matcher import (
+    _get_patterns_data,
+    detect_pii,
+    calculate_risk,
+)
+
+
+# ============================================================
+# 레거시 구현 (비교 기준) - 변경 전 pattern_matcher 로직 그대로
+# ============================================================
+
+def legacy_detect_pii(text: str) -> dict:
+    """변경 전 detect_pii: 호출마다 패턴 수집/정렬 + 문자열 정규식 사용"""
+    data = _get_patterns_data()
+    found_pii = []
+    categories_found = set()
+    highest_risk = "LOW"
+    risk_order = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+    priority_order = {
+        "resident_id": 1, "foreigner_id": 1, "card": 2, "passport": 3,
+        "driver_license": 3, "phone": 4, "account": 5, "birth_date": 10,
+    }
+
+    all_patterns = []
+    for cat_id, cat_info in data["categories"].items():
+        for item in cat_info["items"]:
+            if item.get("regex"):
+                all_patterns.append({
+                    "item": item,
+                    "category": cat_id,
+                    "priority": priority_order.get(item["id"], 10)
+                })
+    all_patterns.sort(key=lambda x: x["priority"])
+
+    matched_ranges = []
+
+    def is_overlapping(start, end):
+        for m_start, m_end in matched_ranges:
+            if not (end <= m_start or start >= m_end):
+                return True
+        return False
+
+    for pattern_info in all_patterns:
+        item = pattern_info["item"]
+        try:
+            for match in re.finditer(item["regex"], text):
+                start, end = match.start(), match.end()
+                if is_overlapping(start, end):
+                    continue
+                matched_ranges.append((start, end))
+                found_pii.append({
+                    "id": item["id"],
+                    "category": pattern_info["category"],
+                    "value": match.group(),
+                    "risk_level": item["risk_level"],
+                    "name_ko": item["name_ko"]
+                })
+                categories_found.add(pattern_info["category"])
+                if risk_order[item["risk_level"]] > risk_order[highest_risk]:
+                    highest_risk = item["risk_level"]
+        except re.error:
+            continue
+
+    return {
+        "found_pii": found_pii,
+        "categories_found": list(categories_found),
+        "highest_risk": highest_risk,
+        "count": len(found_pii)
+    }
+
+
+def legacy_calculate_risk(detected_items: list) -> dict:
+    """변경 전 calculate_risk: 호출마다 규칙을 set으로 재구성"""
+    if not detected_items:
+        return {"final_risk": "LOW", "base_risk": "LOW", "escalation_reason": None,
+                "is_secret_recommended": False, "matched_rules": []}
+
+    data = _get_patterns_data()
+    risk_order = {"LOW": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
+    base_risk = "LOW"
+    for item in detected_items:
+        if risk_order[item["risk_level"]] > risk_order[base_risk]:
+            base_risk = item["risk_level"]
+
+    final_risk = base_risk
+    escalation_reason = None
+    matched_rules = []
+    detected_ids = {item["id"] for item in detected_items}
+    detected_categories = {item["category"] for item in detected_items}
+
+    for rule_id, rule_info in data["combination_rules"].items():
+        for pattern in rule_info["patterns"]:
+            required = set(pattern["required"])
+            any_of = set(pattern.get("any_of", []))
+            if required.issubset(detected_ids):
+                if not any_of or any_of.intersection(detected_ids):
+                    result_risk = pattern["result_risk"]
+                    if risk_order[result_risk] > risk_order[final_risk]:
+                        final_risk = result_risk
+                        escalation_reason = f"{rule_info['name_ko']} - {pattern['reason']}"
+                        matched_rules.append(rule_id)
+
+    count = len(detected_items)
+    for escalation in data["auto_escalation"]["count_based"]:
+        if count >= escalation["min_items"]:
+            if risk_order[escalation["escalate_to"]] > risk_order[final_risk]:
+                final_risk = escalation["escalate_to"]
+                escalation_reason = escalation["reason"]
+
+    for combo in data["auto_escalation"]["category_combination"]:
+        if set(combo["categories"]).issubset(detected_categories):
+            if risk_order[combo["escalate_to"]] > risk_order[final_risk]:
+                final_risk = combo["escalate_to"]
+                escalation_reason = combo["reason"]
+
+    return {
+        "final_risk": final_risk,
+        "base_risk": base_risk,
+        "escalation_reason": escalation_reason,
+        "is_secret_recommended": risk_order[final_risk] >= risk_order["MEDIUM"],
+        "matched_rules": matched_rules,
+        "detected_count": count
+    }
+
+
+# ============================================================
+# 벤치마크
+# ============================================================
+
+def load_messages() -> list:
+    """TestData CSV 문장 + 일반 대화 문장"""
+    csv_path = project_root / "TestData" / "Text" / "개인정보 데이터 샘플문장 생성 - 개인정보 생성 데이터.csv"
+    messages = []
+    with open(csv_path, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            messages.append(row["테스트 데이터 (문장/내용)"])
+    messages.extend([
+        "오늘 점심 뭐 먹을까?",
+        "ㅋㅋㅋ 그래 내일 봐",
+        "회의 자료 보내드렸습니다. 확인 부탁드려요.",
+    ])
+    return messages
+
+
+def make_ocr_text(target_bytes: int = 50_000, seed: int = 7) -> str:
+    """가족관계증명서/주민등록표 등본 OCR 결과를 흉내낸 합성 텍스트"""
+    rng = random.Random(seed)
+    names = ["김민수", "이영희", "박지훈", "최인재", "정수빈", "한서연"]
+    relations = ["본인", "배우자", "자녀", "부", "모", "세대원"]
+    lines = ["가족관계증명서", "등록기준지 서울특별시 강남구 역삼동", "구분 성명 출생연월일 주민등록번호 성별"]
+    size = sum(len(line.encode("utf-8")) + 1 for line in lines)
+    while size < target_bytes:
+        birth = f"{rng.randint(1940, 2015)}년 {rng.randint(1, 12):02d}월 {rng.randint(1, 28):02d}일"
+        rid = f"{rng.randint(0, 999999):06d}-{rng.randint(1, 4)}{rng.randint(0, 999999):06d}"
+        line = (
+            f"{rng.choice(relations)} {rng.choice(names)} {birth} {rid} "
+            f"연락처 010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)} "
+            f"전입 {rng.randint(1990, 2024)}.{rng.randint(1, 12)}.{rng.randint(1, 28)} "
+            f"계좌 {rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(100000, 999999)}"
+        )
+        lines.append(line)
+        size += len(line.encode("utf-8")) + 1
+    return "\n".join(lines)
+
+
+def bench(label: str, fn, messages: list, rounds: int) -> float:
+    """메시지당 평균 소요 시간(us) 측정"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in messages:
+            fn(text)
+    elapsed = time.perf_counter() - start
+    per_message_us = elapsed / (rounds * len(messages)) * 1_000_000
+    print(f"  {label:<28} {per_message_us:8.2f} us/message")
+    return per_message_us
+
+
+def main(rounds: int = 200):
+    messages = load_messages()
+
+    # 결과 동일성 확인
+    for text in messages:
+        legacy = legacy_detect_pii(text)
+        current = detect_pii(text)
+        assert legacy == current, f"detect_pii mismatch: {text}"
+        assert legacy_calculate_risk(legacy["found_pii"]) == calculate_risk(current["found_pii"]), \
+            f"calculate_risk mismatch: {text}"
+
+    print("=" * 60)
+    print(f"PII 분석 마이크로벤치마크 ({len(messages)}개 메시지 x {rounds}회)")
+    print("=" * 60)
+
+    def legacy_full(text):
+        return legacy_calculate_risk(legacy_detect_pii(text)["found_pii"])
+
+    def current_full(text):
+        return calculate_risk(detect_pii(text)["found_pii"])
+
+    before = bench("legacy detect+risk", legacy_full, messages, rounds)
+    after = bench("CompiledPIIEngine detect+risk", current_full, messages, rounds)
+    print(f"  speedup: x{before / after:.2f}")
+
+    # 긴 OCR 텍스트: 매칭 수가 많을수록 선형 겹침 검사가 지배적
+    ocr_texts = [make_ocr_text(seed=seed) for seed in range(3)]
+    for text in ocr_texts:
+        assert legacy_detect_pii(text) == detect_pii(text), "detect_pii mismatch on OCR text"
+
+    matches = detect_pii(ocr_texts[0])["count"]
+    print()
+    print(f"50KB 합성 OCR 텍스트 ({len(ocr_texts)}개, 문서당 PII {matches}건)")
+    before = bench("legacy detect_pii", legacy_detect_pii, ocr_texts, 3)
+    after = bench("SpanIndex detect_pii", detect_pii, ocr_texts, 3)
+    print(f"  speedup: x{before / after:.2f}")
+
+
+if __name__ == "__main__":
+    main()
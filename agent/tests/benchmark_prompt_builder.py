@@ -0,0 +1,146 @@
+"""
+프롬프트 축소(PromptBuilder) 벤치마크
+TestData/Text 개인정보 샘플 CSV의 각 문장에 대해 전체 프롬프트 vs 규칙 탐지 결과 관련 섹션만 넣은 프롬프트
+
+1. 프롬프트 크기 (추정 토큰 / 문자) - 발신 ReAct, 발신 단일 호출, Hybrid PII 감지
+2. 종단 지연 - OutgoingAgent(단일 호출) / HybridAnalyzer를 가짜 엔드포인트(httpx.MockTransport)로 실행
+   호출 1회 지연 = 기본 지연 + 입력 토큰 비례 지연 (프리필 비용 반영)
+
+실행:
+    python agent/tests/benchmark_prompt_builder.py [기본 지연 ms] [입력 1000토큰당 지연 ms] [토큰 예산]
+"""
+import csv
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.agents import outgoing
+from agent.agents.outgoing import OutgoingAgent, _analysis_hits
+from agent.core.hybrid_analyzer import HybridAnalyzer, get_pii_prompt_builder
+from agent.core.pattern_matcher import get_pii_engine
+from agent.llm.kanana import KananaLLM, LLMManager
+from agent.prompts import prompt_builder
+from agent.prompts.outgoing_agent import clear_prompt_cache, get_outgoing_prompt_builder
+from agent.prompts.prompt_builder import count_tokens, pii_hits
+
+
+CSV_PATH = project_root / "TestData" / "Text" / "개인정보 데이터 샘플문장 생성 - 개인정보 생성 데이터.csv"
+TEXT_COLUMN = "테스트 데이터 (문장/내용)"
+
+# 발신 판정 + Hybrid PII 감지 양쪽에서 파싱 가능한 응답
+_ANSWER = json.dumps({
+    "risk_level": "MEDIUM", "detected_pii": [], "reasons": ["벤치마크 응답"],
+    "is_secret_recommended": True, "recommended_action": "시크릿 전송 권장",
+    "found_pii": [],
+}, ensure_ascii=False)
+
+
+def load_texts() -> list:
+    with open(CSV_PATH, encoding="utf-8") as f:
+        return [row[TEXT_COLUMN] for row in csv.DictReader(f) if row.get(TEXT_COLUMN)]
+
+
+class FakeEndpoint:
+    """입력 토큰 수에 비례해 지연하는 OpenAI 호환 엔드포인트"""
+
+    def __init__(self, base_ms: float, per_ktoken_ms: float):
+        self.base = base_ms / 1000
+        self.per_token = per_ktoken_ms / 1000 / 1000
+        self.calls = 0
+        self.tokens = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/models"):
+            return httpx.Response(200, json={"object": "list", "data": [
+                {"id": "kanana-bench", "object": "model", "created": 0, "owned_by": "bench"}]})
+        body = json.loads(request.content)
+        tokens = sum(count_tokens(m.get("content") or "") for m in body["messages"])
+        self.calls += 1
+        self.tokens += tokens
+        time.sleep(self.base + tokens * self.per_token)
+        return httpx.Response(200, json={
+            "id": "chatcmpl-bench", "object": "chat.completion", "created": 0, "model": "kanana-bench",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": _ANSWER}, "finish_reason": "stop"}],
+        })
+
+
+def prompt_sizes(texts: list) -> None:
+    """전체 vs 축소 프롬프트 크기"""
+    engine = get_pii_engine()
+    hits = [_analysis_hits(engine.analyze(text)) for text in texts]
+    builders = [
+        ("발신 ReAct", get_outgoing_prompt_builder()),
+        ("발신 단일 호출", get_outgoing_prompt_builder(preanalyzed=True)),
+        ("Hybrid PII", get_pii_prompt_builder()),
+    ]
+    print(f"{'프롬프트':<12} {'전체 토큰':>9} {'축소 평균':>9} {'축소 최대':>9} {'문자 전체→평균':>16}")
+    for name, builder in builders:
+        built = [builder.build(h) for h in hits]
+        tokens = [b.tokens for b in built]
+        chars = statistics.mean(len(b.text) for b in built)
+        print(f"{name:<12} {builder.full_tokens:>9,} {statistics.mean(tokens):>9,.0f} {max(tokens):>9,} "
+              f"{len(builder.full().text):>7,} → {chars:>6,.0f}  ({1 - statistics.mean(tokens) / builder.full_tokens:.0%} 감소)")
+
+
+def measure(texts: list, pruning: bool, base_ms: float, per_ktoken_ms: float) -> dict:
+    """CSV 전체를 발신 단일 호출 + Hybrid 분석으로 1회씩 처리"""
+    endpoint = FakeEndpoint(base_ms, per_ktoken_ms)
+    llm = KananaLLM(http_client=httpx.Client(transport=httpx.MockTransport(endpoint.handle)),
+                    base_urls=["http://bench.llm/v1"])
+    llm.cache = None  # 캐시 적중 없이 호출 지연만 비교
+    LLMManager._instances["instruct"] = llm
+    prompt_builder.PROMPT_PRUNING = pruning
+    clear_prompt_cache()
+    outgoing.OUTGOING_AI_MODE = "single"
+    agent = OutgoingAgent()
+    hybrid = HybridAnalyzer()
+
+    samples = {"outgoing": [], "hybrid": []}
+    for text in texts:
+        start = time.perf_counter()
+        agent.analyze(text, use_ai=True)
+        samples["outgoing"].append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        hybrid.analyze(text)
+        samples["hybrid"].append((time.perf_counter() - start) * 1000)
+    LLMManager._instances.clear()
+    return {
+        "outgoing_p50": statistics.median(samples["outgoing"]),
+        "hybrid_p50": statistics.median(samples["hybrid"]),
+        "total_s": sum(map(sum, samples.values())) / 1000,
+        "tokens": endpoint.tokens / max(endpoint.calls, 1),
+    }
+
+
+def main(base_ms: float = 100, per_ktoken_ms: float = 150, budget: int = None):
+    if budget is not None:
+        prompt_builder.PROMPT_TOKEN_BUDGET = int(budget)
+    texts = load_texts()
+    print("=" * 72)
+    print(f"프롬프트 축소 벤치마크 ({len(texts)}문장, 토큰 예산 {prompt_builder.PROMPT_TOKEN_BUDGET})")
+    print("=" * 72)
+    prompt_sizes(texts)
+
+    print(f"\n종단 지연 (기본 {base_ms:.0f}ms + 입력 1000토큰당 {per_ktoken_ms:.0f}ms)")
+    pruning = prompt_builder.PROMPT_PRUNING
+    results = {}
+    for label, enabled in (("전체", False), ("축소", True)):
+        results[label] = r = measure(texts, enabled, base_ms, per_ktoken_ms)
+        print(f"  {label}: 발신 p50 {r['outgoing_p50']:6.1f}ms  Hybrid p50 {r['hybrid_p50']:6.1f}ms  "
+              f"합계 {r['total_s']:5.2f}s  호출당 입력 {r['tokens']:,.0f}토큰")
+    prompt_builder.PROMPT_PRUNING = pruning
+    clear_prompt_cache()
+    saved = 1 - results["축소"]["total_s"] / results["전체"]["total_s"]
+    print(f"\n관련 섹션만 포함: 종단 지연 {saved:.0%} 감소")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,122 @@
+"""
+Scam Checker 벤치마크
+- 레거시 선형 검색 (레코드마다 재정규화) vs ScamReportIndex (Bloom filter + 정렬 int64 배열)
+- 합성 신고 DB (계좌/전화번호 각 N건)
+- 델타 반영 / 컴팩션(스냅샷 저장) / 스냅샷 로드 vs JSON 기반 색인 생성
+
+실행:
+    python agent/tests/benchmark_scam_checker.py [N]
+"""
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.core.scam_index import ScamReportIndex, KIND_ACCOUNT, KIND_PHONE
+
+
+def legacy_lookup(db: dict, section: str, field: str, value: str):
+    """변경 전 check_reported_*: 레코드마다 re.sub 정규화 후 비교"""
+    normalized = re.sub(r'[-\s]', '', value)
+    for record in db[section]["data"]:
+        if re.sub(r'[-\s]', '', record[field]) == normalized:
+            return record
+    return None
+
+
+def make_db(count: int, seed: int = 1) -> dict:
+    """합성 신고 DB"""
+    rng = random.Random(seed)
+    accounts = [
+        {"account_number": f"{rng.randint(100, 999)}-{rng.randint(10, 999999)}-{rng.randint(100000, 9999999)}",
+         "report_count": 1, "report_type": "보이스피싱", "status": "confirmed_scam", "risk_score": 100}
+        for _ in range(count)
+    ]
+    phones = [
+        {"phone_number": f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+         "report_count": 1, "report_type": "보이스피싱", "status": "confirmed_scam", "risk_score": 100}
+        for _ in range(count)
+    ]
+    return {"reported_accounts": {"data": accounts}, "reported_phones": {"data": phones}}
+
+
+def main(count: int = 1_000_000):
+    rng = random.Random(2)
+    print("=" * 64)
+    print(f"사기 신고 DB 조회 벤치마크 (계좌/전화 각 {count:,}건)")
+    print("=" * 64)
+
+    db = make_db(count)
+    start = time.perf_counter()
+    index = ScamReportIndex(db)
+    print(f"  색인 생성: {time.perf_counter() - start:.2f}s ({len(index):,} keys)")
+
+    # 미신고 번호 95% + 신고 번호 5% (메시지 1건당 식별자 2개 가정)
+    queries = []
+    for _ in range(20000):
+        if rng.random() < 0.05:
+            record = rng.choice(db["reported_phones"]["data"])
+            queries.append((KIND_PHONE, record["phone_number"].replace("-", "")))
+        else:
+            queries.append((KIND_PHONE, f"010{rng.randint(10000000, 99999999)}"))
+
+    start = time.perf_counter()
+    single = [index.lookup(kind, value) for kind, value in queries]
+    elapsed = time.perf_counter() - start
+    print(f"  index.lookup          {elapsed / len(queries) * 1e9:10.0f} ns/identifier")
+
+    start = time.perf_counter()
+    for i in range(0, len(queries), 2):
+        index.lookup_many(queries[i:i + 2])
+    elapsed = time.perf_counter() - start
+    print(f"  index.lookup_many(2)  {elapsed / len(queries) * 1e9:10.0f} ns/identifier")
+
+    # 레거시는 너무 느려서 소수 질의만 측정
+    sample = queries[:5]
+    start = time.perf_counter()
+    legacy = [legacy_lookup(db, "reported_phones", "phone_number", value) for _kind, value in sample]
+    elapsed = time.perf_counter() - start
+    print(f"  legacy linear scan    {elapsed / len(sample) * 1e9:10.0f} ns/identifier")
+    assert legacy == single[:5], "lookup mismatch"
+
+    # 델타 반영: 기본 색인은 그대로, 오버레이에만 추가
+    deltas = [
+        {"seq": seq, "op": "add", "kind": "phone",
+         "record": {"phone_number": f"070-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+                    "report_count": 1, "report_type": "보이스피싱", "status": "under_investigation",
+                    "risk_score": 60}}
+        for seq in range(1, 501)
+    ]
+    start = time.perf_counter()
+    for delta in deltas:
+        index.apply_delta(delta)
+    elapsed = time.perf_counter() - start
+    print(f"  apply_delta x{len(deltas)}       {elapsed * 1000:10.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "scam_db.snapshot"
+        start = time.perf_counter()
+        index.save_snapshot(path)
+        print(f"  컴팩션(스냅샷 저장)   {time.perf_counter() - start:10.2f} s ({path.stat().st_size / 1e6:.0f}MB)")
+
+        start = time.perf_counter()
+        loaded = ScamReportIndex.from_snapshot(path)
+        print(f"  스냅샷 로드           {(time.perf_counter() - start) * 1000:10.1f} ms")
+
+        start = time.perf_counter()
+        for kind, value in queries:
+            loaded.lookup(kind, value)
+        elapsed = time.perf_counter() - start
+        print(f"  snapshot lookup       {elapsed / len(queries) * 1e9:10.0f} ns/identifier")
+        for kind, value in queries[:200]:
+            assert loaded.lookup(kind, value) == index.lookup(kind, value), "snapshot mismatch"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,87 @@
+"""
+Threat Matcher 마이크로벤치마크
+패턴별 `k in text` 반복 검색 (레거시) vs Aho-Corasick 1회 순회 (CompiledThreatEngine)
+
+실행:
+    python agent/tests/benchmark_threat_matcher.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 추가
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from agent.core.threat_matcher import _get_threat_data, get_threat_engine, detect_threats
+
+
+def legacy_keyword_pass(text: str) -> list:
+    """변경 전 _check_pattern_match의 키워드 검색 비용 (패턴 x 키워드 x 텍스트)"""
+    data = _get_threat_data()
+    results = []
+    for cat_info in data["categories"].values():
+        for pattern in cat_info["patterns"].values():
+            keywords = pattern.get("keywords", [])
+            found_keywords = [k for k in keywords if k in text]
+            if not found_keywords:
+                results.append(None)
+                continue
+            context_keywords = pattern.get("context_keywords", [])
+            found_context = [k for k in context_keywords if k in text]
+            for indicator in pattern.get("url_indicators", []):
+                if indicator.lower() in text.lower():
+                    break
+            for indicator in pattern.get("phone_indicators", []):
+                if indicator in text:
+                    break
+            has_context = len([k for k in context_keywords if k in text]) >= 2 if context_keywords else True
+            results.append((found_keywords, found_context, has_context))
+    data_scoring = data["scoring"]
+    any(uk in text for uk in data_scoring["urgency_keywords"])
+    for safe_ctx in data["safe_patterns"]["safe_contexts"]:
+        any(k in text for k in safe_ctx["keywords"])
+    return results
+
+
+def bench(label: str, fn, messages: list, rounds: int) -> float:
+    """메시지당 평균 소요 시간(us) 측정"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in messages:
+            fn(text)
+    elapsed = time.perf_counter() - start
+    per_message_us = elapsed / (rounds * len(messages)) * 1_000_000
+    print(f"  {label:<32} {per_message_us:10.2f} us/message")
+    return per_message_us
+
+
+def main():
+    data = _get_threat_data()
+    samples = [
+        msg
+        for cat_info in data["categories"].values()
+        for pattern in cat_info["patterns"].values()
+        for msg in pattern.get("sample_messages", [])
+    ]
+    samples.extend(["오늘 저녁 뭐 먹을까?", "ㅋㅋㅋ 그래 내일 봐"])
+
+    engine = get_threat_engine()
+    print("=" * 64)
+    print(f"Threat 키워드 매칭 벤치마크 (오토마톤 키워드 {engine.automaton.size}개)")
+    print("=" * 64)
+
+    for label, messages, rounds in [
+        ("샘플 메시지", samples, 300),
+        ("1KB 메시지", [" ".join(samples)[:1000]] * 5, 100),
+        ("10KB 메시지", [(" ".join(samples) * 20)[:10000]] * 2, 20),
+    ]:
+        print(f"[{label}]")
+        before = bench("legacy keyword pass", legacy_keyword_pass, messages, rounds)
+        after = bench("automaton scan", engine.scan, messages, rounds)
+        bench("detect_threats (전체)", detect_threats, messages, rounds)
+        print(f"  keyword pass speedup: x{before / after:.2f}")
+
+
+if __name__ == "__main__":
+    main()
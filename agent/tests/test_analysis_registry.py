@@ -0,0 +1,183 @@
+"""
+AnalysisRegistry / run_with_budget 단위 테스트 (지연 예산 + 후속 조회)
+"""
+import asyncio
+import time
+import unittest
+
+from ..core.analysis_registry import AnalysisRegistry, run_with_budget
+
+
+def _after(delay: float, value):
+    async def run():
+        await asyncio.sleep(delay)
+        return value
+    return run
+
+
+class TestRunWithBudget(unittest.TestCase):
+    """지연 예산 적용 테스트"""
+
+    def test_fast_full_result_within_budget(self):
+        """예산 안에 끝나면 전체 결과 + analysis_id 없음"""
+        registry = AnalysisRegistry()
+        result, analysis_id = asyncio.run(
+            run_with_budget(_after(0.01, "llm"), _after(0, "rule"), 500, registry)
+        )
+        self.assertEqual(result, "llm")
+        self.assertIsNone(analysis_id)
+        self.assertEqual(len(registry), 0)
+
+    def test_slow_llm_returns_rule_then_follow_up(self):
+        """예산 초과 → 규칙 판정 즉시 반환, LLM 판정은 후속 조회로"""
+        registry = AnalysisRegistry()
+
+        async def run():
+            start = time.perf_counter()
+            result, analysis_id = await run_with_budget(_after(0.3, "llm"), _after(0, "rule"), 50, registry)
+            elapsed = time.perf_counter() - start
+
+            pending = registry.get(analysis_id)
+            done = await registry.wait(analysis_id, timeout=2.0)
+            return result, analysis_id, elapsed, pending, done
+
+        result, analysis_id, elapsed, pending, done = asyncio.run(run())
+        self.assertEqual(result, "rule")
+        self.assertIsNotNone(analysis_id)
+        self.assertLess(elapsed, 0.2)
+        self.assertEqual(pending["status"], "pending")
+        self.assertEqual(pending["initial"], "rule")
+        self.assertEqual(done["status"], "done")
+        self.assertEqual(done["result"], "llm")
+
+    def test_no_budget_waits_for_full(self):
+        """예산 없음(None/0) → 기존처럼 전체 분석 완료까지 대기"""
+        result, analysis_id = asyncio.run(
+            run_with_budget(_after(0.05, "llm"), _after(0, "rule"), None, AnalysisRegistry())
+        )
+        self.assertEqual((result, analysis_id), ("llm", None))
+
+    def test_background_error_reported(self):
+        """백그라운드 LLM 분석 실패 → status=error"""
+        registry = AnalysisRegistry()
+
+        async def failing():
+            await asyncio.sleep(0.1)
+            raise RuntimeError("LLM 연결 실패")
+
+        async def run():
+            _, analysis_id = await run_with_budget(failing, _after(0, "rule"), 10, registry)
+            return await registry.wait(analysis_id, timeout=1.0)
+
+        info = asyncio.run(run())
+        self.assertEqual(info["status"], "error")
+        self.assertIn("LLM 연결 실패", info["error"])
+        self.assertEqual(registry.stats["failed"], 1)
+
+    def test_rule_verdict_within_budget(self):
+        """규칙 판정은 예산 대기와 동시에 실행 → 응답 시간 ≈ 예산 (예산 + 규칙 시간이 아님)"""
+        registry = AnalysisRegistry()
+
+        async def run():
+            start = time.perf_counter()
+            result, analysis_id = await run_with_budget(_after(1.0, "llm"), _after(0.1, "rule"), 150, registry)
+            return result, analysis_id, time.perf_counter() - start
+
+        result, analysis_id, elapsed = asyncio.run(run())
+        self.assertEqual(result, "rule")
+        self.assertIsNotNone(analysis_id)
+        self.assertLess(elapsed, 0.15 + 0.05)
+
+    def test_slow_rule_after_budget_returns_first_finished(self):
+        """예산이 지나도 규칙 판정이 끝나지 않았으면 먼저 끝난 쪽 반환"""
+        registry = AnalysisRegistry()
+        result, analysis_id = asyncio.run(
+            run_with_budget(_after(0.1, "llm"), _after(0.5, "rule"), 20, registry)
+        )
+        self.assertEqual((result, analysis_id), ("llm", None))
+        self.assertEqual(len(registry), 0)
+
+    def test_fallback_error_cancels_task(self):
+        """규칙 판정이 실패하면 LLM 태스크를 취소하고 예외 전달"""
+        registry = AnalysisRegistry()
+        state = {}
+
+        async def slow():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                raise
+
+        async def broken():
+            raise ValueError("규칙 판정 실패")
+
+        async def run():
+            with self.assertRaises(ValueError):
+                await run_with_budget(slow, broken, 10, registry)
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        self.assertTrue(state.get("cancelled"))
+        self.assertEqual(len(registry), 0)
+
+
+class TestAnalysisRegistry(unittest.TestCase):
+    """레지스트리 만료 테스트"""
+
+    def test_ttl_and_max_entries(self):
+        """TTL 만료 항목은 조회 불가, 최대 개수 초과 시 오래된 것부터 제거"""
+        async def run():
+            registry = AnalysisRegistry(ttl_seconds=0.05, max_entries=2)
+            loop = asyncio.get_running_loop()
+
+            def done_future(value):
+                future = loop.create_future()
+                future.set_result(value)
+                return future
+
+            first = registry.register(done_future(1))
+            second = registry.register(done_future(2))
+            third = registry.register(done_future(3))
+            evicted = registry.get(first)
+            alive = registry.get(third)
+            await asyncio.sleep(0.06)
+            return registry, evicted, alive, registry.get(second)
+
+        registry, evicted, alive, expired = asyncio.run(run())
+        self.assertIsNone(evicted)
+        self.assertEqual(alive["result"], 3)
+        self.assertIsNone(expired)
+        self.assertEqual(registry.stats["expired"], 2)
+
+    def test_evicted_task_kept_until_done(self):
+        """제거된 항목의 실행 중 태스크도 완료될 때까지 강한 참조 유지"""
+        async def run():
+            registry = AnalysisRegistry(max_entries=1)
+            first = registry.register(asyncio.ensure_future(_after(0.05, 1)()))
+            registry.register(asyncio.ensure_future(_after(0.05, 2)()))
+            evicted = registry.get(first)
+            running = registry.get_stats()["running"]
+            await asyncio.sleep(0.1)
+            return registry, evicted, running
+
+        registry, evicted, running = asyncio.run(run())
+        self.assertIsNone(evicted)
+        self.assertEqual(running, 2)
+        self.assertEqual(registry.get_stats()["running"], 0)
+        self.assertEqual(registry.stats["completed"], 2)
+
+    def test_unknown_id(self):
+        """없는 ID → None"""
+        registry = AnalysisRegistry()
+        self.assertIsNone(registry.get("missing"))
+        self.assertIsNone(asyncio.run(registry.wait("missing", timeout=0.1)))
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,129 @@
+"""
+AsyncKananaLLM 단위 테스트 (비동기 LLM 경로)
+
+실제 API 대신 httpx.MockTransport로 OpenAI 호환 응답을 흉내 낸다.
+"""
+import asyncio
+import json
+import time
+import unittest
+
+import httpx
+
+from ..llm.kanana import AsyncKananaLLM, AsyncLLMManager, LLMResponseCache
+from ..agents.outgoing import OutgoingAgent
+from ..core.models import RiskLevel
+
+
+def _completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "kanana-test",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+    }
+
+
+def _mock_llm(content: str, delay: float = 0.0, max_concurrency: int = 64) -> AsyncKananaLLM:
+    """지연 후 content를 반환하는 가짜 API 서버에 연결된 클라이언트"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/models"):
+            return httpx.Response(200, json={
+                "object": "list",
+                "data": [{"id": "kanana-test", "object": "model", "created": 0, "owned_by": "test"}],
+            })
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json=_completion(content))
+
+    llm = AsyncKananaLLM(
+        max_concurrency=max_concurrency,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://llm.test/v1"),
+    )
+    llm.cache = LLMResponseCache()  # 테스트 간 응답 공유 방지 (메모리 전용)
+    return llm
+
+
+class TestAsyncKananaLLM(unittest.TestCase):
+    """비동기 클라이언트 테스트"""
+
+    def test_initialize_and_analyze(self):
+        """모델 ID 자동 감지 + 응답 반환"""
+        async def run():
+            llm = _mock_llm("정상")
+            self.assertTrue(await llm.initialize())
+            self.assertEqual(llm.model_id, "kanana-test")
+            return await llm.analyze("안녕")
+
+        self.assertEqual(asyncio.run(run()), "정상")
+
+    def test_concurrency_limit_without_blocking_loop(self):
+        """동시 호출 수 제한 + 대기 중에도 이벤트 루프는 다른 작업 처리"""
+        async def run():
+            llm = _mock_llm("정상", delay=0.1, max_concurrency=10)
+            await llm.initialize()
+
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            tick_task = asyncio.create_task(ticker())
+            start = time.perf_counter()
+            results = await asyncio.gather(*(llm.analyze(f"메시지 {i}") for i in range(40)))
+            elapsed = time.perf_counter() - start
+            tick_task.cancel()
+            return llm, results, elapsed, ticks
+
+        llm, results, elapsed, ticks = asyncio.run(run())
+        self.assertEqual(results, ["정상"] * 40)
+        self.assertEqual(llm.stats["max_in_flight"], 10)
+        self.assertEqual(llm.in_flight, 0)
+        # 40건 / 동시 10건 = 4회분 지연 (순차라면 4초)
+        self.assertLess(elapsed, 2.0)
+        self.assertGreater(ticks, 10)
+
+    def test_outgoing_agent_async_ai_path(self):
+        """OutgoingAgent.analyze_async → AsyncKananaLLM + MCP 도구 경로"""
+        content = json.dumps({
+            "risk_level": "HIGH",
+            "reasons": ["계좌번호 감지"],
+            "is_secret_recommended": True,
+            "recommended_action": "시크릿 전송 권장",
+        }, ensure_ascii=False)
+
+        async def run():
+            llm = _mock_llm(content)
+            await llm.initialize()
+            loop = asyncio.get_running_loop()
+            AsyncLLMManager._instances[loop] = {"instruct": llm}
+            try:
+                return await OutgoingAgent().analyze_async("내 계좌 110-123-456789로 보내줘", use_ai=True)
+            finally:
+                AsyncLLMManager._instances.clear()
+
+        result = asyncio.run(run())
+        self.assertEqual(result.risk_level, RiskLevel.HIGH)
+        self.assertTrue(result.is_secret_recommended)
+
+    def test_outgoing_agent_async_skips_llm_for_plain_text(self):
+        """의심 패턴이 없으면 LLM 없이 바로 통과"""
+        result = asyncio.run(OutgoingAgent().analyze_async("오늘 저녁 뭐 먹을까?", use_ai=True))
+        self.assertEqual(result.risk_level, RiskLevel.LOW)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,109 @@
+"""
+배치 분석 단위 테스트 (중복 제거 + 작업자 풀 + 순서 보존)
+"""
+import asyncio
+import threading
+import unittest
+
+from ..core.batch_runner import BatchItemError, dedupe, run_batch, run_batch_async
+from ..core.pattern_matcher import detect_pii
+from ..agents.incoming import IncomingAgent
+from ..mcp.tools import (
+    scan_pii_batch,
+    analyze_incoming_batch,
+    analyze_incoming_batch_async,
+    analyze_outgoing_batch_async,
+)
+
+
+INCOMING_TEXTS = [
+    "엄마 나 폰 액정 깨져서 그런데 이 계좌로 50만원 보내줘 110-123-456789 급해",
+    "오늘 저녁 뭐 먹을까?",
+    "급한데 문화상품권 좀 사서 핀번호만 보내줘",
+]
+
+
+class TestBatchRunner(unittest.TestCase):
+    """배치 실행기 테스트"""
+
+    def test_dedupe(self):
+        """고유 항목 첫 위치 + 항목별 고유 번호"""
+        first, mapping = dedupe(["a", "b", "a", "c", "b"])
+        self.assertEqual(first, [0, 1, 3])
+        self.assertEqual(mapping, [0, 1, 0, 2, 1])
+
+    def test_order_and_dedupe_across_chunks(self):
+        """여러 청크로 나눠 실행해도 입력 순서 유지, 중복은 1회만 실행"""
+        calls = []
+        lock = threading.Lock()
+
+        def square(x):
+            with lock:
+                calls.append(x)
+            return x * x
+
+        items = [i % 50 for i in range(500)]
+        run = run_batch(items, square, chunk_size=8)
+        self.assertEqual(run.results, [x * x for x in items])
+        self.assertEqual(run.unique, 50)
+        self.assertEqual(sorted(calls), list(range(50)))
+
+    def test_item_error_isolated(self):
+        """항목 실패는 해당 위치만 BatchItemError"""
+        def parse(text):
+            return int(text)
+
+        run = run_batch(["1", "x", "3", "x"], parse)
+        self.assertEqual(run.results[0], 1)
+        self.assertEqual(run.results[2], 3)
+        self.assertIsInstance(run.results[1], BatchItemError)
+        self.assertIs(run.results[1], run.results[3])
+        self.assertEqual([i for i, _ in run.errors], [1, 3])
+
+    def test_async_matches_sync(self):
+        """비동기 실행 결과 = 동기 실행 결과"""
+        items = list(range(100)) * 2
+        run = asyncio.run(run_batch_async(items, lambda x: x + 1, chunk_size=16))
+        self.assertEqual(run.results, [x + 1 for x in items])
+        self.assertEqual(run.unique, 100)
+
+
+class TestBatchTools(unittest.TestCase):
+    """MCP 배치 도구 테스트"""
+
+    def test_scan_pii_batch_matches_single(self):
+        """scan_pii_batch = 텍스트별 detect_pii"""
+        texts = ["내 계좌 110-123-456789", "안녕", "주민번호 900101-1234567", "안녕"]
+        self.assertEqual(scan_pii_batch(texts), [detect_pii(t) for t in texts])
+
+    def test_analyze_incoming_batch_matches_single(self):
+        """analyze_incoming_batch = 메시지별 IncomingAgent.analyze (규칙 기반)"""
+        messages = [{"text": t} for t in INCOMING_TEXTS] * 3
+        messages.append({"text": INCOMING_TEXTS[0], "sender_id": "s1", "user_id": "u1"})
+
+        agent = IncomingAgent(verbose=False)
+        expected = [
+            agent.analyze(m["text"], sender_id=m.get("sender_id"), user_id=m.get("user_id"), use_ai=False)
+            for m in messages
+        ]
+        self.assertEqual(analyze_incoming_batch(messages), expected)
+
+        run = asyncio.run(analyze_incoming_batch_async(messages))
+        self.assertEqual(run.results, expected)
+        # 같은 텍스트라도 발신자/수신자가 다르면 따로 분석
+        self.assertEqual(run.unique, len(INCOMING_TEXTS) + 1)
+
+    def test_outgoing_batch(self):
+        """발신 배치: 계좌번호 포함 메시지만 시크릿 권장"""
+        run = asyncio.run(analyze_outgoing_batch_async(["내 계좌 110-123-456789로 보내줘", "오늘 저녁 뭐 먹을까?"]))
+        self.assertTrue(run.results[0].is_secret_recommended)
+        self.assertFalse(run.results[1].is_secret_recommended)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,62 @@
+"""
+규칙 검증 CLI 단위 테스트 (compile_rules check)
+"""
+import contextlib
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..core.compile_rules import main as compile_rules_main
+from ..core.rule_snapshot import DATA_DIR, PII_FILE, RULE_FILES, THREAT_FILE, RuleSnapshotManager
+
+
+class TestCompileRules(unittest.TestCase):
+    """규칙 검증 CLI 테스트"""
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        for name in RULE_FILES:
+            shutil.copy(DATA_DIR / name, self.dir / name)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _check(self) -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return compile_rules_main(["check", "--data-dir", str(self.dir)])
+
+    def test_check_passes(self):
+        self.assertEqual(self._check(), 0)
+
+    def test_check_fails_on_broken_json(self):
+        """파싱 실패 → 1"""
+        (self.dir / THREAT_FILE).write_text("{", encoding="utf-8")
+        self.assertEqual(self._check(), 1)
+
+    def test_check_fails_without_patterns(self):
+        """컴파일된 PII 정규식이 없음 → 검증 실패 → 1"""
+        path = self.dir / PII_FILE
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for category in data["categories"].values():
+            for item in category["items"]:
+                item.pop("regex", None)
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        self.assertEqual(self._check(), 1)
+
+    def test_scam_store_uses_parsed_data(self):
+        """사기 신고 저장소가 scam_db.json을 다시 파싱하지 않음"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            snapshot = RuleSnapshotManager(self.dir).current()
+        self.assertIs(snapshot.scam_store.base_data, snapshot.scam_db)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,165 @@
+"""
+ConversationStore 단위 테스트 (SQLite 대화 이력 저장소)
+"""
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from ..core import conversation_analyzer
+from ..core.conversation_store import ConversationStore, to_micros, from_micros
+
+
+class TestConversationStore(unittest.TestCase):
+    """대화 이력 저장소 테스트"""
+
+    def test_aggregates_and_ring_buffer(self):
+        """집계는 전체 기준, 메시지는 최근 ring_size건만 보관"""
+        store = ConversationStore(ring_size=5)
+        base = datetime(2025, 1, 1, 9, 0, 0, 123456)
+        for i in range(12):
+            store.register(1, 2, f"메시지 {i}", base + timedelta(days=i))
+
+        pair = store.get_pair(1, 2)
+        self.assertEqual(pair["message_count"], 12)
+        self.assertEqual(pair["first_contact"], base)
+        self.assertEqual(pair["last_contact"], base + timedelta(days=11))
+
+        messages = store.get_recent_messages(1, 2)
+        self.assertEqual([m["content"] for m in messages], [f"메시지 {i}" for i in range(7, 12)])
+        self.assertIsNone(store.get_pair(2, 1))
+
+    def test_ttl_eviction(self):
+        """마지막 연락 후 TTL이 지난 쌍 삭제"""
+        store = ConversationStore(ttl_days=30)
+        now = datetime(2025, 6, 1)
+        store.register(1, 2, "오래된 대화", now - timedelta(days=31))
+        store.register(1, 3, "최근 대화", now - timedelta(days=1))
+
+        self.assertEqual(store.evict_inactive(now), 1)
+        self.assertIsNone(store.get_pair(1, 2))
+        self.assertEqual(store.get_recent_messages(1, 2), [])
+        self.assertIsNotNone(store.get_pair(1, 3))
+
+    def test_file_store_persists(self):
+        """파일 DB는 재시작 후에도 유지"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.db"
+            ConversationStore(path).register(1, 2, "안녕", datetime(2025, 1, 1))
+            self.assertEqual(ConversationStore(path).get_pair(1, 2)["message_count"], 1)
+
+    def test_pair_lookup_uses_primary_key(self):
+        """쌍 조회는 기본키 검색 1회 (쌍 수와 무관)"""
+        store = ConversationStore()
+        plan = store._connect().execute(
+            "EXPLAIN QUERY PLAN SELECT first_contact, last_contact, message_count "
+            "FROM conversation_pairs WHERE user_id = ? AND sender_id = ?", (1, 2)
+        ).fetchall()
+        self.assertEqual(len(plan), 1)
+        self.assertIn("USING PRIMARY KEY", plan[0][-1])
+
+    def test_decayed_count_applied_lazily(self):
+        """감쇠 메시지 수: 저장은 마지막 연락 기준, 조회 시점까지 감쇠"""
+        store = ConversationStore(half_life_days=10)
+        base = datetime(2025, 1, 1)
+        store.register(1, 2, "a", base)
+        store.register(1, 2, "b", base + timedelta(days=10))
+
+        pair = store.get_pair(1, 2, now=base + timedelta(days=10))
+        self.assertAlmostEqual(pair["decayed_count"], 1.5)
+        self.assertEqual(pair["active_days"], 2)
+
+        later = store.get_pair(1, 2, now=base + timedelta(days=30))
+        self.assertAlmostEqual(later["decayed_count"], 0.375)
+        self.assertAlmostEqual(later["idle_days"], 20)
+        self.assertEqual(later["message_count"], 2)
+
+    def test_active_days_and_out_of_order(self):
+        """같은 날 메시지는 활동일 1일, 늦게 들어온 과거 메시지는 기여분만 더함"""
+        store = ConversationStore(half_life_days=10)
+        base = datetime(2025, 1, 10, 9)
+        store.register(1, 2, "a", base)
+        store.register(1, 2, "b", base + timedelta(hours=3))
+        store.register(1, 2, "c", base - timedelta(days=10))
+
+        pair = store.get_pair(1, 2, now=base + timedelta(hours=3))
+        self.assertEqual(pair["active_days"], 2)
+        self.assertEqual(pair["first_contact"], base - timedelta(days=10))
+        self.assertEqual(pair["last_contact"], base + timedelta(hours=3))
+        self.assertAlmostEqual(pair["decayed_count"], 2.5, places=1)
+
+    def test_migrates_old_schema(self):
+        """집계 열이 없는 이전 DB 파일에 열 추가"""
+        import sqlite3
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.db"
+            conn = sqlite3.connect(path)
+            conn.execute(
+                "CREATE TABLE conversation_pairs (user_id INTEGER NOT NULL, sender_id INTEGER NOT NULL, "
+                "first_contact INTEGER NOT NULL, last_contact INTEGER NOT NULL, message_count INTEGER NOT NULL, "
+                "PRIMARY KEY (user_id, sender_id)) WITHOUT ROWID"
+            )
+            ts = to_micros(datetime(2025, 1, 1))
+            conn.execute("INSERT INTO conversation_pairs VALUES (1, 2, ?, ?, 7)", (ts, ts))
+            conn.commit()
+            conn.close()
+
+            pair = ConversationStore(path, half_life_days=None).get_pair(1, 2)
+            self.assertEqual(pair["decayed_count"], 7)
+            self.assertEqual(pair["active_days"], 1)
+
+    def test_micros_round_trip(self):
+        """시각 저장 형식 왕복"""
+        ts = datetime(2024, 2, 29, 23, 59, 59, 999999)
+        self.assertEqual(from_micros(to_micros(ts)), ts)
+
+
+class TestConversationHistory(unittest.TestCase):
+    """conversation_analyzer 공개 함수 테스트 (메모리 저장소)"""
+
+    def setUp(self):
+        self._saved = conversation_analyzer._conversation_store
+        conversation_analyzer._conversation_store = ConversationStore()
+
+    def tearDown(self):
+        conversation_analyzer._conversation_store = self._saved
+
+    def test_unknown_sender(self):
+        """이력 없는 발신자"""
+        history = conversation_analyzer.get_conversation_history(1, 99)
+        self.assertFalse(history["has_history"])
+        self.assertEqual(history["trust_level"], "unknown")
+
+    def test_seeded_trusted_sender(self):
+        """시드된 오래된 친구 → high, 재시드해도 누적되지 않음"""
+        conversation_analyzer.seed_test_data()
+        conversation_analyzer.seed_test_data()
+        history = conversation_analyzer.get_conversation_history(1, 2)
+        self.assertEqual(history["message_count"], 100)
+        self.assertEqual(history["conversation_days"], 297)
+        self.assertEqual(history["trust_level"], "high")
+
+    def test_quiet_contact_loses_trust(self):
+        """1년간 연락이 없던 오랜 친구는 더 이상 high가 아님"""
+        base = datetime.now() - timedelta(days=365 + 300)
+        for i in range(100):
+            conversation_analyzer.register_conversation(1, 3, f"메시지 {i}", base + timedelta(days=i * 3))
+        history = conversation_analyzer.get_conversation_history(1, 3)
+        self.assertEqual(history["message_count"], 100)
+        self.assertEqual(history["active_days"], 100)
+        self.assertNotEqual(history["trust_level"], "high")
+
+    def test_first_message(self):
+        """첫 메시지 + 금융 요청"""
+        conversation_analyzer.register_conversation(1, 5, "급하게 송금 부탁해")
+        result = conversation_analyzer.analyze_sender_risk(1, 5, "급하게 송금 부탁해")
+        self.assertTrue(result["sender_trust"]["is_first_message"])
+        self.assertEqual(result["risk_adjustment"], 50)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,100 @@
+"""
+Import 시간 회귀 테스트 (python -X importtime)
+
+규칙 엔진 모듈만 import하는 경우 MCP / LLM 스택이 로드되지 않는지, import 시간이
+예산 안인지 새 프로세스에서 확인한다.
+"""
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# 규칙 전용 import에서 로드되면 안 되는 패키지 (MCP, pydantic, LLM 클라이언트, 웹 서버)
+HEAVY_PACKAGES = {"mcp", "pydantic", "openai", "dotenv", "httpx", "fastapi", "starlette", "uvicorn"}
+HEAVY_AGENT_MODULES = {"agent.mcp", "agent.llm", "agent.agents", "agent.core.models"}
+
+# 규칙 엔진 import 시간 예산 (ms) - 측정값 ~15ms, 느린 CI를 고려해 여유 있게
+IMPORT_BUDGET_MS = float(os.getenv("KAT_IMPORT_BUDGET_MS", "150"))
+
+
+def _importtime(statement: str) -> List[Tuple[str, int, float]]:
+    """새 프로세스에서 statement 실행 → [(모듈, 깊이, 누적 ms)]"""
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=str(PROJECT_ROOT), env=env, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:   self |  cumulative |   <깊이당 공백 2칸>모듈"
+        _, cumulative, name = line[len("import time:"):].split("|")
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append((stripped.strip(), depth, int(cumulative) / 1000))
+    return entries
+
+
+def _heavy_modules(entries) -> List[str]:
+    heavy = []
+    for name, _, _ in entries:
+        if name.split(".")[0] in HEAVY_PACKAGES or any(
+            name == prefix or name.startswith(prefix + ".") for prefix in HEAVY_AGENT_MODULES
+        ):
+            heavy.append(name)
+    return heavy
+
+
+def _agent_import_ms(entries) -> float:
+    """agent 패키지가 끌어온 최상위 import의 누적 시간 합"""
+    total: Dict[str, float] = {}
+    for name, depth, cumulative in entries:
+        if depth == 0 and name.split(".")[0] == "agent":
+            total[name] = cumulative
+    return sum(total.values())
+
+
+class TestImportTime(unittest.TestCase):
+    """규칙 전용 import 비용 테스트"""
+
+    def test_rule_engine_import_is_light(self):
+        """pattern_matcher / threat_matcher / scam_checker → MCP·LLM 스택 미로드 + 예산 이내"""
+        entries = _importtime("from agent.core import pattern_matcher, threat_matcher, scam_checker")
+        names = {name for name, _, _ in entries}
+        self.assertIn("agent.core.pattern_matcher", names)
+        self.assertEqual(_heavy_modules(entries), [])
+        self.assertLess(_agent_import_ms(entries), IMPORT_BUDGET_MS)
+
+    def test_package_import_is_lazy(self):
+        """import agent → 공개 이름은 접근 전까지 로드하지 않음"""
+        entries = _importtime("import agent")
+        self.assertEqual(_heavy_modules(entries), [])
+
+    def test_lazy_attributes_resolve(self):
+        """공개 이름 접근 시 정의 모듈에서 로드"""
+        import agent
+        from agent import core, llm, mcp, agents
+
+        self.assertIs(agent.RiskLevel, core.RiskLevel)
+        self.assertIn("analyze_outgoing", dir(agent))
+        self.assertTrue(callable(agent.analyze_outgoing))
+        self.assertTrue(callable(mcp.scan_pii))
+        self.assertTrue(callable(llm.get_llm_cache))
+        self.assertEqual(agents.OutgoingAgent.__name__, "OutgoingAgent")
+        with self.assertRaises(AttributeError):
+            agent.not_a_public_name
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
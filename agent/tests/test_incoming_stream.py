@@ -0,0 +1,100 @@
+"""
+IncomingAgent.analyze_stream 단위 테스트 (단계별 점진 분석)
+"""
+import asyncio
+import json
+import unittest
+
+from ..agents.incoming import IncomingAgent
+from ..core.models import RiskLevel
+from ..llm.kanana import AsyncLLMManager
+from .test_async_llm import _mock_llm
+
+
+STAGES = [
+    "stage1_threat_detection",
+    "stage2_scam_check",
+    "stage3_sender_trust",
+    "stage4_final_policy",
+]
+
+# 규칙 판정 HIGH (문화상품권 핀번호 요구)
+HIGH_TEXT = "급한데 문화상품권 좀 사서 핀번호만 보내줘"
+
+
+async def _collect(agent: IncomingAgent, text: str, **kwargs):
+    return [event async for event in agent.analyze_stream(text, **kwargs)]
+
+
+class TestIncomingStream(unittest.TestCase):
+    """단계별 스트리밍 테스트"""
+
+    def test_stage_order_and_final_verdict(self):
+        """4단계가 순서대로 나오고 마지막 판정은 analyze()와 같음"""
+        agent = IncomingAgent()
+        text = "엄마 나 폰 액정 깨져서 그런데 이 계좌로 50만원 보내줘 110-123-456789 급해"
+        events = asyncio.run(_collect(agent, text, sender_id="s1", user_id="u1", use_ai=False))
+
+        # 1~3단계는 끝나는 순서대로, 최종 정책은 마지막
+        self.assertEqual(sorted(e["stage"] for e in events[:3]), STAGES[:3])
+        self.assertEqual(events[3]["stage"], STAGES[3])
+        self.assertEqual([e["final"] for e in events], [False, False, False, True])
+        # 1단계 이후 이벤트부터 잠정 판정 제공
+        by_stage = {e["stage"]: e for e in events}
+        self.assertEqual(by_stage[STAGES[0]]["verdict"].risk_level, RiskLevel.CRITICAL)
+        self.assertIsNotNone(by_stage[STAGES[2]]["result"])
+
+        expected = agent.analyze(text, sender_id="s1", user_id="u1", use_ai=False)
+        self.assertEqual(events[-1]["verdict"], expected)
+
+    def test_skip_sender_trust_without_ids(self):
+        """발신자/수신자 ID가 없으면 Stage 3 결과는 None"""
+        events = asyncio.run(_collect(IncomingAgent(), "오늘 저녁 뭐 먹을까?", use_ai=False))
+        by_stage = {e["stage"]: e["result"] for e in events}
+        self.assertIsNone(by_stage[STAGES[2]])
+        self.assertEqual(events[-1]["verdict"].risk_level, RiskLevel.LOW)
+
+    def test_llm_refinement_upgrades_verdict(self):
+        """LLM이 더 높은 위험도를 판정하면 마지막 이벤트에서 판정 상향"""
+        content = json.dumps({
+            "판단": "피싱", "위험도": "CRITICAL", "유형": "지인 사칭", "근거": "상품권 핀번호 요구"
+        }, ensure_ascii=False)
+
+        async def run():
+            llm = _mock_llm(content)
+            await llm.initialize()
+            loop = asyncio.get_running_loop()
+            AsyncLLMManager._instances[loop] = {"instruct": llm}
+            try:
+                return await _collect(IncomingAgent(), HIGH_TEXT, use_ai=True)
+            finally:
+                AsyncLLMManager._instances.clear()
+
+        events = asyncio.run(run())
+        self.assertEqual([e["stage"] for e in events][3:], [STAGES[3], "llm_refinement"])
+        self.assertEqual(events[3]["verdict"].risk_level, RiskLevel.HIGH)
+        self.assertFalse(events[3]["final"])
+
+        refinement = events[-1]
+        self.assertTrue(refinement["final"])
+        self.assertTrue(refinement["result"]["llm_used"])
+        self.assertTrue(refinement["result"]["upgraded"])
+        self.assertEqual(refinement["verdict"].risk_level, RiskLevel.CRITICAL)
+
+    def test_llm_refinement_skipped_for_safe_message(self):
+        """규칙 판정 SAFE면 LLM 호출 없이 판정 유지"""
+        events = asyncio.run(_collect(IncomingAgent(), "오늘 저녁 뭐 먹을까?", use_ai=True))
+        refinement = events[-1]
+        self.assertEqual(refinement["stage"], "llm_refinement")
+        self.assertFalse(refinement["result"]["llm_used"])
+        self.assertFalse(refinement["result"]["upgraded"])
+        self.assertEqual(refinement["verdict"], events[3]["verdict"])
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
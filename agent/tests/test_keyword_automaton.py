@@ -0,0 +1,73 @@
+"""
+Keyword Automaton / CompiledThreatEngine 단위 테스트
+"""
+import unittest
+from ..core.keyword_automaton import KeywordAutomaton
+from ..core.threat_matcher import get_threat_engine, detect_threats
+
+
+class TestKeywordAutomaton(unittest.TestCase):
+    """Aho-Corasick 오토마톤 테스트"""
+
+    def test_overlapping_keywords(self):
+        """겹치거나 포함된 키워드 모두 검출"""
+        automaton = KeywordAutomaton(["엄마", "엄마야", "마야", "he", "she", "hers"])
+        exact, _ = automaton.scan("엄마야 ushers")
+        self.assertEqual(exact, {"엄마", "엄마야", "마야", "he", "she", "hers"})
+
+    def test_case_sensitive_keywords(self):
+        """대소문자 구분 키워드는 원문 그대로만 매칭"""
+        automaton = KeywordAutomaton(["PIN", "otp"])
+        self.assertEqual(automaton.scan("PIN otp")[0], {"PIN", "otp"})
+        self.assertEqual(automaton.scan("pin OTP")[0], set())
+
+    def test_ignore_case_keywords(self):
+        """대소문자 무시 키워드 (URL 인디케이터)"""
+        automaton = KeywordAutomaton(["bit.ly"], ignore_case=["bit.ly"])
+        exact, ignore_case = automaton.scan("BIT.LY/abc")
+        self.assertEqual(exact, set())
+        self.assertEqual(ignore_case, {"bit.ly"})
+
+    def test_length_changing_lowercase(self):
+        """lower()로 길이가 바뀌는 문자가 앞에 있어도 매칭"""
+        automaton = KeywordAutomaton(["PIN"])
+        self.assertEqual(automaton.scan("İ PIN")[0], {"PIN"})
+
+    def test_empty_input(self):
+        """빈 입력"""
+        self.assertEqual(KeywordAutomaton(["a"]).scan(""), (set(), set()))
+        self.assertEqual(KeywordAutomaton().scan("abc"), (set(), set()))
+
+
+class TestCompiledThreatEngine(unittest.TestCase):
+    """위협 패턴 엔진 테스트"""
+
+    def test_engine_is_reused(self):
+        """같은 스냅샷이면 엔진 재사용"""
+        self.assertIs(get_threat_engine(), get_threat_engine())
+
+    def test_sample_messages_match_own_pattern(self):
+        """각 패턴의 샘플 메시지는 해당 패턴 키워드를 히트"""
+        engine = get_threat_engine()
+        data = engine.source
+        for cat_info in data["categories"].values():
+            for pattern_id, pattern in cat_info["patterns"].items():
+                for sample in pattern.get("sample_messages", []):
+                    hits, _ = engine.scan(sample)
+                    expected = {k for k in pattern["keywords"] if k in sample}
+                    self.assertTrue(expected <= hits, f"{pattern_id}: {sample}")
+
+    def test_safe_message(self):
+        """정상 메시지"""
+        result = detect_threats("오늘 저녁 뭐 먹을까?")
+        self.assertEqual(result["matched_patterns"], [])
+        self.assertEqual(result["risk_level"], "safe")
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,85 @@
+"""
+LLMResponseCache 단위 테스트 (LLM 응답 캐시)
+"""
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..llm.kanana import LLMResponseCache, normalize_prompt
+from .test_async_llm import _mock_llm
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """메모리 LRU + SQLite 2단계 캐시 테스트"""
+
+    def test_key_normalization(self):
+        """공백 차이는 같은 키, 모델/시스템 프롬프트/temperature가 다르면 다른 키"""
+        key = LLMResponseCache.make_key("m", "sys", "엄마  폰 고장나서\n돈 보내줘", 0.1)
+        self.assertEqual(key, LLMResponseCache.make_key("m", "sys", " 엄마 폰 고장나서 돈 보내줘 ", 0.1))
+        self.assertNotEqual(key, LLMResponseCache.make_key("m2", "sys", "엄마 폰 고장나서 돈 보내줘", 0.1))
+        self.assertNotEqual(key, LLMResponseCache.make_key("m", "sys2", "엄마 폰 고장나서 돈 보내줘", 0.1))
+        self.assertNotEqual(key, LLMResponseCache.make_key("m", "sys", "엄마 폰 고장나서 돈 보내줘", 0.7))
+        self.assertEqual(normalize_prompt("a \t b\n"), "a b")
+
+    def test_memory_lru_eviction(self):
+        """메모리 tier는 최근 사용 순으로 memory_entries개 유지"""
+        cache = LLMResponseCache(memory_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        self.assertEqual(cache.get("a"), "1")  # a 최근 사용
+        cache.put("c", "3")                     # b 제거
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        stats = cache.get_stats()
+        self.assertEqual(stats["memory_evictions"], 1)
+        self.assertEqual(stats["memory_hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_ttl_expiry(self):
+        """TTL이 지난 항목은 미스"""
+        cache = LLMResponseCache(ttl_seconds=-1)
+        cache.put("a", "1")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get_stats()["expired"], 1)
+
+    def test_disk_tier_persists_and_trims(self):
+        """SQLite tier: 새 인스턴스(재시작/다른 워커)에서도 히트, 최대 행 수 유지"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "llm_cache.db")
+            LLMResponseCache(path).put("a", "피싱")
+
+            restarted = LLMResponseCache(path)
+            self.assertEqual(restarted.get("a"), "피싱")
+            self.assertEqual(restarted.get_stats()["disk_hits"], 1)
+            self.assertEqual(restarted.get("a"), "피싱")
+            self.assertEqual(restarted.get_stats()["memory_hits"], 1)
+
+            small = LLMResponseCache(path, max_entries=3, trim_every=1000)
+            for i in range(10):
+                small.put(f"k{i}", str(i))
+            self.assertEqual(small.trim(), 8)
+            remaining = small._connect().execute("SELECT key FROM llm_cache ORDER BY created").fetchall()
+            self.assertEqual([k for (k,) in remaining], ["k7", "k8", "k9"])
+
+    def test_identical_prompts_call_llm_once(self):
+        """같은 문구가 반복되면 LLM은 1회만 호출"""
+        async def run():
+            llm = _mock_llm("피싱 (가족사칭)")
+            await llm.initialize()
+            results = [await llm.analyze("엄마 폰 고장나서  급하게 돈 보내줘", system_prompt="") for _ in range(20)]
+            return llm, results
+
+        llm, results = asyncio.run(run())
+        self.assertEqual(set(results), {"피싱 (가족사칭)"})
+        self.assertEqual(llm.stats["calls"], 1)
+        self.assertEqual(llm.cache.get_stats()["memory_hits"], 19)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
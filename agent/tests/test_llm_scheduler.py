@@ -0,0 +1,283 @@
+"""
+LLMScheduler 단위 테스트 (우선순위 / 사용자 공정성 / 부하 차단 / 지표)
+"""
+import asyncio
+import threading
+import time
+import unittest
+
+from ..llm import scheduler as scheduler_module
+from ..llm.scheduler import LLMLoadShed, LLMScheduler, LLMSlotTimeout, threat_priority
+from ..core.hybrid_threat_analyzer import HybridThreatAnalyzer
+
+
+def _wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+class _Holder:
+    """슬롯 하나를 잡고 있다가 release()로 놓는 스레드"""
+
+    def __init__(self, scheduler: LLMScheduler, priority_class: str = "critical"):
+        self._release = threading.Event()
+        self._held = threading.Event()
+
+        def hold():
+            with scheduler.slot(priority_class):
+                self._held.set()
+                self._release.wait()
+
+        self.thread = threading.Thread(target=hold)
+        self.thread.start()
+        self._held.wait()
+
+    def release(self):
+        self._release.set()
+        self.thread.join()
+
+
+def _submit(scheduler: LLMScheduler, order: list, priority_class: str, user=None, label=None):
+    """슬롯을 받으면 order에 기록하는 스레드 (차단되면 'shed:<label>')"""
+    def run():
+        try:
+            with scheduler.slot(priority_class, user):
+                order.append(label or priority_class)
+        except LLMLoadShed:
+            order.append(f"shed:{label or priority_class}")
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+class TestLLMScheduler(unittest.TestCase):
+    """스케줄러 테스트"""
+
+    def _queue_behind(self, scheduler, holder, submissions):
+        """슬롯이 찬 상태에서 순서대로 대기열에 넣고, 모두 줄 선 뒤 슬롯 해제"""
+        order, threads = [], []
+        for priority_class, user, label in submissions:
+            threads.append(_submit(scheduler, order, priority_class, user, label))
+            expected = len(threads)
+            self.assertTrue(_wait_until(lambda: scheduler.get_stats()["queued"] == expected))
+        holder.release()
+        for thread in threads:
+            thread.join()
+        return order
+
+    def test_priority_order(self):
+        """규칙 판정 CRITICAL/DANGEROUS가 SUSPICIOUS보다 먼저"""
+        scheduler = LLMScheduler(slots=1, shed_classes=())
+        holder = _Holder(scheduler)
+        order = self._queue_behind(scheduler, holder, [
+            ("suspicious", None, None), ("pii", None, None), ("outgoing", None, None),
+            ("dangerous", None, None), ("critical", None, None),
+        ])
+        self.assertEqual(order, ["critical", "dangerous", "outgoing", "suspicious", "pii"])
+
+    def test_user_round_robin(self):
+        """같은 클래스 안에서는 사용자별로 번갈아"""
+        scheduler = LLMScheduler(slots=1, shed_classes=())
+        holder = _Holder(scheduler)
+        order = self._queue_behind(scheduler, holder, [
+            ("suspicious", "a", "a1"), ("suspicious", "a", "a2"), ("suspicious", "a", "a3"),
+            ("suspicious", "b", "b1"), ("suspicious", "c", "c1"),
+        ])
+        self.assertEqual(order, ["a1", "b1", "c1", "a2", "a3"])
+
+    def test_shed_after_wait_threshold(self):
+        """차단 가능 클래스는 임계값까지 대기 후 차단, 나머지는 계속 대기"""
+        scheduler = LLMScheduler(slots=1, shed_wait_ms=50)
+        holder = _Holder(scheduler)
+        order = []
+        suspicious = _submit(scheduler, order, "suspicious")
+        critical = _submit(scheduler, order, "critical")
+        suspicious.join(timeout=2)
+        self.assertEqual(order, ["shed:suspicious"])
+        holder.release()
+        critical.join()
+        self.assertEqual(order, ["shed:suspicious", "critical"])
+
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["classes"]["suspicious"]["shed_timeout"], 1)
+        self.assertEqual(stats["shed_total"], 1)
+        self.assertEqual(stats["active"], 0)
+        self.assertEqual(stats["queued"], 0)
+
+    def test_non_shed_class_wait_is_bounded(self):
+        """차단 불가 클래스도 기한까지만 대기 → LLMSlotTimeout (규칙 대체 경로), 차단 지표와 별도"""
+        scheduler = LLMScheduler(slots=1, shed_classes=(), deadline=0.05)
+        holder = _Holder(scheduler)
+        start = time.monotonic()
+        with self.assertRaises(LLMSlotTimeout) as ctx:
+            with scheduler.slot("outgoing"):
+                pass
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertIsInstance(ctx.exception, LLMLoadShed)
+        self.assertEqual(ctx.exception.reason, "deadline")
+
+        async def run():
+            async with scheduler.aslot("critical"):
+                pass
+
+        with self.assertRaises(LLMSlotTimeout):
+            asyncio.run(run())
+        holder.release()
+
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["classes"]["outgoing"]["deadline_timeout"], 1)
+        self.assertEqual(stats["classes"]["critical"]["deadline_timeout"], 1)
+        self.assertEqual(stats["shed_total"], 0)
+        self.assertEqual((stats["active"], stats["queued"]), (0, 0))
+
+    def test_admission_shed_when_recent_wait_is_high(self):
+        """최근 대기 시간(EWMA)이 임계값을 넘으면 줄 서지 않고 바로 차단"""
+        now = [0.0]
+        scheduler = LLMScheduler(slots=1, shed_wait_ms=100, clock=lambda: now[0])
+        holder = _Holder(scheduler)
+        order = []
+        waiting = _submit(scheduler, order, "dangerous")
+        self.assertTrue(_wait_until(lambda: scheduler.get_stats()["queued"] == 1))
+        now[0] = 1.0                       # 1초 대기 후 슬롯 배정 → EWMA 200ms
+        holder.release()
+        waiting.join()
+        self.assertGreater(scheduler.get_stats()["wait_ewma_ms"], 100)
+
+        holder = _Holder(scheduler)
+        with self.assertRaises(LLMLoadShed) as ctx:
+            with scheduler.slot("suspicious"):
+                pass
+        self.assertEqual(ctx.exception.reason, "admission")
+        holder.release()
+        # 슬롯이 비어 있으면 차단하지 않음
+        with scheduler.slot("suspicious"):
+            pass
+        self.assertEqual(scheduler.get_stats()["classes"]["suspicious"]["shed_admission"], 1)
+
+    def test_async_priority_and_shed(self):
+        """비동기: 우선순위 순서 + 차단, 대기 중 이벤트 루프 비차단"""
+        scheduler = LLMScheduler(slots=1, shed_wait_ms=50)
+
+        async def run():
+            order = []
+            gate = asyncio.Event()
+
+            async def holder():
+                async with scheduler.aslot("critical"):
+                    await gate.wait()
+
+            async def job(priority_class):
+                try:
+                    async with scheduler.aslot(priority_class):
+                        order.append(priority_class)
+                except LLMLoadShed:
+                    order.append(f"shed:{priority_class}")
+
+            hold = asyncio.create_task(holder())
+            await asyncio.sleep(0)
+            jobs = [asyncio.create_task(job(c)) for c in ("outgoing", "suspicious", "dangerous")]
+            await asyncio.sleep(0.1)       # suspicious는 50ms 후 차단
+            gate.set()
+            await asyncio.gather(hold, *jobs)
+            return order
+
+        order = asyncio.run(run())
+        self.assertEqual(order, ["shed:suspicious", "dangerous", "outgoing"])
+        self.assertEqual(scheduler.get_stats()["active"], 0)
+
+    def test_async_cancel_releases_slot(self):
+        """대기 중 취소 → 큐에서 제거, 슬롯 누수 없음"""
+        scheduler = LLMScheduler(slots=1, shed_classes=())
+
+        async def run():
+            gate = asyncio.Event()
+
+            async def holder():
+                async with scheduler.aslot("critical"):
+                    await gate.wait()
+
+            async def job():
+                async with scheduler.aslot("vision"):
+                    pass
+
+            hold = asyncio.create_task(holder())
+            await asyncio.sleep(0)
+            waiting = asyncio.create_task(job())
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            await asyncio.sleep(0.01)
+            gate.set()
+            await hold
+
+        asyncio.run(run())
+        stats = scheduler.get_stats()
+        self.assertEqual((stats["active"], stats["queued"]), (0, 0))
+
+    def test_threat_priority(self):
+        self.assertEqual(threat_priority("CRITICAL"), "critical")
+        self.assertEqual(threat_priority("DANGEROUS"), "dangerous")
+        self.assertEqual(threat_priority("SUSPICIOUS"), "suspicious")
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    def analyze(self, text: str, system_prompt: str = None) -> str:
+        self.calls += 1
+        return "피싱 (가족사칭)"
+
+
+class TestAnalyzerLoadShedding(unittest.TestCase):
+    """HybridThreatAnalyzer: 과부하 시 SUSPICIOUS는 규칙 결과만, CRITICAL은 대기 후 LLM 사용"""
+
+    def setUp(self):
+        self._previous = scheduler_module._scheduler
+        self.scheduler = scheduler_module._scheduler = LLMScheduler(slots=1, shed_wait_ms=30)
+        self.analyzer = HybridThreatAnalyzer()
+        self.analyzer.quick_batcher = None
+        self.analyzer.llm = FakeLLM()
+        self.analyzer._llm_initialized = True
+
+    def tearDown(self):
+        scheduler_module._scheduler = self._previous
+
+    def test_suspicious_is_shed_to_rule_tier(self):
+        self.analyzer._rule_based_analyze = lambda text: {"threat_level": "SUSPICIOUS", "threat_score": 40}
+        holder = _Holder(self.scheduler)
+        try:
+            result = self.analyzer.analyze("의심 메시지", user_id=7)
+        finally:
+            holder.release()
+        self.assertTrue(result["llm_shed"])
+        self.assertFalse(result["llm_used"])
+        self.assertEqual(self.analyzer.llm.calls, 0)
+        self.assertEqual(self.analyzer.stats["llm_shed"], 1)
+        self.assertEqual(self.scheduler.get_stats()["classes"]["suspicious"]["shed_timeout"], 1)
+
+    def test_critical_waits_for_llm(self):
+        text = "엄마 나 폰 액정 깨져서 그런데 이 계좌로 50만원 보내줘 110-123-456789 급해"
+        holder = _Holder(self.scheduler)
+        threading.Timer(0.1, holder.release).start()
+        result = self.analyzer.analyze(text)
+        self.assertTrue(result["llm_used"])
+        self.assertNotIn("llm_shed", result)
+        self.assertEqual(self.analyzer.llm.calls, 1)
+        self.assertEqual(self.scheduler.get_stats()["classes"]["critical"]["admitted"], 2)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,270 @@
+"""
+LLM 전송 계층 단위 테스트 (기한 / 재시도 / 회로 차단 / 헤징)
+
+실제 API 대신 로컬 HTTP 서버(OpenAI 호환 stand-in)를 띄워서 지연/오류를 흉내 낸다.
+"""
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ..llm.kanana import (
+    AsyncKananaLLM,
+    CircuitBreaker,
+    KananaLLM,
+    LLMDeadlineExceeded,
+    LLMManager,
+    LLMResponseCache,
+    LLMUnavailableError,
+)
+from ..core.hybrid_threat_analyzer import HybridThreatAnalyzer
+
+
+class StubLLMServer:
+    """
+    OpenAI 호환 stand-in 서버
+
+    responses: chat.completions 요청마다 하나씩 꺼내 쓰는 (status, delay) 목록, 다 쓰면 default
+    models: 모델 목록(GET /models) 응답 (status, delay)
+    """
+
+    def __init__(self, content: str = "정상", default=(200, 0.0)):
+        self.content = content
+        self.default = default
+        self.responses = []
+        self.requests = 0
+        self.models = (200, 0.0)
+        self.model_requests = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: dict):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.model_requests += 1
+                status, delay = stub.models
+                if delay:
+                    time.sleep(delay)
+                if status != 200:
+                    self._send(status, {"error": {"message": f"stub {status}", "type": "server_error"}})
+                    return
+                self._send(200, {"object": "list", "data": [
+                    {"id": "kanana-stub", "object": "model", "created": 0, "owned_by": "test"}
+                ]})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, delay = stub._next()
+                if delay:
+                    time.sleep(delay)
+                if status != 200:
+                    self._send(status, {"error": {"message": f"stub {status}", "type": "server_error"}})
+                    return
+                self._send(200, {
+                    "id": "chatcmpl-stub", "object": "chat.completion", "created": 0, "model": "kanana-stub",
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": stub.content},
+                                 "finish_reason": "stop"}],
+                })
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def _next(self):
+        with self._lock:
+            self.requests += 1
+            return self.responses.pop(0) if self.responses else self.default
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _llm(*servers, **options) -> KananaLLM:
+    options.setdefault("retry_base", 0.01)
+    llm = KananaLLM(base_urls=[server.url for server in servers], **options)
+    llm.cache = LLMResponseCache()  # 테스트 간 응답 공유 방지 (메모리 전용)
+    return llm
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """회로 차단기 상태 전이"""
+
+    def test_open_half_open_close(self):
+        now = [0.0]
+        breaker = CircuitBreaker("test", failure_threshold=2, cooldown=10, clock=lambda: now[0])
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertFalse(breaker.available())
+
+        now[0] = 10.0
+        self.assertTrue(breaker.available())
+        self.assertTrue(breaker.allow())       # 시험 요청 1건
+        self.assertFalse(breaker.allow())      # 시험 중에는 나머지 거절
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        now[0] = 20.0
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.stats["opened"], 2)
+
+
+class TestLLMTransport(unittest.TestCase):
+    """동기 전송 계층 (stand-in 서버)"""
+
+    def setUp(self):
+        self.servers = []
+
+    def tearDown(self):
+        LLMManager._instances.clear()
+        for server in self.servers:
+            server.close()
+
+    def _server(self, **kwargs) -> StubLLMServer:
+        server = StubLLMServer(**kwargs)
+        self.servers.append(server)
+        return server
+
+    def test_retries_transient_errors(self):
+        """5xx 후 재시도로 성공"""
+        server = self._server()
+        server.responses = [(503, 0.0), (500, 0.0)]
+        llm = _llm(server, retries=2)
+        self.assertEqual(llm.model_id, "kanana-stub")
+        self.assertEqual(llm.analyze("안녕"), "정상")
+        self.assertEqual(server.requests, 3)
+        self.assertEqual(llm.transport.stats["retries"], 2)
+
+    def test_client_error_is_not_retried(self):
+        """4xx는 재시도하지 않고 회로도 열지 않음"""
+        server = self._server(default=(400, 0.0))
+        llm = _llm(server, retries=2, failure_threshold=1)
+        self.assertTrue(llm.analyze("안녕").startswith("Kanana Analysis Error"))
+        self.assertEqual(server.requests, 1)
+        self.assertTrue(llm.is_available())
+
+    def test_deadline(self):
+        """응답이 느리면 기한에서 포기 (재시도 포함)"""
+        server = self._server(default=(200, 2.0))
+        llm = _llm(server, retries=5)
+        start = time.monotonic()
+        with self.assertRaises(Exception) as ctx:
+            llm.transport.create(deadline=time.monotonic() + 0.3, idempotent=True,
+                                 model=llm.model_id, messages=[{"role": "user", "content": "x"}])
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertNotIsInstance(ctx.exception, LLMUnavailableError)
+
+        start = time.monotonic()
+        self.assertTrue(llm.analyze("안녕", timeout=0.3).startswith("Kanana Analysis Error"))
+        self.assertLess(time.monotonic() - start, 1.5)
+
+    def test_circuit_breaker_drops_to_rule_tier(self):
+        """연속 실패 → 회로 차단 → 호출 없이 거절, LLMManager/Hybrid는 규칙 분석으로 대체 → 복구"""
+        server = self._server(default=(500, 0.0))
+        llm = _llm(server, retries=0, failure_threshold=2, cooldown=0.2)
+        llm.analyze("하나")
+        llm.analyze("둘")
+        self.assertFalse(llm.is_available())
+        requests = server.requests
+        with self.assertRaises(LLMUnavailableError):
+            llm.transport.create(deadline=time.monotonic() + 1, model=llm.model_id,
+                                 messages=[{"role": "user", "content": "x"}])
+        self.assertEqual(server.requests, requests)
+
+        LLMManager._instances["instruct"] = llm
+        self.assertIsNone(LLMManager.get("instruct"))
+
+        analyzer = HybridThreatAnalyzer()
+        analyzer.llm = llm
+        analyzer._llm_initialized = True
+        result = analyzer.analyze("엄마 나 폰 액정 깨져서 그런데 이 계좌로 50만원 보내줘 110-123-456789 급해")
+        self.assertNotEqual(result["threat_level"], "SAFE")
+        self.assertFalse(result["llm_used"])
+        self.assertEqual(server.requests, requests)
+
+        # 차단 시간 경과 → 시험 요청 성공 → 복구
+        server.default = (200, 0.0)
+        time.sleep(0.25)
+        self.assertTrue(llm.is_available())
+        self.assertEqual(llm.analyze("셋"), "정상")
+        self.assertIs(LLMManager.get("instruct"), llm)
+
+    def test_hedging_sync(self):
+        """주 엔드포인트가 느리면 복제본 응답 사용"""
+        slow = self._server(content="느림", default=(200, 1.5))
+        fast = self._server(content="빠름")
+        llm = _llm(slow, fast, hedge_delay=0.05)
+        start = time.monotonic()
+        self.assertEqual(llm.analyze("안녕"), "빠름")
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(llm.transport.stats["hedge_wins"], 1)
+
+    def test_hedging_async(self):
+        """비동기: 복제본 응답 사용 + 느린 요청은 취소"""
+        slow = self._server(content="느림", default=(200, 1.5))
+        fast = self._server(content="빠름")
+
+        async def run():
+            llm = AsyncKananaLLM(base_urls=[slow.url, fast.url], hedge_delay=0.05)
+            llm.cache = LLMResponseCache()
+            self.assertTrue(await llm.initialize())
+            start = time.monotonic()
+            content = await llm.analyze("안녕")
+            elapsed = time.monotonic() - start
+            await llm.aclose()
+            return llm, content, elapsed
+
+        llm, content, elapsed = asyncio.run(run())
+        self.assertEqual(content, "빠름")
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(llm.transport.stats["hedge_wins"], 1)
+        self.assertTrue(llm.is_available())  # 취소된 요청은 실패로 세지 않음
+
+    def test_async_deadline(self):
+        """비동기: 기한 초과 → LLMDeadlineExceeded"""
+        server = self._server(default=(200, 2.0))
+
+        async def run():
+            llm = AsyncKananaLLM(base_urls=[server.url], retries=0)
+            await llm.initialize()
+            try:
+                await llm.transport.create(time.monotonic() + 0.2, model=llm.model_id,
+                                           messages=[{"role": "user", "content": "x"}])
+            finally:
+                await llm.aclose()
+
+        start = time.monotonic()
+        with self.assertRaises(LLMDeadlineExceeded):
+            asyncio.run(run())
+        self.assertLess(time.monotonic() - start, 1.5)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
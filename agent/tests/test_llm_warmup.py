@@ -0,0 +1,181 @@
+"""
+LLM 워밍업 / 재초기화 단위 테스트 (모델 ID 캐시, 백오프 재시도, 준비 상태)
+
+로컬 stand-in 서버(test_llm_transport.StubLLMServer)로 모델 목록 조회 실패/지연을 흉내 낸다.
+"""
+import asyncio
+import time
+import unittest
+
+from ..llm import kanana
+from ..llm.kanana import AsyncKananaLLM, AsyncLLMManager, KananaLLM, LLMManager, get_llm_readiness
+from .test_llm_transport import StubLLMServer
+
+
+def _wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestLLMWarmUp(unittest.TestCase):
+    """LLMManager 워밍업 / 백오프 재초기화"""
+
+    def setUp(self):
+        self.server = StubLLMServer()
+        self._saved = {
+            name: getattr(kanana, name)
+            for name in ("LLM_API_BASE", "LLM_REPLICAS", "LLM_INIT_RETRY_BASE", "LLM_WARMUP_MODELS")
+        }
+        kanana.LLM_API_BASE = self.server.url
+        kanana.LLM_REPLICAS = []
+        kanana.LLM_INIT_RETRY_BASE = 0.05
+        kanana.LLM_WARMUP_MODELS = ["instruct"]
+        kanana._model_ids.clear()
+        LLMManager._instances.clear()
+
+    def tearDown(self):
+        for name, value in self._saved.items():
+            setattr(kanana, name, value)
+        kanana._model_ids.clear()
+        LLMManager._instances.clear()
+        AsyncLLMManager._instances.clear()
+        self.server.close()
+
+    def test_model_id_is_cached(self):
+        """모델 목록은 base URL당 1회만 조회 (동기/비동기 인스턴스 공유)"""
+        first = KananaLLM(base_urls=[self.server.url])
+        second = KananaLLM(base_urls=[self.server.url])
+        self.assertEqual((first.model_id, second.model_id), ("kanana-stub", "kanana-stub"))
+
+        async def run():
+            llm = AsyncKananaLLM(base_urls=[self.server.url])
+            ready = await llm.initialize()
+            await llm.aclose()
+            return ready
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(self.server.model_requests, 1)
+
+    def test_warm_up_does_not_block_requests(self):
+        """워밍업 중에는 get()이 기다리지 않고 None → 완료 후 준비"""
+        self.server.models = (200, 0.3)
+        threads = LLMManager.warm_up()
+        start = time.monotonic()
+        self.assertIsNone(LLMManager.get("instruct"))
+        self.assertLess(time.monotonic() - start, 0.1)
+        readiness = get_llm_readiness()
+        self.assertFalse(readiness["ready"])
+        self.assertTrue(readiness["models"]["instruct"]["initializing"])
+
+        for thread in threads:
+            thread.join()
+        llm = LLMManager.get("instruct")
+        self.assertIsNotNone(llm)
+        self.assertEqual(llm.model_id, "kanana-stub")
+        self.assertTrue(get_llm_readiness()["ready"])
+        self.assertEqual(self.server.model_requests, 1)
+
+    def test_failed_init_retries_with_backoff(self):
+        """초기화 실패 인스턴스가 영구히 남지 않고 백오프 후 백그라운드 재초기화"""
+        self.server.models = (503, 0.0)
+        for thread in LLMManager.warm_up():
+            thread.join()
+        self.assertIsNone(LLMManager.get("instruct"))
+        status = LLMManager.get_status()["instruct"]
+        self.assertEqual(status["failures"], 1)
+        self.assertIsNotNone(status["last_error"])
+
+        # 백오프 전에는 재시도하지 않음
+        self.assertIsNone(LLMManager.get("instruct"))
+        self.assertEqual(self.server.model_requests, 1)
+
+        self.server.models = (200, 0.0)
+        llm = LLMManager._instances["instruct"]
+        self.assertTrue(_wait_until(lambda: LLMManager.get("instruct") is not None))
+        self.assertIs(LLMManager.get("instruct"), llm)
+        self.assertEqual(llm.init_failures, 0)
+        self.assertEqual(self.server.model_requests, 2)
+
+    def test_async_manager_retries_in_background(self):
+        """비동기: 실패 인스턴스는 요청을 막지 않고 백그라운드 태스크로 재초기화"""
+        self.server.models = (503, 0.0)
+
+        async def run():
+            await AsyncLLMManager.warm_up()
+            self.assertIsNone(await AsyncLLMManager.get("instruct"))
+            self.server.models = (200, 0.0)
+            llm = None
+            deadline = time.monotonic() + 2
+            while llm is None and time.monotonic() < deadline:
+                await asyncio.sleep(0.02)
+                llm = await AsyncLLMManager.get("instruct")
+            status = AsyncLLMManager.get_status()
+            await AsyncLLMManager.unload_all()
+            return llm, status
+
+        llm, status = asyncio.run(run())
+        self.assertIsNotNone(llm)
+        self.assertTrue(status["instruct_async"]["ready"])
+        self.assertEqual(self.server.model_requests, 2)
+
+    def test_first_get_does_not_initialize_inline(self):
+        """워밍업 전 첫 get()도 모델 목록 조회를 기다리지 않고 None → 백그라운드 초기화 후 준비"""
+        self.server.models = (200, 0.3)
+        start = time.monotonic()
+        self.assertIsNone(LLMManager.get("instruct"))
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertTrue(_wait_until(lambda: LLMManager.get("instruct") is not None))
+
+    def test_async_first_get_does_not_initialize_inline(self):
+        """비동기: 첫 get()은 None + 백그라운드 초기화, 모델 ID가 캐시돼 있으면 바로 준비"""
+        self.server.models = (200, 0.3)
+
+        async def run():
+            start = time.monotonic()
+            first = await AsyncLLMManager.get("instruct")
+            elapsed = time.monotonic() - start
+            llm = None
+            deadline = time.monotonic() + 2
+            while llm is None and time.monotonic() < deadline:
+                await asyncio.sleep(0.02)
+                llm = await AsyncLLMManager.get("instruct")
+            await AsyncLLMManager.unload_all()
+            return first, elapsed, llm
+
+        first, elapsed, llm = asyncio.run(run())
+        self.assertIsNone(first)
+        self.assertLess(elapsed, 0.1)
+        self.assertIsNotNone(llm)
+
+        # 새 루프: 모델 ID는 캐시 사용 (목록 재조회 없음)
+        async def cached():
+            await AsyncLLMManager.warm_up(["instruct"])
+            return await AsyncLLMManager.get("instruct")
+
+        self.assertIsNotNone(asyncio.run(cached()))
+        self.assertEqual(self.server.model_requests, 1)
+
+    def test_closed_loop_instances_are_dropped(self):
+        """닫힌 루프의 인스턴스는 남지 않음"""
+        kanana._remember_model_id(self.server.url, "kanana-stub")
+
+        async def run():
+            await AsyncLLMManager.warm_up(["instruct"])
+            return await AsyncLLMManager.get("instruct")
+
+        for _ in range(3):
+            self.assertIsNotNone(asyncio.run(run()))
+        self.assertLessEqual(len(AsyncLLMManager._instances), 1)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,61 @@
+"""
+MessageFeatures 단위 테스트 (수신 메시지 특징 1회 추출)
+"""
+import unittest
+from ..core.message_features import extract_message_features
+from ..core.threat_matcher import analyze_incoming_message, detect_urls
+from ..core.scam_checker import check_scam_in_message, extract_identifiers_from_text
+from ..core.conversation_analyzer import analyze_sender_risk
+
+
+MESSAGES = [
+    "엄마 폰 고장나서 급하게 송금 부탁해 110-123-456789",
+    "[국민건강보험] 환급금 조회 bit.ly/abc123 http://naver.com/notice",
+    "검찰청 수사관입니다. 02-1234-5678로 연락 주세요. 50만원",
+    "오늘 저녁 뭐 먹을까? ㅋㅋ",
+    "",
+]
+
+
+class TestMessageFeatures(unittest.TestCase):
+    """메시지 특징 추출 테스트"""
+
+    def test_extracted_fields(self):
+        """URL/전화번호/계좌/금액/키워드 추출"""
+        features = extract_message_features("엄마 급하게 송금 50만원 110-123-456789 bit.ly/abc 010-1234-5678")
+        self.assertIn("엄마", features.keyword_hits)
+        self.assertIn("bit.ly", features.url_indicator_hits)
+        self.assertEqual(features.short_urls, ("bit.ly/abc",))
+        self.assertIn("110123456789", features.accounts)
+        self.assertIn("01012345678", features.phones)
+        self.assertEqual(features.money_amounts, ("50만원",))
+        self.assertTrue(features.has_url)
+        self.assertEqual(features.financial_keywords, frozenset({"급하게", "송금"}))
+
+    def test_stages_match_without_features(self):
+        """특징 공유 결과 == 각 단계 단독 실행 결과"""
+        for text in MESSAGES:
+            features = extract_message_features(text)
+            self.assertEqual(analyze_incoming_message(text, features), analyze_incoming_message(text))
+            self.assertEqual(detect_urls(text, features), detect_urls(text))
+            self.assertEqual(
+                sorted(extract_identifiers_from_text(text, features)["accounts"]),
+                sorted(extract_identifiers_from_text(text)["accounts"])
+            )
+            self.assertEqual(
+                check_scam_in_message(text, features)["has_reported_identifier"],
+                check_scam_in_message(text)["has_reported_identifier"]
+            )
+            self.assertEqual(
+                analyze_sender_risk(1, 99, text, features)["risk_adjustment"],
+                analyze_sender_risk(1, 99, text)["risk_adjustment"]
+            )
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
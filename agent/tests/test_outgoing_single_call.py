@@ -0,0 +1,190 @@
+"""
+발신 AI 단일 호출 모드 단위 테스트 (규칙 결과 주입 + JSON 판정 1회, 동시 Tool Call)
+
+실제 API 대신 httpx.MockTransport로 OpenAI 호환 응답을 흉내 낸다.
+"""
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+import httpx
+
+from ..agents import outgoing
+from ..agents.outgoing import OutgoingAgent
+from ..core.models import RiskLevel
+from ..llm.kanana import AsyncKananaLLM, AsyncLLMManager, KananaLLM, LLMManager, LLMResponseCache
+
+
+def _completion(content: str = None, tool_calls: list = None) -> dict:
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = [
+            {"id": f"call_{i}", "type": "function",
+             "function": {"name": name, "arguments": json.dumps(args, ensure_ascii=False)}}
+            for i, (name, args) in enumerate(tool_calls)
+        ]
+    return {
+        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "kanana-test",
+        "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if tool_calls else "stop"}],
+    }
+
+
+_MODELS = {"object": "list", "data": [{"id": "kanana-test", "object": "model", "created": 0, "owned_by": "test"}]}
+
+_ANSWER = json.dumps({
+    "risk_level": "HIGH",
+    "detected_pii": ["계좌번호"],
+    "reasons": ["계좌번호 감지"],
+    "is_secret_recommended": True,
+    "recommended_action": "시크릿 전송 강력 권장",
+}, ensure_ascii=False)
+
+
+class _Recorder:
+    """chat.completions 요청 본문 기록 + 준비된 응답을 순서대로 반환"""
+
+    def __init__(self, *replies, status: int = 200):
+        self.replies = list(replies)
+        self.status = status
+        self.requests = []
+
+    def reply(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/models"):
+            return httpx.Response(200, json=_MODELS)
+        self.requests.append(json.loads(request.content))
+        if self.status != 200:
+            return httpx.Response(self.status, json={"error": {"message": "bad request", "type": "invalid_request"}})
+        return httpx.Response(200, json=self.replies.pop(0) if len(self.replies) > 1 else self.replies[0])
+
+
+def _sync_llm(recorder: _Recorder) -> KananaLLM:
+    llm = KananaLLM(http_client=httpx.Client(transport=httpx.MockTransport(recorder.reply)),
+                    base_urls=["http://llm.test/v1"], retries=0)
+    llm.cache = LLMResponseCache()
+    return llm
+
+
+def _async_llm(recorder: _Recorder) -> AsyncKananaLLM:
+    async def handler(request):
+        return recorder.reply(request)
+
+    llm = AsyncKananaLLM(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                         base_urls=["http://llm.test/v1"], retries=0)
+    llm.cache = LLMResponseCache()
+    return llm
+
+
+class TestOutgoingSingleCall(unittest.TestCase):
+    """OutgoingAgent 단일 호출 모드"""
+
+    def setUp(self):
+        self._mode = outgoing.OUTGOING_AI_MODE
+        outgoing.OUTGOING_AI_MODE = "single"
+
+    def tearDown(self):
+        outgoing.OUTGOING_AI_MODE = self._mode
+        LLMManager._instances.clear()
+        AsyncLLMManager._instances.clear()
+
+    def test_single_round_trip_with_injected_results(self):
+        """규칙 분석 결과가 프롬프트에 들어가고 도구 없이 JSON 판정 1회"""
+        recorder = _Recorder(_completion(_ANSWER))
+        LLMManager._instances["instruct"] = _sync_llm(recorder)
+
+        result = OutgoingAgent().analyze("홍길동 110-123-456789로 보내줘", use_ai=True)
+        self.assertEqual(result.risk_level, RiskLevel.HIGH)
+        self.assertTrue(result.is_secret_recommended)
+
+        self.assertEqual(len(recorder.requests), 1)
+        body = recorder.requests[0]
+        self.assertNotIn("tools", body)
+        self.assertEqual(body["response_format"], {"type": "json_object"})
+        user_message = body["messages"][1]["content"]
+        self.assertIn("규칙 분석 결과", user_message)
+        self.assertIn('"id": "account"', user_message)
+        self.assertNotIn("Action Input", body["messages"][0]["content"])
+
+    def test_llm_error_falls_back_to_rule_result(self):
+        """호출 실패 시 LOW가 아니라 미리 계산한 규칙 분석 결과"""
+        recorder = _Recorder(_completion(_ANSWER), status=400)
+        LLMManager._instances["instruct"] = _sync_llm(recorder)
+
+        result = OutgoingAgent().analyze("내 주민번호 900101-1234567", use_ai=True)
+        self.assertEqual(result.risk_level, RiskLevel.CRITICAL)
+        self.assertEqual(len(recorder.requests), 1)
+
+    def test_async_single_round_trip(self):
+        """비동기 경로도 1회 호출"""
+        recorder = _Recorder(_completion(_ANSWER))
+
+        async def run():
+            llm = _async_llm(recorder)
+            await llm.initialize()
+            loop = asyncio.get_running_loop()
+            AsyncLLMManager._instances[loop] = {"instruct": llm}
+            return await OutgoingAgent().analyze_async("홍길동 110-123-456789로 보내줘", use_ai=True)
+
+        result = asyncio.run(run())
+        self.assertEqual(result.risk_level, RiskLevel.HIGH)
+        self.assertEqual(len(recorder.requests), 1)
+        self.assertNotIn("tools", recorder.requests[0])
+
+
+class TestConcurrentToolCalls(unittest.TestCase):
+    """한 턴에 여러 Tool Call → 동시에 실행, 결과는 요청 순서대로"""
+
+    TOOL_CALLS = [("slow_a", {"text": "a"}), ("slow_b", {"text": "b"})]
+
+    def test_sync_tool_calls_run_concurrently(self):
+        recorder = _Recorder(_completion(tool_calls=self.TOOL_CALLS), _completion(_ANSWER))
+        llm = _sync_llm(recorder)
+        threads = set()
+
+        def slow(name):
+            def tool(text: str):
+                threads.add(threading.current_thread().name)
+                time.sleep(0.2)
+                return {"tool": name, "text": text}
+            return tool
+
+        start = time.monotonic()
+        result = llm.analyze_with_tools("메시지", "시스템", {"slow_a": slow("a"), "slow_b": slow("b")})
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(result["risk_level"], "HIGH")
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(len(threads), 2)
+        tool_messages = [m for m in recorder.requests[1]["messages"] if m["role"] == "tool"]
+        self.assertEqual([m["tool_call_id"] for m in tool_messages], ["call_0", "call_1"])
+        self.assertEqual(json.loads(tool_messages[1]["content"])["tool"], "b")
+
+    def test_async_tool_calls_run_concurrently(self):
+        recorder = _Recorder(_completion(tool_calls=self.TOOL_CALLS), _completion(_ANSWER))
+
+        async def slow(text: str):
+            await asyncio.sleep(0.2)
+            return {"text": text}
+
+        async def run():
+            llm = _async_llm(recorder)
+            await llm.initialize()
+            start = time.monotonic()
+            result = await llm.analyze_with_tools("메시지", "시스템", {"slow_a": slow, "slow_b": slow})
+            return result, time.monotonic() - start
+
+        result, elapsed = asyncio.run(run())
+        self.assertEqual(result["risk_level"], "HIGH")
+        self.assertLess(elapsed, 0.35)
+        tool_messages = [m for m in recorder.requests[1]["messages"] if m["role"] == "tool"]
+        self.assertEqual([json.loads(m["content"])["text"] for m in tool_messages], ["a", "b"])
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,121 @@
+"""
+Pattern Matcher 단위 테스트 (CompiledPIIEngine, SpanIndex)
+"""
+import unittest
+from ..core.rule_snapshot import reload_rules
+from ..core.pattern_matcher import (
+    CompiledPIIEngine,
+    SpanIndex,
+    get_pii_engine,
+    detect_pii,
+    calculate_risk,
+)
+
+
+class TestCompiledPIIEngine(unittest.TestCase):
+    """컴파일된 PII 엔진 테스트"""
+
+    def test_engine_is_reused(self):
+        """같은 스냅샷이면 엔진 재사용"""
+        self.assertIs(get_pii_engine(), get_pii_engine())
+
+    def test_engine_rebuilt_on_new_snapshot(self):
+        """규칙 스냅샷이 교체되면 엔진 재컴파일"""
+        engine = get_pii_engine()
+        self.assertTrue(reload_rules(force=True))
+        self.assertIsNot(get_pii_engine(), engine)
+
+    def test_patterns_sorted_by_priority(self):
+        """컴파일된 패턴은 우선순위순 정렬"""
+        priorities = [p.priority for p in get_pii_engine().patterns]
+        self.assertEqual(priorities, sorted(priorities))
+
+    def test_resident_id_beats_account(self):
+        """주민번호가 계좌번호보다 먼저 매칭"""
+        result = detect_pii("주민번호 900101-1234567")
+        self.assertEqual([p["id"] for p in result["found_pii"]], ["resident_id"])
+        self.assertEqual(result["highest_risk"], "CRITICAL")
+
+    def test_phone_beats_account(self):
+        """010 전화번호는 계좌번호로 중복 감지하지 않음"""
+        result = detect_pii("연락처 010-1234-5678")
+        self.assertEqual([p["id"] for p in result["found_pii"]], ["phone"])
+
+    def test_category_escalation(self):
+        """신분증 + 금융정보 동시 노출 → CRITICAL"""
+        result = detect_pii("여권 M12345678 계좌 110-123-456789")
+        risk = calculate_risk(result["found_pii"])
+        self.assertEqual(risk["final_risk"], "CRITICAL")
+        self.assertTrue(risk["is_secret_recommended"])
+
+    def test_empty_items(self):
+        """감지 항목 없음 → LOW"""
+        risk = calculate_risk([])
+        self.assertEqual(risk["final_risk"], "LOW")
+        self.assertFalse(risk["is_secret_recommended"])
+
+    def test_invalid_regex_skipped(self):
+        """잘못된 정규식은 컴파일 단계에서 제외"""
+        data = {
+            "categories": {
+                "test": {
+                    "name_ko": "테스트",
+                    "items": [
+                        {"id": "broken", "name_ko": "깨짐", "risk_level": "LOW", "regex": "(\\d"},
+                        {"id": "digits", "name_ko": "숫자", "risk_level": "MEDIUM", "regex": "\\d{4}"},
+                    ]
+                }
+            },
+            "combination_rules": {},
+            "auto_escalation": {"count_based": [], "category_combination": []},
+            "risk_levels": {},
+        }
+        engine = CompiledPIIEngine(data)
+        self.assertEqual([p.id for p in engine.patterns], ["digits"])
+        self.assertEqual(engine.detect("1234")["count"], 1)
+
+
+class TestSpanIndex(unittest.TestCase):
+    """중복 범위 인덱스 테스트"""
+
+    def test_disjoint_and_touching_spans(self):
+        """맞닿은 범위는 겹치지 않음"""
+        spans = SpanIndex()
+        self.assertTrue(spans.add(10, 20))
+        self.assertTrue(spans.add(20, 25))
+        self.assertTrue(spans.add(0, 10))
+        self.assertEqual(len(spans), 3)
+
+    def test_overlapping_spans_rejected(self):
+        """교차/포함 범위는 거부"""
+        spans = SpanIndex()
+        spans.add(10, 20)
+        self.assertTrue(spans.overlaps(5, 11))
+        self.assertTrue(spans.overlaps(19, 30))
+        self.assertTrue(spans.overlaps(12, 15))
+        self.assertTrue(spans.overlaps(0, 40))
+        self.assertFalse(spans.add(15, 30))
+        self.assertEqual(len(spans), 1)
+
+    def test_matches_linear_scan(self):
+        """선형 검사와 같은 판정"""
+        import random
+        rng = random.Random(3)
+        spans = SpanIndex()
+        linear = []
+        for _ in range(500):
+            start = rng.randint(0, 2000)
+            end = start + rng.randint(1, 15)
+            expected = not any(not (end <= s or start >= e) for s, e in linear)
+            self.assertEqual(spans.add(start, end), expected)
+            if expected:
+                linear.append((start, end))
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
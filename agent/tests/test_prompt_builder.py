@@ -0,0 +1,225 @@
+"""
+PromptBuilder 단위 테스트 (토큰 예산, 관련 섹션 선택, 전체 프롬프트 호환)
+"""
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ..core import hybrid_analyzer, rule_snapshot
+from ..core.rule_snapshot import DATA_DIR, PII_FILE, RULE_FILES, RuleSnapshotManager
+from ..prompts import outgoing_agent, prompt_builder
+from ..prompts.outgoing_agent import (
+    get_outgoing_preanalyzed_system_prompt,
+    get_outgoing_prompt_builder,
+    get_outgoing_system_prompt,
+)
+from ..prompts.prompt_builder import PromptBuilder, PromptSection, count_tokens, pii_hits
+from ..core.hybrid_analyzer import LLM_PII_DETECTION_PROMPT, build_pii_detection_prompt, get_pii_prompt_builder
+from ..core.pattern_matcher import detect_pii
+
+
+def _builder(budget: int = 100) -> PromptBuilder:
+    return PromptBuilder([
+        PromptSection("role", "역할 설명\n", kind=PromptSection.REQUIRED),
+        PromptSection("account", "- 계좌번호\n", {"account"}, group="catalog"),
+        PromptSection("card", "- 카드번호\n", {"card_number"}, group="catalog"),
+        PromptSection("name", "- 이름 (맥락 판단)\n", {"name"}, PromptSection.CONTEXT, group="catalog"),
+        PromptSection("format", "JSON으로 응답\n", kind=PromptSection.REQUIRED),
+    ], groups={"catalog": "## 민감정보 유형\n"}, token_budget=budget)
+
+
+class TestPromptBuilder(unittest.TestCase):
+    """섹션 선택 / 예산"""
+
+    def test_full_keeps_every_section(self):
+        built = _builder().full()
+        self.assertEqual(built.text, "역할 설명\n## 민감정보 유형\n- 계좌번호\n- 카드번호\n- 이름 (맥락 판단)\nJSON으로 응답\n")
+        self.assertEqual(built.tokens, built.full_tokens)
+        self.assertGreaterEqual(built.tokens, count_tokens(built.text))
+        self.assertEqual(built.dropped, [])
+
+    def test_only_relevant_sections(self):
+        """관련 섹션 + 맥락 섹션, 관련 없는 섹션은 예산 부족 시 먼저 제외, 원래 순서 유지, 그룹 제목 1회"""
+        builder = _builder()
+        cost = {section.key: section.tokens for section in builder.sections}
+        budget = sum(cost.values()) - cost["card"] + count_tokens("## 민감정보 유형\n")
+        built = builder.build({"account"}, token_budget=budget)
+        self.assertEqual(built.text, "역할 설명\n## 민감정보 유형\n- 계좌번호\n- 이름 (맥락 판단)\nJSON으로 응답\n")
+        self.assertEqual(built.included, ["role", "account", "name", "format"])
+        self.assertEqual(built.dropped, ["card"])
+        # 섹션별 추정 합 (전체 문자열 추정보다 작지 않음 - 예산 판단이 보수적)
+        self.assertGreaterEqual(built.tokens, count_tokens(built.text))
+        self.assertLess(built.tokens, built.full_tokens)
+
+    def test_budget(self):
+        """예산을 넘는 섹션은 빠지지만 필수 섹션은 항상 포함"""
+        builder = _builder()
+        cost = {section.key: section.tokens for section in builder.sections}
+        budget = cost["role"] + cost["format"] + cost["account"] + count_tokens("## 민감정보 유형\n")
+        with_account = builder.build({"account"}, token_budget=budget)
+        self.assertEqual(with_account.included, ["role", "account", "format"])
+        self.assertEqual(with_account.tokens, budget)
+
+        only_required = builder.build({"account"}, token_budget=0)
+        self.assertEqual(only_required.included, ["role", "format"])
+        self.assertNotIn("## 민감정보 유형", only_required.text)
+
+    def test_unmatched_sections_fill_budget(self):
+        """탐지 결과가 없어도 예산이 남으면 관련 없는 섹션을 채움 (맥락 섹션 다음 순위)"""
+        builder = _builder()
+        self.assertEqual(builder.build(set(), token_budget=100000).text, builder.full().text)
+
+        cost = {section.key: section.tokens for section in builder.sections}
+        budget = cost["role"] + cost["format"] + cost["name"] + count_tokens("## 민감정보 유형\n")
+        self.assertEqual(builder.build(set(), token_budget=budget).included, ["role", "name", "format"])
+
+    def test_pruning_off(self):
+        builder = _builder()
+        self.assertEqual(builder.build({"account"}, prune=False).text, builder.full().text)
+
+    def test_count_tokens(self):
+        self.assertEqual(count_tokens(""), 0)
+        self.assertEqual(count_tokens("계좌번호"), 4)
+        self.assertEqual(count_tokens("abcdefgh"), 2)
+
+    def test_pii_hits(self):
+        found = detect_pii("홍길동 110-123-456789로 보내줘")["found_pii"]
+        hits = pii_hits(found, [{"rule_id": "financial_theft"}, "identity_theft"])
+        self.assertIn("account", hits)
+        self.assertIn("financial_info", hits)
+        self.assertIn("financial_theft", hits)
+        self.assertIn("identity_theft", hits)
+
+
+class TestAgentPrompts(unittest.TestCase):
+    """발신 / Hybrid 프롬프트: 전체 조립은 기존 프롬프트와 동일, 탐지 결과로 축소"""
+
+    def setUp(self):
+        self._pruning = prompt_builder.PROMPT_PRUNING
+        outgoing_agent.clear_prompt_cache()
+
+    def tearDown(self):
+        prompt_builder.PROMPT_PRUNING = self._pruning
+        outgoing_agent.clear_prompt_cache()
+
+    def test_full_matches_legacy_prompt(self):
+        self.assertEqual(get_outgoing_prompt_builder().full().text, get_outgoing_system_prompt())
+        self.assertEqual(get_outgoing_prompt_builder(preanalyzed=True).full().text,
+                         get_outgoing_preanalyzed_system_prompt())
+        self.assertEqual(get_pii_prompt_builder().full().text, LLM_PII_DETECTION_PROMPT)
+
+    def test_pruned_outgoing_prompt(self):
+        hits = pii_hits(detect_pii("내 주민번호 900101-1234567")["found_pii"])
+        for preanalyzed, get_prompt in ((False, get_outgoing_system_prompt),
+                                        (True, get_outgoing_preanalyzed_system_prompt)):
+            builder = get_outgoing_prompt_builder(preanalyzed)
+            pruned = get_prompt(hits=hits)
+            built = builder.build(hits)
+            self.assertEqual(pruned, built.text)
+            self.assertLessEqual(built.tokens, prompt_builder.PROMPT_TOKEN_BUDGET)
+            self.assertLess(len(pruned), len(get_prompt()))
+            self.assertIn("주민등록번호", pruned)
+            self.assertNotIn("catalog:government_id", built.dropped)
+            # 응답 형식은 항상 포함
+            self.assertIn("risk_level", pruned)
+
+    def test_pruning_disabled_returns_full_prompt(self):
+        prompt_builder.PROMPT_PRUNING = False
+        hits = pii_hits(detect_pii("내 주민번호 900101-1234567")["found_pii"])
+        self.assertEqual(get_outgoing_system_prompt(hits=hits), get_outgoing_system_prompt())
+        text = "카드번호 1234-5678-9012-3456"
+        self.assertEqual(build_pii_detection_prompt(text, detect_pii(text)["found_pii"]),
+                         LLM_PII_DETECTION_PROMPT + f"\n입력: \"{text}\"\n출력:")
+
+    def test_pruned_hybrid_prompt(self):
+        text = "카드번호 1234-5678-9012-3456"
+        found = detect_pii(text)["found_pii"]
+        budget = prompt_builder.PROMPT_TOKEN_BUDGET
+        try:
+            prompt_builder.PROMPT_TOKEN_BUDGET = get_pii_prompt_builder().full_tokens // 2
+            prompt = build_pii_detection_prompt(text, found)
+        finally:
+            prompt_builder.PROMPT_TOKEN_BUDGET = budget
+        self.assertLess(len(prompt), len(LLM_PII_DETECTION_PROMPT))
+        self.assertTrue(prompt.endswith(f"\n입력: \"{text}\"\n출력:"))
+        self.assertIn("### 2. 금융정보", prompt)
+        self.assertNotIn("### 1.", prompt)
+        self.assertIn("## 출력 형식", prompt)
+
+    def test_hybrid_prompt_without_hits(self):
+        """규칙 탐지 결과가 없어도 예산이 충분하면 감지 대상 / 예시 전체 포함"""
+        text = "오늘 저녁 뭐 먹을까"
+        self.assertEqual(detect_pii(text)["found_pii"], [])
+        builder = get_pii_prompt_builder()
+        self.assertEqual(builder.build(set(), token_budget=100000).text, LLM_PII_DETECTION_PROMPT)
+        if builder.full_tokens <= prompt_builder.PROMPT_TOKEN_BUDGET:
+            self.assertEqual(build_pii_detection_prompt(text, []),
+                             LLM_PII_DETECTION_PROMPT + f"\n입력: \"{text}\"\n출력:")
+
+    def test_hybrid_prompt_layout_mismatch_fails_loudly(self):
+        """### 항목 수 / 끝 문구가 태그 목록과 맞지 않으면 섹션을 빠뜨리지 않고 ValueError"""
+        cases = [
+            ("_PII_TARGET_TAGS", hybrid_analyzer._PII_TARGET_TAGS[:-1]),
+            ("_PII_EXAMPLE_TAGS", hybrid_analyzer._PII_EXAMPLE_TAGS + [("name",)]),
+            ("_PII_PROMPT_TRAILER", "다음 텍스트를 분석하세요 (변경됨):\n"),
+            ("LLM_PII_DETECTION_PROMPT", LLM_PII_DETECTION_PROMPT + hybrid_analyzer._PII_PROMPT_TRAILER),
+        ]
+        for name, value in cases:
+            with self.subTest(name=name), mock.patch.object(hybrid_analyzer, name, value), \
+                    mock.patch.object(hybrid_analyzer, "_pii_prompt_builder", None):
+                with self.assertRaises(ValueError):
+                    get_pii_prompt_builder()
+
+
+class TestPromptCacheOnRuleReload(unittest.TestCase):
+    """규칙 핫 리로드 / 롤백 후 캐시된 프롬프트 빌더 교체"""
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        for name in RULE_FILES:
+            shutil.copy(DATA_DIR / name, self.dir / name)
+        self._manager = rule_snapshot._rule_manager
+        self.manager = rule_snapshot._rule_manager = RuleSnapshotManager(self.dir)
+
+    def tearDown(self):
+        rule_snapshot._rule_manager = self._manager
+        outgoing_agent.clear_prompt_cache()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _rename_category(self, name: str):
+        path = self.dir / PII_FILE
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["categories"]["personal_info"]["name_ko"] = name
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    def test_reload_and_rollback_rebuild_prompts(self):
+        hits = pii_hits(detect_pii("내 주민번호 900101-1234567")["found_pii"])
+        before = get_outgoing_prompt_builder()
+        pii_builder = get_pii_prompt_builder()
+        self.assertIs(get_outgoing_prompt_builder(), before)
+        self.assertNotIn("리로드 확인용", get_outgoing_system_prompt())
+
+        self._rename_category("리로드 확인용")
+        self.assertTrue(self.manager.reload())
+        self.assertIsNot(get_outgoing_prompt_builder(), before)
+        self.assertIn("리로드 확인용", get_outgoing_prompt_builder().full().text)
+        self.assertIn("리로드 확인용", get_outgoing_system_prompt())
+        self.assertIn("리로드 확인용", get_outgoing_preanalyzed_system_prompt())
+        # PII 감지 빌더는 상수 프롬프트에서 만들어지므로 리로드와 무관
+        self.assertIs(get_pii_prompt_builder(), pii_builder)
+
+        self.assertIsNotNone(self.manager.rollback())
+        self.assertNotIn("리로드 확인용", get_outgoing_system_prompt())
+        self.assertNotIn("리로드 확인용", get_outgoing_prompt_builder().build(hits, token_budget=100000).text)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,268 @@
+"""
+QuickClassifyBatcher 단위 테스트 (빠른 분류 묶음 처리)
+"""
+import asyncio
+import re
+import threading
+import time
+import unittest
+
+from ..core.hybrid_threat_analyzer import QuickClassifyBatcher, HybridThreatAnalyzer
+from ..llm import scheduler as scheduler_module
+from ..llm.scheduler import LLMLoadShed, LLMScheduler
+
+
+_NUMBERED_RE = re.compile(r'^(\d+)\. "(.*)"$', re.MULTILINE)
+
+
+def _answer(prompt: str, broken: bool) -> str:
+    """가짜 LLM 응답: 메시지에 '돈'이 있으면 피싱"""
+    if "메시지 목록" in prompt:
+        if broken:
+            return "잘 모르겠습니다"
+        return "\n".join(
+            f"{number}. {'피싱 (가족사칭)' if '돈' in text else '정상'}"
+            for number, text in _NUMBERED_RE.findall(prompt)
+        )
+    message = prompt.split('메시지: "')[-1]
+    return "피싱 (가족사칭)" if "돈" in message else "정상"
+
+
+class FakeLLM:
+    """지연 후 응답하는 동기 LLM"""
+
+    def __init__(self, delay: float = 0.05, broken: bool = False):
+        self.delay = delay
+        self.broken = broken
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return True
+
+    def analyze(self, text: str, system_prompt: str = None) -> str:
+        with self._lock:
+            self.prompts.append(text)
+        time.sleep(self.delay)
+        return _answer(text, self.broken)
+
+
+class FakeAsyncLLM(FakeLLM):
+    """지연 후 응답하는 비동기 LLM"""
+
+    async def analyze(self, text: str, system_prompt: str = None) -> str:
+        self.prompts.append(text)
+        await asyncio.sleep(self.delay)
+        return _answer(text, self.broken)
+
+
+MESSAGES = [f"엄마야 급하게 돈 보내줘 {i}" if i % 2 else f"내일 회의 {i}시에 하자" for i in range(24)]
+
+
+def _run_threads(batcher, llm, messages):
+    results = [None] * len(messages)
+
+    def worker(i):
+        results[i] = batcher.classify(llm, messages[i])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(messages))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestQuickClassifyBatcher(unittest.TestCase):
+    """묶음 처리 테스트"""
+
+    def test_prompt_and_parse(self):
+        """번호 매긴 프롬프트 + 줄별 판단 파싱 (누락/판단 없음 → None)"""
+        prompt = QuickClassifyBatcher.build_prompt(["엄마 폰 고장\n돈 보내줘", "내일 보자"])
+        self.assertIn('1. "엄마 폰 고장 돈 보내줘"', prompt)
+        self.assertIn('2. "내일 보자"', prompt)
+        self.assertIn("[피싱 예시]", prompt)
+
+        parse = QuickClassifyBatcher.parse_response
+        self.assertEqual(parse("2. 정상\n1) 피싱 (가족사칭)", 2), ["피싱 (가족사칭)", "정상"])
+        self.assertIsNone(parse("1. 피싱", 2))
+        self.assertIsNone(parse("1. 피싱\n2. 글쎄요", 2))
+
+    def test_idle_request_is_not_delayed(self):
+        """진행 중인 분류가 없으면 창을 기다리지 않고 개별 호출"""
+        batcher = QuickClassifyBatcher(window_ms=500)
+        llm = FakeLLM(delay=0)
+        start = time.perf_counter()
+        self.assertEqual(batcher.classify(llm, "내일 회의 하자"), "정상")
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(batcher.stats["batches"], 0)
+
+    def test_threads_are_coalesced(self):
+        """동시 요청은 묶여서 LLM 호출 수 감소, 결과는 각 메시지에 맞게 분배"""
+        batcher = QuickClassifyBatcher(window_ms=30, max_batch=8)
+        llm = FakeLLM()
+        results = _run_threads(batcher, llm, MESSAGES)
+
+        expected = ["피싱 (가족사칭)" if "돈" in m else "정상" for m in MESSAGES]
+        self.assertEqual(results, expected)
+        self.assertGreater(batcher.stats["batches"], 0)
+        self.assertLess(len(llm.prompts), len(MESSAGES))
+
+    def test_unparseable_batch_falls_back(self):
+        """일괄 응답을 파싱할 수 없으면 메시지별 개별 호출"""
+        batcher = QuickClassifyBatcher(window_ms=30, max_batch=8)
+        llm = FakeLLM(broken=True)
+        results = _run_threads(batcher, llm, MESSAGES)
+
+        expected = ["피싱 (가족사칭)" if "돈" in m else "정상" for m in MESSAGES]
+        self.assertEqual(results, expected)
+        self.assertGreater(batcher.stats["parse_failures"], 0)
+
+    def test_async_requests_are_coalesced(self):
+        """이벤트 루프에서 동시에 들어온 요청도 묶음 처리"""
+        batcher = QuickClassifyBatcher(window_ms=20, max_batch=8)
+        llm = FakeAsyncLLM()
+
+        async def run():
+            return await asyncio.gather(*(batcher.classify_async(llm, m) for m in MESSAGES))
+
+        results = asyncio.run(run())
+        expected = ["피싱 (가족사칭)" if "돈" in m else "정상" for m in MESSAGES]
+        self.assertEqual(list(results), expected)
+        self.assertGreater(batcher.stats["batches"], 0)
+        self.assertLessEqual(len(llm.prompts), 1 + 3)
+
+    def test_async_batches_are_per_loop(self):
+        """루프 2개가 동시에 분류 → 묶음은 루프별, 결과는 각 루프의 Future로 전달"""
+        batcher = QuickClassifyBatcher(window_ms=30, max_batch=8)
+        llm = FakeAsyncLLM()
+        halves = [MESSAGES[:12], MESSAGES[12:]]
+        results = [None, None]
+        errors = []
+
+        async def run(messages):
+            return await asyncio.gather(*(batcher.classify_async(llm, m) for m in messages))
+
+        def worker(i):
+            try:
+                results[i] = asyncio.run(run(halves[i]))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for messages, verdicts in zip(halves, results):
+            self.assertEqual(list(verdicts), ["피싱 (가족사칭)" if "돈" in m else "정상" for m in messages])
+        self.assertEqual(batcher.stats["requests"], len(MESSAGES))
+        self.assertEqual(len(batcher._async_pending), 0)
+
+    def test_async_batch_task_is_referenced(self):
+        """일괄 호출 태스크는 끝날 때까지 batcher가 참조를 보관"""
+        batcher = QuickClassifyBatcher(window_ms=10, max_batch=4)
+        llm = FakeAsyncLLM(delay=0.05)
+        seen = []
+
+        async def run():
+            gathered = asyncio.gather(*(batcher.classify_async(llm, m) for m in MESSAGES[:4]))
+            await asyncio.sleep(0.03)
+            seen.append(len(batcher._tasks))
+            return await gathered
+
+        asyncio.run(run())
+        self.assertEqual(seen, [1])
+        self.assertEqual(len(batcher._tasks), 0)
+
+    def test_stats_are_consistent_under_threads(self):
+        """여러 스레드의 통계 갱신이 유실되지 않음"""
+        batcher = QuickClassifyBatcher(window_ms=5, max_batch=4)
+        llm = FakeLLM(delay=0.001)
+        messages = MESSAGES * 4
+        _run_threads(batcher, llm, messages)
+        stats = batcher.stats
+        self.assertEqual(stats["requests"], len(messages))
+        self.assertEqual(len(llm.prompts), stats["batches"] + stats["single_calls"])
+
+    def test_analyzer_uses_batcher(self):
+        """HybridThreatAnalyzer 빠른 분류가 묶음 처리 결과를 해석"""
+        analyzer = HybridThreatAnalyzer()
+        analyzer.quick_batcher = QuickClassifyBatcher(window_ms=30, max_batch=8)
+        analyzer.llm = FakeLLM()
+        analyzer._llm_initialized = True
+
+        results = [None] * 6
+
+        def worker(i):
+            results[i] = analyzer._llm_quick_classify(MESSAGES[i])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([r["is_likely_scam"] for r in results], ["돈" in m for m in MESSAGES[:6]])
+        self.assertEqual(results[1]["detected_threats"][0]["id"], "family_impersonate")
+
+
+class TestBatcherSchedulerSlots(unittest.TestCase):
+    """스케줄러 슬롯은 실제 LLM 호출마다 1개 (묶음 대기 중인 요청은 슬롯을 잡지 않음)"""
+
+    def setUp(self):
+        self._saved = scheduler_module._scheduler
+
+    def tearDown(self):
+        scheduler_module._scheduler = self._saved
+
+    def test_single_slot_still_coalesces(self):
+        """슬롯 1개여도 동시 요청이 묶이고, 슬롯 사용 횟수 = LLM 호출 횟수"""
+        scheduler = scheduler_module._scheduler = LLMScheduler(slots=1, shed_wait_ms=5000)
+        batcher = QuickClassifyBatcher(window_ms=30, max_batch=8)
+        llm = FakeLLM()
+        results = _run_threads(batcher, llm, MESSAGES)
+
+        expected = ["피싱 (가족사칭)" if "돈" in m else "정상" for m in MESSAGES]
+        self.assertEqual(results, expected)
+        self.assertGreater(batcher.stats["batched_messages"], batcher.stats["batches"])
+        stats = scheduler.get_stats()["classes"]["suspicious"]
+        self.assertEqual(stats["admitted"], len(llm.prompts))
+        self.assertLess(stats["admitted"], len(MESSAGES))
+
+    def test_shed_batch_reaches_every_waiter(self):
+        """일괄 호출이 차단되면 묶인 요청 모두 LLMLoadShed → 분석기는 규칙 결과 사용"""
+        scheduler = scheduler_module._scheduler = LLMScheduler(slots=1, shed_wait_ms=20)
+        analyzer = HybridThreatAnalyzer()
+        analyzer.quick_batcher = QuickClassifyBatcher(window_ms=30, max_batch=8)
+        analyzer.llm = FakeLLM()
+        analyzer._llm_initialized = True
+
+        errors = [None] * 4
+
+        def worker(i):
+            try:
+                analyzer._llm_quick_classify(MESSAGES[i], f"user{i}")
+            except LLMLoadShed as e:
+                errors[i] = e
+
+        with scheduler.slot("critical"):
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertTrue(all(isinstance(e, LLMLoadShed) for e in errors))
+        self.assertEqual(analyzer.llm.prompts, [])
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
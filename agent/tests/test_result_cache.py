@@ -0,0 +1,100 @@
+"""
+ResultCache 단위 테스트 (LRU + 규칙 스냅샷 무효화 + 적중률)
+"""
+import unittest
+
+from ..core import threat_matcher
+from ..core.result_cache import ResultCache, get_result_cache, text_key
+from ..core.pattern_matcher import detect_pii, calculate_risk, get_pii_engine
+from ..core.threat_matcher import analyze_incoming_message, get_threat_engine
+
+
+TEXT = "엄마 나 폰 액정 깨져서 그런데 이 계좌로 50만원 보내줘 110-123-456789 급해"
+
+
+class TestResultCache(unittest.TestCase):
+    """캐시 동작 테스트"""
+
+    def test_lru_eviction_and_hit_rate(self):
+        """가장 오래 안 쓴 항목부터 제거, 적중률 집계"""
+        cache = ResultCache("t", max_entries=2)
+        snapshot = object()
+        calls = []
+
+        def compute(key):
+            calls.append(key)
+            return {"key": key}
+
+        for key in ["a", "b", "a", "c", "b"]:
+            cache.get_or_compute(snapshot, key, lambda: compute(key))
+
+        # a, b 계산 → a 적중 → c 계산(b 제거) → b 재계산
+        self.assertEqual(calls, ["a", "b", "c", "b"])
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 4, 2))
+        self.assertEqual(stats["hit_rate"], 0.2)
+
+    def test_snapshot_change_invalidates(self):
+        """규칙 스냅샷이 바뀌면 이전 결과 사용 안 함"""
+        cache = ResultCache("t")
+        cache.get_or_compute("v1", "k", lambda: {"v": 1})
+        self.assertEqual(cache.get_or_compute("v2", "k", lambda: {"v": 2}), {"v": 2})
+        self.assertEqual(cache.get_stats()["invalidations"], 1)
+
+    def test_cached_result_is_copy(self):
+        """호출자가 결과를 수정해도 캐시는 그대로"""
+        cache = ResultCache("t")
+        first = cache.get_or_compute("v", "k", lambda: {"items": [1]})
+        first["items"].append(2)
+        self.assertEqual(cache.get_or_compute("v", "k", lambda: None), {"items": [1]})
+
+    def test_disabled(self):
+        """max_entries=0이면 매번 계산"""
+        cache = ResultCache("t", max_entries=0)
+        cache.get_or_compute("v", "k", lambda: {})
+        self.assertEqual(len(cache), 0)
+
+
+class TestRuleFunctionCaching(unittest.TestCase):
+    """규칙 분석 함수 캐싱 테스트"""
+
+    def test_detect_pii_and_calculate_risk_cached(self):
+        """반복 호출은 적중, 결과는 엔진 직접 호출과 동일"""
+        engine = get_pii_engine()
+        text = TEXT + " 캐시 테스트"
+        hits = get_result_cache("detect_pii").hits
+        first = detect_pii(text)
+        second = detect_pii(text)
+        self.assertEqual(first, engine.detect(text))
+        self.assertEqual(second, first)
+        self.assertIsNot(second, first)
+        self.assertEqual(get_result_cache("detect_pii").hits, hits + 1)
+        self.assertEqual(calculate_risk(first["found_pii"]), engine.calculate_risk(first["found_pii"]))
+        self.assertEqual(calculate_risk(second["found_pii"]), engine.calculate_risk(first["found_pii"]))
+
+    def test_analyze_incoming_message_invalidated_on_reload(self):
+        """위협 패턴 재로드 → 새 엔진 → 캐시 무효화"""
+        cache = get_result_cache("analyze_incoming_message")
+        expected = analyze_incoming_message(TEXT)
+        self.assertEqual(analyze_incoming_message(TEXT), expected)
+        self.assertEqual(cache.get_or_compute(get_threat_engine(), text_key(TEXT), lambda: None), expected)
+
+        threat_matcher.reload_threat_data()
+        invalidations = cache.invalidations
+        self.assertEqual(analyze_incoming_message(TEXT), expected)
+        self.assertEqual(cache.invalidations, invalidations + 1)
+
+    def test_different_texts_not_shared(self):
+        """텍스트가 다르면 결과도 따로"""
+        a = detect_pii("내 계좌 110-123-456789")
+        b = detect_pii("내 계좌 110-123-456780")
+        self.assertNotEqual(a["found_pii"][0]["value"], b["found_pii"][0]["value"])
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
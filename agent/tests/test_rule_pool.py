@@ -0,0 +1,134 @@
+"""
+RulePool 단위 테스트 (풀 실행 + 배압 + 대기/실행 시간 지표)
+"""
+import asyncio
+import multiprocessing
+import time
+import unittest
+
+from ..agents.outgoing import OutgoingAgent
+from ..core import rule_pool
+from ..core.rule_pool import RulePool, RulePoolSaturated
+from ..core.pattern_matcher import detect_pii, get_pii_engine
+from ..mcp.tools import _rule_incoming, _rule_outgoing, analyze_incoming_async, analyze_outgoing_async
+
+
+TEXT = "엄마 나 폰 액정 깨져서 그런데 이 계좌로 50만원 보내줘 110-123-456789 급해"
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+class TestRulePool(unittest.TestCase):
+    """규칙 풀 테스트"""
+
+    def test_thread_pool_matches_direct_call(self):
+        """풀 실행 결과 = 직접 호출 결과"""
+        pool = RulePool(mode="thread", workers=2)
+        try:
+            results = asyncio.run(self._gather(pool, [(_rule_incoming, TEXT, "s1"), (_rule_outgoing, TEXT)]))
+        finally:
+            pool.shutdown()
+        self.assertEqual(results[0], _rule_incoming(TEXT, "s1"))
+        self.assertEqual(results[1], _rule_outgoing(TEXT))
+        self.assertIsNotNone(pool.preloaded)
+
+    def test_backpressure_rejects_when_saturated(self):
+        """대기 작업이 max_pending을 넘으면 admission_timeout 후 RulePoolSaturated"""
+        pool = RulePool(mode="thread", workers=1, max_pending=2, admission_timeout=0.05)
+
+        async def run():
+            tasks = [asyncio.ensure_future(pool.run(_sleep, 0.2)) for _ in range(4)]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            results = asyncio.run(run())
+        finally:
+            pool.shutdown()
+        self.assertEqual(results[:2], [0.2, 0.2])
+        self.assertTrue(all(isinstance(r, RulePoolSaturated) for r in results[2:]))
+        stats = pool.get_stats()
+        self.assertEqual(stats["rejected"], 2)
+        self.assertEqual(stats["pending"], 0)
+
+    def test_waiting_task_gets_released_slot(self):
+        """자리가 나면 기다리던 작업이 실행됨"""
+        pool = RulePool(mode="thread", workers=1, max_pending=1, admission_timeout=1.0)
+        try:
+            results = asyncio.run(self._gather(pool, [(_sleep, 0.05), (_sleep, 0.05)]))
+        finally:
+            pool.shutdown()
+        self.assertEqual(results, [0.05, 0.05])
+        self.assertGreater(pool.get_stats()["admission_wait_ms"]["max"], 30)
+
+    def test_queue_wait_separate_from_exec(self):
+        """워커 1개에 3개 제출 → 뒤 작업은 큐에서 대기, 실행 시간은 작업 시간만큼"""
+        pool = RulePool(mode="thread", workers=1, max_pending=8)
+        try:
+            asyncio.run(self._gather(pool, [(_sleep, 0.05)] * 3))
+        finally:
+            pool.shutdown()
+        stats = pool.get_stats()
+        self.assertEqual(stats["completed"], 3)
+        self.assertGreater(stats["queue_wait_ms"]["max"], 80)
+        self.assertLess(stats["exec_ms"]["max"], 80)
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "fork 미지원 플랫폼")
+    def test_process_pool(self):
+        """프로세스 풀(fork): 부모에서 미리 컴파일한 규칙으로 분석"""
+        pool = RulePool(mode="process", workers=2)
+        try:
+            results = asyncio.run(self._gather(pool, [(detect_pii, TEXT), (_rule_incoming, TEXT, None)]))
+        finally:
+            pool.shutdown()
+        self.assertEqual(results[0], detect_pii(TEXT))
+        self.assertEqual(results[1], _rule_incoming(TEXT, None))
+
+    def test_inline_mode(self):
+        """inline 모드: 풀 없이 바로 실행"""
+        pool = RulePool(mode="inline")
+        self.assertEqual(asyncio.run(pool.run(_sleep, 0)), 0)
+        self.assertEqual(pool.get_stats()["completed"], 1)
+
+    def test_async_tool_uses_pool(self):
+        """analyze_incoming_async(use_ai=False) = 규칙 기반 분석"""
+        result = asyncio.run(analyze_incoming_async(TEXT, sender_id="s1"))
+        self.assertEqual(result, _rule_incoming(TEXT, "s1"))
+
+    def test_ai_path_runs_rules_in_pool(self):
+        """use_ai=True도 규칙 단계는 풀에서 실행 (이벤트 루프에서 정규식 검사 안 함)"""
+        saved = rule_pool._rule_pool
+        pool = rule_pool._rule_pool = RulePool(mode="thread", workers=1)
+        try:
+            incoming = asyncio.run(analyze_incoming_async(TEXT, sender_id="s1", use_ai=True))
+            outgoing = asyncio.run(analyze_outgoing_async("오늘 저녁 뭐 먹을까", use_ai=True))
+        finally:
+            pool.shutdown()
+            rule_pool._rule_pool = saved
+        self.assertEqual(pool.stats["submitted"], 2)
+        self.assertEqual(incoming, _rule_incoming(TEXT, "s1"))
+        self.assertEqual(outgoing.recommended_action, "전송")
+
+    def test_outgoing_uses_precomputed_rule_analysis(self):
+        """풀에서 계산한 규칙 분석 결과를 그대로 사용"""
+        agent = OutgoingAgent()
+        analysis = get_pii_engine().analyze(TEXT)
+        self.assertEqual(agent.rule_tier(TEXT), analysis)
+        self.assertEqual(agent.rule_tier("오늘 저녁 뭐 먹을까"), {})
+        result = asyncio.run(agent.analyze_async(TEXT, use_ai=False, rule_analysis=analysis))
+        self.assertEqual(result, agent.analyze(TEXT, use_ai=False))
+
+    @staticmethod
+    async def _gather(pool, calls):
+        return await asyncio.gather(*(pool.run(func, *args) for func, *args in calls))
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
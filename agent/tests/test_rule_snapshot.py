@@ -0,0 +1,184 @@
+"""
+RuleSnapshot 단위 테스트 (버전 스냅샷 + 원자적 교체 + 롤백 + 파일 감시 / 시그널)
+"""
+import json
+import os
+import shutil
+import signal
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from ..core import rule_snapshot
+from ..core.scam_index import KIND_ACCOUNT, KIND_PHONE
+from ..core.rule_snapshot import (
+    DATA_DIR,
+    PII_FILE,
+    RULE_FILES,
+    SCAM_FILE,
+    THREAT_FILE,
+    RuleSnapshotError,
+    RuleSnapshotManager,
+    build_snapshot,
+)
+
+
+def _wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestRuleSnapshot(unittest.TestCase):
+    """규칙 스냅샷 테스트"""
+
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        for name in RULE_FILES:
+            shutil.copy(DATA_DIR / name, self.dir / name)
+        self.manager = RuleSnapshotManager(self.dir, watch_interval=0.02)
+
+    def tearDown(self):
+        self.manager.stop_watching()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _edit_threat(self, edit):
+        path = self.dir / THREAT_FILE
+        data = json.loads(path.read_text(encoding="utf-8"))
+        edit(data)
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    def test_version_and_unchanged_reload(self):
+        """내용이 같으면 교체하지 않고 같은 스냅샷 유지"""
+        snapshot = self.manager.current()
+        self.assertRegex(snapshot.version, r"^r1-[0-9a-f]{12}$")
+        os.utime(self.dir / PII_FILE)
+        self.assertFalse(self.manager.reload())
+        self.assertIs(self.manager.current(), snapshot)
+        self.assertEqual(self.manager.stats["unchanged"], 1)
+
+    def test_changed_file_swaps_and_reuses_unchanged_parts(self):
+        """바뀐 파일만 재컴파일, 나머지 엔진은 재사용"""
+        old = self.manager.current()
+        self._edit_threat(lambda data: data.__setitem__("version", "test-edit"))
+
+        self.assertTrue(self.manager.reload())
+        new = self.manager.current()
+        self.assertNotEqual(new.version, old.version)
+        self.assertTrue(new.version.startswith("r2-"))
+        self.assertIs(new.pii_engine, old.pii_engine)
+        self.assertIs(new.scam_store, old.scam_store)
+        self.assertIsNot(new.threat_engine, old.threat_engine)
+        self.assertEqual(new.threat_engine.version, "test-edit")
+
+    def test_broken_file_keeps_current_rules(self):
+        """파싱/검증 실패 → 기존 스냅샷 유지 + last_error"""
+        snapshot = self.manager.current()
+        (self.dir / PII_FILE).write_text("{ broken", encoding="utf-8")
+        self.assertFalse(self.manager.reload())
+        self.assertIs(self.manager.current(), snapshot)
+        self.assertIn(PII_FILE, self.manager.last_error)
+
+        self._edit_threat(lambda data: data.__setitem__("categories", {}))
+        shutil.copy(DATA_DIR / PII_FILE, self.dir / PII_FILE)
+        self.assertFalse(self.manager.reload())
+        self.assertIs(self.manager.current(), snapshot)
+        self.assertEqual(self.manager.stats["failures"], 2)
+
+    def test_build_snapshot_rejects_missing_fields(self):
+        """필수 필드 누락 → RuleSnapshotError"""
+        self._edit_threat(lambda data: data.pop("scoring"))
+        with self.assertRaises(RuleSnapshotError):
+            build_snapshot(self.dir)
+
+    def test_rollback(self):
+        """rollback() → 직전 스냅샷으로 복귀"""
+        first = self.manager.current()
+        self.assertTrue(self.manager.reload(force=True))
+        self.assertIsNot(self.manager.current(), first)
+        self.assertEqual(self.manager.rollback(), first.version)
+        self.assertIs(self.manager.current(), first)
+        self.assertIsNone(self.manager.rollback())
+
+    def test_scam_deltas_compact_past_threshold(self):
+        """KAT_SCAM_COMPACT_THRESHOLD 이상 델타 기록 → scam_db.snapshot 저장 + 델타 로그 정리"""
+        previous = rule_snapshot.SCAM_COMPACT_THRESHOLD
+        rule_snapshot.SCAM_COMPACT_THRESHOLD = 2
+        try:
+            store = build_snapshot(self.dir).scam_store
+        finally:
+            rule_snapshot.SCAM_COMPACT_THRESHOLD = previous
+        record = {"phone_number": "02-555-1234", "report_count": 1, "report_type": "기관사칭",
+                  "status": "under_investigation", "risk_score": 60}
+
+        store.append("add", "phone", record=record)
+        self.assertFalse((self.dir / "scam_db.snapshot").exists())
+        store.append("update", "phone", number="02-555-1234", fields={"status": "confirmed_scam"})
+        store.append("add", "phone", record=dict(record, phone_number="02-555-5678"))
+        self.assertTrue((self.dir / "scam_db.snapshot").exists())
+        self.assertEqual((self.dir / "scam_db.delta.jsonl").read_text(encoding="utf-8"), "")
+        self.assertEqual(store.stats["compactions"], 1)
+        self.assertEqual(store.index().overlay_size, 0)
+        self.assertEqual(store.index().lookup(KIND_PHONE, "025551234")["status"], "confirmed_scam")
+
+    def test_scam_db_edit_after_compaction(self):
+        """컴팩션 후 scam_db.json 수정 → 리로드하면 오래된 스냅샷 대신 새 기본 데이터 + 남은 델타로 조회"""
+        store = self.manager.current().scam_store
+        record = {"phone_number": "02-555-1234", "report_count": 1, "report_type": "기관사칭",
+                  "status": "under_investigation", "risk_score": 60}
+        store.append("add", "phone", record=record)
+        store.compact()
+        store.append("add", "phone", record=dict(record, phone_number="02-555-5678"))
+
+        path = self.dir / SCAM_FILE
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["reported_accounts"]["data"].append(
+            {"account_number": "555-55-555555", "report_count": 1, "report_type": "보이스피싱",
+             "status": "confirmed_scam", "risk_score": 100})
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+        self.assertTrue(self.manager.reload())
+        index = self.manager.current().scam_store.index()
+        self.assertEqual(index.lookup(KIND_ACCOUNT, "55555555555")["status"], "confirmed_scam")
+        self.assertIsNotNone(index.lookup(KIND_PHONE, "025555678"))
+        self.assertEqual(index.base_digest, self.manager.current().digests[SCAM_FILE])
+
+        # 다음 컴팩션은 새 기본 데이터 기준 스냅샷 → 재시작해도 그대로
+        self.manager.current().scam_store.compact()
+        restarted = build_snapshot(self.dir).scam_store.index()
+        self.assertIsNotNone(restarted.lookup(KIND_ACCOUNT, "55555555555"))
+        self.assertIsNotNone(restarted.lookup(KIND_PHONE, "025555678"))
+
+    def test_file_watch_triggers_reload(self):
+        """파일 감시 스레드가 변경을 감지하여 교체"""
+        old = self.manager.current()
+        self.manager.watch()
+        self._edit_threat(lambda data: data.__setitem__("version", "watched"))
+        self.assertTrue(_wait_until(lambda: self.manager.current() is not old))
+        self.assertEqual(self.manager.current().threat_engine.version, "watched")
+
+    @unittest.skipUnless(hasattr(signal, "SIGHUP"), "SIGHUP 미지원 플랫폼")
+    def test_signal_triggers_reload(self):
+        """SIGHUP → 리로드"""
+        previous_handler = signal.getsignal(signal.SIGHUP)
+        try:
+            old = self.manager.current()
+            self.assertTrue(self.manager.install_signal_handler())
+            self._edit_threat(lambda data: data.__setitem__("version", "signaled"))
+            os.kill(os.getpid(), signal.SIGHUP)
+            self.assertTrue(_wait_until(lambda: self.manager.current() is not old))
+        finally:
+            signal.signal(signal.SIGHUP, previous_handler)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,171 @@
+"""
+ScamReportStore / DeltaLog 단위 테스트 (사기 신고 증분 반영)
+"""
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from ..core.scam_delta import DeltaLog, ScamReportStore
+from ..core.scam_index import ScamReportIndex, KIND_ACCOUNT, KIND_PHONE
+
+
+BASE_DB = {
+    "version": "test",
+    "reported_accounts": {"data": [
+        {"account_number": "110-123-456789", "report_count": 3, "report_type": "보이스피싱",
+         "status": "under_investigation", "risk_score": 70},
+    ]},
+    "reported_phones": {"data": [
+        {"phone_number": "010-1234-5678", "report_count": 5, "report_type": "보이스피싱",
+         "status": "confirmed_scam", "risk_score": 100},
+    ]},
+    "status_definitions": {"confirmed_scam": {"name_ko": "사기 확정", "action": "block_and_report"}},
+}
+
+NEW_PHONE = {"phone_number": "02-555-1234", "report_count": 1, "report_type": "기관사칭",
+             "status": "under_investigation", "risk_score": 60}
+
+
+class TestScamReportStore(unittest.TestCase):
+    """기본 색인 + 델타 로그 테스트"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.base_path = self.tmp / "scam_db.json"
+        self.base_path.write_text(json.dumps(BASE_DB, ensure_ascii=False), encoding="utf-8")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _store(self, **kwargs):
+        return ScamReportStore(
+            self.base_path, self.tmp / "scam_db.snapshot", self.tmp / "scam_db.delta.jsonl",
+            poll_interval=0, **kwargs
+        )
+
+    def test_add_update_remove(self):
+        """신규 신고 / 상태 변경 / 삭제 반영"""
+        store = self._store()
+        store.append("add", "phone", record=NEW_PHONE)
+        store.append("update", "account", number="110123456789",
+                     fields={"status": "confirmed_scam", "risk_score": 100})
+        store.append("remove", "phone", number="010-1234-5678")
+
+        index = store.index()
+        self.assertEqual(index.lookup(KIND_PHONE, "025551234")["risk_score"], 60)
+        self.assertEqual(index.lookup(KIND_ACCOUNT, "110123456789")["status"], "confirmed_scam")
+        self.assertIsNone(index.lookup(KIND_PHONE, "01012345678"))
+        self.assertEqual(index.last_seq, 3)
+        self.assertEqual(len(index.lookup_many([(KIND_PHONE, "025551234"), (KIND_PHONE, "01012345678")])), 1)
+
+    def test_worker_applies_deltas_in_place(self):
+        """다른 워커의 색인은 재생성 없이 델타만 반영"""
+        writer = self._store()
+        worker = self._store()
+        index = worker.index()
+
+        writer.append("add", "phone", record=NEW_PHONE)
+        self.assertIs(worker.index(), index)
+        self.assertIsNotNone(index.lookup(KIND_PHONE, "025551234"))
+
+    def test_compaction_and_reopen_from_snapshot(self):
+        """컴팩션 → 스냅샷 + 로그 정리, 재시작 시 JSON 없이 로드"""
+        writer = self._store(compact_threshold=2)
+        worker = self._store()
+        worker.index()
+
+        writer.append("add", "phone", record=NEW_PHONE)
+        writer.append("remove", "account", number="110-123-456789")
+        self.assertEqual(writer.stats["compactions"], 1)
+        self.assertEqual(writer.index().overlay_size, 0)
+        self.assertEqual((self.tmp / "scam_db.delta.jsonl").read_text(encoding="utf-8"), "")
+
+        # 로그 교체 감지 → 스냅샷에서 다시 로드
+        index = worker.index()
+        self.assertEqual(worker.stats["reloads"], 1)
+        self.assertIsNotNone(index.lookup(KIND_PHONE, "025551234"))
+        self.assertIsNone(index.lookup(KIND_ACCOUNT, "110123456789"))
+
+        # 스냅샷 이후 델타만 재생, 기본 JSON은 읽지 않음
+        writer.append("update", "phone", number="025551234", fields={"status": "confirmed_scam"})
+        self.base_path.unlink()
+        restarted = self._store().index()
+        self.assertEqual(restarted.lookup(KIND_PHONE, "025551234")["status"], "confirmed_scam")
+        self.assertEqual(restarted.lookup(KIND_PHONE, "01012345678")["risk_score"], 100)
+        self.assertEqual(restarted.status_definitions, BASE_DB["status_definitions"])
+
+    def test_changed_base_discards_snapshot(self):
+        """스냅샷 이후 기본 JSON이 바뀌면 스냅샷 대신 새 기본 데이터 + 남은 델타"""
+        writer = self._store()
+        writer.append("add", "phone", record=NEW_PHONE)
+        writer.compact()
+        writer.append("update", "phone", number="025551234", fields={"status": "confirmed_scam"})
+        self.assertEqual(self._store().index().base_digest, writer.index().base_digest)
+
+        edited = json.loads(json.dumps(BASE_DB))
+        edited["reported_accounts"]["data"].append(dict(edited["reported_accounts"]["data"][0],
+                                                        account_number="555-55-555555"))
+        self.base_path.write_text(json.dumps(edited, ensure_ascii=False), encoding="utf-8")
+
+        for store in (self._store(), self._store(base_data=edited)):
+            index = store.index()
+            self.assertIsNotNone(index.lookup(KIND_ACCOUNT, "55555555555"))
+            # 스냅샷에 병합된 델타(NEW_PHONE 추가)는 버려지고, 로그에 남은 델타만 재생
+            self.assertIsNone(index.lookup(KIND_PHONE, "025551234"))
+            self.assertEqual(index.last_seq, 2)
+
+    def test_snapshot_round_trip(self):
+        """스냅샷 저장/로드 결과 동일"""
+        index = ScamReportIndex(BASE_DB)
+        index.apply_delta({"seq": 1, "op": "add", "kind": "phone", "record": NEW_PHONE})
+        index.apply_delta({"seq": 2, "op": "add", "kind": "account",
+                           "record": {"account_number": "ABC-1", "status": "cleared", "risk_score": 0}})
+        path = self.tmp / "round.snapshot"
+        self.assertEqual(index.save_snapshot(path), 4)
+
+        loaded = ScamReportIndex.from_snapshot(path)
+        for kind, number in [(KIND_PHONE, "025551234"), (KIND_PHONE, "01012345678"),
+                             (KIND_ACCOUNT, "110123456789"), (KIND_ACCOUNT, "ABC1"),
+                             (KIND_ACCOUNT, "999")]:
+            self.assertEqual(loaded.lookup(kind, number), index.lookup(kind, number))
+        self.assertEqual(loaded.last_seq, 2)
+
+
+class TestDeltaLog(unittest.TestCase):
+    """델타 로그 테스트"""
+
+    def test_partial_line_not_consumed(self):
+        """기록 중인 마지막 줄은 다음 읽기로 미룸"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "delta.jsonl"
+            log = DeltaLog(path)
+            log.append("remove", "phone", number="01012345678")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write('{"seq": 2, "op": "remove"')
+            entries, replaced = log.read_new()
+            self.assertEqual([e["seq"] for e in entries], [1])
+            self.assertFalse(replaced)
+
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(', "kind": "phone", "number": "0212345678"}\n')
+            entries, _ = log.read_new()
+            self.assertEqual([e["seq"] for e in entries], [2])
+
+    def test_invalid_entries_rejected(self):
+        """잘못된 델타는 기록하지 않음"""
+        with tempfile.TemporaryDirectory() as tmp:
+            log = DeltaLog(Path(tmp) / "delta.jsonl")
+            with self.assertRaises(ValueError):
+                log.append("add", "phone")
+            with self.assertRaises(ValueError):
+                log.append("remove", "email", number="a@b.c")
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,127 @@
+"""
+ScamReportIndex 단위 테스트 (사기 신고 식별자 색인)
+"""
+import random
+import unittest
+from ..core.scam_index import (
+    BloomFilter,
+    ScamReportIndex,
+    KIND_ACCOUNT,
+    KIND_PHONE,
+    identifier_key,
+)
+from ..core.scam_checker import (
+    _load_scam_db,
+    check_reported_account,
+    check_reported_phone,
+    check_scam_in_message,
+    get_scam_index,
+)
+
+
+def _make_db(accounts, phones):
+    return {
+        "reported_accounts": {"data": [
+            {"account_number": a, "report_count": 1, "report_type": "테스트",
+             "status": "confirmed_scam", "risk_score": 100} for a in accounts
+        ]},
+        "reported_phones": {"data": [
+            {"phone_number": p, "report_count": 1, "report_type": "테스트",
+             "status": "under_investigation", "risk_score": 70} for p in phones
+        ]},
+        "status_definitions": {},
+    }
+
+
+class TestScamReportIndex(unittest.TestCase):
+    """사기 신고 색인 테스트"""
+
+    def test_all_mock_records_found(self):
+        """Mock DB의 모든 신고 번호 조회"""
+        db = _load_scam_db()
+        for record in db["reported_accounts"]["data"]:
+            self.assertTrue(check_reported_account(record["account_number"])["is_reported"])
+        for record in db["reported_phones"]["data"]:
+            result = check_reported_phone(record["phone_number"])
+            self.assertTrue(result["is_reported"])
+            self.assertEqual(result["report_info"]["phone_number"], record["phone_number"])
+
+    def test_unreported_and_kind_separated(self):
+        """미신고 번호 / 계좌-전화 종류 구분"""
+        self.assertFalse(check_reported_account("999-999-999999")["is_reported"])
+        phone = _load_scam_db()["reported_phones"]["data"][0]["phone_number"]
+        self.assertFalse(check_reported_account(phone)["is_reported"])
+
+    def test_leading_zero_distinguished(self):
+        """앞자리 0이 다른 번호는 다른 키"""
+        self.assertNotEqual(identifier_key(KIND_PHONE, "01012345678"),
+                            identifier_key(KIND_PHONE, "1012345678"))
+        self.assertIsNone(identifier_key(KIND_ACCOUNT, "12AB"))
+        self.assertIsNone(identifier_key(KIND_ACCOUNT, "1" * 18))
+
+    def test_non_numeric_record_fallback(self):
+        """숫자가 아닌 식별자도 조회 가능"""
+        index = ScamReportIndex(_make_db(["ABC-123"], []))
+        self.assertIsNotNone(index.lookup(KIND_ACCOUNT, "ABC123"))
+
+    def test_lookup_many_matches_single_lookup(self):
+        """일괄 조회 == 단건 조회"""
+        rng = random.Random(5)
+        accounts = [f"{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(100000, 999999)}"
+                    for _ in range(2000)]
+        phones = [f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}" for _ in range(2000)]
+        index = ScamReportIndex(_make_db(accounts, phones))
+
+        queries = [(KIND_ACCOUNT, a.replace("-", "")) for a in accounts[:300]]
+        queries += [(KIND_PHONE, p.replace("-", "")) for p in phones[:300]]
+        queries += [(KIND_ACCOUNT, str(rng.randint(10 ** 11, 10 ** 12))) for _ in range(300)]
+        rng.shuffle(queries)
+
+        found = index.lookup_many(queries)
+        for kind, value in queries:
+            self.assertIs(found.get((kind, value)), index.lookup(kind, value))
+        self.assertGreaterEqual(len(found), 600)
+
+    def test_message_batch_lookup(self):
+        """메시지 내 신고 계좌/전화번호 일괄 조회"""
+        db = _load_scam_db()
+        account = db["reported_accounts"]["data"][0]["account_number"]
+        phone = db["reported_phones"]["data"][0]["phone_number"]
+        result = check_scam_in_message(f"이 계좌로 보내 {account} 연락은 {phone}")
+        self.assertTrue(result["has_reported_identifier"])
+        self.assertEqual(len(result["reported_accounts"]), 1)
+        self.assertEqual(len(result["reported_phones"]), 1)
+
+    def test_index_is_reused(self):
+        """같은 DB면 색인 재사용"""
+        self.assertIs(get_scam_index(), get_scam_index())
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Bloom filter 테스트"""
+
+    def test_no_false_negatives(self):
+        """추가한 키는 항상 포함"""
+        bloom = BloomFilter(5000)
+        keys = [random.getrandbits(62) for _ in range(5000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+
+    def test_false_positive_rate(self):
+        """오탐률이 목표치 근처"""
+        rng = random.Random(11)
+        bloom = BloomFilter(10000, error_rate=0.01)
+        for _ in range(10000):
+            bloom.add(rng.getrandbits(62))
+        false_positives = sum(rng.getrandbits(62) in bloom for _ in range(20000))
+        self.assertLess(false_positives / 20000, 0.03)
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,161 @@
+"""
+StageExecutor 단위 테스트 (단계 DAG 동시 실행 + 부분 결과)
+"""
+import asyncio
+import time
+import unittest
+
+from ..core.stage_executor import Stage, StageExecutor
+from ..agents.incoming import IncomingAgent, STAGE_SENDER, STAGE_POLICY, build_incoming_stages
+from ..core.models import RiskLevel
+
+
+def _sleep_stage(name: str, delay: float, value=None, **kwargs) -> Stage:
+    def func(ctx):
+        time.sleep(delay)
+        return value if value is not None else name
+    return Stage(name, func, blocking=True, **kwargs)
+
+
+class TestStageExecutor(unittest.TestCase):
+    """실행기 테스트"""
+
+    def test_independent_stages_run_concurrently(self):
+        """의존 없는 blocking 단계 3개 → 가장 느린 단계 시간만큼"""
+        executor = StageExecutor([
+            _sleep_stage("a", 0.2),
+            _sleep_stage("b", 0.2),
+            _sleep_stage("c", 0.2),
+            Stage("total", lambda ctx: [ctx["a"], ctx["b"], ctx["c"]], depends_on=("a", "b", "c")),
+        ])
+        start = time.perf_counter()
+        run = executor.run({})
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(run.results["total"], ["a", "b", "c"])
+        self.assertLess(elapsed, 0.45)
+        self.assertEqual(run.partial, [])
+
+    def test_timeout_and_error_become_partial_results(self):
+        """시간 초과/예외 단계는 기본값으로 채우고 나머지는 계속"""
+        def broken(ctx):
+            raise RuntimeError("DB 연결 실패")
+
+        executor = StageExecutor([
+            _sleep_stage("slow", 0.5, timeout=0.05, default={"timed_out": True}),
+            Stage("broken", broken, blocking=True, default={}),
+            Stage("fast", lambda ctx: "ok"),
+            Stage("final", lambda ctx: (ctx["slow"], ctx["broken"], ctx["fast"]), depends_on=("slow", "broken", "fast")),
+        ])
+        start = time.perf_counter()
+        run = executor.run({})
+
+        self.assertLess(time.perf_counter() - start, 0.3)
+        self.assertEqual(run.results["final"], ({"timed_out": True}, {}, "ok"))
+        self.assertEqual(run.status["slow"], "timeout")
+        self.assertEqual(run.status["broken"], "error")
+        self.assertEqual(sorted(run.partial), ["broken", "slow"])
+        self.assertIn("DB 연결 실패", run.errors["broken"])
+
+    def test_required_stage_error_propagates(self):
+        """required 단계의 예외는 전파"""
+        def broken(ctx):
+            raise ValueError("필수 단계 실패")
+
+        executor = StageExecutor([Stage("core", broken, required=True)])
+        with self.assertRaises(ValueError):
+            executor.run({})
+
+    def test_skipped_stage_and_dependency_order(self):
+        """enabled=False면 건너뜀, 의존 단계 결과는 ctx로 전달"""
+        executor = StageExecutor([
+            Stage("double", lambda ctx: ctx["x"] * 2),
+            Stage("maybe", lambda ctx: "ran", enabled=lambda ctx: ctx["x"] > 10, default="skipped"),
+            Stage("sum", lambda ctx: ctx["double"] + 1, depends_on=("double",)),
+        ])
+        run = executor.run({"x": 3})
+        self.assertEqual(run.results, {"double": 6, "maybe": "skipped", "sum": 7})
+        self.assertEqual(run.status["maybe"], "skipped")
+
+    def test_invalid_graph(self):
+        """미등록 의존 / 순환 → ValueError"""
+        with self.assertRaises(ValueError):
+            StageExecutor([Stage("a", lambda ctx: 1, depends_on=("missing",))]).run({})
+        with self.assertRaises(ValueError):
+            StageExecutor([
+                Stage("a", lambda ctx: 1, depends_on=("b",)),
+                Stage("b", lambda ctx: 1, depends_on=("a",)),
+            ]).run({})
+
+    def test_async_executor_with_coroutine_stage(self):
+        """비동기 실행: async 단계 + blocking 단계 동시 진행, 끝나는 순서대로 반환"""
+        async def remote(ctx):
+            await asyncio.sleep(0.05)
+            return "remote"
+
+        executor = StageExecutor([
+            _sleep_stage("local", 0.2),
+            Stage("remote", remote, timeout=1.0),
+            Stage("final", lambda ctx: ctx["remote"] + "+" + ctx["local"], depends_on=("local", "remote")),
+        ])
+
+        async def run():
+            return [name async for name, _ in executor.iter_async({})]
+
+        start = time.perf_counter()
+        order = asyncio.run(run())
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertEqual(order, ["remote", "local", "final"])
+
+    def test_async_timeout_cancels_coroutine_stage(self):
+        """비동기 실행: 시간 초과 async 단계는 취소 후 기본값"""
+        async def hang(ctx):
+            await asyncio.sleep(10)
+
+        executor = StageExecutor([Stage("hang", hang, timeout=0.05, default="fallback")])
+        run = asyncio.run(executor.run_async({}))
+        self.assertEqual(run.results["hang"], "fallback")
+        self.assertEqual(run.status["hang"], "timeout")
+
+
+class TestIncomingAgentStages(unittest.TestCase):
+    """IncomingAgent 단계 구성 테스트"""
+
+    TEXT = "엄마 나 폰 액정 깨져서 그런데 이 계좌로 50만원 보내줘 110-123-456789 급해"
+
+    def test_slow_sender_trust_returns_partial_verdict(self):
+        """발신자 신뢰도 단계가 시간 초과되어도 나머지 단계로 판정"""
+        slow_sender = _sleep_stage(STAGE_SENDER, 1.0, value={"risk_adjustment": 50}, timeout=0.05)
+        agent = IncomingAgent(extra_stages=[slow_sender])
+
+        start = time.perf_counter()
+        result = agent._analyze_4_stages(self.TEXT, user_id="u1", sender_id="s1")
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(result["partial_stages"], [STAGE_SENDER])
+        self.assertIsNone(result[STAGE_SENDER])
+        self.assertEqual(result["final_risk_level"], "CRITICAL")
+
+    def test_plug_in_stage(self):
+        """추가 단계는 기존 단계와 함께 실행되어 결과에 포함"""
+        agent = IncomingAgent(extra_stages=[Stage("link_preview", lambda ctx: {"urls": len(ctx["features"].urls)})])
+        result = agent._analyze_4_stages("이거 봐 https://example.com")
+        self.assertEqual(result["link_preview"], {"urls": 1})
+        self.assertEqual(len(agent.executor.stages), len(build_incoming_stages()) + 1)
+
+    def test_sync_and_async_paths_agree(self):
+        """analyze()와 analyze_async() 결과 동일"""
+        agent = IncomingAgent()
+        expected = agent.analyze(self.TEXT, sender_id="s1", user_id="u1")
+        actual = asyncio.run(agent.analyze_async(self.TEXT, sender_id="s1", user_id="u1"))
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual.risk_level, RiskLevel.CRITICAL)
+        self.assertIn(STAGE_POLICY, [stage.name for stage in agent.executor.stages])
+
+
+def run_tests():
+    """테스트 실행"""
+    unittest.main(module=__name__, exit=False, verbosity=2)
+
+
+if __name__ == "__main__":
+    run_tests()
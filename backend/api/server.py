@@ -6,14 +6,22 @@ MCP 도구를 HTTP 엔드포인트로 노출
 엔드포인트:
 - POST /api/agents/analyze/outgoing - 발신 메시지 분석
 - POST /api/agents/analyze/incoming - 수신 메시지 분석
+- POST /api/agents/analyze/incoming/stream - 수신 메시지 단계별 분석 (SSE)
+- POST /api/agents/analyze/batch - 메시지 배치 분석 (규칙 기반, 입력 순서 결과)
+- GET /api/agents/analysis/{analysis_id} - 지연 예산 초과 분석의 후속(LLM) 결과
 - POST /api/agents/analyze/image - 이미지 분석 (Vision OCR + PII 감지)
 - POST /api/secret/create - 시크릿 메시지 생성
 - GET /api/secret/view/{secret_id} - 시크릿 메시지 열람
-- GET /api/agents/health - 헬스체크
+- GET /api/agents/health - 헬스체크 (규칙 풀 대기/실행 시간, 결과 캐시 적중률, 규칙 버전, LLM 준비 상태, LLM 회로 상태, LLM 스케줄러 대기/차단 수 포함)
+- POST /api/agents/rules/reload - 규칙 파일 리로드 (실패 시 기존 규칙 유지)
+- POST /api/agents/rules/rollback - 직전 규칙 스냅샷으로 복귀
+  (KAT_RULE_POOL=process 워커에는 전달되지 않음 - 워커는 각자 규칙 파일 감시로 파일 변경만 반영)
 """
 
 import sys
 import os
+import asyncio
+import json
 from pathlib import Path
 
 # 프로젝트 루트를 Python 경로에 추가 (루트의 agent/ 모듈 우선 사용)
@@ -27,10 +35,12 @@ if backend_path in sys.path:
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Literal
 import tempfile
 import shutil
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 import uuid
 
@@ -40,8 +50,26 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 
 # MCP 도구 임포트 (v3.1 - category 필드 포함)
-from agent.mcp.tools import analyze_outgoing, analyze_incoming, analyze_image, mcp
+# 핸들러는 비동기 버전 사용 (LLM 호출이 이벤트 루프를 막지 않음)
+from agent.mcp.tools import (
+    analyze_outgoing_async,
+    analyze_incoming_async,
+    analyze_incoming_stream,
+    analyze_incoming_batch_async,
+    analyze_outgoing_batch_async,
+    analyze_image,
+    mcp,
+)
 from agent.core.models import RiskLevel
+from agent.core.batch_runner import BATCH_MAX_ITEMS, BatchItemError
+from agent.core.rule_pool import RulePoolSaturated, get_rule_pool
+from agent.core.result_cache import get_result_cache_stats
+from agent.core.rule_snapshot import get_rule_manager
+from agent.core.analysis_registry import (
+    DEFAULT_LATENCY_BUDGET_MS,
+    get_analysis_registry,
+    run_with_budget,
+)
 
 # === Database Setup ===
 DATABASE_PATH = PROJECT_ROOT / "kanana_dualguard.db"
@@ -87,10 +115,39 @@ def get_db():
         db.close()
 
 
+async def _warm_up_llm():
+    """LLM 워밍업 (동기 인스턴스 → 모델 ID 캐시 → 비동기 인스턴스) - 그동안 요청은 규칙 분석으로 처리"""
+    from agent.llm.kanana import AsyncLLMManager, warm_up_llms
+
+    await asyncio.to_thread(warm_up_llms)
+    await AsyncLLMManager.warm_up()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    시작 시 규칙 스냅샷 로드 + 규칙 풀 생성 + 규칙 파일 감시 / SIGHUP 리로드 설치 + LLM 백그라운드 워밍업
+
+    규칙 풀은 감시/워밍업 스레드보다 먼저 만든다 (process 모드는 여기서 fork - 스레드가 없을 때,
+    첫 요청이 fork를 기다리지 않도록).
+    """
+    rules = get_rule_manager()
+    pool = get_rule_pool()
+    pool.start()
+    rules.watch()
+    rules.install_signal_handler()
+    warm_up = asyncio.create_task(_warm_up_llm())
+    yield
+    warm_up.cancel()
+    rules.stop_watching()
+    pool.shutdown(wait=False)
+
+
 app = FastAPI(
     title="DualGuard Agent API",
     description="카카오톡 양방향 보안 에이전트 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -126,6 +183,8 @@ class OutgoingRequest(BaseModel):
     sender_id: Optional[int] = None
     receiver_id: Optional[int] = None
     use_ai: bool = True  # Kanana LLM 사용 (테스트용 기본값 True)
+    # 지연 예산 (ms) - 초과 시 규칙 판정 먼저 반환, LLM 결과는 analysis_id로 후속 조회
+    latency_budget_ms: Optional[int] = None
 
 
 class IncomingRequest(BaseModel):
@@ -133,6 +192,7 @@ class IncomingRequest(BaseModel):
     sender_id: Optional[int] = None
     receiver_id: Optional[int] = None
     use_ai: bool = True  # Kanana LLM 사용 (테스트용 기본값 True)
+    latency_budget_ms: Optional[int] = None
 
 
 class AnalysisResponse(BaseModel):
@@ -144,6 +204,87 @@ class AnalysisResponse(BaseModel):
     category: Optional[str] = None  # MECE 카테고리 (A-1, B-2 등)
     category_name: Optional[str] = None  # 카테고리 이름 (가족 사칭 등)
     scam_probability: Optional[int] = None  # 사기 확률 (0-100%)
+    # 지연 예산 초과 시: 규칙 판정 + 진행 중인 LLM 분석 ID
+    analysis_id: Optional[str] = None
+    pending: bool = False
+
+
+class AnalysisFollowUpResponse(BaseModel):
+    """후속 분석 결과 (GET /api/agents/analysis/{analysis_id})"""
+    analysis_id: str
+    status: str  # pending / done / error
+    result: Optional[AnalysisResponse] = None  # 완료 시 LLM 판정
+    upgraded: bool = False  # 먼저 돌려준 규칙 판정과 위험도가 다른지
+    error: Optional[str] = None
+
+
+class BatchItem(BaseModel):
+    text: str
+    sender_id: Optional[int] = None
+    receiver_id: Optional[int] = None
+
+
+class BatchAnalysisRequest(BaseModel):
+    direction: Literal["incoming", "outgoing"] = "incoming"
+    items: List[BatchItem]
+
+
+class BatchItemErrorResponse(BaseModel):
+    index: int
+    detail: str
+
+
+class BatchAnalysisResponse(BaseModel):
+    """배치 분석 결과 (results는 입력 순서, 실패 항목은 None + errors)"""
+    results: List[Optional[AnalysisResponse]]
+    total: int
+    unique: int  # 중복 제거 후 실제 분석한 항목 수
+    errors: List[BatchItemErrorResponse] = []
+
+
+def _outgoing_response(result) -> AnalysisResponse:
+    return AnalysisResponse(
+        risk_level=result.risk_level.value,
+        reasons=result.reasons,
+        recommended_action=result.recommended_action,
+        is_secret_recommended=result.is_secret_recommended
+    )
+
+
+def _incoming_response(result) -> AnalysisResponse:
+    return AnalysisResponse(
+        risk_level=result.risk_level.value,
+        reasons=result.reasons,
+        recommended_action=result.recommended_action,
+        is_secret_recommended=False,
+        category=result.category,
+        category_name=result.category_name,
+        scam_probability=result.scam_probability
+    )
+
+
+async def _analyze_with_budget(full, rule_based, budget_ms: Optional[int], use_ai: bool) -> AnalysisResponse:
+    """
+    지연 예산 적용 분석
+
+    LLM 분석(full)이 예산 안에 끝나지 않으면 규칙 판정(rule_based)을 먼저 반환하고
+    LLM 분석은 백그라운드에서 계속 실행한다 (analysis_id로 후속 조회).
+    규칙 판정은 LLM 분석과 동시에 시작하므로 예산이 끝나면 바로 돌려줄 수 있다.
+    """
+    if budget_ms is None:
+        budget_ms = DEFAULT_LATENCY_BUDGET_MS
+    if not use_ai:
+        budget_ms = 0  # 규칙 기반만 사용 → 예산 불필요
+
+    response, analysis_id = await run_with_budget(full, rule_based, budget_ms)
+    if analysis_id is not None:
+        response = response.model_copy(update={"analysis_id": analysis_id, "pending": True})
+    return response
+
+
+def _pool_saturated(e: RulePoolSaturated) -> HTTPException:
+    """규칙 풀 포화 → 503 (클라이언트는 Retry-After 후 재시도)"""
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 
 # === 엔드포인트 ===
@@ -151,7 +292,41 @@ class AnalysisResponse(BaseModel):
 @app.get("/api/agents/health")
 async def health_check():
     """헬스체크"""
-    return {"status": "ok", "service": "DualGuard Agent API"}
+    from agent.llm.kanana import get_llm_readiness, get_llm_transport_stats
+    from agent.llm.scheduler import get_llm_scheduler
+
+    return {
+        "status": "ok",
+        "service": "DualGuard Agent API",
+        "llm_ready": get_llm_readiness(),
+        "rule_pool": get_rule_pool().get_stats(),
+        "result_cache": get_result_cache_stats(),
+        "rules": get_rule_manager().get_stats(),
+        "llm": get_llm_transport_stats(),
+        "llm_scheduler": get_llm_scheduler().get_stats(),
+    }
+
+
+@app.post("/api/agents/rules/reload")
+async def reload_rules_endpoint(force: bool = False):
+    """
+    규칙 파일 리로드 (컴파일/검증 실패 시 기존 규칙 유지 - last_error 확인)
+
+    이 프로세스만 다시 읽는다 - process 모드 규칙 풀 워커는 각자 파일 감시로 바뀐 파일을 반영.
+    """
+    rules = get_rule_manager()
+    swapped = await asyncio.to_thread(rules.reload, force, "api")
+    return {"swapped": swapped, **rules.get_stats()}
+
+
+@app.post("/api/agents/rules/rollback")
+async def rollback_rules_endpoint():
+    """직전 규칙 스냅샷으로 복귀 (이 프로세스만 - process 모드 규칙 풀 워커는 그대로)"""
+    rules = get_rule_manager()
+    version = rules.rollback()
+    if version is None:
+        raise HTTPException(status_code=409, detail="No previous rule snapshot")
+    return rules.get_stats()
 
 
 @app.get("/api/mcp/info")
@@ -167,6 +342,8 @@ async def mcp_info():
             "analyze_incoming",
             "analyze_image",
             "scan_pii",
+            "scan_pii_batch",
+            "analyze_incoming_batch",
             "evaluate_risk",
             "analyze_full",
             "list_pii_patterns",
@@ -187,15 +364,18 @@ async def api_analyze_outgoing(request: OutgoingRequest):
 
     use_ai=True: Kanana LLM이 ReAct 패턴으로 분석
     use_ai=False: Rule-based 패턴 매칭 (기본값)
+    latency_budget_ms: 지연 예산 (ms) - 초과 시 규칙 판정 + analysis_id(pending=True) 반환
     """
+    async def full():
+        return _outgoing_response(await analyze_outgoing_async(request.text, use_ai=request.use_ai))
+
+    async def rule_based():
+        return _outgoing_response(await analyze_outgoing_async(request.text, use_ai=False))
+
     try:
-        result = analyze_outgoing(request.text, use_ai=request.use_ai)
-        return AnalysisResponse(
-            risk_level=result.risk_level.value,
-            reasons=result.reasons,
-            recommended_action=result.recommended_action,
-            is_secret_recommended=result.is_secret_recommended
-        )
+        return await _analyze_with_budget(full, rule_based, request.latency_budget_ms, request.use_ai)
+    except RulePoolSaturated as e:
+        raise _pool_saturated(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -210,27 +390,151 @@ async def api_analyze_incoming(request: IncomingRequest):
     - category: A-1, B-2 등 (MECE 카테고리 코드)
     - category_name: 가족 사칭 (액정 파손) 등
     - scam_probability: 0-100 (사기 확률 %)
+
+    latency_budget_ms: 지연 예산 (ms) - 초과 시 규칙 판정 + analysis_id(pending=True) 반환
     """
-    try:
-        sender_id = str(request.sender_id) if request.sender_id else None
-        result = analyze_incoming(
+    sender_id = str(request.sender_id) if request.sender_id else None
+
+    async def full():
+        return _incoming_response(await analyze_incoming_async(
             request.text,
             sender_id=sender_id,
             use_ai=request.use_ai
-        )
-        return AnalysisResponse(
-            risk_level=result.risk_level.value,
-            reasons=result.reasons,
-            recommended_action=result.recommended_action,
-            is_secret_recommended=False,
-            category=result.category,
-            category_name=result.category_name,
-            scam_probability=result.scam_probability
-        )
+        ))
+
+    async def rule_based():
+        return _incoming_response(await analyze_incoming_async(
+            request.text,
+            sender_id=sender_id,
+            use_ai=False
+        ))
+
+    try:
+        return await _analyze_with_budget(full, rule_based, request.latency_budget_ms, request.use_ai)
+    except RulePoolSaturated as e:
+        raise _pool_saturated(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/agents/analyze/batch", response_model=BatchAnalysisResponse)
+async def api_analyze_batch(request: BatchAnalysisRequest):
+    """
+    메시지 배치 분석 (규칙 기반)
+
+    대량 백필, 단체방 fan-out용. 같은 메시지는 한 번만 분석하고
+    작업자 풀에서 나눠 실행한 뒤 입력 순서대로 결과를 반환한다.
+
+    direction=incoming: 안심 가드 4단계 (sender_id + receiver_id가 있으면 발신자 신뢰도 포함)
+    direction=outgoing: 안심 전송 PII 감지
+    """
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Too many items: {len(request.items)} > {BATCH_MAX_ITEMS}")
+
+    try:
+        if request.direction == "incoming":
+            run = await analyze_incoming_batch_async([
+                {
+                    "text": item.text,
+                    "sender_id": str(item.sender_id) if item.sender_id else None,
+                    "user_id": str(item.receiver_id) if item.receiver_id else None,
+                }
+                for item in request.items
+            ])
+            convert = _incoming_response
+        else:
+            run = await analyze_outgoing_batch_async([item.text for item in request.items])
+            convert = _outgoing_response
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # 중복 항목은 같은 결과 객체를 공유하므로 변환도 한 번만
+    converted = {}
+    results = []
+    errors = []
+    for index, result in enumerate(run.results):
+        if isinstance(result, BatchItemError):
+            errors.append(BatchItemErrorResponse(index=index, detail=result.detail))
+            results.append(None)
+            continue
+        response = converted.get(id(result))
+        if response is None:
+            response = converted[id(result)] = convert(result)
+        results.append(response)
+
+    return BatchAnalysisResponse(results=results, total=len(results), unique=run.unique, errors=errors)
+
+
+@app.post("/api/agents/analyze/incoming/stream")
+async def api_analyze_incoming_stream(request: IncomingRequest):
+    """
+    안심 가드 Agent - 수신 메시지 단계별 분석 (Server-Sent Events)
+
+    단계가 끝날 때마다 이벤트 1개 전송 (event: 단계 이름):
+    1. stage1_threat_detection - 규칙 기반 위협 감지 (잠정 판정, 수 ms)
+    2. stage2_scam_check - 사기 신고 DB 조회
+    3. stage3_sender_trust - 발신자 신뢰도 (sender_id + receiver_id 필요)
+    4. stage4_final_policy - 정책 기반 최종 판정
+    5. llm_refinement - LLM 정밀 분석 (use_ai=True, 위험도를 올릴 때만 verdict 변경)
+    마지막에 event: done
+
+    data: {"stage", "result", "verdict": AnalysisResponse, "final"}
+    """
+    sender_id = str(request.sender_id) if request.sender_id else None
+    user_id = str(request.receiver_id) if request.receiver_id else None
+
+    async def events():
+        try:
+            async for event in analyze_incoming_stream(
+                request.text,
+                sender_id=sender_id,
+                user_id=user_id,
+                use_ai=request.use_ai
+            ):
+                data = {
+                    "stage": event["stage"],
+                    "result": event["result"],
+                    "verdict": _incoming_response(event["verdict"]).model_dump(),
+                    "final": event["final"],
+                }
+                payload = json.dumps(data, ensure_ascii=False, default=str)
+                yield f"event: {event['stage']}\ndata: {payload}\n\n"
+        except Exception as e:
+            payload = json.dumps({"detail": str(e)}, ensure_ascii=False)
+            yield f"event: error\ndata: {payload}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/agents/analysis/{analysis_id}", response_model=AnalysisFollowUpResponse)
+async def api_analysis_follow_up(analysis_id: str, wait_ms: int = 0):
+    """
+    지연 예산 초과 분석의 후속 결과 조회
+
+    wait_ms > 0이면 LLM 분석이 끝날 때까지 최대 wait_ms 대기 (롱 폴링)
+    upgraded=True면 LLM 판정의 위험도가 먼저 받은 규칙 판정과 다름
+    """
+    registry = get_analysis_registry()
+    info = await registry.wait(analysis_id, min(max(wait_ms, 0), 30000) / 1000)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Analysis not found or expired: {analysis_id}")
+
+    result = info["result"]
+    initial = info["initial"]
+    return AnalysisFollowUpResponse(
+        analysis_id=analysis_id,
+        status=info["status"],
+        result=result,
+        upgraded=bool(result is not None and initial is not None and result.risk_level != initial.risk_level),
+        error=info["error"]
+    )
+
+
 # 이미지 OCR 캐시 (image_url -> extracted_text)
 _ocr_cache: dict = {}
 
@@ -285,7 +589,7 @@ async def api_ocr_image(request: OCRRequest):
             # URL에서 다운로드
             import requests
             import tempfile
-            response = requests.get(image_url)
+            response = await asyncio.to_thread(requests.get, image_url)
             with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as f:
                 f.write(response.content)
                 image_path = f.name
@@ -295,8 +599,10 @@ async def api_ocr_image(request: OCRRequest):
             if not os.path.exists(image_path):
                 raise HTTPException(status_code=404, detail=f"Image not found: {image_path}")
 
-        # OCR 수행
-        extracted_text = vision_model.analyze_image(image_path)
+        # OCR 수행 (동기 Vision 호출은 스레드 풀에서, LLM 스케줄러 vision 클래스 슬롯)
+        from agent.llm.scheduler import get_llm_scheduler
+        async with get_llm_scheduler().aslot("vision"):
+            extracted_text = await asyncio.to_thread(vision_model.analyze_image, image_path)
 
         # 캐싱
         _ocr_cache[image_url] = extracted_text
@@ -319,13 +625,15 @@ async def api_analyze_text_from_image(request: ImageTextAnalysisRequest):
     이미지 전송 시 빠른 분석을 위해 사용
     """
     try:
-        result = analyze_outgoing(request.extracted_text, use_ai=request.use_ai)
+        result = await analyze_outgoing_async(request.extracted_text, use_ai=request.use_ai)
         return AnalysisResponse(
             risk_level=result.risk_level.value,
             reasons=result.reasons,
             recommended_action=result.recommended_action,
             is_secret_recommended=result.is_secret_recommended
         )
+    except RulePoolSaturated as e:
+        raise _pool_saturated(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -357,8 +665,8 @@ async def api_analyze_image(
             temp_path = temp_file.name
             shutil.copyfileobj(file.file, temp_file)
 
-        # MCP 도구로 분석 (순차 처리: Vision → Instruct/Rule-based)
-        result = analyze_image(temp_path, use_ai=use_ai)
+        # MCP 도구로 분석 (순차 처리: Vision → Instruct/Rule-based, 스레드 풀에서)
+        result = await asyncio.to_thread(analyze_image, temp_path, use_ai=use_ai)
 
         return AnalysisResponse(
             risk_level=result.risk_level.value,
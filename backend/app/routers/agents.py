@@ -58,7 +58,7 @@ async def analyze_outgoing_message(request: MessageAnalysisRequest):
     try:
         # AgentManager를 통해 Outgoing Agent 가져오기
         outgoing_agent = AgentManager.get_outgoing()
-        result = outgoing_agent.analyze(request.text)
+        result = await outgoing_agent.analyze_async(request.text)
 
         return MessageAnalysisResponse(
             risk_level=result.risk_level.value,
@@ -89,7 +89,7 @@ async def analyze_incoming_message(request: MessageAnalysisRequest):
     try:
         # AgentManager를 통해 Incoming Agent 가져오기
         incoming_agent = AgentManager.get_incoming()
-        result = incoming_agent.analyze(
+        result = await incoming_agent.analyze_async(
             text=request.text,
             sender_id=request.sender_id
         )
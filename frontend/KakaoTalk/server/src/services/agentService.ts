@@ -13,12 +13,29 @@ import {
   OutgoingAnalysisRequest,
   IncomingAnalysisRequest,
   AgentApiResponse,
+  AnalysisFollowUpResponse,
   RiskLevel
 } from '../types/agent';
 
 // FastAPI Agent API 베이스 URL
 const AGENT_API_BASE_URL = process.env.AGENT_API_URL || 'http://localhost:8002/api/agents';
 
+// 지연 예산: 이 시간 안에 LLM 판정이 없으면 규칙 판정을 먼저 받고 LLM 판정은 후속 조회
+const AGENT_LATENCY_BUDGET_MS = Number(process.env.AGENT_LATENCY_BUDGET_MS || 1500);
+// 예산 + 규칙 판정 + 네트워크 여유
+const AGENT_REQUEST_TIMEOUT_MS = AGENT_LATENCY_BUDGET_MS + 3000;
+// 후속 조회 롱 폴링 대기 (서버 최대 30초)
+const FOLLOW_UP_WAIT_MS = 25000;
+
+const toSecurityAnalysis = (data: AgentApiResponse, isSecretRecommended: boolean): SecurityAnalysis => ({
+  risk_level: data.risk_level as RiskLevel,
+  reasons: data.reasons,
+  recommended_action: data.recommended_action,
+  is_secret_recommended: isSecretRecommended,
+  analysis_id: data.analysis_id || undefined,
+  pending: data.pending || false
+});
+
 /**
  * 안심 전송 Agent (Outgoing) - 발신 메시지 분석
  * 민감정보를 감지하고 시크릿 전송을 추천합니다.
@@ -33,26 +50,22 @@ export const analyzeOutgoing = async (
       text,
       sender_id,
       receiver_id,
-      use_ai: true  // Kanana LLM + ReAct 패턴 활성화
+      use_ai: true,  // Kanana LLM + ReAct 패턴 활성화
+      latency_budget_ms: AGENT_LATENCY_BUDGET_MS
     };
 
     const response = await axios.post<AgentApiResponse>(
       `${AGENT_API_BASE_URL}/analyze/outgoing`,
       request,
       {
-        timeout: 30000, // LLM 호출 고려 30초 타임아웃
+        timeout: AGENT_REQUEST_TIMEOUT_MS, // LLM이 늦으면 서버가 예산 안에 규칙 판정 반환
         headers: {
           'Content-Type': 'application/json'
         }
       }
     );
 
-    const result: SecurityAnalysis = {
-      risk_level: response.data.risk_level as RiskLevel,
-      reasons: response.data.reasons,
-      recommended_action: response.data.recommended_action,
-      is_secret_recommended: response.data.is_secret_recommended
-    };
+    const result = toSecurityAnalysis(response.data, response.data.is_secret_recommended);
 
     logger.info(`Outgoing Agent Analysis: ${result.risk_level} - ${text.substring(0, 50)}`);
     return result;
@@ -78,26 +91,22 @@ export const analyzeIncoming = async (
       text,
       sender_id,
       receiver_id,
-      use_ai: true  // Kanana LLM 활성화
+      use_ai: true,  // Kanana LLM 활성화
+      latency_budget_ms: AGENT_LATENCY_BUDGET_MS
     };
 
     const response = await axios.post<AgentApiResponse>(
       `${AGENT_API_BASE_URL}/analyze/incoming`,
       request,
       {
-        timeout: 30000, // LLM 호출 고려 30초 타임아웃
+        timeout: AGENT_REQUEST_TIMEOUT_MS, // LLM이 늦으면 서버가 예산 안에 규칙 판정 반환
         headers: {
           'Content-Type': 'application/json'
         }
       }
     );
 
-    const result: SecurityAnalysis = {
-      risk_level: response.data.risk_level as RiskLevel,
-      reasons: response.data.reasons,
-      recommended_action: response.data.recommended_action,
-      is_secret_recommended: false
-    };
+    const result = toSecurityAnalysis(response.data, false);
 
     logger.info(`Incoming Agent Analysis: ${result.risk_level} - ${text.substring(0, 50)}`);
     return result;
@@ -108,6 +117,42 @@ export const analyzeIncoming = async (
   }
 };
 
+/**
+ * 지연 예산 초과 분석의 후속(LLM) 판정 조회
+ * 완료될 때까지 롱 폴링하며, 완료 전 만료/실패 시 null 반환
+ */
+export const fetchUpgradedAnalysis = async (
+  analysisId: string,
+  isSecretRecommended?: boolean
+): Promise<SecurityAnalysis | null> => {
+  try {
+    for (let attempt = 0; attempt < 3; attempt++) {
+      const response = await axios.get<AnalysisFollowUpResponse>(
+        `${AGENT_API_BASE_URL}/analysis/${analysisId}`,
+        {
+          params: { wait_ms: FOLLOW_UP_WAIT_MS },
+          timeout: FOLLOW_UP_WAIT_MS + 5000
+        }
+      );
+
+      const { status, result } = response.data;
+      if (status === 'done' && result) {
+        logger.info(`Upgraded Agent Analysis: ${result.risk_level} (${analysisId})`);
+        return toSecurityAnalysis(result, isSecretRecommended ?? result.is_secret_recommended);
+      }
+      if (status === 'error') {
+        logger.error(`Agent Follow-up Failed: ${response.data.error} (${analysisId})`);
+        return null;
+      }
+    }
+    return null;
+
+  } catch (error) {
+    logger.error(`Agent Follow-up API Error: ${error}`);
+    return null;
+  }
+};
+
 /**
  * 이미지 분석 Agent - 이미지 내 민감정보 감지
  * Vision OCR로 텍스트 추출 후 PII 분석
@@ -11,7 +11,8 @@ import {
   ReadChatRequest,
   ReadChatResponse
 } from '../types/chat';
-import { analyzeOutgoing, analyzeIncoming } from '../services/agentService';
+import { analyzeOutgoing, analyzeIncoming, fetchUpgradedAnalysis } from '../services/agentService';
+import { SecurityAnalysis } from '../types/agent';
 
 const runSocketIo = (server: http.Server) => {
   const io = socketIO.listen(server);
@@ -29,6 +30,32 @@ const disconnect = (socket: socketIO.Socket) => {
   });
 };
 
+/**
+    지연 예산 초과로 규칙 판정만 먼저 보낸 경우,
+    LLM 판정이 끝나면 'securityAnalysisUpdate'로 해당 메시지의 분석 결과를 다시 보냅니다.
+**/
+const pushUpgradedAnalysis = (
+  io: socketIO.Server,
+  target: string,
+  message_id: number,
+  room_id: number,
+  analysis: SecurityAnalysis | null,
+  isSecretRecommended?: boolean
+) => {
+  if (!analysis || !analysis.pending || !analysis.analysis_id) {
+    return;
+  }
+  fetchUpgradedAnalysis(analysis.analysis_id, isSecretRecommended).then(upgraded => {
+    if (upgraded) {
+      io.to(target).emit('securityAnalysisUpdate', {
+        id: message_id,
+        room_id,
+        security_analysis: upgraded
+      });
+    }
+  });
+};
+
 const joinRoom = (socket: socketIO.Socket) => {
   socket.on('join', (room_id: string) => {
     socket.join(room_id);
@@ -118,6 +145,8 @@ const message = (socket: socketIO.Socket, io: socketIO.Server) => {
 
         io.to(target).emit('message', targetResponse);
         io.to(me).emit('message', messageResponse);
+        pushUpgradedAnalysis(io, target, savedMessage.id, room_id, incomingAnalysis, false);
+        pushUpgradedAnalysis(io, me, savedMessage.id, room_id, outgoingAnalysis);
         await Participant.increment(['not_read_chat'], {
           where: {
             user_id: messageObj.participant[0].id,
@@ -15,6 +15,8 @@ export interface SecurityAnalysis {
   reasons: string[];
   recommended_action: string;
   is_secret_recommended?: boolean;
+  analysis_id?: string;  // 지연 예산 초과 시 진행 중인 LLM 분석 ID
+  pending?: boolean;     // true면 규칙 판정이며 LLM 판정이 뒤따름
 }
 
 export interface OutgoingAnalysisRequest {
@@ -22,6 +24,7 @@ export interface OutgoingAnalysisRequest {
   sender_id?: number;
   receiver_id?: number;
   use_ai?: boolean;  // Kanana LLM 사용 여부
+  latency_budget_ms?: number;  // 지연 예산 (초과 시 규칙 판정 먼저 반환)
 }
 
 export interface IncomingAnalysisRequest {
@@ -29,6 +32,7 @@ export interface IncomingAnalysisRequest {
   sender_id?: number;
   receiver_id?: number;
   use_ai?: boolean;  // Kanana LLM 사용 여부
+  latency_budget_ms?: number;  // 지연 예산 (초과 시 규칙 판정 먼저 반환)
 }
 
 export interface AgentApiResponse {
@@ -36,4 +40,14 @@ export interface AgentApiResponse {
   reasons: string[];
   recommended_action: string;
   is_secret_recommended: boolean;
+  analysis_id?: string | null;
+  pending?: boolean;
+}
+
+export interface AnalysisFollowUpResponse {
+  analysis_id: string;
+  status: 'pending' | 'done' | 'error';
+  result?: AgentApiResponse | null;
+  upgraded: boolean;
+  error?: string | null;
 }